@@ -45,6 +45,11 @@ OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 # Thinking deaktivierbar via reasoning.effort="none" → keine versteckten Reasoning-Tokens
 OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "google/gemini-2.5-flash")
 
+# HTTP-Verbindungspool für LLM-Calls (ai_coach/llm_transport.py)
+# Ein Pool pro Prozess; Keep-Alive spart TLS-Handshakes zu OpenRouter.
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", 20))
+LLM_HTTP_KEEPALIVE_SECONDS = float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", 60))
+
 
 def validate_config():
     """
@@ -8,8 +8,15 @@ from collections import defaultdict
 from datetime import timedelta
 from typing import Any, Dict, List
 
+from django.db.models import Count, F, FloatField, Max, Min, Q, Sum, Window
+from django.db.models.functions import Cast, RowNumber
 from django.utils import timezone
 
+# RPE als Float (DecimalField) – Summen/Durchschnitte ohne Decimal-Rundung
+_RPE = Cast("rpe", FloatField())
+# Nur Sätze mit Gewicht liefern einen e1RM-Datensatz (records)
+_MIT_GEWICHT = ~Q(gewicht=0)
+
 
 class TrainingAnalyzer:
     """
@@ -74,92 +81,83 @@ class TrainingAnalyzer:
         """
         Hauptfunktion: Analysiert Training und gibt strukturierte Daten zurück
 
+        Konstant drei Queries unabhängig vom Zeitraum (Plan-Generierung
+        analysiert bis zu 90+ Tage): Session-Statistik, Aggregat pro
+        Übung/Muskelgruppe und erster/letzter e1RM-Satz pro Übung per
+        Window-Funktion. Früher lief eine Satz-Query pro Session (N+1) und
+        jeder Satz wurde als Python-Dict aufbereitet.
+
         Returns:
             Dict mit allen relevanten Metriken für LLM
         """
-        from core.models import Trainingseinheit  # Satz, Uebung via ForeignKey Relations
+        from core.models import Trainingseinheit
 
-        # Trainingseinheiten laden
-        sessions = Trainingseinheit.objects.filter(
+        session_stats = Trainingseinheit.objects.filter(
             user_id=self.user_id, datum__gte=self.start_date
-        ).order_by("datum")
-
-        if not sessions.exists():
+        ).aggregate(anzahl=Count("id"), dauer=Sum("dauer_minuten"))
+        total_sessions = session_stats["anzahl"]
+        if not total_sessions:
             return self._empty_analysis()
+        total_duration = session_stats["dauer"] or 0
 
-        # Daten sammeln
-        muscle_volume = defaultdict(
-            lambda: {"effective_reps": 0, "avg_rpe": [], "last_trained": None}
-        )
+        muscle_volume = {}
         exercise_performance = {}
-        total_sessions = sessions.count()
-        total_duration = sum(s.dauer_minuten or 0 for s in sessions)
-
-        # Alle Sätze durchgehen
-        for session in sessions:
-            for satz in session.saetze.select_related("uebung").filter(ist_aufwaermsatz=False):
-                if not satz.wiederholungen or not satz.rpe:
-                    continue
-
-                # Effektive Wiederholungen berechnen (RPE-weighted)
-                effective_reps = satz.wiederholungen * (float(satz.rpe) / 10.0)
-
-                # Muskelgruppen-Statistiken
-                mg = satz.uebung.muskelgruppe
-                muscle_volume[mg]["effective_reps"] += effective_reps
-                muscle_volume[mg]["avg_rpe"].append(float(satz.rpe))
-                if (
-                    not muscle_volume[mg]["last_trained"]
-                    or session.datum > muscle_volume[mg]["last_trained"]
-                ):
-                    muscle_volume[mg]["last_trained"] = session.datum
-
-                # Exercise Performance Tracking
-                ex_name = satz.uebung.bezeichnung
-                if ex_name not in exercise_performance:
-                    exercise_performance[ex_name] = {"records": [], "muscle_group": mg}
-
-                # 1RM berechnen (Epley-Formel)
-                if satz.gewicht and satz.wiederholungen >= 1:
-                    one_rm = float(satz.gewicht) * (1 + satz.wiederholungen / 30.0)
-                    exercise_performance[ex_name]["records"].append(
-                        {
-                            "date": session.datum.isoformat(),
-                            "1rm": round(one_rm, 1),
-                            "weight": float(satz.gewicht),
-                            "reps": satz.wiederholungen,
-                            "rpe": float(satz.rpe),
-                        }
-                    )
+        records = self._first_last_records()
+        record_rpe = defaultdict(list)
+
+        # Reihenfolge wie beim Durchlaufen der Sessions: nach erstem Training
+        for row in (
+            self._arbeitssaetze()
+            .values("uebung__bezeichnung", "uebung__muskelgruppe")
+            .annotate(
+                effective_reps=Sum(F("wiederholungen") * (_RPE / 10.0)),
+                rpe_summe=Sum(_RPE),
+                saetze=Count("id"),
+                record_rpe_summe=Sum(_RPE, filter=_MIT_GEWICHT),
+                record_saetze=Count("id", filter=_MIT_GEWICHT),
+                last_trained=Max("einheit__datum"),
+                erstes_training=Min("einheit__datum"),
+                erster_satz=Min("id"),
+            )
+            .order_by("erstes_training", "erster_satz")
+        ):
+            # Muskelgruppen-Statistiken (RPE-gewichtete effektive Wiederholungen)
+            mg = row["uebung__muskelgruppe"]
+            mg_stats = muscle_volume.setdefault(
+                mg, {"effective_reps": 0, "avg_rpe": [], "last_trained": row["last_trained"]}
+            )
+            mg_stats["effective_reps"] += row["effective_reps"]
+            mg_stats["avg_rpe"].append((row["rpe_summe"], row["saetze"]))
+            mg_stats["last_trained"] = max(mg_stats["last_trained"], row["last_trained"])
+
+            # Exercise Performance Tracking
+            ex_name = row["uebung__bezeichnung"]
+            if ex_name not in exercise_performance:
+                exercise_performance[ex_name] = {
+                    "records": records.get(ex_name, []),
+                    "muscle_group": mg,
+                }
+            record_rpe[ex_name].append((row["record_rpe_summe"] or 0.0, row["record_saetze"]))
 
         # Durchschnitte berechnen
-        for mg in muscle_volume:
-            if muscle_volume[mg]["avg_rpe"]:
-                muscle_volume[mg]["avg_rpe"] = round(
-                    sum(muscle_volume[mg]["avg_rpe"]) / len(muscle_volume[mg]["avg_rpe"]), 1
-                )
-                muscle_volume[mg]["last_trained"] = muscle_volume[mg]["last_trained"].isoformat()
-
-        # Exercise Performance: Trends berechnen
-        for ex_name in exercise_performance:
-            records = exercise_performance[ex_name]["records"]
-            if len(records) >= 2:
-                # Sortieren nach Datum
-                records.sort(key=lambda x: x["date"])
-                first_1rm = records[0]["1rm"]
-                last_1rm = records[-1]["1rm"]
+        for mg_stats in muscle_volume.values():
+            mg_stats["avg_rpe"] = self._schnitt(mg_stats["avg_rpe"])
+            mg_stats["last_trained"] = mg_stats["last_trained"].isoformat()
+
+        # Exercise Performance: Trends aus erstem/letztem Satz mit Gewicht
+        for ex_name, ex_stats in exercise_performance.items():
+            ex_records = ex_stats["records"]
+            if len(ex_records) >= 2:
+                first_1rm = ex_records[0]["1rm"]
+                last_1rm = ex_records[-1]["1rm"]
                 trend = round(last_1rm - first_1rm, 1)
-                exercise_performance[ex_name]["trend"] = (
-                    f"+{trend}kg" if trend > 0 else f"{trend}kg"
-                )
-                exercise_performance[ex_name]["last_1rm"] = last_1rm
-                exercise_performance[ex_name]["avg_rpe"] = round(
-                    sum(r["rpe"] for r in records) / len(records), 1
-                )
+                ex_stats["trend"] = f"+{trend}kg" if trend > 0 else f"{trend}kg"
+                ex_stats["last_1rm"] = last_1rm
+                ex_stats["avg_rpe"] = self._schnitt(record_rpe[ex_name])
             else:
-                exercise_performance[ex_name]["trend"] = "Nicht genug Daten"
-                exercise_performance[ex_name]["last_1rm"] = records[0]["1rm"] if records else 0
-                exercise_performance[ex_name]["avg_rpe"] = records[0]["rpe"] if records else 0
+                ex_stats["trend"] = "Nicht genug Daten"
+                ex_stats["last_1rm"] = ex_records[0]["1rm"] if ex_records else 0
+                ex_stats["avg_rpe"] = ex_records[0]["rpe"] if ex_records else 0
 
         # Push/Pull Balance
         push_volume = sum(
@@ -199,6 +197,74 @@ class TrainingAnalyzer:
             "weaknesses": weaknesses,
         }
 
+    def _arbeitssaetze(self):
+        """Sätze des Zeitraums, die in die Analyse eingehen (ohne Aufwärmen, mit Wdh. und RPE)."""
+        from core.models import Satz
+
+        return Satz.objects.filter(
+            einheit__user_id=self.user_id,
+            einheit__datum__gte=self.start_date,
+            ist_aufwaermsatz=False,
+            wiederholungen__gt=0,
+            rpe__gt=0,
+        )
+
+    def _first_last_records(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Erster und letzter Satz mit Gewicht pro Übung (chronologisch) als records.
+
+        Window-Funktion statt alle Sätze zu laden: pro Übung kommen höchstens
+        zwei Zeilen aus der DB, genug für Trend und letzten e1RM.
+        """
+        partition = [F("uebung__bezeichnung")]
+        saetze = (
+            self._arbeitssaetze()
+            .filter(_MIT_GEWICHT)
+            .annotate(
+                nr_vorwaerts=Window(
+                    RowNumber(),
+                    partition_by=partition,
+                    order_by=[F("einheit__datum").asc(), F("satz_nr").asc()],
+                ),
+                nr_rueckwaerts=Window(
+                    RowNumber(),
+                    partition_by=partition,
+                    order_by=[F("einheit__datum").desc(), F("satz_nr").desc()],
+                ),
+            )
+            .filter(Q(nr_vorwaerts=1) | Q(nr_rueckwaerts=1))
+            .values(
+                "uebung__bezeichnung",
+                "einheit__datum",
+                "gewicht",
+                "wiederholungen",
+                "rpe",
+                "nr_vorwaerts",
+            )
+            .order_by("uebung__bezeichnung", "nr_vorwaerts")
+        )
+
+        records = defaultdict(list)
+        for satz in saetze:
+            # 1RM berechnen (Epley-Formel)
+            one_rm = float(satz["gewicht"]) * (1 + satz["wiederholungen"] / 30.0)
+            records[satz["uebung__bezeichnung"]].append(
+                {
+                    "date": satz["einheit__datum"].isoformat(),
+                    "1rm": round(one_rm, 1),
+                    "weight": float(satz["gewicht"]),
+                    "reps": satz["wiederholungen"],
+                    "rpe": float(satz["rpe"]),
+                }
+            )
+        return records
+
+    @staticmethod
+    def _schnitt(summen: List[tuple]) -> float:
+        """Durchschnitt aus (Summe, Anzahl)-Teilergebnissen, auf 1 Nachkommastelle."""
+        anzahl = sum(n for _, n in summen)
+        return round(sum(summe for summe, _ in summen) / anzahl, 1) if anzahl else 0
+
     def _identify_weaknesses(self, muscle_volume: dict, exercise_performance: dict) -> List[str]:
         """
         Identifiziert Schwachstellen basierend auf Volumen und Performance
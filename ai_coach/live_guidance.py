@@ -3,16 +3,133 @@ Live Guidance - KI-Coach während dem Training
 Gibt kontextbasierte Tipps und beantwortet Fragen in Echtzeit
 """
 
+import os
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
+from django.conf import settings
 from django.utils import timezone
 
 # Django Setup
 sys.path.insert(0, str(Path(__file__).parent))
 from .db_client import DatabaseClient
 
+_llm_lock = threading.Lock()
+_llm_pool: ThreadPoolExecutor | None = None
+_llm_plaetze: threading.BoundedSemaphore | None = None
+
+
+def _llm_executor() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """Prozessweiter Pool (lazy) für Stream-Calls samt Semaphore für freie Plätze.
+
+    Pool und Semaphore haben dieselbe Größe – ein Call wird nur eingereicht,
+    wenn ein Platz frei ist, es staut sich also nichts in der Pool-Queue.
+    """
+    global _llm_pool, _llm_plaetze
+    if _llm_pool is None:
+        with _llm_lock:
+            if _llm_pool is None:
+                anzahl = max(1, getattr(settings, "LIVE_GUIDANCE_PARALLEL", 4))
+                _llm_plaetze = threading.BoundedSemaphore(anzahl)
+                _llm_pool = ThreadPoolExecutor(
+                    max_workers=anzahl, thread_name_prefix="live-guidance"
+                )
+    return _llm_pool, _llm_plaetze
+
+
+def _nach_fork() -> None:
+    # Threads überleben fork() nicht – im Kind (Gunicorn-Worker) neu anlegen
+    global _llm_pool, _llm_plaetze, _llm_lock
+    _llm_pool, _llm_plaetze = None, None
+    _llm_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_nach_fork)
+
+
+class _AntwortFilter:
+    """
+    Zieht beim Streaming den Antworttext aus der LLM-Ausgabe.
+
+    Im JSON-Mode (OpenRouter) kommt ``{"antwort": "..."}`` – gestreamt wird nur
+    der erste String-Wert (Escapes aufgelöst), wie ``get_guidance`` ihn nimmt.
+    Freitext (Ollama) wird unverändert durchgereicht.
+    """
+
+    _ESCAPES = {
+        '"': '"',
+        "\\": "\\",
+        "/": "/",
+        "b": "\b",
+        "f": "\f",
+        "n": "\n",
+        "r": "\r",
+        "t": "\t",
+    }
+
+    def __init__(self):
+        self._zustand = "start"
+        self._escape = False
+        self._unicode = ""
+
+    def feed(self, text: str) -> str:
+        """Gibt den sichtbaren Anteil des Deltas zurück."""
+        ausgabe = []
+        for zeichen in text:
+            if self._zustand == "text":
+                ausgabe.append(zeichen)
+            elif self._zustand == "start":
+                if zeichen.isspace():
+                    continue
+                self._zustand = "vor_schluessel" if zeichen == "{" else "text"
+                if self._zustand == "text":
+                    ausgabe.append(zeichen)
+            elif self._zustand == "vor_schluessel" and zeichen == '"':
+                self._zustand = "schluessel"
+            elif self._zustand == "schluessel":
+                if self._escape:
+                    self._escape = False
+                elif zeichen == "\\":
+                    self._escape = True
+                elif zeichen == '"':
+                    self._zustand = "nach_schluessel"
+            elif self._zustand == "nach_schluessel":
+                if zeichen == '"':
+                    self._zustand = "wert"
+                elif not (zeichen.isspace() or zeichen == ":"):
+                    self._zustand = "ende"  # kein String-Wert → erst das Schluss-Event
+            elif self._zustand == "wert":
+                ausgabe.append(self._wert_zeichen(zeichen))
+        return "".join(ausgabe)
+
+    def _wert_zeichen(self, zeichen: str) -> str:
+        if self._unicode:
+            self._unicode += zeichen
+            if len(self._unicode) < 5:
+                return ""
+            code, self._unicode = self._unicode[1:], ""
+            try:
+                return chr(int(code, 16))
+            except ValueError:
+                return ""
+        if self._escape:
+            self._escape = False
+            if zeichen == "u":
+                self._unicode = "u"
+                return ""
+            return self._ESCAPES.get(zeichen, zeichen)
+        if zeichen == "\\":
+            self._escape = True
+            return ""
+        if zeichen == '"':
+            self._zustand = "ende"
+            return ""
+        return zeichen
+
 
 class LiveGuidance:
     """
@@ -27,6 +144,9 @@ class LiveGuidance:
         """
         self.use_openrouter = use_openrouter
 
+    # Max. Wartezeit auf das nächste Token beim Streaming (Sekunden)
+    STREAM_TIMEOUT = 60
+
     def build_context(
         self,
         trainingseinheit_id: int,
@@ -259,6 +379,8 @@ FOKUS:
         current_uebung_id: Optional[int] = None,
         current_satz_number: Optional[int] = None,
         chat_history: Optional[List[Dict[str, str]]] = None,
+        cache: bool = True,
+        on_token: Optional[Callable[[str, Any], None]] = None,
     ) -> Dict[str, Any]:
         """
         Hauptmethode: Holt KI-Guidance für User-Frage
@@ -269,13 +391,16 @@ FOKUS:
             current_uebung_id: ID der aktuellen Übung (optional)
             current_satz_number: Satznummer (optional)
             chat_history: Bisherige Chat-Nachrichten [{role, content}] (optional)
+            cache: False = LLM-Response-Cache umgehen
+            on_token: Callback(text_delta, metriken) – Antwort wird gestreamt
 
         Returns:
             {
                 'answer': str - KI Antwort,
                 'context': dict - Verwendeter Context,
                 'cost': float - Kosten in Euro,
-                'model': str - Verwendetes LLM
+                'model': str - Verwendetes LLM,
+                'cached': bool - Antwort aus dem LLM-Response-Cache
             }
         """
         from .llm_client import LLMClient
@@ -287,14 +412,7 @@ FOKUS:
         print(f"   Chat-Historie: {len(chat_history) if chat_history else 0} Nachrichten")
 
         # User-ID für Logging ermitteln
-        try:
-            from core.models import Trainingseinheit as _TE
-
-            _user_id = (
-                _TE.objects.filter(id=trainingseinheit_id).values_list("user_id", flat=True).first()
-            )
-        except Exception:
-            _user_id = None
+        _user_id = self._user_id_fuer(trainingseinheit_id)
 
         # 1. Context sammeln
         context = self.build_context(
@@ -315,18 +433,11 @@ FOKUS:
 
         llm_result = None
         try:
-            llm_result = llm_client.generate_training_plan(messages=messages, max_tokens=300)
-
-            # generate_training_plan parst JSON; Live Guidance gibt Freitext zurück.
-            # Falls LLM dennoch JSON liefert, nehmen wir den ersten Text-Wert.
-            response_data = llm_result.get("response", {})
-            if isinstance(response_data, dict):
-                answer = next(iter(response_data.values()), str(response_data))
-            else:
-                answer = str(response_data) if response_data else ""
+            llm_result = llm_client.generate_training_plan(
+                messages=messages, max_tokens=300, cache=cache, on_token=on_token
+            )
 
-            if not answer:
-                raise ValueError("Leere Antwort vom LLM")
+            answer = self._antwort_aus(llm_result)
 
             print(f"   ✓ Antwort erhalten ({len(answer)} Zeichen)")
             print(f"   Model: {llm_result.get('model', '?')}")
@@ -339,6 +450,7 @@ FOKUS:
                 "context": context,
                 "cost": llm_result.get("cost", 0.0),
                 "model": llm_result.get("model", ""),
+                "cached": bool(llm_result.get("cached", False)),
             }
 
         except Exception as e:
@@ -355,6 +467,193 @@ FOKUS:
                 "model": "error",
             }
 
+    def stream_guidance(
+        self,
+        trainingseinheit_id: int,
+        user_question: str,
+        current_uebung_id: Optional[int] = None,
+        current_satz_number: Optional[int] = None,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+        cache: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Wie get_guidance, liefert die Antwort aber Token für Token (für SSE).
+
+        Context und Prompt entstehen wie bei get_guidance; nur der LLM-Call läuft
+        im begrenzten Pool (``LIVE_GUIDANCE_PARALLEL`` pro Prozess) und schiebt
+        Tokens über eine Queue hierher. Ist kein Platz frei, kommt sofort ein
+        Fehler-Event mit ``busy`` – ohne LLM-Call. KIApiLog
+        schreibt der aufrufende Thread – außer der Stream wurde vorher verlassen
+        (Timeout, Client weg): dann loggt der LLM-Thread die Kosten selbst, sobald
+        der bezahlte Call fertig ist.
+
+        Yields:
+            {'token': str, 'done': False}  – Text-Delta
+            {'reset': True, 'done': False} – Ollama brach ab, OpenRouter beginnt neu
+            {'done': True, 'success': True, 'answer', 'cost', 'model', 'usage',
+             'metrics', 'cached'} – Schluss-Event (Kosten wie in KIApiLog)
+            {'done': True, 'success': False, 'error': str}
+            {'done': True, 'success': False, 'error': str, 'busy': True} – Pool voll
+        """
+        from .llm_client import LLMClient
+
+        user_id = self._user_id_fuer(trainingseinheit_id)
+        context = self.build_context(
+            trainingseinheit_id=trainingseinheit_id,
+            current_uebung_id=current_uebung_id,
+            current_satz_number=current_satz_number,
+        )
+        messages = self.generate_prompt(context, user_question, chat_history)
+
+        ereignisse: queue.Queue = queue.Queue()
+        # Wer das Ergebnis loggt, entscheidet sich unter dem Lock: der Generator,
+        # solange er läuft, danach der LLM-Thread (genau ein KIApiLog pro Call)
+        lock = threading.Lock()
+        verlassen = False
+
+        def llm_call() -> None:
+            from django.db import connection
+
+            try:
+                llm_client = LLMClient(
+                    use_openrouter=self.use_openrouter,
+                    fallback_to_openrouter=True,
+                    temperature=0.7,
+                )
+                ergebnis = llm_client.generate_training_plan(
+                    messages=messages,
+                    max_tokens=300,
+                    cache=cache,
+                    on_token=lambda text, metriken: ereignisse.put(("token", text, metriken)),
+                )
+            except Exception as e:
+                ereignisse.put(("fehler", e, None))
+                return
+            else:
+                with lock:
+                    if not verlassen:
+                        ereignisse.put(("ergebnis", ergebnis, None))
+                        return
+                self._log_stream_kosten(user_id, ergebnis)
+            finally:
+                # Pool-Threads leben weiter: DB-Verbindung schließen, Platz freigeben
+                connection.close()
+                plaetze.release()
+
+        pool, plaetze = _llm_executor()
+        if not plaetze.acquire(blocking=False):
+            print("   ⚠️ Live-Guidance-Stream: alle Plätze belegt")
+            yield {
+                "done": True,
+                "success": False,
+                "busy": True,
+                "error": "Der KI-Coach ist gerade ausgelastet. Bitte versuche es gleich erneut.",
+            }
+            return
+        try:
+            pool.submit(llm_call)
+        except BaseException:
+            plaetze.release()
+            raise
+
+        try:
+            yield from self._stream_events(ereignisse, user_id)
+        finally:
+            with lock:
+                verlassen = True
+            # Ergebnis schon in der Queue, aber nicht mehr abgeholt
+            while True:
+                try:
+                    art, wert, _ = ereignisse.get_nowait()
+                except queue.Empty:
+                    break
+                if art == "ergebnis":
+                    self._log_stream_kosten(user_id, wert)
+
+    def _stream_events(
+        self, ereignisse: queue.Queue, user_id: Optional[int]
+    ) -> Iterator[Dict[str, Any]]:
+        """Übersetzt die Queue-Ereignisse des LLM-Threads in SSE-Events."""
+        fehler_event = {
+            "done": True,
+            "success": False,
+            "error": "Es ist ein Fehler beim Generieren der Antwort aufgetreten. Bitte versuche es später erneut.",
+        }
+        stream, antwort_filter = None, None
+        while True:
+            try:
+                art, wert, metriken = ereignisse.get(timeout=self.STREAM_TIMEOUT)
+            except queue.Empty:
+                print("   ❌ Live-Guidance-Stream: Timeout")
+                yield fehler_event
+                return
+
+            if art == "token":
+                if metriken is not stream:
+                    if stream is not None:
+                        yield {"reset": True, "done": False}
+                    stream, antwort_filter = metriken, _AntwortFilter()
+                text = antwort_filter.feed(wert)
+                if text:
+                    yield {"token": text, "done": False}
+            elif art == "fehler":
+                print(f"   ❌ Fehler: {wert}")
+                yield fehler_event
+                return
+            else:
+                answer = self._log_stream_kosten(user_id, wert)
+                if answer is None:
+                    yield fehler_event
+                    return
+                yield {
+                    "done": True,
+                    "success": True,
+                    "answer": answer,
+                    "cost": wert.get("cost", 0.0),
+                    "model": wert.get("model", ""),
+                    "usage": wert.get("usage", {}),
+                    "metrics": wert.get("metrics", {}),
+                    "cached": bool(wert.get("cached", False)),
+                }
+                return
+
+    def _log_stream_kosten(self, user_id: Optional[int], llm_result: Dict) -> Optional[str]:
+        """Loggt einen fertigen Stream-Call in KIApiLog; Antwort oder None bei Formatfehler."""
+        try:
+            answer = self._antwort_aus(llm_result)
+        except ValueError as e:
+            self._log_ki_cost(user_id, llm_result, success=False, error_message=str(e))
+            return None
+        self._log_ki_cost(user_id, llm_result)
+        return answer
+
+    @staticmethod
+    def _user_id_fuer(trainingseinheit_id: int) -> Optional[int]:
+        """User der Trainingseinheit (für KIApiLog); None wenn nicht ermittelbar."""
+        try:
+            from core.models import Trainingseinheit as _TE
+
+            return (
+                _TE.objects.filter(id=trainingseinheit_id).values_list("user_id", flat=True).first()
+            )
+        except Exception:
+            return None
+
+    @staticmethod
+    def _antwort_aus(llm_result: dict) -> str:
+        """Antworttext aus dem LLM-Ergebnis. Raises ValueError bei leerer Antwort."""
+        # generate_training_plan parst JSON; Live Guidance gibt Freitext zurück.
+        # Falls LLM dennoch JSON liefert, nehmen wir den ersten Text-Wert.
+        response_data = llm_result.get("response", {})
+        if isinstance(response_data, dict):
+            answer = next(iter(response_data.values()), str(response_data))
+        else:
+            answer = str(response_data) if response_data else ""
+
+        if not answer:
+            raise ValueError("Leere Antwort vom LLM")
+        return answer
+
     def _log_ki_cost(
         self,
         user_id: Optional[int],
@@ -375,6 +674,7 @@ FOKUS:
                 tokens_input=usage.get("prompt_tokens", 0),
                 tokens_output=usage.get("completion_tokens", 0),
                 cost_eur=llm_result.get("cost", 0.0),
+                cached=bool(llm_result.get("cached", False)),
                 success=success,
                 is_retry=False,
                 error_message=error_message,
@@ -0,0 +1,113 @@
+"""
+LLM Response Cache - Prompt-Fingerprint
+Doppelklicks, SSE-Reconnects und neu generierte Vorschauen schicken identische
+Message-Arrays. Statt erneut 15-20s auf Ollama/OpenRouter zu warten (und bei
+OpenRouter erneut zu zahlen), wird die Antwort unter einem Hash aus
+(model, temperature, messages, max_tokens) im Django-Cache abgelegt.
+
+Regeln:
+- Nur deterministische bzw. niedrige Temperaturen
+  (<= settings.LLM_CACHE_MAX_TEMPERATUR) – kreative Antworten sollen variieren.
+- TTL aus settings.LLM_CACHE_TTL_SEKUNDEN (0 = Cache aus).
+- Abgeschnittene Antworten (truncated) werden nie gespeichert.
+- Antworten, die der Aufrufer verwirft (z.B. Plan mit falschem Schema oder
+  Validierungsfehlern), entfernt er per verwirf() – sonst käme derselbe
+  kaputte Plan bei jedem erneuten Versuch aus dem Cache zurück.
+- Treffer kommen mit cost=0, usage=0 und cached=True zurück, damit
+  KIApiLog den Aufruf kostenfrei protokolliert.
+- Ohne Django-Setup (CLI-Skripte) ist der Cache still deaktiviert.
+"""
+
+import copy
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+KEY_PREFIX = "llm_antwort"
+
+
+def _einstellung(name: str, default):
+    try:
+        from django.conf import settings
+
+        if not settings.configured:
+            return None
+        return getattr(settings, name, default)
+    except ImportError:
+        return None
+
+
+def ttl() -> int:
+    """TTL in Sekunden; 0 wenn der Cache deaktiviert oder Django nicht konfiguriert ist."""
+    return int(_einstellung("LLM_CACHE_TTL_SEKUNDEN", 900) or 0)
+
+
+def ist_cachebar(temperature: float) -> bool:
+    """True, wenn ein Call mit dieser Temperatur gecacht werden darf."""
+    max_temperatur = _einstellung("LLM_CACHE_MAX_TEMPERATUR", 0.3)
+    return ttl() > 0 and max_temperatur is not None and temperature <= max_temperatur
+
+
+def fingerprint(
+    model: str, temperature: float, messages: List[Dict[str, str]], max_tokens: int
+) -> str:
+    """Cache-Key: SHA-256 über die kanonische JSON-Form aller Eingaben."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": round(float(temperature), 4),
+            "messages": messages,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return f"{KEY_PREFIX}_{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def hole(key: str) -> Optional[Dict[str, Any]]:
+    """Gecachte Antwort als kostenfreies Ergebnis oder None."""
+    try:
+        from django.core.cache import cache
+
+        gespeichert = cache.get(key)
+    except Exception:
+        return None
+    if gespeichert is None:
+        return None
+
+    ergebnis = copy.deepcopy(gespeichert)
+    ergebnis.update(
+        {
+            "cost": 0.0,
+            "tokens": 0,
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0},
+            "cached": True,
+        }
+    )
+    print(f"♻️ LLM-Cache-Treffer ({ergebnis.get('model', '?')}) – 0€")
+    return ergebnis
+
+
+def speichere(key: str, ergebnis: Dict[str, Any]) -> None:
+    """Speichert eine vollständige Antwort. Fehler sind non-fatal."""
+    if ergebnis.get("truncated") or not ergebnis.get("response"):
+        return
+    try:
+        from django.core.cache import cache
+
+        cache.set(key, ergebnis, ttl())
+    except Exception as e:
+        print(f"   ⚠️ LLM-Cache nicht beschreibbar (non-fatal): {e}")
+
+
+def verwirf(key: Optional[str]) -> None:
+    """Entfernt eine Antwort, die der Aufrufer nicht akzeptiert hat. Fehler sind non-fatal."""
+    if not key:
+        return
+    try:
+        from django.core.cache import cache
+
+        cache.delete(key)
+    except Exception as e:
+        print(f"   ⚠️ LLM-Cache-Eintrag nicht löschbar (non-fatal): {e}")
@@ -8,12 +8,16 @@ OpenRouter-Modell: google/gemini-2.5-flash (Default)
 - $0.30/M Input, $2.50/M Output (vs. Llama 3.1 70B: $0.35/M, kein JSON-Mode)
 """
 
+import functools
 import json
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import ollama
 
-from . import ai_config
+from . import ai_config, llm_cache, llm_transport
+
+# on_token(text_delta, metriken) – für Fortschritt/SSE während des Streamings
+TokenCallback = Callable[[str, "llm_transport.StreamMetriken"], None]
 
 
 class LLMClient:
@@ -119,6 +123,8 @@ class LLMClient:
                     api_key=api_key,
                     base_url="https://openrouter.ai/api/v1",
                     timeout=150.0,  # Client-Level Timeout: höher als Gunicorn (180s) minus Puffer
+                    # Geteilter Keep-Alive-Pool: kein neuer TLS-Handshake pro Request
+                    http_client=llm_transport.http_client(),
                 )
                 print("✓ OpenRouter Client bereit (Key aus sicherer Quelle)")
             except ImportError:
@@ -129,7 +135,12 @@ class LLMClient:
         return self.openrouter_client
 
     def generate_training_plan(
-        self, messages: List[Dict[str, str]], max_tokens: int = 4000, timeout: int = 120
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 4000,
+        timeout: int = 120,
+        cache: bool = True,
+        on_token: Optional[TokenCallback] = None,
     ) -> Dict[str, Any]:
         """
         Generiert Trainingsplan - versucht erst Ollama, dann OpenRouter
@@ -138,33 +149,73 @@ class LLMClient:
             messages: [{"role": "system", "content": "..."}, {"role": "user", "content": "..."}]
             max_tokens: Maximale Response-Länge
             timeout: Timeout in Sekunden
+            cache: False = Response-Cache umgehen (frische Antwort erzwingen)
+            on_token: Callback(text_delta, metriken) – aktiviert Streaming; das
+                Ergebnis enthält dann zusätzlich "metrics" (TTFT, Tokens/s)
 
         Returns:
-            Parsed JSON Response als Dict
+            Parsed JSON Response als Dict (bei Cache-Treffer mit cached=True, cost=0).
+            Gecachte Antworten tragen "cache_key" – Aufrufer, die die Antwort
+            verwerfen, entfernen sie mit llm_cache.verwirf().
 
         Raises:
             Exception: Wenn beide Methoden fehlschlagen
         """
+        cache_key = None
+        if cache and llm_cache.ist_cachebar(self.temperature):
+            cache_key = llm_cache.fingerprint(
+                self._ziel_modell(), self.temperature, messages, max_tokens
+            )
+            treffer = llm_cache.hole(cache_key)
+            if treffer is not None:
+                treffer["cache_key"] = cache_key
+                return treffer
+
+        result = self._generate(messages, max_tokens, timeout, on_token)
+        if cache_key is not None:
+            llm_cache.speichere(cache_key, result)
+            result = {**result, "cache_key": cache_key}
+        return result
+
+    def _ziel_modell(self) -> str:
+        """Modell, das ohne Fehler antworten würde (Teil des Cache-Keys)."""
+        if self.use_openrouter or not self.ollama_available:
+            return ai_config.OPENROUTER_MODEL
+        return self.model
+
+    def _generate(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        timeout: int,
+        on_token: Optional[TokenCallback] = None,
+    ) -> Dict[str, Any]:
+        """Routing Ollama → OpenRouter ohne Cache (gestreamt, wenn on_token gesetzt)."""
+        if on_token is None:
+            mit_ollama, mit_openrouter = self._generate_with_ollama, self._generate_with_openrouter
+        else:
+            mit_ollama = functools.partial(self._stream_with_ollama, on_token=on_token)
+            mit_openrouter = functools.partial(self._stream_with_openrouter, on_token=on_token)
 
         # Strategie 1: OpenRouter direkt
         if self.use_openrouter:
-            return self._generate_with_openrouter(messages, max_tokens, timeout)
+            return mit_openrouter(messages, max_tokens, timeout)
 
         # Strategie 2: Ollama mit OpenRouter Fallback
         if self.ollama_available:
             try:
-                return self._generate_with_ollama(messages, max_tokens, timeout)
+                return mit_ollama(messages, max_tokens, timeout)
             except Exception as e:
                 if self.fallback_to_openrouter:
                     print(f"\n⚠️ Ollama fehlgeschlagen: {e}")
                     print("→ Versuche OpenRouter Fallback...\n")
-                    return self._generate_with_openrouter(messages, max_tokens, timeout)
+                    return mit_openrouter(messages, max_tokens, timeout)
                 else:
                     raise
 
         # Strategie 3: Nur OpenRouter (Ollama nicht verfügbar)
         if self.fallback_to_openrouter:
-            return self._generate_with_openrouter(messages, max_tokens, timeout)
+            return mit_openrouter(messages, max_tokens, timeout)
 
         raise Exception("Kein LLM verfügbar - weder Ollama noch OpenRouter konfiguriert")
 
@@ -245,20 +296,7 @@ class LLMClient:
 
         try:
             response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=max_tokens,
-                timeout=timeout,
-                # Strukturiertes JSON direkt vom Modell – kein Markdown-Wrapping
-                response_format={"type": "json_object"},
-                # Thinking/Reasoning deaktivieren: verhindert versteckte Reasoning-Tokens
-                # die Kosten verdoppeln würden (Gemini 2.5 Flash Thinking-Modus)
-                extra_body={"reasoning": {"effort": "none"}},
-                extra_headers={
-                    "HTTP-Referer": "https://gym.last-strawberry.com",
-                    "X-Title": "HomeGym AI Coach",
-                },
+                **self._openrouter_parameter(model, messages, max_tokens, timeout)
             )
 
             content = response.choices[0].message.content
@@ -269,11 +307,7 @@ class LLMClient:
             prompt_tokens = response.usage.prompt_tokens
             completion_tokens = response.usage.completion_tokens
 
-            # Kosten berechnen – Gemini 2.5 Flash Preise ($0.30/$2.50 per 1M Tokens)
-            # Quelle: openrouter.ai/google/gemini-2.5-flash (Stand Feb 2026)
-            cost_input = (prompt_tokens / 1_000_000) * 0.30
-            cost_output = (completion_tokens / 1_000_000) * 2.50
-            total_cost = cost_input + cost_output
+            total_cost = self._openrouter_kosten(prompt_tokens, completion_tokens)
 
             print("✓ OpenRouter Response:")
             print(f"   Tokens: {tokens_used} (in: {prompt_tokens}, out: {completion_tokens})")
@@ -314,6 +348,113 @@ class LLMClient:
             print(f"\n❌ OpenRouter Error: {e}")
             raise
 
+    def _openrouter_parameter(
+        self, model: str, messages: List[Dict[str, str]], max_tokens: int, timeout: int
+    ) -> Dict[str, Any]:
+        """Gemeinsame Parameter für chat.completions.create (mit und ohne Streaming)."""
+        return {
+            "model": model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": max_tokens,
+            "timeout": timeout,
+            # Strukturiertes JSON direkt vom Modell – kein Markdown-Wrapping
+            "response_format": {"type": "json_object"},
+            # Thinking/Reasoning deaktivieren: verhindert versteckte Reasoning-Tokens
+            # die Kosten verdoppeln würden (Gemini 2.5 Flash Thinking-Modus)
+            "extra_body": {"reasoning": {"effort": "none"}},
+            "extra_headers": {
+                "HTTP-Referer": "https://gym.last-strawberry.com",
+                "X-Title": "HomeGym AI Coach",
+            },
+        }
+
+    @staticmethod
+    def _openrouter_kosten(prompt_tokens: int, completion_tokens: int) -> float:
+        # Kosten berechnen – Gemini 2.5 Flash Preise ($0.30/$2.50 per 1M Tokens)
+        # Quelle: openrouter.ai/google/gemini-2.5-flash (Stand Feb 2026)
+        cost_input = (prompt_tokens / 1_000_000) * 0.30
+        cost_output = (completion_tokens / 1_000_000) * 2.50
+        return cost_input + cost_output
+
+    def _stream_with_ollama(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        timeout: int,
+        on_token: TokenCallback,
+    ) -> Dict[str, Any]:
+        """Wie _generate_with_ollama, reicht aber jedes Token an on_token weiter."""
+        print(f"\n🤖 Streame mit Ollama ({self.model})...")
+        metriken = llm_transport.StreamMetriken()
+        teile = []
+        for text in llm_transport.stream_ollama(
+            self.model, messages, self.temperature, max_tokens, metriken
+        ):
+            teile.append(text)
+            on_token(text, metriken)
+
+        truncated = metriken.finish_reason == "length" or metriken.tokens >= max_tokens
+        return self._stream_ergebnis(
+            "".join(teile), metriken, model=self.model, cost=0.0, truncated=truncated
+        )
+
+    def _stream_with_openrouter(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        timeout: int,
+        on_token: TokenCallback,
+    ) -> Dict[str, Any]:
+        """Wie _generate_with_openrouter, reicht aber jedes Token an on_token weiter."""
+        client = self._get_openrouter_client()
+        model = ai_config.OPENROUTER_MODEL
+        print(f"\n🌐 Streame mit OpenRouter ({model})...")
+        metriken = llm_transport.StreamMetriken()
+        teile = []
+        for text in llm_transport.stream_openrouter(
+            client, self._openrouter_parameter(model, messages, max_tokens, timeout), metriken
+        ):
+            teile.append(text)
+            on_token(text, metriken)
+
+        return self._stream_ergebnis(
+            "".join(teile),
+            metriken,
+            model=model,
+            cost=self._openrouter_kosten(metriken.prompt_tokens, metriken.tokens),
+            truncated=metriken.finish_reason == "length",
+        )
+
+    def _stream_ergebnis(
+        self, content: str, metriken, *, model: str, cost: float, truncated: bool
+    ) -> Dict[str, Any]:
+        """Baut das Ergebnis-Dict eines Streams (Format wie die Nicht-Stream-Pfade)."""
+        kennzahlen = metriken.als_dict()
+        print(
+            f"✓ Stream fertig: {metriken.tokens} Tokens, TTFT {kennzahlen['ttft_ms']} ms, "
+            f"{kennzahlen['tokens_per_s']} Tokens/s, Kosten {cost:.4f}€"
+        )
+        if truncated:
+            print("   ⚠️  WARNUNG: Antwort gegen Token-Limit gelaufen – ABGESCHNITTEN!")
+        try:
+            response = self._extract_json(content)
+        except json.JSONDecodeError:
+            print(f"\n❌ JSON Parse Error im Stream. Raw Response:\n{content[:500]}")
+            raise
+        return {
+            "response": response,
+            "cost": cost,
+            "model": model,
+            "tokens": metriken.prompt_tokens + metriken.tokens,
+            "truncated": truncated,
+            "usage": {
+                "prompt_tokens": metriken.prompt_tokens,
+                "completion_tokens": metriken.tokens,
+            },
+            "metrics": kennzahlen,
+        }
+
     def _extract_json(self, content: str) -> Dict[str, Any]:
         """
         Extrahiert JSON aus LLM Response
@@ -0,0 +1,152 @@
+"""
+LLM Transport - geteilte HTTP-Verbindungen und Token-Streaming
+
+Bisher baute jeder LLMClient (also jeder Live-Guidance-Request) einen eigenen
+OpenAI-Client mit eigenem Verbindungsaufbau, und beide Backends lieferten erst
+nach der kompletten Antwort etwas zurück.
+
+- http_client(): ein httpx-Pool mit Keep-Alive pro Prozess (thread-safe,
+  nach fork() neu – Gunicorn-/Job-Worker teilen keine Sockets).
+  Ollama nutzt bereits den modulweiten Client von ``ollama`` (ebenfalls ein
+  Pool pro Prozess, Host aus OLLAMA_HOST).
+- stream_ollama() / stream_openrouter(): Generatoren über die Text-Deltas.
+- StreamMetriken: Time-to-first-Token, Tokens/s, Usage und finish_reason.
+
+Bewusst synchron: Die App läuft unter Gunicorn-Sync-Workern und streamt per
+StreamingHttpResponse. Ein asyncio-Client wäre an einen Event-Loop pro
+Request gebunden und könnte seinen Pool nicht über Requests hinweg halten.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import ai_config
+
+_lock = threading.Lock()
+_http_client = None
+
+
+def http_client():
+    """Prozessweiter httpx.Client mit Keep-Alive-Pool (lazy)."""
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                import httpx
+
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=ai_config.LLM_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=ai_config.LLM_HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=ai_config.LLM_HTTP_KEEPALIVE_SECONDS,
+                    ),
+                    timeout=httpx.Timeout(150.0, connect=10.0),
+                    follow_redirects=True,
+                )
+    return _http_client
+
+
+def _nach_fork() -> None:
+    # Geerbte Sockets gehören dem Elternprozess – im Kind neu aufbauen
+    global _http_client, _lock
+    _http_client = None
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_nach_fork)
+
+
+@dataclass
+class StreamMetriken:
+    """Laufzeit-Kennzahlen eines gestreamten LLM-Calls."""
+
+    start: float = field(default_factory=time.perf_counter)
+    erstes_token: Optional[float] = None
+    ende: Optional[float] = None
+    tokens: int = 0
+    prompt_tokens: int = 0
+    finish_reason: Optional[str] = None
+
+    def token(self) -> None:
+        if self.erstes_token is None:
+            self.erstes_token = time.perf_counter()
+        self.tokens += 1
+
+    def fertig(self) -> None:
+        self.ende = time.perf_counter()
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        if self.erstes_token is None:
+            return None
+        return (self.erstes_token - self.start) * 1000
+
+    @property
+    def tokens_pro_sekunde(self) -> float:
+        ende = self.ende or time.perf_counter()
+        if self.erstes_token is None or ende <= self.erstes_token:
+            return 0.0
+        return self.tokens / (ende - self.erstes_token)
+
+    def als_dict(self) -> Dict[str, Any]:
+        ende = self.ende or time.perf_counter()
+        return {
+            "ttft_ms": round(self.ttft_ms, 1) if self.ttft_ms is not None else None,
+            "tokens_per_s": round(self.tokens_pro_sekunde, 1),
+            "duration_s": round(ende - self.start, 2),
+            "completion_tokens": self.tokens,
+            "prompt_tokens": self.prompt_tokens,
+        }
+
+
+def stream_ollama(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    metriken: StreamMetriken,
+) -> Iterator[str]:
+    """Streamt eine Ollama-Antwort als Text-Deltas (ein Chunk ≈ ein Token)."""
+    import ollama
+
+    chunks = ollama.chat(
+        model=model,
+        messages=messages,
+        stream=True,
+        options={"temperature": temperature, "num_predict": max_tokens},
+    )
+    for chunk in chunks:
+        text = chunk["message"]["content"]
+        if text:
+            metriken.token()
+            yield text
+        if chunk.get("done"):
+            # Finale Zählung von Ollama ist genauer als die Chunk-Anzahl
+            metriken.tokens = chunk.get("eval_count") or metriken.tokens
+            metriken.prompt_tokens = chunk.get("prompt_eval_count") or 0
+            metriken.finish_reason = chunk.get("done_reason")
+    metriken.fertig()
+
+
+def stream_openrouter(client, parameter: Dict[str, Any], metriken: StreamMetriken) -> Iterator[str]:
+    """Streamt eine OpenAI-kompatible Antwort; ``parameter`` wie für create()."""
+    chunks = client.chat.completions.create(
+        **parameter, stream=True, stream_options={"include_usage": True}
+    )
+    for chunk in chunks:
+        if chunk.choices:
+            wahl = chunk.choices[0]
+            text = wahl.delta.content if wahl.delta else None
+            if text:
+                metriken.token()
+                yield text
+            if wahl.finish_reason:
+                metriken.finish_reason = wahl.finish_reason
+        usage = getattr(chunk, "usage", None)
+        if usage:
+            metriken.tokens = usage.completion_tokens
+            metriken.prompt_tokens = usage.prompt_tokens
+    metriken.fertig()
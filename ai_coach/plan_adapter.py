@@ -324,10 +324,14 @@ class PlanAdapter:
 
         return None
 
-    def suggest_optimizations(self, days: int = 30) -> Dict[str, Any]:
+    def suggest_optimizations(self, days: int = 30, cache: bool = True) -> Dict[str, Any]:
         """
         KI-gestützte Optimierungs-Vorschläge (~0.003€)
 
+        Args:
+            days: Analyse-Zeitraum in Tagen
+            cache: False = LLM-Response-Cache umgehen (frische Vorschläge)
+
         Returns:
             {
                 'optimizations': [
@@ -339,7 +343,8 @@ class PlanAdapter:
                     }
                 ],
                 'cost': 0.003,
-                'model': 'llama-3.1-70b'
+                'model': 'llama-3.1-70b',
+                'cached': False
             }
         """
         # Performance-Daten sammeln
@@ -428,7 +433,7 @@ Bitte analysiere und schlage Optimierungen vor."""
             client = RuntimeLLMClient(temperature=0.3, use_openrouter=True)
 
             # generate_training_plan nutzt automatisch Ollama oder OpenRouter
-            result = client.generate_training_plan(messages=messages, max_tokens=2000)
+            result = client.generate_training_plan(messages=messages, max_tokens=2000, cache=cache)
 
             # Parse Result
             response = result.get("response")
@@ -446,6 +451,7 @@ Bitte analysiere und schlage Optimierungen vor."""
                 "optimizations": response.get("optimizations", []),
                 "cost": cost,
                 "model": model_used,
+                "cached": bool(result.get("cached", False)),
                 "analysis_period_days": days,
             }
 
@@ -474,6 +480,7 @@ Bitte analysiere und schlage Optimierungen vor."""
                 tokens_input=usage.get("prompt_tokens", 0),
                 tokens_output=usage.get("completion_tokens", 0),
                 cost_eur=llm_result.get("cost", 0.0),
+                cached=bool(llm_result.get("cached", False)),
                 success=success,
                 is_retry=False,
                 error_message=error_message,
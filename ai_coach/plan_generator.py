@@ -8,6 +8,7 @@ import json
 import sys
 from typing import Dict, List
 
+from . import llm_cache
 from .data_analyzer import TrainingAnalyzer
 from .db_client import DatabaseClient
 from .llm_client import LLMClient
@@ -90,6 +91,7 @@ class PlanGenerator:
         fallback_to_openrouter: bool = True,
         progress_callback=None,
         duration_weeks: int = 12,
+        cache: bool = True,
     ):
         """
         Args:
@@ -104,6 +106,7 @@ class PlanGenerator:
             fallback_to_openrouter: True = Fallback zu OpenRouter bei Ollama-Fehler
             progress_callback: Optional callable(percent: int, step: str) für SSE-Streaming
             duration_weeks: Plandauer in Wochen (4-16, Default 12)
+            cache: False = LLM-Response-Cache umgehen (frischen Plan erzwingen)
         """
         self.user_id = user_id
         self.analysis_days = analysis_days
@@ -116,12 +119,46 @@ class PlanGenerator:
         self.fallback_to_openrouter = fallback_to_openrouter
         self._progress_callback = progress_callback
         self.duration_weeks = duration_weeks
+        self.cache = cache
 
     def _progress(self, percent: int, step: str) -> None:
         """Sendet Fortschrittsupdate – no-op wenn kein Callback gesetzt."""
         if self._progress_callback:
             self._progress_callback(percent, step)
 
+    def _token_fortschritt(self, start: int = 35, ende: int = 65, alle: int = 40):
+        """on_token-Callback für LLMClient: meldet den Schreibfortschritt der KI.
+
+        Ohne progress_callback None – dann läuft der LLM-Call ungestreamt. Gemeldet
+        wird alle ``alle`` Tokens; der Prozentwert wandert von ``start`` Richtung
+        ``ende`` (Ziel: ``_get_max_tokens()``).
+        """
+        if not self._progress_callback:
+            return None
+        max_tokens = self._get_max_tokens()
+
+        def on_token(_text: str, metriken) -> None:
+            if metriken.tokens % alle:
+                return
+            anteil = min(1.0, metriken.tokens / max_tokens)
+            self._progress(
+                start + int((ende - start) * anteil),
+                f"KI schreibt Plan... {metriken.tokens} Tokens "
+                f"({metriken.tokens_pro_sekunde:.0f}/s)",
+            )
+
+        return on_token
+
+    @staticmethod
+    def _verwirf_aus_cache(llm_result) -> None:
+        """Entfernt eine verworfene LLM-Antwort aus dem Response-Cache.
+
+        Ein Plan mit falschem Schema oder Validierungsfehlern darf nicht bei
+        jedem erneuten Versuch identisch aus dem Cache zurückkommen.
+        """
+        if isinstance(llm_result, dict):
+            llm_cache.verwirf(llm_result.get("cache_key"))
+
     def _log_ki_cost(
         self,
         llm_result: dict,
@@ -146,6 +183,7 @@ class PlanGenerator:
                 tokens_input=usage.get("prompt_tokens", 0),
                 tokens_output=usage.get("completion_tokens", 0),
                 cost_eur=llm_result.get("cost", 0.0),
+                cached=bool(llm_result.get("cached", False)),
                 success=success,
                 is_retry=is_retry,
                 error_message=error_message,
@@ -317,7 +355,11 @@ class PlanGenerator:
             fallback_to_openrouter=self.fallback_to_openrouter,
         )
         llm_result = llm_client.generate_training_plan(
-            messages=messages, max_tokens=self._get_max_tokens(), timeout=120
+            messages=messages,
+            max_tokens=self._get_max_tokens(),
+            timeout=120,
+            cache=self.cache,
+            on_token=self._token_fortschritt(),
         )
         self._log_ki_cost(llm_result)
 
@@ -346,7 +388,10 @@ class PlanGenerator:
         actual_keys = set(plan_json.keys()) if isinstance(plan_json, dict) else set()
 
         if not required_keys.intersection(actual_keys):
-            print(f"\n⚠️ Schema komplett falsch! Erwartet: {required_keys}, Erhalten: {actual_keys}")
+            print(
+                f"\n⚠️ Schema komplett falsch! Erwartet: {required_keys}, Erhalten: {actual_keys}"
+            )
+            self._verwirf_aus_cache(llm_result)
 
             # Wenn Fallback erlaubt → OpenRouter versuchen
             if self.fallback_to_openrouter and not self.use_openrouter:
@@ -359,7 +404,10 @@ class PlanGenerator:
                     fallback_to_openrouter=False,
                 )
                 llm_result = llm_client_or.generate_training_plan(
-                    messages=messages, max_tokens=self._get_max_tokens(), timeout=120
+                    messages=messages,
+                    max_tokens=self._get_max_tokens(),
+                    timeout=120,
+                    cache=self.cache,
                 )
                 self._log_ki_cost(llm_result)
                 plan_json = (
@@ -424,6 +472,7 @@ class PlanGenerator:
             for error in errors:
                 print(f"   - {error}")
             print("\n   Plan wird NICHT gespeichert!")
+            self._verwirf_aus_cache(llm_result)
             return {
                 "success": False,
                 "errors": errors,
@@ -517,6 +566,7 @@ class PlanGenerator:
             if cap_warnings:
                 print(f"   - {len(cap_warnings)} Übertraining-Cap-Verletzung(en)")
             print("   Plan wird NICHT gespeichert – bitte erneut versuchen.")
+            self._verwirf_aus_cache(llm_result)
             return {
                 "success": False,
                 "errors": hard_fail_errors,
@@ -958,7 +1008,9 @@ Kopiere die Ersatz-Namen EXAKT aus der Liste – keine Variationen!"""
         print("\n   🤖 Sende Korrektur-Request an LLM...")
 
         try:
-            result = llm_client.generate_training_plan(messages=messages, max_tokens=500)
+            result = llm_client.generate_training_plan(
+                messages=messages, max_tokens=500, cache=self.cache
+            )
             self._log_ki_cost(result, is_retry=True)
 
             # generate_training_plan() gibt immer {"response": <dict>, ...} zurück
@@ -3,6 +3,8 @@ import runpy
 import types
 from datetime import timedelta
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 import pytest
@@ -131,6 +133,80 @@ class TestTrainingAnalyzerCore:
         assert result["push_pull_balance"]["ratio"] == 0
         assert result["push_pull_balance"]["balanced"] is False
 
+    def test_trend_aus_erstem_und_letztem_satz_mit_gewicht(self):
+        user = UserFactory()
+        bank = UebungFactory(bezeichnung="Bankdrücken", muskelgruppe="BRUST")
+        dips = UebungFactory(bezeichnung="Dips", muskelgruppe="BRUST")
+        saetze = {
+            9: [(80, 8, 7.0), (82.5, 8, 8.0)],
+            5: [(85, 8, 8.0)],
+            1: [(90, 5, 9.0), (87.5, 6, 9.0)],
+        }
+        for tage, werte in saetze.items():
+            session = TrainingseinheitFactory(
+                user=user, datum=timezone.now() - timedelta(days=tage), dauer_minuten=60
+            )
+            for nr, (gewicht, wdh, rpe) in enumerate(werte, start=1):
+                SatzFactory(
+                    einheit=session,
+                    uebung=bank,
+                    satz_nr=nr,
+                    gewicht=gewicht,
+                    wiederholungen=wdh,
+                    rpe=rpe,
+                    ist_aufwaermsatz=False,
+                )
+            # Körpergewicht: zählt fürs Volumen, liefert aber keinen e1RM
+            SatzFactory(
+                einheit=session,
+                uebung=dips,
+                satz_nr=9,
+                gewicht=0,
+                wiederholungen=10,
+                rpe=6.0,
+                ist_aufwaermsatz=False,
+            )
+
+        result = TrainingAnalyzer(user_id=user.id, days=30).analyze()
+
+        ex = result["exercise_performance"]["Bankdrücken"]
+        assert [(r["weight"], r["reps"]) for r in ex["records"]] == [(80.0, 8), (87.5, 6)]
+        assert ex["last_1rm"] == 105.0
+        assert ex["trend"] == "+3.7kg"
+        assert ex["avg_rpe"] == 8.2
+        assert result["exercise_performance"]["Dips"] == {
+            "records": [],
+            "muscle_group": "BRUST",
+            "trend": "Nicht genug Daten",
+            "last_1rm": 0,
+            "avg_rpe": 0,
+        }
+
+        brust = result["muscle_groups"]["BRUST"]
+        assert brust["effective_reps"] == pytest.approx((56 + 64 + 64 + 45 + 54 + 3 * 60) / 10)
+        assert brust["avg_rpe"] == 7.4
+        assert list(result["muscle_groups"]) == ["BRUST"]
+
+    def test_konstante_query_anzahl(self):
+        user = UserFactory()
+        uebung = UebungFactory(bezeichnung="Kniebeuge", muskelgruppe="BEINE_QUAD")
+
+        def trainings(anzahl):
+            for tag in range(anzahl):
+                session = TrainingseinheitFactory(
+                    user=user, datum=timezone.now() - timedelta(days=tag + 1)
+                )
+                SatzFactory(einheit=session, uebung=uebung, rpe=8.0, ist_aufwaermsatz=False)
+
+        trainings(2)
+        with CaptureQueriesContext(connection) as wenige:
+            TrainingAnalyzer(user_id=user.id, days=90).analyze()
+        trainings(20)
+        with CaptureQueriesContext(connection) as viele:
+            TrainingAnalyzer(user_id=user.id, days=90).analyze()
+
+        assert len(viele) == len(wenige) == 3
+
 
 @pytest.mark.django_db
 class TestTrainingAnalyzerHelpers:
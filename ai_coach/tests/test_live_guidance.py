@@ -6,12 +6,15 @@ Abdeckung:
 - build_context(): DB-Abfragen mit Test-Fixtures
 - _log_ki_cost(): KIApiLog-Eintrag erstellen
 - get_guidance(): LLMClient gemockt, kein echter API-Call
+- stream_guidance(): Token-Stream, Abbruch, begrenzter Pool ("busy")
 """
 
+import threading
+import time
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 
 from ai_coach.live_guidance import LiveGuidance
 from core.models import Equipment, KoerperWerte, Plan, Satz, Trainingseinheit, Uebung
@@ -378,3 +381,153 @@ class TestGetGuidance(TestCase):
         result = self.guidance.get_guidance(self.session.id, "Test?")
         self.assertEqual(result["cost"], 0.0005)
         self.assertEqual(result["model"], "gemini-2.5-flash")
+
+
+class TestStreamGuidance(TestCase):
+    """stream_guidance() – Tokens aus dem (gemockten) LLM-Stream, Schluss-Event mit Kosten."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="stream_test", password="pass")
+        self.session = Trainingseinheit.objects.create(user=self.user, dauer_minuten=30)
+        self.guidance = LiveGuidance()
+
+    @staticmethod
+    def _streamendes_llm(deltas, result):
+        def generate_training_plan(messages, max_tokens, cache, on_token):
+            for stream in deltas:
+                metriken = object()  # neues Objekt = neuer Stream (Fallback)
+                for text in stream:
+                    on_token(text, metriken)
+            return result
+
+        return generate_training_plan
+
+    @patch("ai_coach.llm_client.LLMClient")
+    def test_tokens_und_schluss_event(self, MockLLMClient):
+        from core.models import KIApiLog
+
+        result = {
+            "response": {"antwort": 'Halte "Spannung"!'},
+            "model": "gemini-2.5-flash",
+            "cost": 0.0004,
+            "usage": {"prompt_tokens": 90, "completion_tokens": 12},
+            "metrics": {"ttft_ms": 180.0},
+        }
+        MockLLMClient.return_value.generate_training_plan.side_effect = self._streamendes_llm(
+            [['{"antwort": "Hal', 'te \\"Spannung\\"', '!"}']], result
+        )
+
+        events = list(self.guidance.stream_guidance(self.session.id, "Tipp?"))
+
+        tokens = "".join(e["token"] for e in events if "token" in e)
+        self.assertEqual(tokens, 'Halte "Spannung"!')
+        schluss = events[-1]
+        self.assertTrue(schluss["done"] and schluss["success"])
+        self.assertEqual(schluss["answer"], 'Halte "Spannung"!')
+        self.assertEqual(schluss["usage"], {"prompt_tokens": 90, "completion_tokens": 12})
+        self.assertEqual(schluss["metrics"]["ttft_ms"], 180.0)
+        log = KIApiLog.objects.get(user_id=self.user.id)
+        self.assertEqual((log.tokens_input, log.tokens_output), (90, 12))
+
+    @patch("ai_coach.llm_client.LLMClient")
+    def test_fallback_sendet_reset(self, MockLLMClient):
+        result = {"response": "Tiefer gehen.", "model": "m", "cost": 0.0, "usage": {}}
+        MockLLMClient.return_value.generate_training_plan.side_effect = self._streamendes_llm(
+            [["Kaputt"], ["Tiefer ", "gehen."]], result
+        )
+
+        events = list(self.guidance.stream_guidance(self.session.id, "Tipp?"))
+
+        self.assertEqual(
+            [e.get("token", "RESET" if e.get("reset") else None) for e in events[:-1]],
+            ["Kaputt", "RESET", "Tiefer ", "gehen."],
+        )
+        self.assertEqual(events[-1]["answer"], "Tiefer gehen.")
+
+    @patch("ai_coach.llm_client.LLMClient")
+    def test_llm_fehler_gibt_fehler_event(self, MockLLMClient):
+        MockLLMClient.return_value.generate_training_plan.side_effect = Exception("down")
+        events = list(self.guidance.stream_guidance(self.session.id, "Tipp?"))
+        self.assertEqual(len(events), 1)
+        self.assertFalse(events[0]["success"])
+
+
+class TestStreamGuidanceAbbruch(TransactionTestCase):
+    """
+    Verlassener Stream (Timeout, Client weg): der bezahlte Call landet trotzdem
+    genau einmal in KIApiLog. Transaktional, weil der LLM-Thread selbst schreibt.
+    """
+
+    RESULT = {
+        "response": "Tiefer gehen.",
+        "model": "m",
+        "cost": 0.002,
+        "usage": {"prompt_tokens": 50, "completion_tokens": 5},
+    }
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="abbruch_test", password="pass")
+        self.session = Trainingseinheit.objects.create(user=self.user, dauer_minuten=30)
+        self.guidance = LiveGuidance()
+        self.weiter = threading.Event()
+
+    def _blockierendes_llm(self, messages, max_tokens, cache, on_token):
+        on_token("Tiefer ", object())
+        self.weiter.wait(5)
+        return self.RESULT
+
+    def _warte_auf_log(self):
+        from core.models import KIApiLog
+
+        for _ in range(50):
+            if KIApiLog.objects.filter(user_id=self.user.id).exists():
+                break
+            time.sleep(0.1)
+        return KIApiLog.objects.filter(user_id=self.user.id)
+
+    @patch("ai_coach.llm_client.LLMClient")
+    def test_client_trennt_kosten_trotzdem_geloggt(self, MockLLMClient):
+        MockLLMClient.return_value.generate_training_plan.side_effect = self._blockierendes_llm
+
+        events = self.guidance.stream_guidance(self.session.id, "Tipp?")
+        self.assertEqual(next(events), {"token": "Tiefer ", "done": False})
+        events.close()  # Client weg, LLM-Call läuft noch
+        self.weiter.set()
+
+        logs = self._warte_auf_log()
+        self.assertEqual(logs.count(), 1)
+        self.assertEqual(logs.get().tokens_input, 50)
+
+    @patch("ai_coach.llm_client.LLMClient")
+    def test_timeout_kosten_trotzdem_geloggt(self, MockLLMClient):
+        MockLLMClient.return_value.generate_training_plan.side_effect = self._blockierendes_llm
+
+        with patch.object(LiveGuidance, "STREAM_TIMEOUT", 0.05):
+            events = list(self.guidance.stream_guidance(self.session.id, "Tipp?"))
+        self.assertFalse(events[-1]["success"])
+        self.weiter.set()
+
+        self.assertEqual(self._warte_auf_log().count(), 1)
+
+    @patch("ai_coach.live_guidance._llm_plaetze", None)
+    @patch("ai_coach.live_guidance._llm_pool", None)
+    @patch("ai_coach.llm_client.LLMClient")
+    def test_pool_voll_gibt_busy_event(self, MockLLMClient):
+        MockLLMClient.return_value.generate_training_plan.side_effect = self._blockierendes_llm
+
+        with self.settings(LIVE_GUIDANCE_PARALLEL=1):
+            erster = self.guidance.stream_guidance(self.session.id, "Tipp?")
+            self.assertEqual(next(erster), {"token": "Tiefer ", "done": False})
+
+            zweiter = list(self.guidance.stream_guidance(self.session.id, "Noch einer?"))
+            self.assertEqual(len(zweiter), 1)
+            self.assertTrue(zweiter[0]["busy"])
+            self.assertFalse(zweiter[0]["success"])
+            self.assertEqual(MockLLMClient.return_value.generate_training_plan.call_count, 1)
+
+            self.weiter.set()
+            self.assertTrue(list(erster)[-1]["success"])
+            # Platz wieder frei
+            self.assertTrue(
+                list(self.guidance.stream_guidance(self.session.id, "Tipp?"))[-1]["success"]
+            )
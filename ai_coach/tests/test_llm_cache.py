@@ -0,0 +1,126 @@
+"""Tests für ai_coach/llm_cache.py – Prompt-Fingerprint-Cache im LLMClient."""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+import pytest
+
+from ai_coach import llm_cache
+from ai_coach.live_guidance import LiveGuidance
+from ai_coach.llm_client import LLMClient
+from core.models import KIApiLog
+
+MESSAGES = [
+    {"role": "system", "content": "Du bist ein Coach."},
+    {"role": "user", "content": "Wie viel soll ich heute drücken?"},
+]
+
+ANTWORT = {
+    "response": {"answer": "80 kg"},
+    "cost": 0.0021,
+    "model": "google/gemini-2.5-flash",
+    "tokens": 900,
+    "truncated": False,
+    "usage": {"prompt_tokens": 700, "completion_tokens": 200},
+}
+
+
+@pytest.fixture(autouse=True)
+def leerer_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestFingerprint:
+    def test_stabil_und_eingabe_sensitiv(self):
+        key = llm_cache.fingerprint("m", 0.3, MESSAGES, 300)
+        assert key == llm_cache.fingerprint("m", 0.3, [dict(m) for m in MESSAGES], 300)
+        assert key != llm_cache.fingerprint("m", 0.3, MESSAGES, 301)
+        assert key != llm_cache.fingerprint("m", 0.2, MESSAGES, 300)
+        assert key != llm_cache.fingerprint("x", 0.3, MESSAGES, 300)
+        assert key != llm_cache.fingerprint("m", 0.3, MESSAGES[:1], 300)
+
+    def test_temperatur_grenze(self, settings):
+        settings.LLM_CACHE_MAX_TEMPERATUR = 0.3
+        assert llm_cache.ist_cachebar(0.0)
+        assert llm_cache.ist_cachebar(0.3)
+        assert not llm_cache.ist_cachebar(0.7)
+
+        settings.LLM_CACHE_TTL_SEKUNDEN = 0
+        assert not llm_cache.ist_cachebar(0.0)
+
+
+class TestGenerateTrainingPlanCache:
+    def test_wiederholung_kommt_kostenfrei_aus_cache(self):
+        client = LLMClient(temperature=0.3, use_openrouter=True)
+        with patch.object(client, "_generate_with_openrouter", return_value=dict(ANTWORT)) as llm:
+            erste = client.generate_training_plan(MESSAGES, max_tokens=300)
+            zweite = client.generate_training_plan(MESSAGES, max_tokens=300)
+
+        assert llm.call_count == 1
+        assert erste["cost"] == 0.0021 and "cached" not in erste
+        assert zweite["response"] == ANTWORT["response"]
+        assert zweite["cached"] is True
+        assert zweite["cost"] == 0.0
+        assert zweite["usage"] == {"prompt_tokens": 0, "completion_tokens": 0}
+
+    def test_bypass_pro_request(self):
+        client = LLMClient(temperature=0.3, use_openrouter=True)
+        with patch.object(client, "_generate_with_openrouter", return_value=dict(ANTWORT)) as llm:
+            client.generate_training_plan(MESSAGES, max_tokens=300)
+            frisch = client.generate_training_plan(MESSAGES, max_tokens=300, cache=False)
+
+        assert llm.call_count == 2
+        assert "cached" not in frisch
+
+    def test_verworfene_antwort_wird_neu_generiert(self):
+        client = LLMClient(temperature=0.3, use_openrouter=True)
+        with patch.object(client, "_generate_with_openrouter", return_value=dict(ANTWORT)) as llm:
+            erste = client.generate_training_plan(MESSAGES, max_tokens=300)
+            treffer = client.generate_training_plan(MESSAGES, max_tokens=300)
+            assert treffer["cache_key"] == erste["cache_key"]
+
+            llm_cache.verwirf(treffer["cache_key"])
+            frisch = client.generate_training_plan(MESSAGES, max_tokens=300)
+
+        assert llm.call_count == 2
+        assert "cached" not in frisch
+        assert "cache_key" not in cache.get(erste["cache_key"])
+
+    def test_hohe_temperatur_und_abgeschnitten_werden_nicht_gecacht(self):
+        kreativ = LLMClient(temperature=0.7, use_openrouter=True)
+        with patch.object(kreativ, "_generate_with_openrouter", return_value=dict(ANTWORT)) as llm:
+            kreativ.generate_training_plan(MESSAGES)
+            kreativ.generate_training_plan(MESSAGES)
+        assert llm.call_count == 2
+
+        client = LLMClient(temperature=0.0, use_openrouter=True)
+        abgeschnitten = {**ANTWORT, "truncated": True}
+        with patch.object(client, "_generate_with_openrouter", return_value=abgeschnitten) as llm:
+            client.generate_training_plan(MESSAGES)
+            client.generate_training_plan(MESSAGES)
+        assert llm.call_count == 2
+
+
+@pytest.mark.django_db
+class TestCacheTrefferImKIApiLog:
+    def test_live_guidance_loggt_treffer_mit_null_kosten(self, settings):
+        settings.LLM_CACHE_MAX_TEMPERATUR = 0.7
+        guidance = LiveGuidance(use_openrouter=True)
+        with (
+            patch.object(guidance, "build_context", return_value={}),
+            patch.object(guidance, "generate_prompt", return_value=MESSAGES),
+            patch.object(LLMClient, "_generate_with_openrouter", return_value=dict(ANTWORT)),
+        ):
+            erste = guidance.get_guidance(trainingseinheit_id=1, user_question="?")
+            zweite = guidance.get_guidance(trainingseinheit_id=1, user_question="?")
+
+        assert (erste["cached"], zweite["cached"]) == (False, True)
+        assert zweite["answer"] == "80 kg"
+        logs = list(KIApiLog.objects.order_by("id"))
+        assert [(log.cached, float(log.cost_eur), log.tokens_input) for log in logs] == [
+            (False, 0.0021, 700),
+            (True, 0.0, 0),
+        ]
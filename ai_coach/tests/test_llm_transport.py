@@ -0,0 +1,143 @@
+"""Tests für ai_coach/llm_transport.py – geteilter HTTP-Pool und Token-Streaming."""
+
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai_coach import llm_transport
+from ai_coach.llm_client import LLMClient
+from ai_coach.plan_generator import PlanGenerator
+
+PLAN_JSON = '{"plan_name": "X", "sessions": []}'
+
+
+def _openrouter_chunks(teile, finish_reason="stop", prompt_tokens=50, completion_tokens=4):
+    chunks = [
+        types.SimpleNamespace(
+            choices=[
+                types.SimpleNamespace(
+                    delta=types.SimpleNamespace(content=text),
+                    finish_reason=finish_reason if i == len(teile) - 1 else None,
+                )
+            ],
+            usage=None,
+        )
+        for i, text in enumerate(teile)
+    ]
+    usage = types.SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    chunks.append(types.SimpleNamespace(choices=[], usage=usage))
+    return chunks
+
+
+class TestHttpPool:
+    def test_ein_client_pro_prozess_und_neu_nach_fork(self):
+        llm_transport._nach_fork()
+        erster = llm_transport.http_client()
+        assert llm_transport.http_client() is erster
+
+        llm_transport._nach_fork()
+        assert llm_transport.http_client() is not erster
+
+    def test_openrouter_client_nutzt_geteilten_pool(self):
+        fake_openai = types.SimpleNamespace(OpenAI=MagicMock(return_value="client"))
+        with (
+            patch.dict("sys.modules", {"openai": fake_openai}),
+            patch("ai_coach.secrets_manager.get_openrouter_key", return_value="sk-test"),
+        ):
+            LLMClient(use_openrouter=True)._get_openrouter_client()
+            LLMClient(use_openrouter=True)._get_openrouter_client()
+
+        pools = {call.kwargs["http_client"] for call in fake_openai.OpenAI.call_args_list}
+        assert pools == {llm_transport.http_client()}
+
+
+class TestStreamMetriken:
+    def test_ttft_und_tokens_pro_sekunde(self):
+        metriken = llm_transport.StreamMetriken(start=10.0)
+        with patch("ai_coach.llm_transport.time.perf_counter", side_effect=[10.5, 12.5]):
+            metriken.token()
+            metriken.tokens = 41
+            metriken.fertig()
+
+        assert metriken.ttft_ms == 500.0
+        assert metriken.tokens_pro_sekunde == pytest.approx(20.5)
+        assert metriken.als_dict()["duration_s"] == 2.5
+
+    def test_ohne_token(self):
+        metriken = llm_transport.StreamMetriken()
+        metriken.fertig()
+        assert metriken.ttft_ms is None
+        assert metriken.tokens_pro_sekunde == 0.0
+
+
+class TestStreamingImLLMClient:
+    def test_openrouter_stream_reicht_tokens_weiter(self):
+        fake_client = MagicMock()
+        fake_client.chat.completions.create.return_value = iter(
+            _openrouter_chunks(['{"plan_name": "X", ', '"sessions": []}'])
+        )
+        client = LLMClient(temperature=0.7, use_openrouter=True)
+        empfangen = []
+
+        with patch.object(client, "_get_openrouter_client", return_value=fake_client):
+            result = client.generate_training_plan(
+                [{"role": "user", "content": "Plan"}],
+                max_tokens=500,
+                on_token=lambda text, m: empfangen.append((text, m.tokens)),
+            )
+
+        assert empfangen == [('{"plan_name": "X", ', 1), ('"sessions": []}', 2)]
+        assert result["response"] == {"plan_name": "X", "sessions": []}
+        assert result["usage"] == {"prompt_tokens": 50, "completion_tokens": 4}
+        assert result["cost"] == pytest.approx(LLMClient._openrouter_kosten(50, 4))
+        assert result["truncated"] is False
+        assert result["metrics"]["ttft_ms"] is not None
+        kwargs = fake_client.chat.completions.create.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    def test_ollama_stream_mit_fallback_ohne_on_token_unveraendert(self):
+        chunks = [
+            {"message": {"content": PLAN_JSON[:10]}, "done": False},
+            {
+                "message": {"content": PLAN_JSON[10:]},
+                "done": True,
+                "eval_count": 7,
+                "prompt_eval_count": 30,
+                "done_reason": "stop",
+            },
+        ]
+        client = LLMClient(use_openrouter=True)
+        client.use_openrouter, client.ollama_available = False, True
+        on_token = MagicMock()
+
+        with patch("ai_coach.llm_client.ollama.chat", return_value=iter(chunks)) as chat:
+            result = client.generate_training_plan([], max_tokens=100, on_token=on_token)
+
+        assert chat.call_args.kwargs["stream"] is True
+        assert on_token.call_count == 2
+        assert result["usage"] == {"prompt_tokens": 30, "completion_tokens": 7}
+        assert result["cost"] == 0.0
+
+        with patch.object(client, "_generate_with_ollama", return_value={"ok": True}) as sync:
+            assert client.generate_training_plan([], max_tokens=100) == {"ok": True}
+        sync.assert_called_once()
+
+
+class TestPlanGeneratorTokenFortschritt:
+    def test_fortschritt_waehrend_des_schreibens(self):
+        meldungen = []
+        generator = PlanGenerator(user_id=1, progress_callback=lambda p, s: meldungen.append(p))
+        on_token = generator._token_fortschritt(alle=10)
+        metriken = llm_transport.StreamMetriken()
+        for _ in range(generator._get_max_tokens()):
+            metriken.token()
+            on_token("x", metriken)
+
+        assert meldungen[0] == 35
+        assert meldungen[-1] == 65
+        assert meldungen == sorted(meldungen)
+
+    def test_ohne_callback_kein_streaming(self):
+        assert PlanGenerator(user_id=1)._token_fortschritt() is None
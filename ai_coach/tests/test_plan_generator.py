@@ -912,6 +912,7 @@ class TestGenerateWithExistingDjangoPhase2:
             "response": {"unexpected": "schema"},
             "usage": {},
             "cost": 0.01,
+            "cache_key": "llm_antwort_falsches_schema",
         }
         first_client.validate_plan.return_value = (True, [])
 
@@ -933,6 +934,7 @@ class TestGenerateWithExistingDjangoPhase2:
             patch.object(gen, "_log_ki_cost") as mock_log_cost,
             patch.object(gen, "_validate_weakness_coverage", return_value=[]),
             patch.object(gen, "_format_macrocycle_summary", return_value="summary"),
+            patch("ai_coach.plan_generator.llm_cache.verwirf") as verwirf,
         ):
             result = gen._generate_with_existing_django(save_to_db=False)
 
@@ -940,6 +942,8 @@ class TestGenerateWithExistingDjangoPhase2:
         assert result["plan_data"]["plan_name"] == "Fallback Plan"
         assert mock_llm_cls.call_count == 2
         assert mock_log_cost.call_count == 2
+        # Falsches Schema darf beim nächsten Versuch nicht aus dem Cache kommen
+        verwirf.assert_called_once_with("llm_antwort_falsches_schema")
 
     @patch("ai_coach.plan_generator.LLMClient")
     @patch("ai_coach.plan_generator.PromptBuilder")
@@ -967,19 +971,25 @@ class TestGenerateWithExistingDjangoPhase2:
             "response": plan_json,
             "usage": {},
             "cost": 0.01,
+            "cache_key": "llm_antwort_invalid",
         }
         llm_client.validate_plan.side_effect = [
             (False, ["erste Fehlerwelle"]),
             (False, ["zweite Fehlerwelle"]),
         ]
 
-        gen = PlanGenerator(user_id=1)
-        with patch.object(gen, "_fix_invalid_exercises", return_value=plan_json):
+        gen = PlanGenerator(user_id=1, cache=False)
+        with (
+            patch.object(gen, "_fix_invalid_exercises", return_value=plan_json),
+            patch("ai_coach.plan_generator.llm_cache.verwirf") as verwirf,
+        ):
             result = gen._generate_with_existing_django(save_to_db=False)
 
         assert result["success"] is False
         assert result["errors"] == ["zweite Fehlerwelle"]
         assert result["plan_data"] == plan_json
+        assert llm_client.generate_training_plan.call_args.kwargs["cache"] is False
+        verwirf.assert_called_once_with("llm_antwort_invalid")
 
     @patch("ai_coach.plan_generator.LLMClient")
     @patch("ai_coach.plan_generator.PromptBuilder")
@@ -213,10 +213,43 @@ STATIC_ROOT = os.getenv("STATIC_ROOT", BASE_DIR / "staticfiles")
 # WeasyPrint braucht native Libs (Pango/GLib); ist es nicht ladbar oder
 # scheitert das Rendern, fällt der Renderer automatisch auf xhtml2pdf zurück.
 PDF_ENGINE = os.getenv("PDF_ENGINE", "xhtml2pdf")
+# PDF-Report nach finish_training im Hintergrund vorrendern (Datei-Cache,
+# core/export/pdf_cache.py) – der nächste Download ist dann sofort da.
+PDF_REPORT_VORRENDERN = os.getenv("PDF_REPORT_VORRENDERN", "False") == "True"
+# Datei-Cache der gerenderten Reports (<user_id>/<fingerprint>.pdf) – wie
+# JOB_DATEI_ROOT außerhalb von MEDIA_ROOT, ausgeliefert nur über
+# export_training_pdf. Nicht in nginx freigeben.
+PDF_CACHE_ROOT = os.getenv("PDF_CACHE_ROOT", BASE_DIR / "private" / "pdf_cache")
+# Chart-Rendering des PDF-Reports im Prozess-Pool (core/export/chart_pool.py).
+# Opt-in: 0 = seriell im Request-Prozess. Der Pool entsteht pro Django-Prozess –
+# bei N Gunicorn-Workern laufen N × PDF_CHART_WORKERS Chart-Prozesse (Sizing
+# siehe docs/DEPLOYMENT.md). Deadline in Sekunden, danach werden fehlende
+# Charts seriell nachgerendert.
+PDF_CHART_WORKERS = int(os.getenv("PDF_CHART_WORKERS", "0"))
+PDF_CHART_TIMEOUT = float(os.getenv("PDF_CHART_TIMEOUT", "30"))
+
+# Start-Budget für django.setup() + URLconf-Import. Sekunden prüft nur
+# `manage.py import_profile --pruefen` (eigener CI-Schritt), die Modulzahl
+# zusätzlich core/tests/test_import_budget.py. Schwere Bibliotheken werden lazy geladen.
+IMPORT_BUDGET_SEKUNDEN = float(os.getenv("IMPORT_BUDGET_SEKUNDEN", "2.5"))
+IMPORT_BUDGET_MODULE = int(os.getenv("IMPORT_BUDGET_MODULE", "1400"))
+
+# Geladene ML-Modelle pro Worker-Prozess (LRU, ml_coach/model_registry.py).
+# Ein RandomForest belegt einige MB RAM.
+ML_MODEL_REGISTRY_GROESSE = int(os.getenv("ML_MODEL_REGISTRY_GROESSE", "32"))
+
+# LLM-Response-Cache (ai_coach/llm_cache.py): identische Prompts innerhalb der TTL
+# kommen kostenfrei aus dem Cache. Nur bis zu dieser Temperatur; TTL 0 = aus.
+LLM_CACHE_TTL_SEKUNDEN = int(os.getenv("LLM_CACHE_TTL_SEKUNDEN", "900"))
+LLM_CACHE_MAX_TEMPERATUR = float(os.getenv("LLM_CACHE_MAX_TEMPERATUR", "0.3"))
 
 # Media files (User uploads)
 MEDIA_URL = "media/"
 MEDIA_ROOT = os.getenv("MEDIA_ROOT", BASE_DIR / "media")
+# Job-Dateien (PDF-Reports, Hevy-Uploads) – bewusst NICHT unter MEDIA_ROOT:
+# /media/ wird öffentlich ausgeliefert, diese Dateien nur über job_download
+# (/api/jobs/<id>/download/, Owner-Check). Nicht in nginx freigeben.
+JOB_DATEI_ROOT = os.getenv("JOB_DATEI_ROOT", BASE_DIR / "private" / "jobs")
 
 # Staticfiles Finders
 STATICFILES_DIRS = [
@@ -248,6 +281,16 @@ DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "HomeGym <noreply@last-stra
 # Site URL (für Einladungs-Emails & Passwort-Reset)
 SITE_URL = os.getenv("SITE_URL", "https://gym.last-strawberry.com")
 
+# Hintergrund-Jobs (DB-Queue, abgearbeitet von `manage.py run_worker`)
+# EAGER: Jobs direkt beim Einreihen im Request ausführen (Entwicklung ohne Worker)
+HINTERGRUND_JOBS_EAGER = os.getenv("HINTERGRUND_JOBS_EAGER", "False") == "True"
+# Sekunden ohne Heartbeat, nach denen ein laufender Job als hängend gilt
+HINTERGRUND_JOBS_TIMEOUT = int(os.getenv("HINTERGRUND_JOBS_TIMEOUT", "900"))
+# Max. gleichzeitige Jobs im Web-Prozess (Plan-Stream); weitere warten in der Queue
+HINTERGRUND_JOBS_WEB_PARALLEL = int(os.getenv("HINTERGRUND_JOBS_WEB_PARALLEL", "2"))
+# Abgeschlossene Jobs samt Job-Dateien werden nach so vielen Tagen gelöscht (run_worker)
+HINTERGRUND_JOBS_AUFBEWAHRUNG_TAGE = int(os.getenv("HINTERGRUND_JOBS_AUFBEWAHRUNG_TAGE", "7"))
+
 # Web Push Notifications
 VAPID_PRIVATE_KEY_FILE = os.getenv("VAPID_PRIVATE_KEY_FILE", "vapid_private.pem")
 VAPID_PUBLIC_KEY_FILE = os.getenv("VAPID_PUBLIC_KEY_FILE", "vapid_public.pem")
@@ -413,6 +456,10 @@ AI_RATE_LIMIT_PLAN_GENERATION = int(os.getenv("AI_RATE_LIMIT_PLAN_GENERATION", "
 AI_RATE_LIMIT_LIVE_GUIDANCE = int(os.getenv("AI_RATE_LIMIT_LIVE_GUIDANCE", "50"))
 AI_RATE_LIMIT_ANALYSIS = int(os.getenv("AI_RATE_LIMIT_ANALYSIS", "10"))
 
+# Max. gleichzeitige Live-Guidance-Streams (LLM-Calls) pro Web-Prozess;
+# darüber bekommt der Client sofort ein "busy"-Fehler-Event
+LIVE_GUIDANCE_PARALLEL = int(os.getenv("LIVE_GUIDANCE_PARALLEL", "4"))
+
 # ==================================
 # SALERIA API (Elder-Berry AI-Assistent)
 # ==================================
@@ -10,6 +10,7 @@ from .models import (
     MUSKELGRUPPEN,
     Equipment,
     Feedback,
+    HintergrundJob,
     InviteCode,
     KIApiLog,
     KoerperWerte,
@@ -708,8 +709,9 @@ class KIApiLogAdmin(admin.ModelAdmin):
         "cost_eur_fmt",
         "success_badge",
         "is_retry",
+        "cached",
     )
-    list_filter = ("endpoint", "success", "is_retry", "created_at")
+    list_filter = ("endpoint", "success", "is_retry", "cached", "created_at")
     search_fields = ("user__username", "model_name", "error_message")
     ordering = ("-created_at",)
     readonly_fields = (
@@ -721,6 +723,7 @@ class KIApiLogAdmin(admin.ModelAdmin):
         "cost_eur",
         "success",
         "is_retry",
+        "cached",
         "error_message",
         "created_at",
     )
@@ -971,3 +974,36 @@ class TrainingsPauseAdmin(admin.ModelAdmin):
     @admin.display(boolean=True, description="Laufend")
     def ist_laufend_display(self, obj):
         return obj.ist_laufend
+
+
+# --- HINTERGRUND-JOBS ---
+@admin.register(HintergrundJob)
+class HintergrundJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "typ",
+        "user",
+        "status",
+        "fortschritt",
+        "versuche",
+        "erstellt_am",
+        "beendet_am",
+    )
+    list_filter = ("status", "typ")
+    search_fields = ("user__username", "typ", "fehler")
+    ordering = ("-erstellt_am",)
+    raw_id_fields = ("user",)
+    readonly_fields = (
+        "gestartet_am",
+        "aktualisiert_am",
+        "beendet_am",
+        "worker",
+    )
+    actions = ["erneut_einreihen"]
+
+    @admin.action(description="Erneut einreihen (Versuche zurücksetzen)")
+    def erneut_einreihen(self, request, queryset):
+        anzahl = queryset.exclude(status="LAEUFT").update(
+            status="WARTEND", versuche=0, fehler="", ausfuehren_ab=timezone.now()
+        )
+        self.message_user(request, f"{anzahl} Job(s) erneut eingereiht.")
@@ -4,9 +4,13 @@ Optimierung (2026-01-11):
 - Rendert die echte SVG-Muscle-Map (muscle_map.svg) via cairosvg in ein PNG für xhtml2pdf.
 - Hervorhebung erfolgt durch Setzen von "fill" pro SVG-Pfad-ID (keine PIL-"Oval/Box"-Ersatzgrafik).
 - Fallback: Wenn SVG nicht gefunden/parsebar ist, nutzt die bisherige PIL-Variante (kompatibel).
+- Die SVG wird einmal pro Prozess geparst (``_muscle_map_vorlage``); Body-Map-PNGs
+  sind nach dem diskreten Status-Vektor der Muskelgruppen memoisiert.
 """
 
 import base64
+import copy
+import functools
 import io
 from pathlib import Path
 
@@ -148,118 +152,138 @@ def _find_muscle_svg_path() -> Path | None:
 # -----------------------------
 
 
-def _render_svg_muscle_map_png_base64(muskelgruppen_stats):
-    """Rendert die SVG-Muscle-Map als PNG (base64), mit farbiger Hervorhebung per IDs.
-
-    Erwartet muskelgruppen_stats als Liste von Dicts, z.B.:
-      [{"key": "BRUST", "status": "optimal"}, ...]
-    """
-    if not muskelgruppen_stats:
-        return None
+# Mapping: Muskelgruppen-Key -> SVG IDs (angepasst an deine Keys)
+_MUSCLE_MAP_IDS = {
+    "BRUST": ["front_chest_left", "front_chest_right"],
+    "SCHULTER_VORD": ["front_delt_left", "front_delt_right"],
+    "SCHULTER_SEIT": [
+        "front_delt_left",
+        "front_delt_right",
+        "back_delt_left",
+        "back_delt_right",
+    ],
+    "SCHULTER_HINT": ["back_delt_left", "back_delt_right"],
+    "TRIZEPS": ["back_triceps_left", "back_triceps_right"],
+    "BIZEPS": ["front_biceps_left", "front_biceps_right"],
+    "UNTERARME": [
+        "front_forearm_left",
+        "front_forearm_right",
+        "back_forearm_left",
+        "back_forearm_right",
+    ],
+    "RUECKEN_LAT": ["back_lat_left", "back_lat_right"],
+    "RUECKEN_TRAPEZ": [
+        "front_traps_left",
+        "front_traps_right",
+        "back_traps_left",
+        "back_traps_right",
+        "back_midback",
+    ],
+    "RUECKEN_OBERER": ["back_midback"],
+    "RUECKEN_UNTER": ["back_erectors_left", "back_erectors_right"],
+    "BAUCH": [
+        "front_abs_upper",
+        "front_abs_mid",
+        "front_abs_lower",
+        "front_oblique_left",
+        "front_oblique_right",
+    ],
+    "BEINE_QUAD": ["front_quad_left", "front_quad_right"],
+    "BEINE_ADDUKTOREN": ["front_adductor_left", "front_adductor_right"],
+    "BEINE_HAM": ["back_hamstring_left", "back_hamstring_right"],
+    "BEINE_GESAESS": ["back_glute_left", "back_glute_right"],
+    "BEINE_WADEN": ["front_calf_left", "front_calf_right", "back_calf_left", "back_calf_right"],
+}
 
-    svg_path = _find_muscle_svg_path()
-    if not svg_path:
-        raise FileNotFoundError(
-            "muscle_map.svg nicht gefunden (setze settings.MUSCLE_MAP_SVG_PATH oder lege Datei in static/core/images/ ab)."
-        )
 
-    # Import hier, damit das Modul auch ohne cairosvg/cairo-library funktioniert
-    try:
-        import cairosvg
-    except (ImportError, OSError) as e:
-        # cairosvg nicht installiert ODER Cairo-C-Library fehlt (Windows)
-        raise ImportError(f"cairosvg/cairo nicht verfügbar: {e}")
+@functools.lru_cache(maxsize=2)
+def _muscle_map_vorlage(svg_path: str, mtime_ns: int):
+    """Parst muscle_map.svg EINMAL pro Prozess (bzw. nach Dateiänderung, ``mtime_ns``).
 
+    Returns:
+        (root, positionen): ``positionen`` bildet jede SVG-ID auf ihre Position
+        in ``root.iter()`` ab – ``deepcopy`` erhält die Reihenfolge, so findet
+        das Umfärben die Elemente der Kopie ohne ID-Suche.
+    """
     import defusedxml.ElementTree as ET
 
-    svg_text = svg_path.read_text(encoding="utf-8")
-
-    # Parse SVG
     try:
-        root = ET.fromstring(svg_text)
+        root = ET.fromstring(Path(svg_path).read_text(encoding="utf-8"))
     except ET.ParseError as e:
         raise ValueError(f"SVG ParseError: {e}") from e
+    positionen = {}
+    for i, el in enumerate(root.iter()):
+        el_id = el.get("id")
+        if el_id is not None:
+            positionen.setdefault(el_id, i)
+    return root, positionen
 
-    # Namespace ermitteln (typisch '{http://www.w3.org/2000/svg}')
-    def find_by_id(el_id: str):
-        # ElementTree unterstützt XPath mit @id nur eingeschränkt; wir iterieren.
-        for el in root.iter():
-            if el.get("id") == el_id:
-                return el
-        return None
 
-    # Mapping: Muskelgruppen-Key -> SVG IDs (angepasst an deine Keys)
-    KEY_TO_IDS = {
-        "BRUST": ["front_chest_left", "front_chest_right"],
-        "SCHULTER_VORD": ["front_delt_left", "front_delt_right"],
-        "SCHULTER_SEIT": [
-            "front_delt_left",
-            "front_delt_right",
-            "back_delt_left",
-            "back_delt_right",
-        ],
-        "SCHULTER_HINT": ["back_delt_left", "back_delt_right"],
-        "TRIZEPS": ["back_triceps_left", "back_triceps_right"],
-        "BIZEPS": ["front_biceps_left", "front_biceps_right"],
-        "UNTERARME": [
-            "front_forearm_left",
-            "front_forearm_right",
-            "back_forearm_left",
-            "back_forearm_right",
-        ],
-        "RUECKEN_LAT": ["back_lat_left", "back_lat_right"],
-        "RUECKEN_TRAPEZ": [
-            "front_traps_left",
-            "front_traps_right",
-            "back_traps_left",
-            "back_traps_right",
-            "back_midback",
-        ],
-        "RUECKEN_OBERER": ["back_midback"],
-        "RUECKEN_UNTER": ["back_erectors_left", "back_erectors_right"],
-        "BAUCH": [
-            "front_abs_upper",
-            "front_abs_mid",
-            "front_abs_lower",
-            "front_oblique_left",
-            "front_oblique_right",
-        ],
-        "BEINE_QUAD": ["front_quad_left", "front_quad_right"],
-        "BEINE_ADDUKTOREN": ["front_adductor_left", "front_adductor_right"],
-        "BEINE_HAM": ["back_hamstring_left", "back_hamstring_right"],
-        "BEINE_GESAESS": ["back_glute_left", "back_glute_right"],
-        "BEINE_WADEN": ["front_calf_left", "front_calf_right", "back_calf_left", "back_calf_right"],
-    }
+def _muskel_status_vektor(muskelgruppen_stats) -> tuple:
+    """Diskreter Status je Muskelgruppe – alles, wovon die Body-Map abhängt (Cache-Key)."""
+    status = {}
+    for mg in muskelgruppen_stats:
+        wert = mg.get("status")
+        status[mg.get("key")] = wert if wert is None else str(wert)
+    return tuple(sorted(status.items(), key=lambda kv: str(kv[0])))
+
+
+def _muscle_map_svg_bytes(status_vektor: tuple) -> bytes:
+    """Umgefärbte Kopie der SVG-Vorlage (fill pro ID aus dem Status-Vektor)."""
+    import defusedxml.ElementTree as ET
+
+    svg_path = _find_muscle_svg_path()
+    if not svg_path:
+        raise FileNotFoundError(
+            "muscle_map.svg nicht gefunden (setze settings.MUSCLE_MAP_SVG_PATH oder lege Datei in static/core/images/ ab)."
+        )
+    vorlage, positionen = _muscle_map_vorlage(str(svg_path), svg_path.stat().st_mtime_ns)
+    root = copy.deepcopy(vorlage)
+    elemente = list(root.iter())
 
     # Farben aus Statusdaten ableiten
-    key_to_hex = {}
-    for mg in muskelgruppen_stats:
-        key = mg.get("key")
-        status = mg.get("status")
-        key_to_hex[key] = _rgba_to_hex(_status_to_rgba(status))
+    key_to_hex = {key: _rgba_to_hex(_status_to_rgba(status)) for key, status in status_vektor}
 
     # Setze Fill-Override pro ID
-    for key, ids in KEY_TO_IDS.items():
+    for key, ids in _MUSCLE_MAP_IDS.items():
         if key not in key_to_hex:
             continue
         fill_hex = key_to_hex[key]
         for el_id in ids:
-            el = find_by_id(el_id)
-            if el is not None:
-                # WICHTIG: CSS-Klasse entfernen, sonst überschreibt sie das fill-Attribut
-                if "class" in el.attrib:
-                    del el.attrib["class"]
-                # Style-Attribut entfernen falls vorhanden
-                if "style" in el.attrib:
-                    del el.attrib["style"]
-                # Jetzt fill setzen
-                el.set("fill", fill_hex)
-                # Optional: kräftigere Kontur
-                el.set("stroke", "#1F2226")
-                el.set("stroke-width", "3")
+            if el_id not in positionen:
+                continue
+            el = elemente[positionen[el_id]]
+            # WICHTIG: CSS-Klasse entfernen, sonst überschreibt sie das fill-Attribut
+            el.attrib.pop("class", None)
+            # Style-Attribut entfernen falls vorhanden
+            el.attrib.pop("style", None)
+            # Jetzt fill setzen
+            el.set("fill", fill_hex)
+            # Optional: kräftigere Kontur
+            el.set("stroke", "#1F2226")
+            el.set("stroke-width", "3")
 
     # SVG wieder serialisieren
-    svg_bytes = ET.tostring(root, encoding="utf-8", method="xml")
+    return ET.tostring(root, encoding="utf-8", method="xml")
+
+
+def _render_svg_muscle_map_png_base64(muskelgruppen_stats):
+    """Rendert die SVG-Muscle-Map als PNG (base64), mit farbiger Hervorhebung per IDs.
+
+    Erwartet muskelgruppen_stats als Liste von Dicts, z.B.:
+      [{"key": "BRUST", "status": "optimal"}, ...]
+    """
+    if not muskelgruppen_stats:
+        return None
+
+    # Import hier, damit das Modul auch ohne cairosvg/cairo-library funktioniert
+    try:
+        import cairosvg
+    except (ImportError, OSError) as e:
+        # cairosvg nicht installiert ODER Cairo-C-Library fehlt (Windows)
+        raise ImportError(f"cairosvg/cairo nicht verfügbar: {e}")
+
+    svg_bytes = _muscle_map_svg_bytes(_muskel_status_vektor(muskelgruppen_stats))
 
     # Render to PNG
     # background_color: leicht grau wie im alten PNG (sonst transparent)
@@ -570,6 +594,13 @@ def generate_body_map_with_data(muskelgruppen_stats):
     """
     if not muskelgruppen_stats:
         return None
+    return _body_map_png_gecacht(_muskel_status_vektor(muskelgruppen_stats))
+
+
+@functools.lru_cache(maxsize=256)
+def _body_map_png_gecacht(status_vektor: tuple):
+    """Body-Map je Status-Vektor – wenige Status pro Muskelgruppe, kleiner Raum."""
+    muskelgruppen_stats = [{"key": key, "status": status} for key, status in status_vektor]
 
     # 1) Versuche SVG-Rendering (professionell) - nur wenn Cairo verfügbar
     try:
@@ -4,6 +4,11 @@ Chart orchestration for PDF export.
 Coordinates generation of all chart images (muscle heatmap, volume chart,
 push/pull pie, body map) used in the training PDF report.
 Includes caching with 1h TTL to avoid regenerating unchanged charts.
+
+Cache-Misses werden gemeinsam über ``chart_pool.rendere`` gerendert (parallel
+im Prozess-Pool, sonst seriell). ``pdf_chart_auftraege`` liefert die Aufträge
+der vier Basis-Charts, damit ``build_training_pdf_context`` sie mit den übrigen
+Report-Charts in EINEM Pool-Durchlauf rendern kann.
 """
 
 import hashlib
@@ -12,12 +17,7 @@ import logging
 
 from django.core.cache import cache
 
-from core.chart_generator import (
-    generate_body_map_with_data,
-    generate_muscle_heatmap,
-    generate_push_pull_pie,
-    generate_volume_chart,
-)
+from . import chart_pool
 
 logger = logging.getLogger(__name__)
 
@@ -30,15 +30,55 @@ def _data_hash(*args) -> str:
     return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()[:12]
 
 
-def _get_or_generate(cache_key: str, generator_fn, *args):
-    """Return cached result or generate, cache and return it."""
-    cached = cache.get(cache_key)
-    if cached is not None:
-        logger.debug("Chart cache hit: %s", cache_key)
-        return cached
-    result = generator_fn(*args)
-    cache.set(cache_key, result, CHART_CACHE_TTL)
-    return result
+def rendere_gecacht(auftraege: dict[str, tuple[str | None, tuple]]) -> dict:
+    """Rendert ``{name: (cache_key, (funktion, args, kwargs))}``; Cache-Hits ohne Rendern.
+
+    ``cache_key=None`` → ungecacht. Fehlgeschlagene Charts (``None``) werden nicht gecacht.
+    """
+    ergebnisse = {}
+    offen = {}
+    treffer = cache.get_many([k for k, _ in auftraege.values() if k])
+    for name, (cache_key, auftrag) in auftraege.items():
+        if cache_key and treffer.get(cache_key) is not None:
+            logger.debug("Chart cache hit: %s", cache_key)
+            ergebnisse[name] = treffer[cache_key]
+        else:
+            offen[name] = auftrag
+    neu = chart_pool.rendere(offen)
+    cache.set_many(
+        {
+            auftraege[name][0]: wert
+            for name, wert in neu.items()
+            if auftraege[name][0] and wert is not None
+        },
+        CHART_CACHE_TTL,
+    )
+    return {**ergebnisse, **neu}
+
+
+def pdf_chart_auftraege(
+    muskelgruppen_stats: list[dict], volumen_wochen: list[dict], push_saetze: int, pull_saetze: int
+) -> dict:
+    """Aufträge (mit Cache-Key) für Heatmap, Volumen, Push/Pull und Body-Map."""
+    h = _data_hash(muskelgruppen_stats, volumen_wochen, push_saetze, pull_saetze)
+    return {
+        "muscle_heatmap": (
+            f"pdf_chart_heatmap_{h}",
+            ("generate_muscle_heatmap", (muskelgruppen_stats,), {}),
+        ),
+        "volume_chart": (
+            f"pdf_chart_volume_{h}",
+            ("generate_volume_chart", (volumen_wochen[-8:],), {}),
+        ),
+        "push_pull_chart": (
+            f"pdf_chart_pushpull_{h}",
+            ("generate_push_pull_pie", (push_saetze, pull_saetze), {}),
+        ),
+        "body_map_image": (
+            f"pdf_chart_bodymap_{h}",
+            ("generate_body_map_with_data", (muskelgruppen_stats,), {}),
+        ),
+    }
 
 
 def generate_pdf_charts(
@@ -47,23 +87,16 @@ def generate_pdf_charts(
     """Generate chart images for PDF; returns (muscle_heatmap, volume_chart, push_pull_chart, body_map).
     Returns (None, None, None, None) if generation fails."""
     try:
-        h = _data_hash(muskelgruppen_stats, volumen_wochen, push_saetze, pull_saetze)
-
-        muscle_heatmap = _get_or_generate(
-            f"pdf_chart_heatmap_{h}", generate_muscle_heatmap, muskelgruppen_stats
+        charts = rendere_gecacht(
+            pdf_chart_auftraege(muskelgruppen_stats, volumen_wochen, push_saetze, pull_saetze)
         )
-        volume_chart = _get_or_generate(
-            f"pdf_chart_volume_{h}", generate_volume_chart, volumen_wochen[-8:]
-        )
-        push_pull_chart = _get_or_generate(
-            f"pdf_chart_pushpull_{h}", generate_push_pull_pie, push_saetze, pull_saetze
-        )
-        body_map_image = _get_or_generate(
-            f"pdf_chart_bodymap_{h}", generate_body_map_with_data, muskelgruppen_stats
-        )
-
         logger.info("Charts successfully generated (with caching)")
-        return muscle_heatmap, volume_chart, push_pull_chart, body_map_image
+        return (
+            charts["muscle_heatmap"],
+            charts["volume_chart"],
+            charts["push_pull_chart"],
+            charts["body_map_image"],
+        )
     except Exception as e:
         logger.warning(f"Chart generation failed: {str(e)}")
         return None, None, None, None
@@ -0,0 +1,130 @@
+"""
+Prozess-Pool für das Chart-Rendering des PDF-Reports.
+
+Matplotlib und cairosvg sind CPU-gebunden und halten den GIL – die ~10 Charts
+eines Reports (Heatmaps, Volumen, Push/Pull, Body-Map, Körperwerte, RPE,
+Übungsverläufe) liefen bisher nacheinander im Request-Thread.
+
+``rendere(auftraege)`` verteilt unabhängige Charts auf einen warmen
+``ProcessPoolExecutor`` (``settings.PDF_CHART_WORKERS`` Prozesse, pro
+Django-Prozess einmal gestartet). Die Worker werden per ``spawn`` gestartet –
+kein ``fork`` eines Prozesses mit offenen DB-Verbindungen und Threads – und
+laden Matplotlib (Agg) und ``core.chart_generator`` beim Start vor. Statt
+``django.setup()`` bekommen sie nur die Settings, die die Chart-Funktionen
+lesen (``_worker_settings``); Argumente müssen daher ohne App-Registry
+picklebar sein (keine Model-Instanzen).
+
+Ein Auftrag ist ``(funktionsname, args, kwargs)`` einer Funktion aus
+``core.chart_generator`` (per Name, damit er picklebar ist). Ergebnisse, die
+bis ``settings.PDF_CHART_TIMEOUT`` nicht da sind, und alle Aufträge bei
+nicht verfügbarem Pool (``PDF_CHART_WORKERS = 0``, Pool kaputt) werden
+seriell im aufrufenden Prozess gerendert – der Report ist immer vollständig.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _worker_settings() -> dict:
+    """Settings, die ``core.chart_generator`` liest (Body-Map-SVG-Suche)."""
+    return {
+        "BASE_DIR": str(settings.BASE_DIR),
+        "MUSCLE_MAP_SVG_PATH": getattr(settings, "MUSCLE_MAP_SVG_PATH", None),
+    }
+
+
+def _worker_init(worker_settings: dict) -> None:
+    """Läuft einmal je Worker: Settings setzen, Matplotlib (Agg) + Chart-Modul vorladen."""
+    from django.conf import settings as worker_conf
+
+    if not worker_conf.configured:
+        worker_conf.configure(**worker_settings)
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import core.chart_generator  # noqa: F401
+
+
+def _rendere_einzeln(funktion: str, args: tuple, kwargs: dict):
+    from core import chart_generator
+
+    return getattr(chart_generator, funktion)(*args, **kwargs)
+
+
+def _hole_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    workers = int(getattr(settings, "PDF_CHART_WORKERS", 0) or 0)
+    if workers < 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_worker_init,
+                initargs=(_worker_settings(),),
+            )
+        return _pool
+
+
+def _verwerfe_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _seriell(name: str, auftrag: tuple):
+    try:
+        return _rendere_einzeln(*auftrag)
+    except Exception as e:
+        logger.warning("Chart %s fehlgeschlagen: %s", name, e)
+        return None
+
+
+def rendere(auftraege: dict[str, tuple[str, tuple, dict]]) -> dict:
+    """Rendert alle Aufträge; gibt ``{name: Ergebnis}`` zurück (``None`` bei Fehler).
+
+    Ein einzelner Chart-Fehler betrifft nur diesen Chart, nicht den Report.
+    """
+    pool = _hole_pool() if len(auftraege) > 1 else None
+    if pool is None:
+        return {name: _seriell(name, auftrag) for name, auftrag in auftraege.items()}
+
+    try:
+        futures = {name: pool.submit(_rendere_einzeln, *a) for name, a in auftraege.items()}
+    except (BrokenProcessPool, RuntimeError) as e:
+        logger.warning("Chart-Pool nicht verfügbar, rendere seriell: %s", e)
+        _verwerfe_pool()
+        return {name: _seriell(name, auftrag) for name, auftrag in auftraege.items()}
+
+    deadline = time.monotonic() + float(getattr(settings, "PDF_CHART_TIMEOUT", 30))
+    ergebnisse = {}
+    for name, future in futures.items():
+        try:
+            ergebnisse[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            future.cancel()
+            logger.warning("Chart %s: Pool-Deadline überschritten, rendere seriell", name)
+            ergebnisse[name] = _seriell(name, auftraege[name])
+        except BrokenProcessPool as e:
+            logger.warning("Chart-Pool abgestürzt, rendere seriell: %s", e)
+            _verwerfe_pool()
+            ergebnisse[name] = _seriell(name, auftraege[name])
+        except Exception as e:
+            logger.warning("Chart %s fehlgeschlagen: %s", name, e)
+            ergebnisse[name] = None
+    return ergebnisse
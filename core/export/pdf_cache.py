@@ -0,0 +1,135 @@
+"""
+Inhaltsadressierter Datei-Cache für den Trainings-PDF-Report.
+
+Der Report (``collect_pdf_stats`` + alle Charts + WeasyPrint/xhtml2pdf) kostet
+mehrere Sekunden CPU – auch wenn sich seit dem letzten Download nichts geändert
+hat. Die gerenderten Bytes liegen deshalb unter
+``PDF_CACHE_ROOT/<user_id>/<fingerprint>.pdf`` – außerhalb von MEDIA_ROOT
+(``/media/`` ist öffentlich), ausgeliefert nur über ``export_training_pdf``.
+
+Der Fingerprint (``report_fingerprint``) hasht alle Eingaben des Reports:
+
+- Daten-Versionen des Users (``core/services/daten_version.py``) – jede
+  Änderung an Sätzen, Einheiten, Körperwerten, Pausen oder Plänen ergibt einen
+  neuen Fingerprint, explizites Invalidieren ist nicht nötig
+- Berichtszeitraum (letzte 30 Tage bis heute → Tagesdatum)
+- ``settings.PDF_ENGINE`` und Hash des Report-Templates
+- ``PDF_CACHE_FORMAT`` – bei Änderungen an Statistik-/Chart-Code erhöhen
+
+Beim Schreiben eines neuen Reports werden ältere Dateien des Users entfernt
+(deren Fingerprint wird nie mehr berechnet). „Erstellt am" im Report zeigt die
+Uhrzeit des ersten Renderns am jeweiligen Tag.
+
+``vorrendern_einreihen(user_id)`` reiht nach ``finish_training`` optional
+(``settings.PDF_REPORT_VORRENDERN``) einen ``training_pdf_vorrendern``-Job ein.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.template.loader import get_template
+from django.utils import timezone
+
+from core.services.daten_version import versionen
+
+from .pdf_renderer import _render_pdf_bytes, training_pdf_filename
+
+logger = logging.getLogger(__name__)
+
+# Erhöhen, wenn sich Statistik-/Chart-Code ändert, ohne dass das Template es tut
+PDF_CACHE_FORMAT = 1
+# Domänen, aus denen collect_pdf_stats & Charts rechnen (Aktiver-Plan-Filter: "plaene")
+PDF_DOMAENEN = ("saetze", "einheiten", "koerper", "pausen", "plaene")
+PDF_TEMPLATE = "core/training_pdf_simple.html"
+# Berichtszeitraum des Reports (build_training_pdf_context)
+BERICHTSZEITRAUM_TAGE = 30
+
+
+@functools.lru_cache(maxsize=1)
+def _template_hash() -> str:
+    """Hash des Report-Template-Quelltexts (pro Prozess; ein Deploy startet neu)."""
+    quelle = get_template(PDF_TEMPLATE).template.source
+    return hashlib.sha256(quelle.encode("utf-8")).hexdigest()[:16]
+
+
+def report_fingerprint(user_id: int, heute) -> str:
+    """Hash aller Eingaben, von denen der gerenderte Report abhängt."""
+    eingaben = {
+        "format": PDF_CACHE_FORMAT,
+        "versionen": versionen(user_id, *PDF_DOMAENEN),
+        "zeitraum": heute.strftime("%Y%m%d"),
+        "engine": str(getattr(settings, "PDF_ENGINE", "xhtml2pdf")).lower(),
+        "template": _template_hash(),
+    }
+    roh = json.dumps(eingaben, sort_keys=True)
+    return hashlib.sha256(roh.encode()).hexdigest()[:32]
+
+
+def _user_ordner(user_id: int) -> str:
+    return os.path.join(settings.PDF_CACHE_ROOT, str(user_id))
+
+
+def _dateiname(user, heute) -> str:
+    zeitraum = {
+        "start_datum": heute - timedelta(days=BERICHTSZEITRAUM_TAGE),
+        "end_datum": heute,
+    }
+    return training_pdf_filename(user.username, zeitraum, heute)
+
+
+def _speichern(ordner: str, pfad: str, pdf_bytes: bytes) -> None:
+    """Schreibt atomar (temp + rename) und entfernt ältere Reports des Users."""
+    os.makedirs(ordner, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=ordner, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(tmp, pfad)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    for name in os.listdir(ordner):
+        alt = os.path.join(ordner, name)
+        if alt != pfad and name.endswith(".pdf"):
+            try:
+                os.remove(alt)
+            except FileNotFoundError:  # paralleler Request war schneller
+                pass
+
+
+def hole_oder_rendere(user, request=None) -> tuple[str, str]:
+    """Pfad des gerenderten Reports (aus dem Cache oder frisch gerendert) + Dateiname.
+
+    Der Fingerprint wird VOR dem Rendern bestimmt: Ändern sich die Daten
+    währenddessen, landet der Report unter dem alten Fingerprint und wird
+    nicht mehr ausgeliefert. Render-Fehler werden an den Aufrufer durchgereicht.
+    """
+    from core.views.export import build_training_pdf_context
+
+    heute = timezone.now()
+    ordner = _user_ordner(user.id)
+    pfad = os.path.join(ordner, f"{report_fingerprint(user.id, heute)}.pdf")
+    if os.path.exists(pfad):
+        logger.debug("PDF-Cache-Hit: %s", pfad)
+        return pfad, _dateiname(user, heute)
+
+    context, heute = build_training_pdf_context(user)
+    pdf_bytes = _render_pdf_bytes(request, context)
+    _speichern(ordner, pfad, pdf_bytes)
+    return pfad, training_pdf_filename(user.username, context, heute)
+
+
+def vorrendern_einreihen(user_id: int) -> None:
+    """Reiht das Vorrendern nach dem Commit ein, falls ``PDF_REPORT_VORRENDERN`` aktiv."""
+    if not getattr(settings, "PDF_REPORT_VORRENDERN", False):
+        return
+    from core.services.hintergrund_jobs import enqueue_einmalig
+
+    transaction.on_commit(lambda: enqueue_einmalig("training_pdf_vorrendern", user=user_id))
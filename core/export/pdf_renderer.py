@@ -17,24 +17,26 @@ from pathlib import Path
 from urllib.parse import unquote, urlparse
 
 from django.conf import settings
-from django.contrib import messages
 from django.contrib.staticfiles import finders
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import redirect
+from django.http import HttpRequest
 from django.template.loader import render_to_string
 
-try:
-    from xhtml2pdf import pisa
-except ImportError:
-    pisa = None
-
-try:
-    import weasyprint
-except Exception:  # pragma: no cover -- ImportError o. fehlende native Libs (Pango/GLib)
-    weasyprint = None
+from core.utils.lazy_import import modul_getattr
 
 logger = logging.getLogger(__name__)
 
+# Engines erst beim ersten PDF laden (xhtml2pdf/reportlab + WeasyPrint ≈ 1 s
+# Importzeit); ``pisa``/``weasyprint`` sind None, wenn nicht installiert bzw.
+# native Libs (Pango/GLib) fehlen.
+__getattr__ = modul_getattr(
+    globals(), {"pisa": ("xhtml2pdf", "pisa"), "weasyprint": ("weasyprint", None)}
+)
+
+
+def _lib(name: str):
+    """Engine-Modul (lädt beim ersten Zugriff; in Tests per ``patch.object`` ersetzbar)."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
 
 def _weasyprint_url_fetcher(url: str):
     """Löst Django-Static-URLs (die Font-TTFs) für WeasyPrint auf das
@@ -60,10 +62,15 @@ def _weasyprint_url_fetcher(url: str):
     return default_url_fetcher(url)
 
 
-def _render_pdf_bytes(request: HttpRequest, context: dict) -> bytes:
+def _render_pdf_bytes(
+    request: HttpRequest | None, context: dict, base_url: str | None = None
+) -> bytes:
     """Rendert das Report-Template zu PDF-Bytes. WeasyPrint primär (falls
     konfiguriert + verfügbar), sonst/­bei Fehler xhtml2pdf. Wirft bei totalem
-    Fehlschlag, der Aufrufer fängt das ab."""
+    Fehlschlag, der Aufrufer fängt das ab.
+
+    Ohne Request (Hintergrund-Job) wird ``base_url`` bzw. ``settings.SITE_URL``
+    als Basis für relative URLs verwendet."""
     engine = str(getattr(settings, "PDF_ENGINE", "xhtml2pdf")).lower()
 
     def _html(engine_name: str) -> str:
@@ -71,12 +78,14 @@ def _render_pdf_bytes(request: HttpRequest, context: dict) -> bytes:
             "core/training_pdf_simple.html", {**context, "pdf_engine": engine_name}
         )
 
-    if engine == "weasyprint" and weasyprint is not None:
+    weasyprint = _lib("weasyprint") if engine == "weasyprint" else None
+    if weasyprint is not None:
         try:
             html_string = _html("weasyprint")
             return weasyprint.HTML(
                 string=html_string,
-                base_url=request.build_absolute_uri("/"),
+                base_url=base_url
+                or (request.build_absolute_uri("/") if request else settings.SITE_URL),
                 url_fetcher=_weasyprint_url_fetcher,
             ).write_pdf()
         except Exception as e:
@@ -84,6 +93,7 @@ def _render_pdf_bytes(request: HttpRequest, context: dict) -> bytes:
                 "WeasyPrint-PDF fehlgeschlagen, Fallback auf xhtml2pdf: %s", e, exc_info=True
             )
 
+    pisa = _lib("pisa")
     if pisa is None:
         raise RuntimeError("Keine PDF-Engine verfügbar (xhtml2pdf nicht importierbar).")
     result = BytesIO()
@@ -93,28 +103,10 @@ def _render_pdf_bytes(request: HttpRequest, context: dict) -> bytes:
     return result.getvalue()
 
 
-def render_training_pdf_response(request: HttpRequest, context: dict, heute) -> HttpResponse:
-    """Render training PDF template and return PDF download response.
-
-    Handles both template rendering errors and PDF-engine errors, returning a
-    redirect to training_stats with an error message on failure.
-    """
-    try:
-        pdf_bytes = _render_pdf_bytes(request, context)
-    except Exception as e:
-        logger.error(f"PDF export failed: {str(e)}", exc_info=True)
-        messages.error(request, "PDF-Generierung fehlgeschlagen. Bitte später erneut versuchen.")
-        return redirect("training_stats")
-
-    response = HttpResponse(pdf_bytes, content_type="application/pdf")
-    username = request.user.username
+def training_pdf_filename(username: str, context: dict, heute) -> str:
+    """Download-Dateiname des Trainings-Reports (Zeitraum, sonst Erstellungsdatum)."""
     start = context.get("start_datum")
     end = context.get("end_datum")
     if start and end:
-        filename = (
-            f"TrainingReport_{username}_{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}.pdf"
-        )
-    else:
-        filename = f"TrainingReport_{username}_{heute.strftime('%Y%m%d')}.pdf"
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+        return f"TrainingReport_{username}_{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}.pdf"
+    return f"TrainingReport_{username}_{heute.strftime('%Y%m%d')}.pdf"
@@ -28,6 +28,7 @@ from core.utils.plan_helpers import (
     get_active_plan_start_date,
     is_active_plan_too_new,
 )
+from core.utils.satz_spalten import lade_satz_spalten
 from core.utils.week_classification import build_weekly_volume_overview
 
 
@@ -595,6 +596,10 @@ def collect_pdf_stats(user, letzte_30_tage, heute) -> dict:
         einheit__ist_deload=False,
     )
     gesamt_saetze = alle_saetze.count()
+    # Alle Sätze des Users (inkl. Warmup/Deload) EINMAL spaltenweise laden –
+    # Plateau-, RPE- und Fatigue-Analysen maskieren nur noch im Speicher.
+    alle_spalten = lade_satz_spalten(Satz.objects.filter(einheit__user=user))
+    arbeits_spalten = alle_spalten.arbeitssaetze()
     saetze_30_tage = alle_saetze.filter(einheit__datum__gte=letzte_30_tage).count()
 
     user_kg = get_user_kg(user)
@@ -617,7 +622,7 @@ def collect_pdf_stats(user, letzte_30_tage, heute) -> dict:
 
     reentry_pause = get_active_reentry_pause(user, today=heute.date())
     plateau_analysis = calculate_plateau_analysis(
-        alle_saetze, top_uebungen, reentry_pause=reentry_pause
+        arbeits_spalten, top_uebungen, reentry_pause=reentry_pause
     )
 
     # Kraftentwicklung: seit Plan-Start (Default), oder letzte 5 Sessions (Fallback)
@@ -654,14 +659,14 @@ def collect_pdf_stats(user, letzte_30_tage, heute) -> dict:
 
     avg_rpe, rpe_verteilung = collect_intensity_data(alle_saetze, letzte_30_tage)
     rpe_saetze = alle_saetze.filter(rpe__isnull=False, einheit__datum__gte=letzte_30_tage)
-    rpe_quality = calculate_rpe_quality_analysis(alle_saetze)
+    rpe_quality = calculate_rpe_quality_analysis(arbeits_spalten)
     # Phase 23.1: Zeitfenster-basierte RPE-Verteilung (2w / 4w / all).
     # Plan-Clamping nur, wenn Plan nicht zu jung – konsistent mit Phase 22.
     rpe_window_plan_start = (
         plan_start_date if (active_uebung_ids is not None and not plan_too_new) else None
     )
     rpe_quality_windowed = calculate_rpe_quality_analysis_windowed(
-        alle_saetze, reference_date=heute, plan_start=rpe_window_plan_start
+        arbeits_spalten, reference_date=heute, plan_start=rpe_window_plan_start
     )
     # Volume chart uses ALL sets (incl. deload) so deload weeks show real volume
     alle_saetze_inkl_deload = Satz.objects.filter(
@@ -675,7 +680,9 @@ def collect_pdf_stats(user, letzte_30_tage, heute) -> dict:
         heute=heute,
         pausen=TrainingsPause.objects.filter(user=user),
     )
-    fatigue_analysis = calculate_fatigue_index(volumen_wochen, rpe_saetze, alle_trainings)
+    fatigue_analysis = calculate_fatigue_index(
+        volumen_wochen, rpe_saetze, alle_trainings, spalten=alle_spalten
+    )
 
     koerperwerte_qs = KoerperWerte.objects.filter(user=user).order_by("-datum")
     koerperwerte = list(koerperwerte_qs[:10])  # letzte 10 für Verlaufstabelle im PDF
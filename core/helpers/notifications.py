@@ -67,26 +67,47 @@ def _send_single_push(subscription, payload: str, vapid_key_path: str) -> bool:
 def send_push_notification(user, title: str, body: str, url: str = "/", icon: str | None = None):
     """Sendet eine Push-Notification an alle Geräte eines Users.
 
-    Orchestriert _build_push_payload und _send_single_push.
-    Enthält selbst keine eigene Logik außer Vorbedingungsprüfungen.
+    Prüft nur die Vorbedingungen; der Fan-out (je ein HTTP-Call zum
+    Push-Dienst) läuft als Hintergrund-Job ``push_senden`` und blockiert
+    keinen Request-Worker. Gibt den ``HintergrundJob`` zurück, None wenn
+    nichts zu senden ist.
     """
     if not settings.VAPID_PRIVATE_KEY or not settings.VAPID_PUBLIC_KEY:
         logger.warning("VAPID keys not configured - push notifications disabled")
-        return
+        return None
 
     from core.models import PushSubscription
 
-    subscriptions = PushSubscription.objects.filter(user=user)
-    if not subscriptions.exists():
-        return
+    if not PushSubscription.objects.filter(user=user).exists():
+        return None
+
+    from core.services.hintergrund_jobs import enqueue
+
+    return enqueue(
+        "push_senden", user=user, title=title, body=body, url=url, icon=icon, max_versuche=1
+    )
+
+
+def _sende_an_alle_geraete(
+    user, title: str, body: str, url: str = "/", icon: str | None = None
+) -> int:
+    """Fan-out an alle Subscriptions eines Users (Job ``push_senden``).
+
+    Orchestriert _build_push_payload und _send_single_push. Gibt die Anzahl
+    noch gültiger Subscriptions zurück.
+    """
+    from core.models import PushSubscription
 
     payload = _build_push_payload(title, body, url, icon)
     vapid_key_path = os.path.join(settings.BASE_DIR, settings.VAPID_PRIVATE_KEY_FILE)
 
-    for subscription in subscriptions:
+    gesendet = 0
+    for subscription in PushSubscription.objects.filter(user=user):
         still_valid = _send_single_push(subscription, payload, vapid_key_path)
         if still_valid:
             subscription.last_used = timezone.now()
             subscription.save()
+            gesendet += 1
         else:
             subscription.delete()
+    return gesendet
@@ -0,0 +1,99 @@
+"""
+Management Command: Import-Kosten des Django-Starts (pro Modul)
+
+Misst ``django.setup()`` + URLconf-Import in einem frischen Prozess
+(``python -X importtime``) und listet die teuersten Module. Mit ``--pruefen``
+endet das Command mit Fehler, wenn das Budget (``IMPORT_BUDGET_SEKUNDEN`` /
+``IMPORT_BUDGET_MODULE``) überschritten ist oder schwere Bibliotheken
+(matplotlib, scikit-learn, xhtml2pdf, …) schon beim Start geladen werden.
+
+Usage:
+    python manage.py import_profile
+    python manage.py import_profile --top 40 --selbst
+    python manage.py import_profile --pruefen     # CI / nach Dependency-Updates
+"""
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.import_profil import messe_start
+
+
+class Command(BaseCommand):
+    help = "Misst die Import-Kosten von django.setup() + URLconf pro Modul"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="Anzahl gelisteter Module")
+        parser.add_argument(
+            "--selbst",
+            action="store_true",
+            help="Nach Eigenzeit statt kumulierter Zeit sortieren",
+        )
+        parser.add_argument("--json", action="store_true", help="Ausgabe als JSON")
+        parser.add_argument(
+            "--pruefen",
+            action="store_true",
+            help="Fehler bei Budget-Überschreitung oder schweren Modulen",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            profil = messe_start()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        budget_s = settings.IMPORT_BUDGET_SEKUNDEN
+        budget_module = settings.IMPORT_BUDGET_MODULE
+        teuerste = profil.teuerste(options["top"], kumuliert=not options["selbst"])
+        schwere = profil.schwere_module()
+
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "gesamt_sekunden": round(profil.gesamt_sekunden, 4),
+                        "module": profil.anzahl_module,
+                        "budget_sekunden": budget_s,
+                        "budget_module": budget_module,
+                        "schwere_module": schwere,
+                        "teuerste": [
+                            {
+                                "modul": e.modul,
+                                "selbst_ms": e.selbst_us / 1000,
+                                "kumuliert_ms": e.kumuliert_us / 1000,
+                            }
+                            for e in teuerste
+                        ],
+                    },
+                    indent=2,
+                )
+            )
+        else:
+            self.stdout.write(
+                f"⏱  Start-Imports: {profil.gesamt_sekunden:.3f} s "
+                f"(Budget {budget_s:.1f} s), {profil.anzahl_module} Module (Budget {budget_module})"
+            )
+            self.stdout.write(f"{'kumuliert ms':>13} {'selbst ms':>10}  Modul")
+            for e in teuerste:
+                self.stdout.write(
+                    f"{e.kumuliert_us / 1000:>13.1f} {e.selbst_us / 1000:>10.1f}  "
+                    f"{'  ' * (e.tiefe - 1)}{e.modul}"
+                )
+            if schwere:
+                self.stdout.write(
+                    self.style.WARNING(f"Schwere Module beim Start geladen: {', '.join(schwere)}")
+                )
+
+        if options["pruefen"]:
+            fehler = []
+            if profil.gesamt_sekunden > budget_s:
+                fehler.append(f"Importzeit {profil.gesamt_sekunden:.2f} s > {budget_s} s")
+            if profil.anzahl_module > budget_module:
+                fehler.append(f"{profil.anzahl_module} Module > {budget_module}")
+            if schwere:
+                fehler.append(f"schwere Module: {', '.join(schwere)}")
+            if fehler:
+                raise CommandError("Import-Budget überschritten: " + "; ".join(fehler))
+            self.stdout.write(self.style.SUCCESS("✅ Import-Budget eingehalten"))
@@ -0,0 +1,68 @@
+"""
+Management Command: Baut den ML-Feature-Store neu auf
+
+Einmalig nach dem Deploy von Migration 0091 (Backfill) oder jederzeit, falls
+Daten an den Signalen vorbei geschrieben wurden (loaddata, raw SQL) bzw. sich
+Gewichtstyp oder Körpergewichtsfaktor einer Übung geändert haben.
+
+Usage:
+    python manage.py rebuild_ml_features
+    python manage.py rebuild_ml_features --user-id 123
+    python manage.py rebuild_ml_features --nur-fehlende
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from core.models import MLFeatureZeile, Satz
+from core.services.ml_features import rebuild_fuer_user
+
+
+class Command(BaseCommand):
+    help = "Baut MLFeatureZeile (ML-Features je Arbeitssatz) neu auf"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="Nur für spezifischen User neu aufbauen (sonst alle)",
+        )
+        parser.add_argument(
+            "--nur-fehlende",
+            action="store_true",
+            help="Backfill: nur Einheiten mit Arbeitssätzen ohne Feature-Zeile",
+        )
+
+    def handle(self, *args, **options):
+        user_id = options.get("user_id")
+        nur_fehlende = options.get("nur_fehlende", False)
+
+        if user_id:
+            users = User.objects.filter(id=user_id)
+            if not users.exists():
+                self.stdout.write(self.style.ERROR(f"User {user_id} nicht gefunden"))
+                return
+        else:
+            users = User.objects.all()
+
+        modus = "Backfill" if nur_fehlende else "Rebuild"
+        self.stdout.write(self.style.SUCCESS(f"🧮 {modus} ML-Feature-Store gestartet"))
+        gesamt = 0
+        for user in users.order_by("id"):
+            einheit_ids = None
+            if nur_fehlende:
+                einheit_ids = list(
+                    Satz.objects.filter(einheit__user=user, ist_aufwaermsatz=False)
+                    .exclude(Exists(MLFeatureZeile.objects.filter(satz=OuterRef("pk"))))
+                    .values_list("einheit_id", flat=True)
+                    .distinct()
+                )
+                if not einheit_ids:
+                    continue
+            anzahl = rebuild_fuer_user(user.id, einheit_ids=einheit_ids)
+            gesamt += anzahl
+            if anzahl:
+                self.stdout.write(f"  👤 {user.username} (ID: {user.id}): {anzahl} Zeilen")
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Fertig: {gesamt} Zeilen aufgebaut"))
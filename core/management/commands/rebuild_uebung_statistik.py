@@ -0,0 +1,56 @@
+"""
+Management Command: Baut die materialisierte Übungs-Statistik neu auf
+
+Einmalig nach dem Deploy von Migration 0086/0087 (Backfill) oder jederzeit,
+falls Daten an den Signalen vorbei geschrieben wurden (loaddata, raw SQL).
+Baut ``UebungTagesStatistik`` und ``PersoenlicherRekord`` auf.
+
+Usage:
+    python manage.py rebuild_uebung_statistik
+    python manage.py rebuild_uebung_statistik --user-id 123
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from core.services import persoenliche_rekorde
+from core.services.uebung_statistik import rebuild_fuer_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Baut UebungTagesStatistik (1RM/Tonnage/RPE je Einheit & Übung) "
+        "und PersoenlicherRekord (PR-Erkennung) neu auf"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="Nur für spezifischen User neu aufbauen (sonst alle)",
+        )
+
+    def handle(self, *args, **options):
+        user_id = options.get("user_id")
+
+        if user_id:
+            users = User.objects.filter(id=user_id)
+            if not users.exists():
+                self.stdout.write(self.style.ERROR(f"User {user_id} nicht gefunden"))
+                return
+        else:
+            users = User.objects.all()
+
+        self.stdout.write(self.style.SUCCESS("📊 Rebuild Übungs-Statistik gestartet"))
+        gesamt = 0
+        rekorde = 0
+        for user in users.order_by("id"):
+            anzahl = rebuild_fuer_user(user.id)
+            gesamt += anzahl
+            rekorde += persoenliche_rekorde.rebuild_fuer_user(user.id)
+            if anzahl:
+                self.stdout.write(f"  👤 {user.username} (ID: {user.id}): {anzahl} Zeilen")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\n✅ Fertig: {gesamt} Zeilen aufgebaut, {rekorde} Rekorde")
+        )
@@ -0,0 +1,141 @@
+"""
+Management Command: Arbeitet Hintergrund-Jobs ab (DB-Queue, ohne Redis/Celery)
+
+Usage:
+    python manage.py run_worker
+    python manage.py run_worker --concurrency 4 --pool process
+    python manage.py run_worker --once          # fällige Jobs abarbeiten, dann beenden
+
+Deployment: als eigener systemd-Service neben Gunicorn. Mehrere Worker-Prozesse
+sind möglich – Jobs werden per bedingtem UPDATE exklusiv beansprucht.
+"""
+
+import logging
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.services.hintergrund_jobs import (
+    fuehre_job_aus,
+    hole_naechsten_job,
+    raeume_alte_jobs,
+    setze_haengende_zurueck,
+    worker_name,
+)
+
+logger = logging.getLogger(__name__)
+
+# Wie oft hängende Jobs (Worker abgestürzt) erneut eingereiht werden
+HAENGEND_PRUEFEN_SEKUNDEN = 60
+# Wie oft abgeschlossene Jobs samt Dateien nach Ablauf der Aufbewahrung gelöscht werden
+AUFRAEUMEN_SEKUNDEN = 3600
+
+
+class Command(BaseCommand):
+    help = "Arbeitet Hintergrund-Jobs ab (Plan-Generierung, ML-Training, PDF, Push)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=2,
+            help="Parallel laufende Jobs (default: 2)",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default="thread",
+            help="thread (I/O-lastig: LLM, Push) oder process (CPU-lastig: ML, PDF)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Sekunden zwischen zwei Abfragen der Queue (default: 1.0)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Nur fällige Jobs abarbeiten und dann beenden (Cron/Tests)",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        pool = options["pool"]
+        poll_interval = options["poll_interval"]
+        once = options["once"]
+        worker = worker_name()
+        self._stop = False
+
+        if not once:
+            signal.signal(signal.SIGTERM, self._beenden)
+            signal.signal(signal.SIGINT, self._beenden)
+
+        if pool == "process":
+            # fork: Kinder erben das Django-Setup. Offene DB-Verbindungen dürfen
+            # nicht geteilt werden → vor jedem Fork schließen (siehe _submit).
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                max_workers=concurrency, mp_context=multiprocessing.get_context("fork")
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"⚙️  Worker {worker} gestartet ({pool}, concurrency={concurrency})")
+        )
+        laufend: set = set()
+        erledigt = 0
+        naechste_pruefung = naechstes_aufraeumen = 0.0
+        try:
+            while not self._stop:
+                if time.monotonic() >= naechste_pruefung:
+                    setze_haengende_zurueck()
+                    naechste_pruefung = time.monotonic() + HAENGEND_PRUEFEN_SEKUNDEN
+                if time.monotonic() >= naechstes_aufraeumen:
+                    raeume_alte_jobs()
+                    naechstes_aufraeumen = time.monotonic() + AUFRAEUMEN_SEKUNDEN
+
+                while len(laufend) < concurrency and not self._stop:
+                    job_id = hole_naechsten_job(worker)
+                    if job_id is None:
+                        break
+                    laufend.add(self._submit(executor, pool, job_id))
+
+                if not laufend:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                fertig, laufend = wait(laufend, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                erledigt += self._auswerten(fertig)
+        finally:
+            # Laufende Jobs zu Ende bringen (SIGTERM von systemd → graceful)
+            erledigt += self._auswerten(laufend)
+            executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Worker beendet: {erledigt} Jobs ausgeführt"))
+
+    def _submit(self, executor, pool: str, job_id: int):
+        if pool == "process":
+            connections.close_all()
+        return executor.submit(fuehre_job_aus, job_id)
+
+    def _auswerten(self, futures) -> int:
+        anzahl = 0
+        for future in futures:
+            try:
+                future.result()
+                anzahl += 1
+            except Exception as e:  # fuehre_job_aus fängt Handler-Fehler selbst ab
+                logger.error(f"Worker-Fehler: {e}", exc_info=True)
+        return anzahl
+
+    def _beenden(self, signum, frame):
+        logger.info("Worker: Signal %s – beende nach laufenden Jobs", signum)
+        self._stop = True
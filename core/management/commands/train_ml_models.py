@@ -1,22 +1,63 @@
 """
 Management Command: Trainiert ML-Modelle für alle User
 
+Trainiert nur veraltete (User, Übung)-Paare – ohne Modell, mit neuen
+Arbeitssätzen seit dem letzten Training oder älter als 30 Tage
+(``MLTrainer.veraltete_paare``). Unveränderte Modelle werden übersprungen.
+
 Usage:
     python manage.py train_ml_models
     python manage.py train_ml_models --user-id 123
     python manage.py train_ml_models --min-samples 15
+    python manage.py train_ml_models --workers 4
+    python manage.py train_ml_models --force
 """
 
 import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
+from django.db import connections
 
 from ml_coach.ml_trainer import MLTrainer
 
 logger = logging.getLogger(__name__)
 
 
+def _trainiere_paar(user_id: int, uebung_id: int, n_jobs: int = -1) -> dict:
+    """Trainiert ein Paar; läuft im Pool-Worker oder seriell. Wirft nie."""
+    from core.models import Uebung
+
+    start = time.monotonic()
+    try:
+        user = User.objects.get(id=user_id)
+        uebung = Uebung.objects.get(id=uebung_id)
+        ml_model, metrics = MLTrainer(user, uebung, n_jobs=n_jobs).train_model()
+    except Exception as e:
+        logger.error(f"ML-Training User {user_id} / Übung {uebung_id}: {e}", exc_info=True)
+        return {"status": "fehler", "fehler": str(e)}
+
+    ergebnis = {
+        "username": user.username,
+        "uebung": uebung.bezeichnung,
+        "dauer": round(time.monotonic() - start, 2),
+    }
+    if ml_model is None:
+        return {**ergebnis, "status": "zu_wenig_daten", "fehler": metrics.get("error", "")}
+    return {**ergebnis, "status": "trainiert", **metrics}
+
+
+def _trainiere_paar_im_pool(user_id: int, uebung_id: int) -> dict:
+    """Pool-Variante: ein Core je Worker, keine DB-Verbindung zwischen Paaren offen."""
+    try:
+        return _trainiere_paar(user_id, uebung_id, n_jobs=1)
+    finally:
+        connections.close_all()
+
+
 class Command(BaseCommand):
     help = "Trainiert ML-Modelle für Gewichtsvorhersagen (scikit-learn, CPU-only)"
 
@@ -37,53 +78,91 @@ class Command(BaseCommand):
             action="store_true",
             help="Erzwingt Re-Training auch für aktuelle Modelle",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Parallele Trainings-Prozesse (default: 1 = seriell im Prozess)",
+        )
 
     def handle(self, *args, **options):
         user_id = options.get("user_id")
         min_samples = options.get("min_samples", 10)
         force = options.get("force", False)
+        workers = max(1, options.get("workers") or 1)
 
         self.stdout.write(self.style.SUCCESS("🤖 ML Training Service gestartet"))
         self.stdout.write(f"Minimale Samples: {min_samples}")
 
+        user_ids = None
         if user_id:
-            # Einzelner User
-            try:
-                user = User.objects.get(id=user_id)
-                self.train_user_models(user, min_samples, force)
-            except User.DoesNotExist:
+            if not User.objects.filter(id=user_id).exists():
                 self.stdout.write(self.style.ERROR(f"User {user_id} nicht gefunden"))
-        else:
-            # Alle User
-            users = User.objects.filter(is_active=True)
-            self.stdout.write(f"Trainiere Modelle für {users.count()} User...\n")
-
-            for user in users:
-                self.train_user_models(user, min_samples, force)
-
-        self.stdout.write(self.style.SUCCESS("\n✅ Training abgeschlossen!"))
+                return
+            user_ids = [user_id]
 
-    def train_user_models(self, user, min_samples, force):
-        """Trainiert alle Modelle für einen User"""
-        self.stdout.write(f"\n👤 User: {user.username} (ID: {user.id})")
+        start = time.monotonic()
+        paare, aktuell = MLTrainer.veraltete_paare(
+            user_ids=user_ids, min_samples=min_samples, force=force
+        )
+        self.stdout.write(
+            f"{len(paare)} veraltete Modelle, {aktuell} aktuell (übersprungen)"
+            + (" – --force" if force else "")
+        )
 
-        results = MLTrainer.train_all_user_models(user, min_samples=min_samples)
+        zaehler = {"trainiert": 0, "zu_wenig_daten": 0, "fehler": 0}
+        for (uid, uebung_id, grund), ergebnis in self._trainiere(paare, workers):
+            zaehler[ergebnis["status"]] += 1
+            self._ausgabe(uid, uebung_id, grund, ergebnis)
+
+        dauer = time.monotonic() - start
+        durchsatz = zaehler["trainiert"] / dauer if dauer > 0 else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✅ Training abgeschlossen: {zaehler['trainiert']} trainiert, "
+                f"{aktuell} übersprungen (aktuell), "
+                f"{zaehler['zu_wenig_daten']} zu wenig Daten, "
+                f"{zaehler['fehler']} fehlgeschlagen – "
+                f"{dauer:.1f}s, {durchsatz:.2f} Modelle/s ({workers} Worker)"
+            )
+        )
 
-        if not results:
-            self.stdout.write(self.style.WARNING("  Keine Übungen mit genug Daten gefunden"))
+    def _trainiere(self, paare, workers):
+        """Liefert (paar, ergebnis) in Fertigstellungsreihenfolge."""
+        if workers == 1 or len(paare) < 2:
+            for paar in paare:
+                yield paar, _trainiere_paar(paar[0], paar[1])
             return
 
-        for uebung, metrics in results:
-            if metrics.get("created"):
+        # fork wie run_worker --pool process: Kinder erben das Django-Setup,
+        # offene DB-Verbindungen dürfen nicht geteilt werden.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            futures = {executor.submit(_trainiere_paar_im_pool, p[0], p[1]): p for p in paare}
+            for future in as_completed(futures):
+                try:
+                    ergebnis = future.result()
+                except Exception as e:  # Worker-Prozess abgestürzt
+                    ergebnis = {"status": "fehler", "fehler": str(e)}
+                yield futures[future], ergebnis
+
+    def _ausgabe(self, user_id, uebung_id, grund, ergebnis):
+        name = f"User {ergebnis.get('username', user_id)} / {ergebnis.get('uebung', uebung_id)}"
+        if ergebnis["status"] == "fehler":
+            self.stdout.write(self.style.ERROR(f"  ❌ {name}: {ergebnis['fehler']}"))
+        elif ergebnis["status"] == "zu_wenig_daten":
+            self.stdout.write(self.style.WARNING(f"  ⏭️  {name}: {ergebnis['fehler']}"))
+        else:
+            if ergebnis.get("created"):
                 status = self.style.SUCCESS("✨ NEU")
             else:
-                status = self.style.WARNING("🔄 AKTUALISIERT")
-
+                status = self.style.WARNING(f"🔄 AKTUALISIERT ({grund})")
             self.stdout.write(
-                f"  {status} {uebung.bezeichnung}: "
-                f'{metrics["samples"]} Samples, '
-                f'MAE={metrics["mae"]}kg, '
-                f'R²={metrics["r2_score"]}'
+                f"  {status} {name}: "
+                f'{ergebnis["samples"]} Samples, '
+                f'MAE={ergebnis["mae"]}kg, '
+                f'R²={ergebnis["r2_score"]}, '
+                f'{ergebnis["dauer"]}s'
             )
-
-        self.stdout.write(self.style.SUCCESS(f"  → {len(results)} Modelle trainiert"))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.15 on 2026-10-17 04:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0085_trainingspause_aerztliche_freigabe_noetig'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UebungTagesStatistik',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('saetze_anzahl', models.PositiveIntegerField(default=0, verbose_name='Arbeitssätze')),
+                ('bestes_1rm', models.FloatField(default=0.0, verbose_name='Bestes 1RM (roh)')),
+                ('max_gewicht', models.DecimalField(decimal_places=2, default=0, max_digits=6, verbose_name='Max. Gewicht (roh)')),
+                ('effektives_1rm', models.FloatField(default=0.0, verbose_name='Bestes 1RM (effektiv)')),
+                ('max_effektives_gewicht', models.FloatField(default=0.0, verbose_name='Max. effektives Gewicht')),
+                ('max_wdh_ohne_gewicht', models.PositiveIntegerField(blank=True, null=True, verbose_name='Max. Wdh ohne Zusatzgewicht')),
+                ('tonnage', models.FloatField(default=0.0, verbose_name='Tonnage (kg)')),
+                ('koerpergewicht', models.FloatField(blank=True, help_text='Nur bei KOERPERGEWICHT-Übungen gesetzt; Abweichung = Zeile neu berechnen', null=True, verbose_name='Verwendetes Körpergewicht')),
+                ('rpe_summe', models.FloatField(default=0.0, verbose_name='RPE-Summe')),
+                ('rpe_anzahl', models.PositiveIntegerField(default=0, verbose_name='Sätze mit RPE')),
+                ('aktualisiert_am', models.DateTimeField(auto_now=True)),
+                ('bester_satz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.satz', verbose_name='Satz mit bestem 1RM')),
+                ('einheit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uebung_statistiken', to='core.trainingseinheit')),
+                ('uebung', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tages_statistiken', to='core.uebung', verbose_name='Übung')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uebung_tages_statistiken', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Übungs-Tagesstatistik',
+                'verbose_name_plural': 'Übungs-Tagesstatistiken',
+                'indexes': [models.Index(fields=['user', 'uebung'], name='uebung_tagesstat_user_ueb_idx')],
+                'constraints': [models.UniqueConstraint(fields=('einheit', 'uebung'), name='uebung_tagesstatistik_einheit_uebung_uniq')],
+            },
+        ),
+    ]
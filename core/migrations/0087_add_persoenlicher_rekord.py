@@ -0,0 +1,98 @@
+# Generated by Django 5.2.15 on 2026-10-17 04:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0086_add_uebung_tages_statistik"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PersoenlicherRekord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("bestes_1rm", models.FloatField(default=0.0, verbose_name="Bestes 1RM")),
+                (
+                    "vorheriges_1rm",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Bestes 1RM aller übrigen Sätze (leer = nur ein Satz) – Vergleichswert des PR",
+                        null=True,
+                        verbose_name="Vorheriges 1RM",
+                    ),
+                ),
+                (
+                    "max_gewicht",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=6, verbose_name="Max. Gewicht"
+                    ),
+                ),
+                (
+                    "wdh_bei_max_gewicht",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Beste Wdh auf Max. Gewicht"
+                    ),
+                ),
+                ("aktualisiert_am", models.DateTimeField(auto_now=True)),
+                (
+                    "bester_satz",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="core.satz",
+                        verbose_name="Satz mit bestem 1RM",
+                    ),
+                ),
+                (
+                    "max_gewicht_satz",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="core.satz",
+                        verbose_name="Satz mit Max. Gewicht",
+                    ),
+                ),
+                (
+                    "uebung",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rekorde",
+                        to="core.uebung",
+                        verbose_name="Übung",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="persoenliche_rekorde",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Persönlicher Rekord",
+                "verbose_name_plural": "Persönliche Rekorde",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "uebung"), name="persoenlicher_rekord_user_uebung_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
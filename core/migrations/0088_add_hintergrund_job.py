@@ -0,0 +1,116 @@
+# Generated by Django 5.2.15 on 2026-10-17 04:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0087_add_persoenlicher_rekord"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HintergrundJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("typ", models.CharField(max_length=50, verbose_name="Job-Typ")),
+                ("parameter", models.JSONField(blank=True, default=dict, verbose_name="Parameter")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("WARTEND", "Wartend"),
+                            ("LAEUFT", "Läuft"),
+                            ("FERTIG", "Fertig"),
+                            ("FEHLER", "Fehlgeschlagen"),
+                        ],
+                        default="WARTEND",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "fortschritt",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="Fortschritt (%)"),
+                ),
+                (
+                    "schritt",
+                    models.CharField(
+                        blank=True, default="", max_length=200, verbose_name="Schritt"
+                    ),
+                ),
+                ("ergebnis", models.JSONField(blank=True, null=True, verbose_name="Ergebnis")),
+                ("fehler", models.TextField(blank=True, default="", verbose_name="Fehlermeldung")),
+                ("versuche", models.PositiveSmallIntegerField(default=0, verbose_name="Versuche")),
+                (
+                    "max_versuche",
+                    models.PositiveSmallIntegerField(default=3, verbose_name="Max. Versuche"),
+                ),
+                (
+                    "ausfuehren_ab",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Frühester Startzeitpunkt (Retry-Backoff)",
+                        verbose_name="Ausführen ab",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.CharField(blank=True, default="", max_length=100, verbose_name="Worker"),
+                ),
+                (
+                    "erstellt_am",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Erstellt"
+                    ),
+                ),
+                (
+                    "gestartet_am",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Gestartet"),
+                ),
+                (
+                    "aktualisiert_am",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="Heartbeat – hängende Jobs werden daran erkannt",
+                        verbose_name="Aktualisiert",
+                    ),
+                ),
+                ("beendet_am", models.DateTimeField(blank=True, null=True, verbose_name="Beendet")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="hintergrund_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Hintergrund-Job",
+                "verbose_name_plural": "Hintergrund-Jobs",
+                "ordering": ["-erstellt_am"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "ausfuehren_ab"], name="core_hinter_status_6a18b0_idx"
+                    ),
+                    models.Index(
+                        fields=["user", "erstellt_am"], name="core_hinter_user_id_e6aaf7_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.15 on 2026-10-17 05:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0088_add_hintergrund_job"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncSchluessel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "schluessel",
+                    models.CharField(max_length=64, verbose_name="Idempotenz-Schlüssel"),
+                ),
+                ("ergebnis", models.JSONField(default=dict, verbose_name="Ergebnis")),
+                ("erstellt_am", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sync_schluessel",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sync-Schlüssel",
+                "verbose_name_plural": "Sync-Schlüssel",
+                "indexes": [
+                    models.Index(fields=["user", "erstellt_am"], name="sync_schluessel_alter_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "schluessel"), name="sync_schluessel_user_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.15 on 2026-10-17 06:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0089_add_sync_schluessel"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mlpredictionmodel",
+            name="arbeitssaetze",
+            field=models.PositiveIntegerField(default=0, verbose_name="Arbeitssätze beim Training"),
+        ),
+        migrations.AddField(
+            model_name="mlpredictionmodel",
+            name="letzter_satz_id",
+            field=models.PositiveBigIntegerField(
+                blank=True, null=True, verbose_name="Letzter Arbeitssatz (ID) beim Training"
+            ),
+        ),
+    ]
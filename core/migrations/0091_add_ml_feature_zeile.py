@@ -0,0 +1,93 @@
+# Generated by Django 5.2.15 on 2026-10-17 06:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0090_add_ml_datenstand"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MLFeatureZeile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "gewicht",
+                    models.FloatField(
+                        help_text="Zielwert des Vorgängers", verbose_name="Gewicht (roh)"
+                    ),
+                ),
+                ("effektives_gewicht", models.FloatField(verbose_name="Effektives Gewicht")),
+                ("wiederholungen", models.PositiveIntegerField(default=0)),
+                ("rpe", models.FloatField(blank=True, null=True, verbose_name="RPE")),
+                (
+                    "satz_nummer",
+                    models.PositiveIntegerField(
+                        default=1,
+                        help_text="Position in der Einheit (inkl. Aufwärmen)",
+                        verbose_name="Satz-Nummer",
+                    ),
+                ),
+                (
+                    "koerpergewicht",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Nur bei KOERPERGEWICHT-Übungen gesetzt; Abweichung = Zeilen neu berechnen",
+                        null=True,
+                        verbose_name="Verwendetes Körpergewicht",
+                    ),
+                ),
+                (
+                    "einheit",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ml_feature_zeilen",
+                        to="core.trainingseinheit",
+                    ),
+                ),
+                (
+                    "satz",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ml_features",
+                        to="core.satz",
+                    ),
+                ),
+                (
+                    "uebung",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ml_feature_zeilen",
+                        to="core.uebung",
+                        verbose_name="Übung",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ml_feature_zeilen",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "ML-Feature-Zeile",
+                "verbose_name_plural": "ML-Feature-Zeilen",
+                "indexes": [
+                    models.Index(fields=["user", "uebung"], name="ml_feature_user_uebung_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.15 on 2026-10-17 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0091_add_ml_feature_zeile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="kiapilog",
+            name="cached",
+            field=models.BooleanField(
+                default=False,
+                help_text="True wenn die Antwort aus dem LLM-Response-Cache kam (0€, keine Tokens)",
+                verbose_name="Cache-Treffer",
+            ),
+        ),
+    ]
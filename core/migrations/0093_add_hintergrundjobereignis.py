@@ -0,0 +1,56 @@
+# Generated by Django 5.2.15 on 2026-10-17 06:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0092_add_kiapilog_cached"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HintergrundJobEreignis",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "fortschritt",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="Fortschritt (%)"),
+                ),
+                (
+                    "schritt",
+                    models.CharField(
+                        blank=True, default="", max_length=200, verbose_name="Schritt"
+                    ),
+                ),
+                (
+                    "erstellt_am",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Erstellt"
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ereignisse",
+                        to="core.hintergrundjob",
+                        verbose_name="Job",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Job-Ereignis",
+                "verbose_name_plural": "Job-Ereignisse",
+                "ordering": ["id"],
+            },
+        ),
+    ]
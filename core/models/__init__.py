@@ -35,11 +35,14 @@ from .exercise import Equipment, Uebung, UebungTag  # noqa: F401
 # Feedback & Notifications
 from .feedback import Feedback, PushSubscription  # noqa: F401
 
+# Hintergrund-Jobs
+from .job import HintergrundJob, HintergrundJobEreignis  # noqa: F401
+
 # KI API Logging
 from .ki_log import KIApiLog  # noqa: F401
 
 # ML
-from .ml import MLPredictionModel  # noqa: F401
+from .ml import MLFeatureZeile, MLPredictionModel  # noqa: F401
 
 # Pause / Ausfallzeit
 from .pause import TrainingsPause  # noqa: F401
@@ -53,6 +56,12 @@ from .site_settings import SiteSettings  # noqa: F401
 # Social / Beta-Zugang
 from .social import InviteCode, WaitlistEntry  # noqa: F401
 
+# Materialisierte Statistik
+from .statistik import PersoenlicherRekord, UebungTagesStatistik  # noqa: F401
+
+# Offline-Sync
+from .sync import SyncSchluessel  # noqa: F401
+
 # Training
 from .training import Satz, Trainingsblock, Trainingseinheit  # noqa: F401
 
@@ -78,10 +87,14 @@ __all__ = [
     "CardioEinheit",
     "Equipment",
     "Feedback",
+    "HintergrundJob",
+    "HintergrundJobEreignis",
     "InviteCode",
     "KIApiLog",
     "KoerperWerte",
+    "MLFeatureZeile",
     "MLPredictionModel",
+    "PersoenlicherRekord",
     "Plan",
     "PlanUebung",
     "ProgressPhoto",
@@ -89,12 +102,14 @@ __all__ = [
     "Satz",
     "ScientificDisclaimer",
     "SiteSettings",
+    "SyncSchluessel",
     "Trainingsblock",
     "Trainingseinheit",
     "TrainingsPause",
     "TrainingSource",
     "Uebung",
     "UebungTag",
+    "UebungTagesStatistik",
     "UserProfile",
     "WaitlistEntry",
 ]
@@ -0,0 +1,101 @@
+"""HintergrundJob – DB-gestützte Job-Queue für schwere Arbeit außerhalb des Requests."""
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+class HintergrundJob(models.Model):
+    """
+    Ein Eintrag pro eingereihter Hintergrund-Aufgabe (Plan-Generierung,
+    ML-Training, PDF-Report, Push-Versand).
+
+    Abgearbeitet von ``manage.py run_worker``; der Client pollt den Status
+    über ``/api/jobs/<id>/``. Kein Redis/Celery – die Tabelle ist die Queue.
+    """
+
+    STATUS_CHOICES = [
+        ("WARTEND", "Wartend"),
+        ("LAEUFT", "Läuft"),
+        ("FERTIG", "Fertig"),
+        ("FEHLER", "Fehlgeschlagen"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="hintergrund_jobs",
+        verbose_name="User",
+    )
+    typ = models.CharField(max_length=50, verbose_name="Job-Typ")
+    parameter = models.JSONField(default=dict, blank=True, verbose_name="Parameter")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default="WARTEND", verbose_name="Status"
+    )
+    fortschritt = models.PositiveSmallIntegerField(default=0, verbose_name="Fortschritt (%)")
+    schritt = models.CharField(max_length=200, blank=True, default="", verbose_name="Schritt")
+    ergebnis = models.JSONField(null=True, blank=True, verbose_name="Ergebnis")
+    fehler = models.TextField(blank=True, default="", verbose_name="Fehlermeldung")
+    versuche = models.PositiveSmallIntegerField(default=0, verbose_name="Versuche")
+    max_versuche = models.PositiveSmallIntegerField(default=3, verbose_name="Max. Versuche")
+    ausfuehren_ab = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Ausführen ab",
+        help_text="Frühester Startzeitpunkt (Retry-Backoff)",
+    )
+    worker = models.CharField(max_length=100, blank=True, default="", verbose_name="Worker")
+    erstellt_am = models.DateTimeField(default=timezone.now, verbose_name="Erstellt")
+    gestartet_am = models.DateTimeField(null=True, blank=True, verbose_name="Gestartet")
+    aktualisiert_am = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Aktualisiert",
+        help_text="Heartbeat – hängende Jobs werden daran erkannt",
+    )
+    beendet_am = models.DateTimeField(null=True, blank=True, verbose_name="Beendet")
+
+    class Meta:
+        verbose_name = "Hintergrund-Job"
+        verbose_name_plural = "Hintergrund-Jobs"
+        ordering = ["-erstellt_am"]
+        indexes = [
+            models.Index(fields=["status", "ausfuehren_ab"]),
+            models.Index(fields=["user", "erstellt_am"]),
+        ]
+
+    def __str__(self):
+        user_str = self.user.username if self.user else "system"
+        return f"#{self.pk} {self.typ} ({user_str}) – {self.get_status_display()}"
+
+    @property
+    def ist_abgeschlossen(self) -> bool:
+        return self.status in ("FERTIG", "FEHLER")
+
+
+class HintergrundJobEreignis(models.Model):
+    """
+    Fortschritts-Verlauf eines Jobs (ein Eintrag pro gemeldetem Schritt).
+
+    Der Plan-Stream (SSE) sendet die Einträge mit ``id: <job>:<ereignis>``;
+    ein neu verbundener Browser schickt die letzte ID als ``Last-Event-ID``
+    und bekommt nur die fehlenden Ereignisse nachgeliefert.
+    """
+
+    job = models.ForeignKey(
+        HintergrundJob,
+        on_delete=models.CASCADE,
+        related_name="ereignisse",
+        verbose_name="Job",
+    )
+    fortschritt = models.PositiveSmallIntegerField(default=0, verbose_name="Fortschritt (%)")
+    schritt = models.CharField(max_length=200, blank=True, default="", verbose_name="Schritt")
+    erstellt_am = models.DateTimeField(default=timezone.now, verbose_name="Erstellt")
+
+    class Meta:
+        verbose_name = "Job-Ereignis"
+        verbose_name_plural = "Job-Ereignisse"
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"#{self.job_id}: {self.fortschritt}% {self.schritt}"
@@ -67,6 +67,11 @@ class KIApiLog(models.Model):
         verbose_name="Retry",
         help_text="True wenn dieser Call ein Korrektur-Retry eines vorherigen Calls war",
     )
+    cached = models.BooleanField(
+        default=False,
+        verbose_name="Cache-Treffer",
+        help_text="True wenn die Antwort aus dem LLM-Response-Cache kam (0€, keine Tokens)",
+    )
     error_message = models.TextField(
         blank=True,
         default="",
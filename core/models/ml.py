@@ -1,9 +1,10 @@
-"""ML-Prediction Models: MLPredictionModel."""
+"""ML-Prediction Models: MLPredictionModel, MLFeatureZeile."""
 
 from django.contrib.auth.models import User
 from django.db import models
 
 from .exercise import Uebung
+from .training import Satz, Trainingseinheit
 
 
 class MLPredictionModel(models.Model):
@@ -39,6 +40,13 @@ class MLPredictionModel(models.Model):
     )
     hyperparameters = models.JSONField(default=dict, blank=True, verbose_name="ML Hyperparameter")
     feature_stats = models.JSONField(default=dict, blank=True, verbose_name="Feature-Statistiken")
+    # Datenstand beim Training: neue (höhere ID) oder gelöschte Arbeitssätze → veraltet
+    letzter_satz_id = models.PositiveBigIntegerField(
+        null=True, blank=True, verbose_name="Letzter Arbeitssatz (ID) beim Training"
+    )
+    arbeitssaetze = models.PositiveIntegerField(
+        default=0, verbose_name="Arbeitssätze beim Training"
+    )
 
     def __str__(self):
         if self.uebung:
@@ -57,6 +65,17 @@ class MLPredictionModel(models.Model):
 
         return timezone.now() - self.trained_at > timedelta(days=30)
 
+    def hat_neue_daten(self, anzahl: int, letzter_satz_id: int | None) -> bool:
+        """Prüft, ob sich die Arbeitssätze seit dem Training geändert haben.
+
+        Satz-IDs sind monoton – eine höhere ID heißt "seit ``trained_at``
+        hinzugekommen", auch bei rückdatierten Importen. Die Anzahl erkennt
+        gelöschte Sätze. Modelle ohne gespeicherten Datenstand gelten als veraltet.
+        """
+        if self.letzter_satz_id is None:
+            return True
+        return letzter_satz_id != self.letzter_satz_id or anzahl != self.arbeitssaetze
+
     class Meta:
         verbose_name = "ML Prediction Model"
         verbose_name_plural = "ML Prediction Models"
@@ -66,3 +85,50 @@ class MLPredictionModel(models.Model):
             models.Index(fields=["user", "model_type", "status"]),
             models.Index(fields=["user", "uebung", "status"]),
         ]
+
+
+class MLFeatureZeile(models.Model):
+    """Feature-Store: vorberechnete ML-Features eines Arbeitssatzes.
+
+    Eine Zeile je Arbeitssatz mit den Werten, die ``MLTrainer.get_training_data``
+    bisher bei jedem Training pro Satz neu berechnet hat. Gepflegt je
+    (Trainingseinheit, Übung) über ``core/services/ml_features.py`` (Satz-Signale,
+    Bulk-Importe); Backfill/Rebuild per ``manage.py rebuild_ml_features``.
+
+    Wie bei ``UebungTagesStatistik`` wird das Datum nicht kopiert, sondern beim
+    Lesen über ``einheit__datum`` gejoint – ``days_since_last`` entsteht erst
+    beim Lesen aus der Reihenfolge.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ml_feature_zeilen")
+    uebung = models.ForeignKey(
+        Uebung, on_delete=models.CASCADE, related_name="ml_feature_zeilen", verbose_name="Übung"
+    )
+    einheit = models.ForeignKey(
+        Trainingseinheit, on_delete=models.CASCADE, related_name="ml_feature_zeilen"
+    )
+    satz = models.OneToOneField(Satz, on_delete=models.CASCADE, related_name="ml_features")
+
+    gewicht = models.FloatField(verbose_name="Gewicht (roh)", help_text="Zielwert des Vorgängers")
+    effektives_gewicht = models.FloatField(verbose_name="Effektives Gewicht")
+    wiederholungen = models.PositiveIntegerField(default=0)
+    rpe = models.FloatField(null=True, blank=True, verbose_name="RPE")
+    satz_nummer = models.PositiveIntegerField(
+        default=1, verbose_name="Satz-Nummer", help_text="Position in der Einheit (inkl. Aufwärmen)"
+    )
+    koerpergewicht = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Verwendetes Körpergewicht",
+        help_text="Nur bei KOERPERGEWICHT-Übungen gesetzt; Abweichung = Zeilen neu berechnen",
+    )
+
+    class Meta:
+        verbose_name = "ML-Feature-Zeile"
+        verbose_name_plural = "ML-Feature-Zeilen"
+        indexes = [
+            models.Index(fields=["user", "uebung"], name="ml_feature_user_uebung_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} – {self.uebung_id}: Satz {self.satz_id}"
@@ -0,0 +1,157 @@
+"""Materialisierte Übungs-Statistik: UebungTagesStatistik, PersoenlicherRekord.
+
+Eine Zeile je (Trainingseinheit, Übung) mit den Kennzahlen, die Stats-Seite,
+Dashboard-Kacheln, PDF und Saleria-API bisher bei jedem Aufruf aus ALLEN
+Sätzen neu berechnet haben (bestes 1RM, Max-Gewicht, Tonnage, RPE …).
+
+Wichtig:
+- Nur Arbeitssätze (``ist_aufwaermsatz=False``) fließen ein.
+- Datum, Deload- und Abschluss-Flag werden NICHT kopiert, sondern beim Lesen
+  über ``einheit__…`` gejoint. Ein ``Trainingseinheit.objects.update(datum=…)``
+  (Hevy-Import, Tests) macht die Zeilen damit nicht stale.
+- Gepflegt wird die Tabelle in ``core/signals.py`` (Satz save/delete) über
+  ``core/services/uebung_statistik.py``; Backfill/Rebuild per
+  ``python manage.py rebuild_uebung_statistik``.
+
+``PersoenlicherRekord`` hält je (User, Übung) die aktuellen Bestwerte für die
+PR-Erkennung beim Loggen (``add_set``) – gepflegt über
+``core/services/persoenliche_rekorde.py``.
+"""
+
+from django.contrib.auth.models import User
+from django.db import models
+
+from .exercise import Uebung
+from .training import Satz, Trainingseinheit
+
+
+class UebungTagesStatistik(models.Model):
+    """Aggregat der Arbeitssätze einer Übung innerhalb einer Trainingseinheit."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="uebung_tages_statistiken"
+    )
+    einheit = models.ForeignKey(
+        Trainingseinheit, on_delete=models.CASCADE, related_name="uebung_statistiken"
+    )
+    uebung = models.ForeignKey(
+        Uebung, on_delete=models.CASCADE, related_name="tages_statistiken", verbose_name="Übung"
+    )
+    saetze_anzahl = models.PositiveIntegerField(default=0, verbose_name="Arbeitssätze")
+
+    # Roh-Epley (gewicht × (1 + wdh/30), 0 Wdh zählt als 1) – Basis für
+    # Kraftstandards, Plateau-Fallback und Saleria-PRs.
+    bestes_1rm = models.FloatField(default=0.0, verbose_name="Bestes 1RM (roh)")
+    bester_satz = models.ForeignKey(
+        Satz,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Satz mit bestem 1RM",
+    )
+    max_gewicht = models.DecimalField(
+        max_digits=6, decimal_places=2, default=0, verbose_name="Max. Gewicht (roh)"
+    )
+
+    # Effektive Werte nach ``_compute_1rm_and_weight`` (PRO_SEITE ×2,
+    # KOERPERGEWICHT mit historischem Körpergewicht, ZEIT = Wdh).
+    effektives_1rm = models.FloatField(default=0.0, verbose_name="Bestes 1RM (effektiv)")
+    max_effektives_gewicht = models.FloatField(default=0.0, verbose_name="Max. effektives Gewicht")
+    max_wdh_ohne_gewicht = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Max. Wdh ohne Zusatzgewicht"
+    )
+    tonnage = models.FloatField(default=0.0, verbose_name="Tonnage (kg)")
+    koerpergewicht = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Verwendetes Körpergewicht",
+        help_text="Nur bei KOERPERGEWICHT-Übungen gesetzt; Abweichung = Zeile neu berechnen",
+    )
+
+    rpe_summe = models.FloatField(default=0.0, verbose_name="RPE-Summe")
+    rpe_anzahl = models.PositiveIntegerField(default=0, verbose_name="Sätze mit RPE")
+
+    aktualisiert_am = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Übungs-Tagesstatistik"
+        verbose_name_plural = "Übungs-Tagesstatistiken"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["einheit", "uebung"], name="uebung_tagesstatistik_einheit_uebung_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "uebung"], name="uebung_tagesstat_user_ueb_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.einheit_id} – {self.uebung_id}: {self.saetze_anzahl} Sätze"
+
+    @property
+    def avg_rpe(self) -> float | None:
+        """Durchschnittliche RPE der Arbeitssätze (None ohne RPE-Angaben)."""
+        if not self.rpe_anzahl:
+            return None
+        return self.rpe_summe / self.rpe_anzahl
+
+
+class PersoenlicherRekord(models.Model):
+    """Aktuelle Bestwerte eines Users für eine Übung (PR-Erkennung in ``add_set``).
+
+    Es zählen Arbeitssätze aus Nicht-Deload-Einheiten. Das 1RM folgt der
+    bisherigen PR-Regel: Epley auf dem eingetragenen Gewicht, bei
+    KOERPERGEWICHT-Übungen auf dem effektiven Gewicht mit dem Körpergewicht
+    vom Trainingstag.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="persoenliche_rekorde")
+    uebung = models.ForeignKey(
+        Uebung, on_delete=models.CASCADE, related_name="rekorde", verbose_name="Übung"
+    )
+
+    bestes_1rm = models.FloatField(default=0.0, verbose_name="Bestes 1RM")
+    bester_satz = models.ForeignKey(
+        Satz,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Satz mit bestem 1RM",
+    )
+    vorheriges_1rm = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="Vorheriges 1RM",
+        help_text="Bestes 1RM aller übrigen Sätze (leer = nur ein Satz) – Vergleichswert des PR",
+    )
+
+    max_gewicht = models.DecimalField(
+        max_digits=6, decimal_places=2, default=0, verbose_name="Max. Gewicht"
+    )
+    wdh_bei_max_gewicht = models.PositiveIntegerField(
+        default=0, verbose_name="Beste Wdh auf Max. Gewicht"
+    )
+    max_gewicht_satz = models.ForeignKey(
+        Satz,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Satz mit Max. Gewicht",
+    )
+
+    aktualisiert_am = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Persönlicher Rekord"
+        verbose_name_plural = "Persönliche Rekorde"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "uebung"], name="persoenlicher_rekord_user_uebung_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} – {self.uebung_id}: {self.bestes_1rm:.1f} kg (1RM)"
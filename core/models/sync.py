@@ -0,0 +1,32 @@
+"""SyncSchluessel – Idempotenz-Schlüssel für den Offline-Sync (v2)."""
+
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class SyncSchluessel(models.Model):
+    """
+    Ein Eintrag je erfolgreich verarbeitetem Offline-Item mit Client-Schlüssel.
+
+    Bricht die Verbindung nach dem Commit ab (Gym-WLAN), schickt
+    ``offline-manager.js`` denselben Batch erneut – Items mit bekanntem
+    Schlüssel liefern dann das gespeicherte Ergebnis statt eines doppelten Satzes.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="sync_schluessel", verbose_name="User"
+    )
+    schluessel = models.CharField(max_length=64, verbose_name="Idempotenz-Schlüssel")
+    ergebnis = models.JSONField(default=dict, verbose_name="Ergebnis")
+    erstellt_am = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Sync-Schlüssel"
+        verbose_name_plural = "Sync-Schlüssel"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "schluessel"], name="sync_schluessel_user_uniq")
+        ]
+        indexes = [models.Index(fields=["user", "erstellt_am"], name="sync_schluessel_alter_idx")]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.schluessel}"
@@ -0,0 +1,122 @@
+"""Dashboard-Cache (``dashboard_computed_<user>_…``) mit Single-Flight und Vorwärmen.
+
+Der Key enthält die Daten-Versionen aller Domänen, aus denen der Block
+berechnet wird (``core/services/daten_version.py``), und das Datum – Streak und
+Wochenwerte hängen auch vom Tag ab. Eine Datenänderung erzeugt so einen neuen
+Key; explizites Löschen ist nicht nötig und der TTL kann lang sein.
+
+Bisher hat ``signals.py`` den berechneten Dashboard-Block nur gelöscht – der
+erste Dashboard-Aufruf nach dem Training (genau dann, wenn User ihn öffnen)
+hat die volle Neuberechnung bezahlt.
+
+- ``hole_oder_berechne(user_id, berechne)`` – Cache-Hit oder Neuberechnung.
+  Single-Flight: Nur EIN Aufrufer je User rechnet (Lock per ``cache.add``);
+  parallele Requests warten bis ``WARTEN_MAX_SEKUNDEN`` auf dessen Ergebnis
+  und rechnen erst danach selbst (Lock-Halter abgestürzt/zu langsam).
+- ``aufwaermen_einreihen(user_id)`` – reiht nach dem Commit einen
+  ``dashboard_aufwaermen``-Job ein (``finish_training``, Pausen-CRUD). Ein
+  bereits wartender Job desselben Users wird wiederverwendet.
+- ``aufwaermen(user_id)`` – Job-Handler: berechnet den Block und schreibt ihn
+  in den Cache, sodass der nächste Dashboard-Aufruf ein Cache-Hit ist.
+"""
+
+import logging
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.services.daten_version import versionierter_key
+
+logger = logging.getLogger(__name__)
+
+# Versionierter Key → kein veralteter Stand; der TTL begrenzt nur den Speicher.
+DASHBOARD_CACHE_TTL = 6 * 3600
+# Domänen, aus denen _compute_dashboard_block rechnet (Blöcke: "plaene")
+DASHBOARD_DOMAENEN = ("saetze", "einheiten", "koerper", "pausen", "plaene")
+# Lock-Lebensdauer: länger als die langsamste Berechnung, kürzer als ein Ausfall.
+LOCK_TTL_SEKUNDEN = 60
+WARTEN_MAX_SEKUNDEN = 5.0
+WARTEN_INTERVALL_SEKUNDEN = 0.05
+
+
+def dashboard_cache_key(user_id: int, heute=None) -> str:
+    tag = (heute or timezone.now()).strftime("%Y%m%d")
+    return f"{versionierter_key('dashboard_computed', user_id, *DASHBOARD_DOMAENEN)}_{tag}"
+
+
+def _lock_key(user_id: int) -> str:
+    return f"dashboard_computed_lock_{user_id}"
+
+
+def _berechne_mit_lock(user_id: int, key: str, berechne, token: str) -> dict:
+    try:
+        computed = berechne()
+        cache.set(key, computed, timeout=DASHBOARD_CACHE_TTL)
+        return computed
+    finally:
+        # Nur den eigenen Lock freigeben (nach Ablauf kann ein anderer ihn halten)
+        if cache.get(_lock_key(user_id)) == token:
+            cache.delete(_lock_key(user_id))
+
+
+def hole_oder_berechne(user_id: int, berechne, heute=None) -> dict:
+    """Berechneter Dashboard-Block aus dem Cache, sonst genau eine Berechnung je User.
+
+    Der Key wird VOR der Berechnung bestimmt: Ändern sich die Daten währenddessen,
+    landet das Ergebnis unter dem alten Key und wird nie mehr gelesen.
+    """
+    key = dashboard_cache_key(user_id, heute)
+    computed = cache.get(key)
+    if computed is not None:
+        return computed
+
+    token = uuid.uuid4().hex
+    if cache.add(_lock_key(user_id), token, timeout=LOCK_TTL_SEKUNDEN):
+        return _berechne_mit_lock(user_id, key, berechne, token)
+
+    # Ein anderer Request/Worker rechnet gerade → auf sein Ergebnis warten
+    deadline = time.monotonic() + WARTEN_MAX_SEKUNDEN
+    while time.monotonic() < deadline:
+        time.sleep(WARTEN_INTERVALL_SEKUNDEN)
+        computed = cache.get(key)
+        if computed is not None:
+            return computed
+        if cache.add(_lock_key(user_id), token, timeout=LOCK_TTL_SEKUNDEN):
+            return _berechne_mit_lock(user_id, key, berechne, token)
+
+    logger.warning("Dashboard-Single-Flight: Wartezeit für User %s überschritten", user_id)
+    return berechne()
+
+
+def aufwaermen(user_id: int) -> bool:
+    """Berechnet den Block und schreibt ihn unter dem aktuellen Key in den Cache.
+
+    Ist der aktuelle Key schon befüllt (ein Request war schneller), entfällt die
+    Berechnung. Gibt False zurück, wenn nichts berechnet wurde.
+    """
+    from django.contrib.auth.models import User
+
+    from core.views.training_stats import _compute_dashboard_block
+
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return False
+    heute = timezone.now()
+    key = dashboard_cache_key(user_id, heute)
+    if cache.get(key) is not None:
+        return False
+    token = uuid.uuid4().hex
+    # Lock nur, damit parallel wartende Requests das Job-Ergebnis übernehmen
+    cache.add(_lock_key(user_id), token, timeout=LOCK_TTL_SEKUNDEN)
+    _berechne_mit_lock(user_id, key, lambda: _compute_dashboard_block(user, heute), token)
+    return True
+
+
+def aufwaermen_einreihen(user_id: int) -> None:
+    """Reiht das Vorwärmen nach dem Commit ein (die Berechnung soll die neuen Daten sehen)."""
+    from core.services.hintergrund_jobs import enqueue_einmalig
+
+    transaction.on_commit(lambda: enqueue_einmalig("dashboard_aufwaermen", user=user_id))
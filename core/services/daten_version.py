@@ -0,0 +1,102 @@
+"""Daten-Versionen je User und Domäne für versionierte Cache-Keys.
+
+Statt bei jeder Änderung alle abhängigen Cache-Keys aufzuzählen und zu löschen
+(was nur für ``Trainingseinheit``/``TrainingsPause`` passierte – Sätze und
+Körperwerte blieben bis zum TTL veraltet), hält der Cache je (User, Domäne)
+einen Zähler. Cache-Keys enthalten die Versionen der Domänen, von denen sie
+abhängen; eine Änderung erhöht nur den Zähler (O(1)), alte Einträge werden nie
+mehr gelesen und laufen über ihren TTL aus.
+
+Domänen und ihre Auslöser (``core/signals.py``):
+
+- ``saetze`` – Satz angelegt/geändert/gelöscht
+- ``einheiten`` – Trainingseinheit angelegt/geändert/gelöscht
+- ``koerper`` – KoerperWerte
+- ``pausen`` – TrainingsPause
+- ``plaene`` – Plan, PlanUebung, Trainingsblock
+- ``equipment`` – verfügbares Equipment des Users
+- ``ml`` – trainierte ML-Modelle (MLPredictionModel)
+
+Queryset-``update()``/``bulk_create`` umgehen Signale – solche Schreibpfade
+rufen ``erhoehe`` selbst auf.
+
+Fehlt ein Zähler im Cache (neu oder verdrängt), wird er mit einem
+zeitbasierten Startwert angelegt – so entsteht nie wieder ein Key, unter dem
+noch ein alter Eintrag liegen könnte.
+"""
+
+import time
+
+from django.core.cache import cache
+
+DOMAENEN = ("saetze", "einheiten", "koerper", "pausen", "plaene", "equipment", "ml")
+
+# Kürzel im Cache-Key (kurz halten: Memcached/FileBased-Keys)
+_KUERZEL = {
+    "saetze": "s",
+    "einheiten": "e",
+    "koerper": "k",
+    "pausen": "p",
+    "plaene": "pl",
+    "equipment": "eq",
+    "ml": "ml",
+}
+
+
+def _key(user_id: int, domaene: str) -> str:
+    if domaene not in _KUERZEL:
+        raise ValueError(f"Unbekannte Daten-Domäne: {domaene}")
+    return f"datenversion_{user_id}_{domaene}"
+
+
+def _startwert() -> int:
+    return time.time_ns() // 1000
+
+
+def versionen(user_id: int, *domaenen: str) -> dict[str, int]:
+    """Aktuelle Versionen (ein ``get_many``; fehlende Zähler werden angelegt)."""
+    keys = {d: _key(user_id, d) for d in domaenen}
+    vorhanden = cache.get_many(keys.values())
+    result = {}
+    for domaene, key in keys.items():
+        wert = vorhanden.get(key)
+        if wert is None:
+            start = _startwert()
+            wert = start if cache.add(key, start, timeout=None) else cache.get(key, start)
+        result[domaene] = wert
+    return result
+
+
+def erhoehe(user_id: int | None, *domaenen: str) -> None:
+    """Invalidiert alle Cache-Einträge des Users, die von ``domaenen`` abhängen."""
+    if not user_id:
+        return
+    for domaene in domaenen:
+        key = _key(user_id, domaene)
+        try:
+            cache.incr(key)
+        except ValueError:  # Zähler fehlt → neu anlegen (neuer Namensraum)
+            cache.set(key, _startwert(), timeout=None)
+
+
+def versionierter_key(praefix: str, user_id: int, *domaenen: str) -> str:
+    """``<praefix>_<user>_<kürzel><version>…`` – ändert sich bei jeder Datenänderung."""
+    v = versionen(user_id, *domaenen)
+    teile = "_".join(f"{_KUERZEL[d]}{v[d]}" for d in domaenen)
+    return f"{praefix}_{user_id}_{teile}"
+
+
+def gecacht(praefix: str, user_id: int, domaenen, berechne, timeout: int, zusatz: str = ""):
+    """Ergebnis von ``berechne()`` unter dem versionierten Key (``zusatz`` z.B. Datum).
+
+    Auch ``None``-Ergebnisse werden gecacht (als 1-Tupel gespeichert).
+    """
+    key = versionierter_key(praefix, user_id, *domaenen)
+    if zusatz:
+        key = f"{key}_{zusatz}"
+    treffer = cache.get(key)
+    if treffer is not None:
+        return treffer[0]
+    wert = berechne()
+    cache.set(key, (wert,), timeout=timeout)
+    return wert
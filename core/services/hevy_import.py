@@ -0,0 +1,348 @@
+"""Import von Hevy-CSV-Exporten (Trainings + Sätze) in Batches.
+
+Bisher hat ``import_hevy_csv`` die ganze Datei als String gelesen, jede Übung
+pro Zeile nachgeschlagen und jede Einheit/jeden Satz einzeln angelegt – bei
+mehrjährigen Exporten mehrere Minuten (Gunicorn-Timeout). Ablauf jetzt:
+
+1. ``_lese_zeilen`` – CSV zeilenweise parsen, je Workout (title, start_time)
+   kompakte Satz-Tupel sammeln; ungültige Werte als Zeilen-Fehler melden.
+2. ``_loese_uebungen`` – alle Übungsnamen in EINEM Query auflösen (global vor
+   eigenen Custom-Übungen, case-insensitiv), fehlende per ``bulk_create``.
+3. ``_schreibe`` – Einheiten und Sätze per ``bulk_create`` in Batches, alles in
+   einer Transaktion. Dubletten (±5 min) werden gegen einen einzigen Query
+   der vorhandenen Einheiten geprüft.
+
+``bulk_create`` umgeht die Signale – PR-Tabelle, Übungs-Statistik und
+Daten-Versionen werden danach für die importierten Daten nachgezogen.
+
+Vorschau (``dry_run``) läuft durch dieselbe Pipeline, nur ohne Schritt 3.
+"""
+
+import csv
+import io
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Lower
+from django.utils.timezone import is_aware, make_aware
+
+from core.models import Satz, Trainingseinheit, Uebung
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_HEVY_COLS = {"title", "start_time", "exercise_title", "set_type", "weight_kg", "reps"}
+# Datensätze je INSERT (SQLite-Parameterlimit, MariaDB max_allowed_packet)
+BATCH_SIZE = 500
+# Workouts innerhalb dieses Abstands gelten als bereits importiert
+DUBLETTEN_FENSTER = timedelta(minutes=5)
+# Höchstens so viele Zeilen-Fehler werden einzeln gemeldet
+MAX_FEHLERMELDUNGEN = 20
+
+
+class HevyImportFehler(Exception):
+    """Datei als Ganzes unbrauchbar (leer, Spalten fehlen, kein CSV)."""
+
+
+@dataclass
+class HevyImportErgebnis:
+    vorschau: list[dict] = field(default_factory=list)
+    fehler: list[str] = field(default_factory=list)
+    trainings: int = 0
+    saetze: int = 0
+    neue_uebungen: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Workout:
+    title: str
+    start_str: str
+    end_str: str
+    beschreibung: str
+    # (übungsname, satz_nr, gewicht, wdh, ist_warmup, rpe, notiz, superset_gruppe)
+    saetze: list[tuple] = field(default_factory=list)
+    # Zeilen je Übung (satz_nr zählt wie bisher auch übersprungene Zeilen)
+    zaehler: dict[str, int] = field(default_factory=dict)
+    zeilen: int = 0
+
+
+def _parse_hevy_datetime(raw: str) -> datetime | None:
+    """Parse Hevy datetime string. Hevy uses 'YYYY-MM-DD HH:MM:SS' or ISO."""
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
+        try:
+            dt = datetime.strptime(raw.strip(), fmt)
+        except ValueError:
+            continue
+        # Make datetime timezone-aware (use server default timezone)
+        return dt if is_aware(dt) else make_aware(dt)
+    return None
+
+
+def _parse_satz(row: dict, zeile: int, fehler: list[str]) -> tuple | None:
+    """(gewicht, wdh, ist_warmup, rpe, notiz, superset_gruppe) oder None (Zeile überspringen)."""
+    try:
+        gewicht = float(row.get("weight_kg") or 0)
+    except ValueError:
+        fehler.append(f"Zeile {zeile}: ungültiges Gewicht '{row['weight_kg']}' – 0 kg übernommen.")
+        gewicht = 0.0
+    try:
+        wdh = int(float(row.get("reps") or 0))
+    except ValueError:
+        fehler.append(f"Zeile {zeile}: ungültige Wiederholungen '{row['reps']}' – übersprungen.")
+        return None
+    if wdh == 0:
+        return None  # skip empty rows
+
+    set_type = (row.get("set_type") or "normal").strip().lower()
+    ist_warmup = set_type in ("warmup", "warm_up", "warm up")
+
+    rpe_raw = (row.get("rpe") or "").strip()
+    rpe = None
+    if rpe_raw:
+        try:
+            rpe_val = float(rpe_raw)
+            if 1.0 <= rpe_val <= 10.0:
+                rpe = rpe_val
+        except ValueError:
+            fehler.append(f"Zeile {zeile}: ungültiger RPE-Wert '{rpe_raw}' – ignoriert.")
+
+    superset_raw = (row.get("superset_id") or "").strip()
+    superset_gruppe = 0
+    if superset_raw.startswith("S") and superset_raw[1:].isdigit():
+        superset_gruppe = int(superset_raw[1:])
+
+    notiz = (row.get("exercise_notes") or "").strip() or None
+    return gewicht, wdh, ist_warmup, rpe, notiz, superset_gruppe
+
+
+def _lese_zeilen(datei, fehler: list[str]) -> dict[tuple, _Workout]:
+    """Liest die CSV zeilenweise (Upload wird nicht komplett in einen String geladen)."""
+    try:
+        text = io.TextIOWrapper(datei, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        spalten = reader.fieldnames
+    except Exception as exc:
+        raise HevyImportFehler(f"CSV konnte nicht gelesen werden: {exc}") from exc
+    if not spalten:
+        raise HevyImportFehler("Die CSV-Datei enthält keine Daten.")
+    missing = REQUIRED_HEVY_COLS - set(spalten)
+    if missing:
+        raise HevyImportFehler(f"Fehlende Spalten: {', '.join(sorted(missing))}")
+
+    workouts: dict[tuple, _Workout] = {}
+    try:
+        for zeile, row in enumerate(reader, start=2):  # Zeile 1 = Header
+            key = ((row["title"] or "").strip(), (row["start_time"] or "").strip())
+            workout = workouts.get(key)
+            if workout is None:
+                workout = workouts[key] = _Workout(
+                    title=key[0],
+                    start_str=key[1],
+                    end_str=(row.get("end_time") or "").strip(),
+                    beschreibung=(row.get("description") or "").strip(),
+                )
+            workout.zeilen += 1
+            ex_name = (row["exercise_title"] or "").strip()
+            if not ex_name:
+                continue
+            satz_nr = workout.zaehler[ex_name] = workout.zaehler.get(ex_name, 0) + 1
+            satz = _parse_satz(row, zeile, fehler)
+            if satz is not None:
+                workout.saetze.append((ex_name, satz_nr, *satz))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HevyImportFehler(f"CSV konnte nicht gelesen werden: {exc}") from exc
+    finally:
+        text.detach()  # Upload nicht mitschließen
+    if not workouts:
+        raise HevyImportFehler("Die CSV-Datei enthält keine Daten.")
+    return workouts
+
+
+def _loese_uebungen(namen: set[str], user, anlegen: bool) -> tuple[dict[str, Uebung], list[str]]:
+    """Name (lowercase) → Übung für alle Namen; fehlende als Custom-Übung per ``bulk_create``.
+
+    Vorrang wie bisher: globale Übung vor eigener Custom-Übung.
+    """
+    gesucht = {n.lower(): n for n in namen}
+    # SQLite-LOWER() kennt nur ASCII → zusätzlich exakte Namen; Zuordnung in Python
+    kandidaten = (
+        Uebung.objects.annotate(name_lower=Lower("bezeichnung"))
+        .filter(Q(name_lower__in=list(gesucht)) | Q(bezeichnung__in=list(namen)))
+        .filter(Q(created_by__isnull=True) | Q(created_by=user))
+        .order_by(F("created_by").asc(nulls_first=True), "id")  # global zuerst
+    )
+    gefunden: dict[str, Uebung] = {}
+    for uebung in kandidaten:
+        gefunden.setdefault(uebung.bezeichnung.lower(), uebung)
+
+    fehlend = sorted(n for low, n in gesucht.items() if low not in gefunden)
+    if fehlend and anlegen:
+        neu = Uebung.objects.bulk_create(
+            [
+                Uebung(bezeichnung=n, muskelgruppe="sonstige", created_by=user, is_custom=True)
+                for n in fehlend
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # MySQL/MariaDB liefert keine PKs aus bulk_create – Sätze brauchen sie.
+            # Gleichnamige Übungen wurden oben bereits gefunden, der Name ist eindeutig.
+            neu = Uebung.objects.filter(created_by=user, is_custom=True, bezeichnung__in=fehlend)
+        for uebung in neu:
+            gefunden[uebung.bezeichnung.lower()] = uebung
+        logger.info("Hevy import: %d custom exercises created for user %s", len(fehlend), user)
+    return gefunden, fehlend
+
+
+def _ist_dublette(vorhanden: list[datetime], start_dt: datetime) -> bool:
+    """``vorhanden`` sortiert; True wenn ein Eintrag im ±5-min-Fenster liegt."""
+    i = bisect_left(vorhanden, start_dt - DUBLETTEN_FENSTER)
+    return i < len(vorhanden) and vorhanden[i] <= start_dt + DUBLETTEN_FENSTER
+
+
+def _schreibe(user, workouts: list[tuple[_Workout, datetime]], uebungen: dict, fortschritt):
+    """Legt Einheiten und Sätze per ``bulk_create`` an. Gibt die Einheiten zurück."""
+    einheiten = []
+    for workout, start_dt in workouts:
+        end_dt = _parse_hevy_datetime(workout.end_str) if workout.end_str else None
+        dauer = None
+        if end_dt and end_dt > start_dt:
+            dauer = int((end_dt - start_dt).total_seconds() / 60)
+        einheiten.append(
+            Trainingseinheit(
+                user=user,
+                dauer_minuten=dauer,
+                kommentar=workout.beschreibung or None,
+                abgeschlossen=True,
+            )
+        )
+    if connection.features.can_return_rows_from_bulk_insert:
+        einheiten = Trainingseinheit.objects.bulk_create(einheiten, batch_size=BATCH_SIZE)
+    else:  # MySQL liefert keine PKs aus bulk_create – Sätze brauchen sie
+        for einheit in einheiten:
+            einheit.save()
+    # auto_now_add überschreibt datum beim INSERT -> per bulk_update nachziehen
+    for einheit, (_, start_dt) in zip(einheiten, workouts):
+        einheit.datum = start_dt
+    Trainingseinheit.objects.bulk_update(einheiten, ["datum"], batch_size=BATCH_SIZE)
+
+    puffer: list[Satz] = []
+    geschrieben = 0
+    gesamt = sum(len(w.saetze) for w, _ in workouts) or 1
+    for einheit, (workout, _) in zip(einheiten, workouts):
+        for name, satz_nr, gewicht, wdh, warmup, rpe, notiz, superset in workout.saetze:
+            puffer.append(
+                Satz(
+                    einheit=einheit,
+                    uebung=uebungen[name.lower()],
+                    satz_nr=satz_nr,
+                    gewicht=gewicht,
+                    wiederholungen=wdh,
+                    ist_aufwaermsatz=warmup,
+                    rpe=rpe,
+                    notiz=notiz,
+                    superset_gruppe=superset,
+                )
+            )
+            if len(puffer) >= BATCH_SIZE:
+                Satz.objects.bulk_create(puffer)
+                geschrieben += len(puffer)
+                puffer = []
+                fortschritt(50 + int(40 * geschrieben / gesamt), "Sätze speichern")
+    Satz.objects.bulk_create(puffer)
+    return einheiten
+
+
+def _abgeleitete_daten_nachziehen(user_id: int, einheiten: list, uebung_ids: set[int]) -> None:
+    """Was die Satz-Signale sonst erledigen: Statistik, ML-Features, PRs, Daten-Versionen."""
+    from core.services import ml_features, persoenliche_rekorde, uebung_statistik
+    from core.services.daten_version import erhoehe
+
+    ids = [e.pk for e in einheiten]
+    for i in range(0, len(ids), BATCH_SIZE):
+        uebung_statistik.rebuild_fuer_user(user_id, einheit_ids=ids[i : i + BATCH_SIZE])
+        ml_features.rebuild_fuer_user(user_id, einheit_ids=ids[i : i + BATCH_SIZE])
+    for uebung_id in uebung_ids:
+        persoenliche_rekorde.berechne_rekord(user_id, uebung_id)
+    erhoehe(user_id, "einheiten", "saetze")
+
+
+def importiere_hevy_csv(datei, user, dry_run: bool = False, fortschritt=None):
+    """Importiert eine Hevy-CSV (Datei-Objekt im Binärmodus) für ``user``.
+
+    Args:
+        datei: Upload bzw. geöffnete Datei (bytes)
+        user: Ziel-User
+        dry_run: nur Vorschau, nichts schreiben
+        fortschritt: optional ``(prozent, schritt)``-Callback (Hintergrund-Job)
+
+    Returns:
+        HevyImportErgebnis
+
+    Raises:
+        HevyImportFehler: Datei leer, Spalten fehlen oder kein CSV.
+    """
+    fortschritt = fortschritt or (lambda prozent, schritt: None)
+    ergebnis = HevyImportErgebnis()
+
+    fortschritt(5, "CSV lesen")
+    workouts = _lese_zeilen(datei, ergebnis.fehler)
+
+    gueltig: list[tuple[_Workout, datetime]] = []
+    for (title, start_str), workout in workouts.items():
+        start_dt = _parse_hevy_datetime(start_str)
+        if not start_dt:
+            ergebnis.fehler.append(
+                f"Ungültiges Datum '{start_str}' – Workout '{title}' übersprungen."
+            )
+            continue
+        ergebnis.vorschau.append(
+            {
+                "title": title,
+                "date": start_dt.strftime("%d.%m.%Y %H:%M"),
+                "sets": workout.zeilen,
+                "exercises": sorted(workout.zaehler),
+            }
+        )
+        gueltig.append((workout, start_dt))
+
+    fortschritt(30, "Übungen zuordnen")
+    namen = {s[0] for workout, _ in gueltig for s in workout.saetze}
+    if dry_run:
+        _, ergebnis.neue_uebungen = _loese_uebungen(namen, user, anlegen=False)
+        return ergebnis
+
+    # Dubletten: EIN Query über den Zeitraum der Datei, danach Bisect
+    neue: list[tuple[_Workout, datetime]] = []
+    if gueltig:
+        starts = [start_dt for _, start_dt in gueltig]
+        vorhanden = sorted(
+            Trainingseinheit.objects.filter(
+                user=user,
+                datum__range=(min(starts) - DUBLETTEN_FENSTER, max(starts) + DUBLETTEN_FENSTER),
+            ).values_list("datum", flat=True)
+        )
+        for workout, start_dt in gueltig:
+            if _ist_dublette(vorhanden, start_dt):
+                ergebnis.fehler.append(
+                    f"Workout '{workout.title}' ({start_dt.strftime('%d.%m.%Y %H:%M')}) "
+                    "existiert bereits – übersprungen."
+                )
+                continue
+            neue.append((workout, start_dt))
+            vorhanden.insert(bisect_left(vorhanden, start_dt), start_dt)
+
+    namen = {s[0] for workout, _ in neue for s in workout.saetze}
+    with transaction.atomic():
+        uebungen, ergebnis.neue_uebungen = _loese_uebungen(namen, user, anlegen=True)
+        fortschritt(50, "Trainings speichern")
+        einheiten = _schreibe(user, neue, uebungen, fortschritt)
+        fortschritt(90, "Statistiken aktualisieren")
+        _abgeleitete_daten_nachziehen(user.id, einheiten, {uebungen[n.lower()].pk for n in namen})
+
+    ergebnis.trainings = len(neue)
+    ergebnis.saetze = sum(len(w.saetze) for w, _ in neue)
+    return ergebnis
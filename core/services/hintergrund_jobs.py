@@ -0,0 +1,332 @@
+"""DB-gestützte Job-Queue (``HintergrundJob``) ohne Redis/Celery.
+
+Schwere Arbeit (Plan-Generierung, ML-Training, PDF-Report, Push-Versand) lief
+bisher im Request-Thread und hat Gunicorn-Sync-Worker 15–120 s blockiert.
+Views reihen jetzt einen Job ein und antworten sofort mit der Job-ID; der
+Client pollt ``/api/jobs/<id>/``. Abgearbeitet wird von ``manage.py run_worker``.
+
+Bausteine:
+
+- ``@aufgabe("typ")`` – registriert einen Handler ``handler(job) -> dict``.
+  Die Handler liegen in ``core/services/job_aufgaben.py``.
+- ``enqueue(typ, user=None, **parameter)`` – legt einen wartenden Job an;
+  ``enqueue_einmalig`` verwendet einen gleichen, noch wartenden Job wieder.
+- ``hole_naechsten_job(worker)`` – beansprucht atomar den ältesten fälligen
+  Job (bedingtes ``UPDATE … WHERE status='WARTEND'`` – funktioniert auf SQLite
+  und MariaDB ohne ``SKIP LOCKED``, mehrere Worker-Prozesse sind sicher).
+- ``fuehre_job_aus(job_id)`` – führt einen beanspruchten Job aus, schreibt
+  Ergebnis/Fehler. Fehler → Retry mit exponentiellem Backoff bis
+  ``max_versuche``; ``JobAbbruch`` beendet sofort ohne Retry.
+- ``melde_fortschritt(job, prozent, schritt)`` – Fortschritt + Heartbeat;
+  jede Änderung landet zusätzlich als ``HintergrundJobEreignis`` (SSE-Resume).
+- ``starte_im_webprozess(job)`` – führt einen Job in einem prozessweiten,
+  begrenzten Thread-Pool des Web-Prozesses aus (``HINTERGRUND_JOBS_WEB_PARALLEL``
+  gleichzeitig, der Rest wartet). Für Jobs, auf die der User live wartet
+  (Plan-Stream) – ``run_worker`` kann dieselben Jobs ebenfalls abholen.
+- ``setze_haengende_zurueck()`` – Jobs, deren Worker gestorben ist (kein
+  Heartbeat seit ``HINTERGRUND_JOBS_TIMEOUT``), werden erneut eingereiht.
+- ``raeume_alte_jobs()`` – löscht abgeschlossene Jobs nach
+  ``HINTERGRUND_JOBS_AUFBEWAHRUNG_TAGE`` samt ihren Dateien in ``JOB_DATEI_ROOT``.
+
+``settings.HINTERGRUND_JOBS_EAGER`` führt Jobs direkt in ``enqueue`` aus
+(lokale Entwicklung ohne Worker).
+"""
+
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import HintergrundJob, HintergrundJobEreignis
+
+logger = logging.getLogger(__name__)
+
+# Retry-Backoff: BASIS * 2^(versuch-1) Sekunden, gedeckelt.
+BACKOFF_BASIS_SEKUNDEN = 30
+BACKOFF_MAX_SEKUNDEN = 3600
+
+_AUFGABEN: dict = {}
+
+
+class JobAbbruch(Exception):
+    """Fachlicher Fehler ohne Aussicht auf Erfolg beim Retry (z.B. zu wenig Daten)."""
+
+
+def aufgabe(typ: str):
+    """Decorator: registriert ``handler(job) -> dict`` für den Job-Typ ``typ``."""
+
+    def decorator(func):
+        _AUFGABEN[typ] = func
+        return func
+
+    return decorator
+
+
+def _lade_aufgaben() -> dict:
+    """Importiert die Handler-Module (registrieren sich per ``@aufgabe``)."""
+    from core.services import job_aufgaben  # noqa: F401
+
+    return _AUFGABEN
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _user_id(user) -> int | None:
+    return getattr(user, "pk", user)
+
+
+def enqueue(typ: str, user=None, max_versuche: int = 3, **parameter) -> HintergrundJob:
+    """Reiht einen Job ein. ``user``: User oder User-ID; ``parameter`` JSON-serialisierbar."""
+    if typ not in _lade_aufgaben():
+        raise ValueError(f"Unbekannter Job-Typ: {typ}")
+    job = HintergrundJob.objects.create(
+        user_id=_user_id(user), typ=typ, parameter=parameter, max_versuche=max_versuche
+    )
+    if getattr(settings, "HINTERGRUND_JOBS_EAGER", False):
+        if _beanspruche(job.pk, "eager"):
+            fuehre_job_aus(job.pk, verbindung_schliessen=False)
+        job.refresh_from_db()
+    return job
+
+
+def enqueue_einmalig(typ: str, user=None, **parameter) -> HintergrundJob:
+    """Wie ``enqueue``, verwendet aber einen noch wartenden gleichen Job wieder.
+
+    Für idempotente Jobs (Cache vorwärmen): zehn Auslöser kurz hintereinander
+    ergeben EINE Berechnung statt zehn.
+    """
+    wartend = HintergrundJob.objects.filter(
+        typ=typ, user_id=_user_id(user), status="WARTEND", versuche=0
+    ).first()
+    if wartend is not None and wartend.parameter == parameter:
+        return wartend
+    return enqueue(typ, user=user, **parameter)
+
+
+def _beanspruche(job_id: int, worker: str) -> bool:
+    """WARTEND → LAEUFT, nur wenn kein anderer Worker schneller war.
+
+    Der Versuch zählt ab hier – auch ein abgestürzter Lauf verbraucht ihn.
+    """
+    return bool(
+        HintergrundJob.objects.filter(pk=job_id, status="WARTEND").update(
+            status="LAEUFT",
+            worker=worker,
+            versuche=F("versuche") + 1,
+            gestartet_am=timezone.now(),
+            aktualisiert_am=timezone.now(),
+        )
+    )
+
+
+def hole_naechsten_job(worker: str | None = None) -> int | None:
+    """Beansprucht den ältesten fälligen Job und gibt seine ID zurück (oder None)."""
+    worker = worker or worker_name()
+    kandidaten = HintergrundJob.objects.filter(
+        status="WARTEND", ausfuehren_ab__lte=timezone.now()
+    ).order_by("ausfuehren_ab", "id")
+    for job_id in kandidaten.values_list("id", flat=True)[:10]:
+        if _beanspruche(job_id, worker):
+            return job_id
+    return None
+
+
+def melde_fortschritt(job: HintergrundJob, prozent: int, schritt: str = "") -> None:
+    """Schreibt Fortschritt/Schritt (und damit den Heartbeat) in die DB.
+
+    Geänderte Werte werden zusätzlich als Ereignis gespeichert – reine
+    Heartbeats mit gleichem Stand erzeugen keine Zeile.
+    """
+    fortschritt = max(0, min(100, int(prozent)))
+    schritt = schritt[:200]
+    if (fortschritt, schritt) != (job.fortschritt, job.schritt):
+        HintergrundJobEreignis.objects.create(job=job, fortschritt=fortschritt, schritt=schritt)
+    job.fortschritt, job.schritt = fortschritt, schritt
+    HintergrundJob.objects.filter(pk=job.pk).update(
+        fortschritt=job.fortschritt, schritt=job.schritt, aktualisiert_am=timezone.now()
+    )
+
+
+_web_lock = threading.Lock()
+_web_pool: ThreadPoolExecutor | None = None
+
+
+def _web_executor() -> ThreadPoolExecutor:
+    """Prozessweiter Pool (lazy); begrenzt parallele Jobs pro Web-Prozess."""
+    global _web_pool
+    if _web_pool is None:
+        with _web_lock:
+            if _web_pool is None:
+                _web_pool = ThreadPoolExecutor(
+                    max_workers=max(1, getattr(settings, "HINTERGRUND_JOBS_WEB_PARALLEL", 2)),
+                    thread_name_prefix="hintergrund-job",
+                )
+    return _web_pool
+
+
+def _nach_fork() -> None:
+    # Threads überleben fork() nicht – im Kind (Gunicorn-Worker) neu anlegen
+    global _web_pool, _web_lock
+    _web_pool = None
+    _web_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_nach_fork)
+
+
+def _im_webprozess_ausfuehren(job_id: int) -> None:
+    if _beanspruche(job_id, f"{worker_name()}/web"):
+        fuehre_job_aus(job_id)
+    else:
+        # Ein Worker war schneller – nur die Verbindung des Pool-Threads abräumen
+        connection.close()
+
+
+def starte_im_webprozess(job: HintergrundJob) -> Future | None:
+    """Reiht einen wartenden Job in den begrenzten Pool des Web-Prozesses ein.
+
+    Ist der Pool voll, wartet der Job (Status WARTEND) in der Pool-Queue;
+    ``warteschlangen_platz`` liefert die Position. Im EAGER-Modus ist der Job
+    bereits in ``enqueue`` gelaufen.
+    """
+    if job.status != "WARTEND":
+        return None
+    return _web_executor().submit(_im_webprozess_ausfuehren, job.pk)
+
+
+def warteschlangen_platz(job: HintergrundJob) -> int:
+    """1-basierte Position unter den wartenden Jobs gleichen Typs (0 = läuft/fertig)."""
+    if job.status != "WARTEND":
+        return 0
+    return HintergrundJob.objects.filter(typ=job.typ, status="WARTEND", pk__lt=job.pk).count() + 1
+
+
+def _backoff(versuch: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_MAX_SEKUNDEN, BACKOFF_BASIS_SEKUNDEN * 2 ** (versuch - 1)))
+
+
+def fuehre_job_aus(job_id: int, verbindung_schliessen: bool = True) -> str:
+    """Führt einen beanspruchten (LAEUFT) Job aus. Gibt den Endstatus zurück.
+
+    Läuft im Worker-Thread bzw. -Prozess; ``verbindung_schliessen`` räumt die
+    thread-lokale DB-Verbindung danach ab.
+    """
+    try:
+        job = HintergrundJob.objects.select_related("user").get(pk=job_id)
+        handler = _lade_aufgaben().get(job.typ)
+        try:
+            if handler is None:
+                raise JobAbbruch(f"Unbekannter Job-Typ: {job.typ}")
+            ergebnis = handler(job)
+        except Exception as e:
+            retry = not isinstance(e, JobAbbruch) and job.versuche < job.max_versuche
+            logger.warning(
+                "Job #%s (%s) Versuch %s/%s fehlgeschlagen: %s",
+                job.pk,
+                job.typ,
+                job.versuche,
+                job.max_versuche,
+                e,
+                exc_info=not isinstance(e, JobAbbruch),
+            )
+            job.fehler = str(e)[:2000] or e.__class__.__name__
+            if retry:
+                job.status = "WARTEND"
+                job.ausfuehren_ab = timezone.now() + _backoff(job.versuche)
+            else:
+                job.status = "FEHLER"
+                job.beendet_am = timezone.now()
+        else:
+            job.status = "FERTIG"
+            job.ergebnis = ergebnis if ergebnis is not None else {}
+            job.fehler = ""
+            job.fortschritt = 100
+            job.beendet_am = timezone.now()
+        job.save(
+            update_fields=[
+                "status",
+                "ergebnis",
+                "fehler",
+                "fortschritt",
+                "ausfuehren_ab",
+                "beendet_am",
+                "aktualisiert_am",
+            ]
+        )
+        return job.status
+    finally:
+        if verbindung_schliessen:
+            connection.close()
+
+
+def setze_haengende_zurueck(timeout: timedelta | None = None) -> int:
+    """Reiht Jobs ohne Heartbeat seit ``timeout`` erneut ein (Worker abgestürzt).
+
+    Jobs, die ihre Versuche aufgebraucht haben, werden als FEHLER beendet.
+    """
+    timeout = timeout or timedelta(seconds=getattr(settings, "HINTERGRUND_JOBS_TIMEOUT", 15 * 60))
+    grenze = timezone.now() - timeout
+    with transaction.atomic():
+        haengend = HintergrundJob.objects.filter(status="LAEUFT", aktualisiert_am__lt=grenze)
+        haengend.filter(versuche__gte=F("max_versuche")).update(
+            status="FEHLER", fehler="Worker-Timeout", beendet_am=timezone.now()
+        )
+        anzahl = haengend.update(status="WARTEND", worker="", ausfuehren_ab=timezone.now())
+    if anzahl:
+        logger.warning("%s hängende Hintergrund-Jobs erneut eingereiht", anzahl)
+    return anzahl
+
+
+def raeume_alte_jobs(aufbewahrung: timedelta | None = None) -> int:
+    """Löscht abgeschlossene Jobs älter als ``aufbewahrung`` samt Job-Dateien.
+
+    Entfernt zusätzlich verwaiste Dateien in ``JOB_DATEI_ROOT`` (z.B. Upload
+    ohne angelegten Job), die älter als die Aufbewahrung sind. Gibt die Zahl
+    der gelöschten Jobs zurück.
+    """
+    from core.services.job_aufgaben import job_datei_pfad
+
+    aufbewahrung = aufbewahrung or timedelta(
+        days=getattr(settings, "HINTERGRUND_JOBS_AUFBEWAHRUNG_TAGE", 7)
+    )
+    grenze = timezone.now() - aufbewahrung
+    alte = HintergrundJob.objects.filter(status__in=["FERTIG", "FEHLER"], beendet_am__lt=grenze)
+    for ergebnis, parameter in alte.values_list("ergebnis", "parameter"):
+        for quelle in (ergebnis or {}, parameter or {}):
+            if quelle.get("datei"):
+                try:
+                    os.remove(job_datei_pfad(quelle["datei"]))
+                except FileNotFoundError:
+                    pass
+    anzahl = alte.delete()[1].get(HintergrundJob._meta.label, 0)
+
+    ordner = settings.JOB_DATEI_ROOT
+    if os.path.isdir(ordner):
+        for eintrag in os.scandir(ordner):
+            if eintrag.is_file() and eintrag.stat().st_mtime < grenze.timestamp():
+                os.remove(eintrag.path)
+    return anzahl
+
+
+def job_status_dict(job: HintergrundJob) -> dict:
+    """Antwort des Polling-Endpoints."""
+    return {
+        "id": job.pk,
+        "typ": job.typ,
+        "status": job.status,
+        "fortschritt": job.fortschritt,
+        "schritt": job.schritt,
+        "ergebnis": job.ergebnis if job.status == "FERTIG" else None,
+        "fehler": job.fehler if job.status == "FEHLER" else "",
+        "versuche": job.versuche,
+        "fertig": job.ist_abgeschlossen,
+    }
@@ -0,0 +1,161 @@
+"""Handler der Hintergrund-Jobs (registriert per ``@aufgabe``).
+
+Jeder Handler bekommt den beanspruchten ``HintergrundJob`` und gibt ein
+JSON-serialisierbares Ergebnis-Dict zurück. Die eigentliche Arbeit steckt in
+denselben Funktionen, die auch die synchronen Views nutzen – Job und View
+liefern identische Antworten.
+
+- ``plan_generieren`` – KI-Plan (``generate_plan_api`` mit ``async``)
+- ``plan_vorschau`` – KI-Plan-Vorschau für ``generate_plan_stream_api`` (SSE)
+- ``ml_training`` – ML-Modelle (``ml_train_model`` mit ``async``)
+- ``training_pdf`` – PDF-Report nach ``JOB_DATEI_ROOT`` (``export_training_pdf?async=1``)
+- ``training_pdf_vorrendern`` – PDF-Report nach dem Training in den Datei-Cache rendern
+- ``push_senden`` – Push-Fan-out an alle Geräte eines Users (``send_push_notification``)
+- ``dashboard_aufwaermen`` – Dashboard-Block nach dem Training vorberechnen
+- ``hevy_import`` – Hevy-CSV-Import (``import_hevy_csv`` mit ``async``)
+"""
+
+import logging
+import os
+import shutil
+
+from django.conf import settings
+
+from core.models import Uebung
+
+from .hintergrund_jobs import JobAbbruch, aufgabe, melde_fortschritt
+
+logger = logging.getLogger(__name__)
+
+
+def job_datei_pfad(name: str) -> str:
+    """Absoluter Pfad einer Job-Datei (``ergebnis["datei"]`` / ``parameter["datei"]``).
+
+    Job-Dateien liegen in ``settings.JOB_DATEI_ROOT`` – außerhalb von MEDIA_ROOT,
+    ausgeliefert nur über ``job_download``.
+    """
+    return os.path.join(settings.JOB_DATEI_ROOT, os.path.basename(name))
+
+
+@aufgabe("plan_generieren")
+def plan_generieren(job) -> dict:
+    from core.views.ai_recommendations import _create_plan_generator, _plan_generation_result
+
+    params = tuple(job.parameter["params"])
+    generator, use_openrouter = _create_plan_generator(
+        job.user_id,
+        params,
+        progress_callback=lambda prozent, schritt: melde_fortschritt(job, prozent, schritt),
+        cache=job.parameter.get("cache", True),
+    )
+    return _plan_generation_result(job.user, generator, params[5], use_openrouter)
+
+
+@aufgabe("plan_vorschau")
+def plan_vorschau(job) -> dict:
+    from core.views.ai_recommendations import _create_plan_generator, _plan_preview_result
+
+    try:
+        generator, use_openrouter = _create_plan_generator(
+            job.user_id,
+            tuple(job.parameter["params"]),
+            progress_callback=lambda prozent, schritt: melde_fortschritt(job, prozent, schritt),
+            cache=job.parameter.get("cache", True),
+        )
+        ergebnis = _plan_preview_result(generator, use_openrouter)
+    except Exception as exc:
+        logger.error(f"Stream Generator Error: {exc}", exc_info=True)
+        raise JobAbbruch("Plan-Generierung fehlgeschlagen. Bitte erneut versuchen.")
+    if not ergebnis["success"]:
+        raise JobAbbruch(ergebnis["error"])
+    return ergebnis
+
+
+@aufgabe("ml_training")
+def ml_training(job) -> dict:
+    from core.views.machine_learning import _train_ml_models
+
+    uebung_id = job.parameter.get("uebung_id")
+    uebung = None
+    if uebung_id:
+        uebung = Uebung.objects.filter(id=uebung_id).first()
+        if uebung is None:
+            raise JobAbbruch(f"Übung {uebung_id} existiert nicht")
+    melde_fortschritt(job, 10, "Trainiere Modelle")
+    payload, status = _train_ml_models(job.user, uebung)
+    if status != 200:
+        raise JobAbbruch(payload["message"])
+    return payload
+
+
+@aufgabe("training_pdf")
+def training_pdf(job) -> dict:
+    from core.export.pdf_cache import hole_oder_rendere
+
+    melde_fortschritt(job, 10, "Statistiken, Charts & PDF")
+    cache_pfad, dateiname = hole_oder_rendere(job.user)
+
+    # Kopie: der Cache räumt ältere Reports weg, der Job-Download muss bleiben
+    name = f"job_{job.pk}.pdf"
+    pfad = job_datei_pfad(name)
+    os.makedirs(os.path.dirname(pfad), exist_ok=True)
+    shutil.copyfile(cache_pfad, pfad)
+    return {
+        "datei": name,
+        "dateiname": dateiname,
+        "content_type": "application/pdf",
+    }
+
+
+@aufgabe("training_pdf_vorrendern")
+def training_pdf_vorrendern(job) -> dict:
+    from core.export.pdf_cache import hole_oder_rendere
+
+    # Kein "datei": der Report bleibt im PDF-Cache, kein Job-Download
+    pfad, _ = hole_oder_rendere(job.user)
+    return {"fingerprint": os.path.splitext(os.path.basename(pfad))[0]}
+
+
+@aufgabe("push_senden")
+def push_senden(job) -> dict:
+    from core.helpers.notifications import _sende_an_alle_geraete
+
+    p = job.parameter
+    gesendet = _sende_an_alle_geraete(
+        job.user, p["title"], p["body"], p.get("url", "/"), p.get("icon")
+    )
+    return {"gesendet": gesendet}
+
+
+@aufgabe("dashboard_aufwaermen")
+def dashboard_aufwaermen(job) -> dict:
+    from .dashboard_cache import aufwaermen
+
+    return {"aufgewaermt": aufwaermen(job.user_id)}
+
+
+@aufgabe("hevy_import")
+def hevy_import(job) -> dict:
+    from .hevy_import import HevyImportFehler, importiere_hevy_csv
+
+    pfad = job_datei_pfad(job.parameter["datei"])
+    try:
+        with open(pfad, "rb") as f:
+            ergebnis = importiere_hevy_csv(
+                f,
+                job.user,
+                fortschritt=lambda prozent, schritt: melde_fortschritt(job, prozent, schritt),
+            )
+    except FileNotFoundError:
+        raise JobAbbruch("Upload nicht mehr vorhanden")
+    except HevyImportFehler as exc:
+        os.remove(pfad)
+        raise JobAbbruch(str(exc))
+    # Bei anderen Fehlern bleibt die Datei für den Retry liegen
+    os.remove(pfad)
+    return {
+        "trainings": ergebnis.trainings,
+        "saetze": ergebnis.saetze,
+        "neue_uebungen": ergebnis.neue_uebungen,
+        "fehler": ergebnis.fehler,
+    }
@@ -0,0 +1,244 @@
+"""Pflege und Lesen des ML-Feature-Stores (``MLFeatureZeile``).
+
+``MLTrainer.get_training_data`` hat bei jedem Training sechs Monate Sätze neu
+geladen, lazy eine Körpergewichts-Map gebaut und pro Satz die Satz-Nummer per
+eigener Query ermittelt. Der Feature-Store hält diese Werte je Arbeitssatz
+vor; gepflegt wird er wie ``UebungTagesStatistik`` je (Einheit, Übung):
+
+- ``aktualisiere_gruppe`` – Zeilen einer (Einheit, Übung) neu berechnen
+  (Satz save/delete, siehe ``core/signals.py``; Offline-Sync).
+- ``rebuild_fuer_user`` – alle bzw. ausgewählte Zeilen eines Users in wenigen
+  Queries neu aufbauen (Hevy-Import, ``manage.py rebuild_ml_features``).
+- ``backfill_falls_leer`` – Sicherheitsnetz für Bestandsdaten ohne Zeilen.
+
+Gelesen wird über ``lade_matrix`` (Training) und ``letzte_zeile`` (Vorhersage).
+KOERPERGEWICHT-Zeilen, deren Körpergewicht nicht mehr zum Verlauf passt,
+werden beim Lesen nachgezogen (wie ``aktualisiere_koerpergewicht``).
+
+Rechenregeln (bewusst identisch zur bisherigen Live-Berechnung):
+- effective_weight: KOERPERGEWICHT = Körpergewicht am Trainingstag × Faktor
+  ± Zusatz (GEGEN: max(0, Basis − Zusatz)), PRO_SEITE ×2, sonst roh.
+- set_number: Position in der Einheit unter allen Sätzen der Übung
+  (inkl. Aufwärmsätze) in ``satz_nr``-Reihenfolge.
+- days_since_last: Tage zum vorherigen Arbeitssatz im gelesenen Zeitraum
+  (erste Zeile 0) – entsteht erst beim Lesen.
+"""
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import DenseRank
+
+import numpy as np
+
+from core.models import MLFeatureZeile, Satz
+
+# Spalten von ``lade_matrix`` (rpe_target ergänzt der Trainer)
+FEATURE_SPALTEN = ("effective_weight", "last_reps", "days_since_last", "rpe", "set_number")
+RPE_DEFAULT = 7.0
+
+
+def _effektives_gewicht(zusatz: float, uebung, koerpergewicht: float) -> float:
+    if uebung.gewichts_typ == "KOERPERGEWICHT":
+        basis = koerpergewicht * (uebung.koerpergewicht_faktor or 1.0)
+        if (uebung.gewichts_richtung or "ZUSATZ") == "GEGEN":
+            return max(0.0, basis - zusatz)
+        return basis + zusatz
+    if uebung.gewichts_typ == "PRO_SEITE":
+        return zusatz * 2
+    return zusatz
+
+
+def _koerpergewicht_fuer(user_id: int, daten) -> dict:
+    """Historisches Körpergewicht je Trainingsdatum (ein Query, Bisect)."""
+    from django.contrib.auth.models import User
+
+    from core.views.training_stats import _get_koerpergewicht_map
+
+    return _get_koerpergewicht_map(User(pk=user_id), daten)
+
+
+def _zeilen(einheit, uebung, saetze, koerpergewicht: float) -> list[MLFeatureZeile]:
+    """Baut (ungespeicherte) Zeilen aus ALLEN Sätzen einer (Einheit, Übung)."""
+    ist_kg = uebung.gewichts_typ == "KOERPERGEWICHT"
+    zeilen = []
+    for nummer, satz in enumerate(saetze, start=1):
+        if satz.ist_aufwaermsatz:
+            continue
+        gewicht = float(satz.gewicht)
+        zeilen.append(
+            MLFeatureZeile(
+                user_id=einheit.user_id,
+                uebung_id=uebung.id,
+                einheit_id=einheit.id,
+                satz_id=satz.id,
+                gewicht=gewicht,
+                effektives_gewicht=_effektives_gewicht(gewicht, uebung, koerpergewicht),
+                wiederholungen=satz.wiederholungen or 0,
+                rpe=float(satz.rpe) if satz.rpe is not None else None,
+                satz_nummer=nummer,
+                koerpergewicht=koerpergewicht if ist_kg else None,
+            )
+        )
+    return zeilen
+
+
+@transaction.atomic
+def aktualisiere_gruppe(einheit_id: int, uebung_id: int) -> int:
+    """Berechnet die Zeilen für (Einheit, Übung) neu. Gibt die Zeilenanzahl zurück."""
+    saetze = list(
+        Satz.objects.filter(einheit_id=einheit_id, uebung_id=uebung_id)
+        .select_related("einheit", "uebung")
+        .order_by("satz_nr", "id")
+    )
+    MLFeatureZeile.objects.filter(einheit_id=einheit_id, uebung_id=uebung_id).delete()
+    if not saetze:
+        return 0
+
+    einheit, uebung = saetze[0].einheit, saetze[0].uebung
+    koerpergewicht = 0.0
+    if uebung.gewichts_typ == "KOERPERGEWICHT":
+        koerpergewicht = _koerpergewicht_fuer(einheit.user_id, [einheit.datum])[einheit.datum]
+    zeilen = _zeilen(einheit, uebung, saetze, koerpergewicht)
+    MLFeatureZeile.objects.bulk_create(zeilen)
+    return len(zeilen)
+
+
+@transaction.atomic
+def rebuild_fuer_user(user_id: int, einheit_ids=None, uebung_id: int | None = None) -> int:
+    """Baut die Feature-Zeilen eines Users neu auf. Gibt die Zeilenanzahl zurück.
+
+    ``einheit_ids``: nur Zeilen dieser Einheiten (``bulk_create`` umgeht die Signale);
+    ``uebung_id``: nur Zeilen dieser Übung (Backfill).
+    """
+    saetze = (
+        Satz.objects.filter(einheit__user_id=user_id)
+        .select_related("einheit", "uebung")
+        .order_by("einheit_id", "uebung_id", "satz_nr", "id")
+    )
+    bestehend = MLFeatureZeile.objects.filter(user_id=user_id)
+    if einheit_ids is not None:
+        saetze = saetze.filter(einheit_id__in=einheit_ids)
+        bestehend = bestehend.filter(einheit_id__in=einheit_ids)
+    if uebung_id is not None:
+        saetze = saetze.filter(uebung_id=uebung_id)
+        bestehend = bestehend.filter(uebung_id=uebung_id)
+    gruppen: dict[tuple[int, int], list] = {}
+    for satz in saetze:
+        gruppen.setdefault((satz.einheit_id, satz.uebung_id), []).append(satz)
+
+    kg_daten = {
+        s[0].einheit.datum for s in gruppen.values() if s[0].uebung.gewichts_typ == "KOERPERGEWICHT"
+    }
+    kg_map = _koerpergewicht_fuer(user_id, list(kg_daten)) if kg_daten else {}
+
+    zeilen = []
+    for s in gruppen.values():
+        zeilen.extend(_zeilen(s[0].einheit, s[0].uebung, s, kg_map.get(s[0].einheit.datum, 0.0)))
+    bestehend.delete()
+    MLFeatureZeile.objects.bulk_create(zeilen, batch_size=500)
+    return len(zeilen)
+
+
+def backfill_falls_leer(user_id: int, uebung_id: int) -> bool:
+    """Baut die Zeilen einer Übung nach, falls noch keine existieren.
+
+    Sicherheitsnetz für Bestandsdaten, solange der Backfill-Command noch nicht
+    gelaufen ist. Gibt True zurück, wenn Zeilen angelegt wurden.
+    """
+    if MLFeatureZeile.objects.filter(user_id=user_id, uebung_id=uebung_id).exists():
+        return False
+    return rebuild_fuer_user(user_id, uebung_id=uebung_id) > 0
+
+
+def _koerpergewicht_nachziehen(user_id: int, uebung, werte: list) -> bool:
+    """Rechnet KOERPERGEWICHT-Gruppen mit veraltetem Körpergewicht neu. True = geändert."""
+    if uebung.gewichts_typ != "KOERPERGEWICHT" or not werte:
+        return False
+    kg_map = _koerpergewicht_fuer(user_id, list({w[0] for w in werte}))
+    veraltet = {w[-1] for w in werte if w[-2] != kg_map.get(w[0], w[-2])}
+    for einheit_id in veraltet:
+        aktualisiere_gruppe(einheit_id, uebung.id)
+    return bool(veraltet)
+
+
+def lade_matrix(user_id: int, uebung, seit=None) -> tuple[np.ndarray, np.ndarray]:
+    """Liest die Feature-Zeilen chronologisch (``einheit__datum``, Satz-ID).
+
+    Returns:
+        (features, gewichte): ``features`` hat die Spalten ``FEATURE_SPALTEN``
+        (n×5), ``gewichte`` die Rohgewichte (n) – Zielwert ist das Gewicht der
+        jeweils nächsten Zeile.
+    """
+    zeilen = MLFeatureZeile.objects.filter(user_id=user_id, uebung_id=uebung.id)
+    if seit is not None:
+        zeilen = zeilen.filter(einheit__datum__gte=seit)
+    zeilen = zeilen.order_by("einheit__datum", "satz_id").values_list(
+        "einheit__datum",
+        "effektives_gewicht",
+        "wiederholungen",
+        "rpe",
+        "satz_nummer",
+        "gewicht",
+        "koerpergewicht",
+        "einheit_id",
+    )
+
+    werte = list(zeilen)
+    if not werte and backfill_falls_leer(user_id, uebung.id):
+        werte = list(zeilen.all())
+    if _koerpergewicht_nachziehen(user_id, uebung, werte):
+        werte = list(zeilen.all())
+
+    features = np.empty((len(werte), len(FEATURE_SPALTEN)))
+    for i, (datum, eff, wdh, rpe, nummer, _gewicht, _kg, _einheit) in enumerate(werte):
+        tage = (datum - werte[i - 1][0]).days if i > 0 else 0
+        features[i] = (eff, wdh, tage, rpe if rpe is not None else RPE_DEFAULT, nummer)
+    gewichte = np.array([w[5] for w in werte], dtype=float)
+    return features, gewichte
+
+
+def letzte_zeilen(user_id: int, uebung_ids) -> dict[int, dict]:
+    """Letzter Arbeitssatz je Übung als Feature-Dict für die Vorhersage (eine Query).
+
+    ``days_since_last`` = Tage zwischen der letzten und der vorherigen Einheit
+    mit dieser Übung (7, wenn es nur eine gibt). Übungen ohne Daten fehlen.
+    """
+    uebung_ids = set(uebung_ids)
+    if not uebung_ids:
+        return {}
+    # Rang 1 = letzte Einheit je Übung, Rang 2 = die davor
+    zeilen = (
+        MLFeatureZeile.objects.filter(user_id=user_id, uebung_id__in=uebung_ids)
+        .annotate(
+            rang=Window(
+                DenseRank(), partition_by=F("uebung_id"), order_by=F("einheit__datum").desc()
+            )
+        )
+        .filter(rang__lte=2)
+        .order_by("uebung_id", "rang", "-satz_id")
+        .values_list("uebung_id", "rang", "einheit__datum", "gewicht", "wiederholungen", "rpe")
+    )
+    werte = list(zeilen)
+    fehlend = uebung_ids - {w[0] for w in werte}
+    if fehlend and any([backfill_falls_leer(user_id, uid) for uid in fehlend]):
+        werte = list(zeilen.all())
+
+    ergebnis: dict[int, dict] = {}
+    letzte_datum: dict[int, object] = {}
+    for uebung_id, rang, datum, gewicht, wdh, rpe in werte:
+        if rang == 1 and uebung_id not in ergebnis:
+            letzte_datum[uebung_id] = datum
+            ergebnis[uebung_id] = {
+                "last_weight": gewicht,
+                "last_reps": float(wdh),
+                "rpe": rpe if rpe is not None else RPE_DEFAULT,
+                "days_since_last": 7,
+            }
+        elif rang == 2:
+            ergebnis[uebung_id]["days_since_last"] = (letzte_datum[uebung_id] - datum).days
+    return ergebnis
+
+
+def letzte_zeile(user_id: int, uebung_id: int) -> dict | None:
+    """Wie ``letzte_zeilen`` für eine Übung (``None`` ohne Daten)."""
+    return letzte_zeilen(user_id, [uebung_id]).get(uebung_id)
@@ -0,0 +1,276 @@
+"""Batch-Sync offline erfasster Sätze (``POST /api/v2/sync-offline/``).
+
+v1 (``sync_offline_data``) verarbeitet jedes Item einzeln: Training und Übung
+laden, ``Max("satz_nr")`` aggregieren, ``save()`` – ein Backlog von 100 Sätzen
+kostet hunderte Queries, und ein Retry nach Verbindungsabbruch legt Sätze
+doppelt an. v2:
+
+1. Alle Items vorab validieren (Pflichtfelder, Zahlenformate, Feldgrenzen) –
+   ein fehlerhaftes Item wird einzeln abgelehnt, der Rest des Batches läuft.
+2. Bekannte Idempotenz-Schlüssel (``SyncSchluessel``) in einem Query laden –
+   deren Items liefern das gespeicherte Ergebnis (``duplicate: true``).
+3. Trainings, Übungen, zu aktualisierende Sätze und die höchste ``satz_nr`` je
+   (Training, Übung) in je einem Query vorladen; ``satz_nr`` im Speicher vergeben.
+4. ``bulk_create`` / ``bulk_update`` + Schlüssel in EINER Transaktion.
+
+``bulk_*`` umgeht die Satz-Signale → Übungs-Statistik, PR-Tabelle und
+Daten-Version werden für die betroffenen (Training, Übung)-Paare nachgezogen.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.models import Satz, SyncSchluessel, Trainingseinheit, Uebung
+
+logger = logging.getLogger(__name__)
+
+# Maximal verarbeitete Items je Request (Schutz vor Riesen-Payloads)
+MAX_ITEMS = 500
+# Schlüssel älter als das werden beim nächsten Sync des Users entfernt –
+# kein Client hält einen Batch so lange zurück.
+SCHLUESSEL_AUFBEWAHRUNG = timedelta(days=30)
+
+_UPDATE_URL_RE = re.compile(r"/set/(\d{1,10})/update/")
+_SATZ_FELDER = ["gewicht", "wiederholungen", "rpe", "ist_aufwaermsatz", "superset_gruppe", "notiz"]
+# Obergrenzen der Integer-Spalten (PositiveIntegerField bzw. BigAutoField-IDs)
+_MAX_INT = 2**31 - 1
+_MAX_ID = 2**63 - 1
+
+
+class SyncFehler(ValueError):
+    """Payload als Ganzes ungültig (kein Array, zu viele Items)."""
+
+
+@dataclass
+class _Item:
+    client_id: object
+    schluessel: str
+    training_id: int
+    uebung_id: int
+    werte: dict
+    update_satz_id: int | None
+
+
+def _fehler(client_id, meldung: str) -> dict:
+    return {"id": client_id, "success": False, "error": meldung}
+
+
+def _passt_in_feld(wert: Decimal, feldname: str) -> bool:
+    """Passt ``wert`` (auf ``decimal_places`` gerundet) in das DecimalField von Satz?
+
+    Sonst schlägt erst das Speichern in der gemeinsamen Transaktion fehl – und
+    der ganze Batch würde zurückgerollt.
+    """
+    feld = Satz._meta.get_field(feldname)
+    gerundet = wert.quantize(Decimal(1).scaleb(-feld.decimal_places))
+    return abs(gerundet) < Decimal(10) ** (feld.max_digits - feld.decimal_places)
+
+
+def _validiere(item) -> _Item | str:
+    """Prüft ein Item vollständig vor jedem DB-Zugriff. Gibt Fehlermeldung oder _Item zurück."""
+    if not isinstance(item, dict):
+        return "Ungültiger Eintrag"
+    try:
+        werte = {
+            "gewicht": Decimal(str(item["gewicht"])),
+            "wiederholungen": int(item["wiederholungen"]),
+            "rpe": Decimal(str(item["rpe"])) if item.get("rpe") else None,
+            "ist_aufwaermsatz": bool(item.get("is_warmup", False)),
+            "superset_gruppe": int(item.get("superset_gruppe") or 0),
+            "notiz": item.get("notiz", "") or None,
+        }
+        training_id = int(item["training_id"])
+        uebung_id = int(item["uebung_id"])
+        update_satz_id = None
+        if item.get("satz_id"):
+            update_satz_id = int(item["satz_id"])
+        elif item.get("is_update") or "/update/" in str(item.get("action", "")):
+            match = _UPDATE_URL_RE.search(str(item.get("action", "")))
+            update_satz_id = int(match.group(1)) if match else None
+    except (KeyError, TypeError, ValueError, InvalidOperation):
+        return "Ungültige oder fehlende Felder"
+    if not werte["gewicht"].is_finite() or not (0 <= werte["wiederholungen"] <= _MAX_INT):
+        return "Ungültige oder fehlende Felder"
+    if not (0 <= werte["superset_gruppe"] <= _MAX_INT):
+        return "Ungültige oder fehlende Felder"
+    if not all(0 < i <= _MAX_ID for i in (training_id, uebung_id, update_satz_id or 1)):
+        return "Ungültige oder fehlende Felder"
+    if not _passt_in_feld(werte["gewicht"], "gewicht"):
+        return "Gewicht außerhalb des gültigen Bereichs"
+    if werte["rpe"] is not None and not (1 <= werte["rpe"] <= 10):
+        return "RPE muss zwischen 1 und 10 liegen"
+
+    return _Item(
+        client_id=item.get("id"),
+        schluessel=str(item.get("idempotency_key") or "")[:64],
+        training_id=training_id,
+        uebung_id=uebung_id,
+        werte=werte,
+        update_satz_id=update_satz_id,
+    )
+
+
+def _neue_saetze_speichern(saetze: list[Satz]) -> None:
+    if connection.features.can_return_rows_from_bulk_insert:
+        Satz.objects.bulk_create(saetze)
+    else:  # MySQL liefert keine PKs aus bulk_create – das Ergebnis braucht sie
+        for satz in saetze:
+            satz.save()
+
+
+def _abgeleitete_daten_nachziehen(user_id: int, paare: set[tuple[int, int]]) -> None:
+    """Was die Satz-Signale sonst erledigen – mengenbasiert wie beim Hevy-Import.
+
+    Feste Query-Anzahl unabhängig von der Zahl betroffener (Einheit, Übung)-Paare.
+    """
+    from core.services import ml_features, persoenliche_rekorde, uebung_statistik
+    from core.services.daten_version import erhoehe
+
+    einheit_ids = {e for e, _ in paare}
+    uebung_statistik.rebuild_fuer_user(user_id, einheit_ids=einheit_ids)
+    ml_features.rebuild_fuer_user(user_id, einheit_ids=einheit_ids)
+    persoenliche_rekorde.berechne_rekorde(user_id, {u for _, u in paare})
+    erhoehe(user_id, "saetze")
+
+
+def _verarbeite(user, items: dict[int, _Item], results: dict) -> None:
+    """Wendet alle gültigen Items in einer Transaktion an; füllt ``results`` (Index → Dict)."""
+    bekannte = dict(
+        SyncSchluessel.objects.filter(
+            user=user, schluessel__in={i.schluessel for i in items.values() if i.schluessel}
+        ).values_list("schluessel", "ergebnis")
+    )
+    offen = {}
+    schluessel_im_batch: dict[str, int] = {}
+    for idx, item in items.items():
+        if item.schluessel in bekannte:
+            results[idx] = {"id": item.client_id, **bekannte[item.schluessel], "duplicate": True}
+        elif item.schluessel in schluessel_im_batch:
+            results[idx] = ("wie", schluessel_im_batch[item.schluessel])
+        else:
+            if item.schluessel:
+                schluessel_im_batch[item.schluessel] = idx
+            offen[idx] = item
+    if not offen:
+        return
+
+    trainings = set(
+        Trainingseinheit.objects.filter(
+            user=user, id__in={i.training_id for i in offen.values()}
+        ).values_list("id", flat=True)
+    )
+    uebungen = set(
+        Uebung.objects.filter(id__in={i.uebung_id for i in offen.values()}).values_list(
+            "id", flat=True
+        )
+    )
+    zu_aktualisieren = Satz.objects.filter(
+        einheit__user=user,
+        id__in={i.update_satz_id for i in offen.values() if i.update_satz_id},
+    ).in_bulk()
+    max_nr = {
+        (r["einheit_id"], r["uebung_id"]): r["max_nr"]
+        for r in Satz.objects.filter(einheit_id__in=trainings)
+        .values("einheit_id", "uebung_id")
+        .annotate(max_nr=Max("satz_nr"))
+    }
+
+    neue: dict[int, Satz] = {}
+    geaendert: dict[int, Satz] = {}
+    paare: set[tuple[int, int]] = set()
+    for idx, item in offen.items():
+        if item.training_id not in trainings:
+            results[idx] = _fehler(
+                item.client_id, "Training nicht gefunden oder keine Berechtigung"
+            )
+            continue
+        if item.uebung_id not in uebungen:
+            results[idx] = _fehler(item.client_id, "Übung nicht gefunden")
+            continue
+
+        satz = zu_aktualisieren.get(item.update_satz_id)
+        if satz is not None:
+            for feld, wert in item.werte.items():
+                setattr(satz, feld, wert)
+            geaendert[idx] = satz
+        else:  # Add oder Update-Fallthrough (Satz weg → neu anlegen)
+            paar = (item.training_id, item.uebung_id)
+            max_nr[paar] = (max_nr.get(paar) or 0) + 1
+            satz = Satz(
+                einheit_id=item.training_id,
+                uebung_id=item.uebung_id,
+                satz_nr=max_nr[paar],
+                **item.werte,
+            )
+            neue[idx] = satz
+        paare.add((satz.einheit_id, satz.uebung_id))
+
+    with transaction.atomic():
+        _neue_saetze_speichern(list(neue.values()))
+        Satz.objects.bulk_update(list({s.pk: s for s in geaendert.values()}.values()), _SATZ_FELDER)
+        schluessel = []
+        for idx, satz in [*neue.items(), *geaendert.items()]:
+            ergebnis = {"success": True, "satz_id": satz.pk, "updated": idx in geaendert}
+            results[idx] = {"id": offen[idx].client_id, **ergebnis}
+            if offen[idx].schluessel:
+                schluessel.append(
+                    SyncSchluessel(user=user, schluessel=offen[idx].schluessel, ergebnis=ergebnis)
+                )
+        SyncSchluessel.objects.bulk_create(schluessel)
+        if paare:
+            _abgeleitete_daten_nachziehen(user.id, paare)
+
+
+def synchronisiere(user, payload) -> list[dict]:
+    """Verarbeitet einen Offline-Batch. Ergebnis je Item in Eingabe-Reihenfolge.
+
+    Raises:
+        SyncFehler: Payload kein Array bzw. mehr als ``MAX_ITEMS`` Einträge.
+    """
+    roh = payload.get("items") if isinstance(payload, dict) else payload
+    if not isinstance(roh, list):
+        raise SyncFehler("Erwartet: Liste von Einträgen")
+    if len(roh) > MAX_ITEMS:
+        raise SyncFehler(f"Maximal {MAX_ITEMS} Einträge pro Sync")
+
+    results: dict[int, object] = {}
+    items: dict[int, _Item] = {}
+    for idx, item in enumerate(roh):
+        geprueft = _validiere(item)
+        if isinstance(geprueft, str):
+            client_id = item.get("id") if isinstance(item, dict) else None
+            results[idx] = _fehler(client_id, geprueft)
+        else:
+            items[idx] = geprueft
+
+    if items:
+        try:
+            _verarbeite(user, items, results)
+        except IntegrityError:
+            # Paralleler Retry desselben Batches hat die Schlüssel zuerst
+            # geschrieben → erneut: jetzt greifen die gespeicherten Ergebnisse.
+            logger.info("Offline-Sync: Schlüssel-Kollision für User %s – wiederhole", user.id)
+            _verarbeite(user, items, results)
+
+    SyncSchluessel.objects.filter(
+        user=user, erstellt_am__lt=timezone.now() - SCHLUESSEL_AUFBEWAHRUNG
+    ).delete()
+
+    # Doppelte Schlüssel innerhalb des Batches bekommen das Ergebnis des ersten Items
+    ausgabe = []
+    for idx in range(len(roh)):
+        r = results[idx]
+        if isinstance(r, tuple):
+            erstes = results[r[1]]
+            r = {**erstes, "id": items[idx].client_id}
+            if erstes.get("success"):
+                r["duplicate"] = True
+        ausgabe.append(r)
+    return ausgabe
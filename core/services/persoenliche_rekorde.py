@@ -0,0 +1,245 @@
+"""Pflege der PR-Tabelle (``PersoenlicherRekord``) für die PR-Erkennung beim Loggen.
+
+Vorher hat ``_check_pr`` bei jedem ``add_set`` ALLE historischen Arbeitssätze
+der Übung geladen und bewertet (bei Körpergewichts-Übungen zusätzlich die
+komplette Körpergewichts-Map). Jetzt hält eine Zeile je (User, Übung) die
+Bestwerte; ``_check_pr`` liest nur noch diese Zeile.
+
+Schreibpfade (``core/signals.py``):
+
+- ``aktualisiere_rekord`` – Satz gespeichert: inkrementeller Vergleich gegen
+  die Zeile (konstante Kosten). Ist der geänderte Satz selbst Rekordhalter
+  oder liegt er nach einer Änderung unter ``vorheriges_1rm`` (er kann der
+  Zweitbeste gewesen sein), wird neu berechnet – sein Wert kann gesunken sein.
+- ``rekorde_nach_loeschen`` – Satz gelöscht: Zeilen, deren Halter (``SET_NULL``
+  hat die Referenz geleert) oder Zweitbester gelöscht wurde, werden neu berechnet.
+- ``berechne_rekord`` – Vollberechnung einer Übung (Fallback, Deload-Umschalten,
+  fehlende Zeile bei Bestandsdaten).
+- ``berechne_rekorde`` – dasselbe für mehrere Übungen mit fester Query-Anzahl
+  (Offline-Sync, umgeht die Signale).
+- ``rebuild_fuer_user`` – alle Zeilen eines Users (``manage.py rebuild_uebung_statistik``).
+
+Rechenregeln (identisch zur bisherigen PR-Erkennung):
+- Nur Arbeitssätze aus Nicht-Deload-Einheiten.
+- 1RM: Epley auf dem eingetragenen Gewicht; KOERPERGEWICHT-Übungen auf dem
+  effektiven Gewicht (Körpergewicht vom Trainingstag × Faktor ± Zusatz).
+- Gleichstand ist kein neuer Rekord (der ältere Satz bleibt Halter).
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import PersoenlicherRekord, Satz
+
+
+def pr_1rm(uebung, gewicht: float, wdh: int, koerpergewicht: float = 0.0) -> float:
+    """Epley-1RM nach PR-Regel (0 bei effektivem Gewicht ≤ 0)."""
+    if uebung.gewichts_typ == "KOERPERGEWICHT":
+        faktor = getattr(uebung, "koerpergewicht_faktor", 1.0) or 1.0
+        richtung = getattr(uebung, "gewichts_richtung", "ZUSATZ") or "ZUSATZ"
+        basis = koerpergewicht * faktor
+        eff = max(0.0, basis - gewicht) if richtung == "GEGEN" else basis + gewicht
+    else:
+        eff = gewicht
+    return eff * (1 + wdh / 30) if eff > 0 else 0.0
+
+
+def koerpergewicht_am(user_id: int, uebung, datum) -> float:
+    """Körpergewicht vom Trainingstag – nur für KOERPERGEWICHT-Übungen (sonst 0)."""
+    if uebung.gewichts_typ != "KOERPERGEWICHT":
+        return 0.0
+    from django.contrib.auth.models import User
+
+    from core.views.training_stats import _get_koerpergewicht_for_date
+
+    return _get_koerpergewicht_for_date(User(pk=user_id), datum.date())
+
+
+def _satz_1rm(satz) -> float:
+    """PR-1RM eines einzelnen Satzes (Körpergewicht vom Trainingstag)."""
+    einheit, uebung = satz.einheit, satz.uebung
+    return pr_1rm(
+        uebung,
+        float(satz.gewicht),
+        int(satz.wiederholungen),
+        koerpergewicht_am(einheit.user_id, uebung, einheit.datum),
+    )
+
+
+def _uebernimm_max_gewicht(rekord, satz) -> bool:
+    """Setzt Max.-Gewicht/Wdh, wenn ``satz`` besser ist (mehr Gewicht, sonst mehr Wdh).
+
+    ``gewicht``/``wiederholungen`` können direkt nach ``Satz.objects.create``
+    noch die POST-Strings sein – daher normalisieren.
+    """
+    gewicht = Decimal(str(satz.gewicht))
+    wdh = int(satz.wiederholungen)
+    if rekord.max_gewicht_satz_id is not None and (gewicht, wdh) <= (
+        rekord.max_gewicht,
+        rekord.wdh_bei_max_gewicht,
+    ):
+        return False
+    rekord.max_gewicht = gewicht
+    rekord.wdh_bei_max_gewicht = wdh
+    rekord.max_gewicht_satz = satz
+    return True
+
+
+def _arbeitssaetze(user_id: int):
+    return (
+        Satz.objects.filter(
+            einheit__user_id=user_id, ist_aufwaermsatz=False, einheit__ist_deload=False
+        )
+        .select_related("einheit", "uebung")
+        .order_by("einheit__datum", "satz_nr", "id")
+    )
+
+
+def _koerpergewicht_map(user_id: int, saetze: list) -> dict:
+    """Körpergewicht je Trainingstag – nur für Tage mit KOERPERGEWICHT-Sätzen (ein Query)."""
+    daten = {s.einheit.datum for s in saetze if s.uebung.gewichts_typ == "KOERPERGEWICHT"}
+    if not daten:
+        return {}
+    from django.contrib.auth.models import User
+
+    from core.views.training_stats import _get_koerpergewicht_map
+
+    return _get_koerpergewicht_map(User(pk=user_id), list(daten))
+
+
+def _rekord_aus(user_id: int, saetze: list, kg_map: dict) -> PersoenlicherRekord:
+    """Rekord-Zeile aus den chronologisch sortierten Arbeitssätzen einer Übung."""
+    uebung = saetze[0].uebung
+    rekord = PersoenlicherRekord(user_id=user_id, uebung=uebung)
+    werte = []
+    for satz in saetze:
+        wert = pr_1rm(
+            uebung,
+            float(satz.gewicht),
+            int(satz.wiederholungen),
+            kg_map.get(satz.einheit.datum, 0.0),
+        )
+        werte.append(wert)
+        if rekord.bester_satz is None or wert > rekord.bestes_1rm:
+            rekord.bestes_1rm = wert
+            rekord.bester_satz = satz
+        _uebernimm_max_gewicht(rekord, satz)
+    andere = [w for s, w in zip(saetze, werte) if s.id != rekord.bester_satz.id]
+    rekord.vorheriges_1rm = max(andere) if andere else None
+    return rekord
+
+
+@transaction.atomic
+def berechne_rekord(user_id: int, uebung_id: int) -> PersoenlicherRekord | None:
+    """Berechnet die Zeile für (User, Übung) aus allen Sätzen neu; löscht sie ohne Sätze."""
+    saetze = list(_arbeitssaetze(user_id).filter(uebung_id=uebung_id))
+    PersoenlicherRekord.objects.filter(user_id=user_id, uebung_id=uebung_id).delete()
+    if not saetze:
+        return None
+    rekord = _rekord_aus(user_id, saetze, _koerpergewicht_map(user_id, saetze))
+    rekord.save()
+    return rekord
+
+
+@transaction.atomic
+def berechne_rekorde(user_id: int, uebung_ids) -> int:
+    """Wie ``berechne_rekord`` für mehrere Übungen – feste Query-Anzahl statt je Übung.
+
+    Für Schreibpfade, die die Satz-Signale umgehen (Offline-Sync, ``bulk_create``).
+    Gibt die Anzahl geschriebener Zeilen zurück.
+    """
+    gruppen: dict[int, list] = {}
+    for satz in _arbeitssaetze(user_id).filter(uebung_id__in=uebung_ids):
+        gruppen.setdefault(satz.uebung_id, []).append(satz)
+    kg_map = _koerpergewicht_map(user_id, [s for saetze in gruppen.values() for s in saetze])
+
+    PersoenlicherRekord.objects.filter(user_id=user_id, uebung_id__in=uebung_ids).delete()
+    zeilen = [_rekord_aus(user_id, saetze, kg_map) for saetze in gruppen.values()]
+    PersoenlicherRekord.objects.bulk_create(zeilen)
+    return len(zeilen)
+
+
+@transaction.atomic
+def aktualisiere_rekord(satz, created: bool = True) -> PersoenlicherRekord | None:
+    """Zieht die Zeile nach einem gespeicherten Satz nach (Satz-``post_save``).
+
+    ``vorheriges_1rm`` steigt inkrementell nur. Liegt ein geänderter Satz
+    (``created=False``) jetzt darunter, war er evtl. der Zweitbeste – dann wird
+    neu berechnet, sonst bliebe ein Vergleichswert ohne zugehörigen Satz stehen.
+    """
+    einheit = satz.einheit
+    rekord = (
+        PersoenlicherRekord.objects.select_for_update()
+        .filter(user_id=einheit.user_id, uebung_id=satz.uebung_id)
+        .first()
+    )
+    if (
+        rekord is None
+        or rekord.bester_satz_id is None
+        or rekord.max_gewicht_satz_id is None
+        or satz.id in (rekord.bester_satz_id, rekord.max_gewicht_satz_id)
+    ):
+        # Keine Zeile (Bestandsdaten), verwaiste Halter-Referenz oder der
+        # Halter selbst wurde geändert → einmalig vollständig neu berechnen.
+        return berechne_rekord(einheit.user_id, satz.uebung_id)
+    zaehlt = not (satz.ist_aufwaermsatz or einheit.ist_deload)
+    if not zaehlt and created:
+        return rekord
+
+    wert = _satz_1rm(satz) if zaehlt else 0.0
+    if not created and rekord.vorheriges_1rm is not None and wert < rekord.vorheriges_1rm:
+        return berechne_rekord(einheit.user_id, satz.uebung_id)
+    if not zaehlt:
+        return rekord
+
+    geaendert = False
+    if wert > rekord.bestes_1rm:
+        rekord.vorheriges_1rm = rekord.bestes_1rm
+        rekord.bestes_1rm = wert
+        rekord.bester_satz = satz
+        geaendert = True
+    elif rekord.vorheriges_1rm is None or wert > rekord.vorheriges_1rm:
+        rekord.vorheriges_1rm = wert
+        geaendert = True
+    if _uebernimm_max_gewicht(rekord, satz):
+        geaendert = True
+    if geaendert:
+        rekord.save()
+    return rekord
+
+
+def rekorde_nach_loeschen(satz) -> None:
+    """Satz-``post_delete``: Zeilen, deren Halter oder Zweitbester gelöscht wurde, neu berechnen.
+
+    ``SET_NULL`` leert die Halter-Referenzen vor dem ``post_delete``-Signal –
+    diese Zeilen erkennt man an der leeren Referenz. Der Zweitbeste hat keine
+    Referenz: hatte der gelöschte Satz ein 1RM ≥ ``vorheriges_1rm``, stammt der
+    Vergleichswert evtl. von ihm. Löschen eines schwächeren Satzes ändert nichts.
+    """
+    betroffen = set(
+        PersoenlicherRekord.objects.filter(uebung_id=satz.uebung_id)
+        .filter(Q(bester_satz__isnull=True) | Q(max_gewicht_satz__isnull=True))
+        .values_list("user_id", flat=True)
+    )
+    einheit = satz.einheit
+    if einheit.user_id not in betroffen and not (satz.ist_aufwaermsatz or einheit.ist_deload):
+        vorher = (
+            PersoenlicherRekord.objects.filter(user_id=einheit.user_id, uebung_id=satz.uebung_id)
+            .values_list("vorheriges_1rm", flat=True)
+            .first()
+        )
+        if vorher is not None and _satz_1rm(satz) >= vorher:
+            betroffen.add(einheit.user_id)
+    for user_id in betroffen:
+        berechne_rekord(user_id, satz.uebung_id)
+
+
+def rebuild_fuer_user(user_id: int) -> int:
+    """Baut alle Rekord-Zeilen eines Users neu auf. Gibt die Zeilenanzahl zurück."""
+    uebung_ids = set(
+        Satz.objects.filter(einheit__user_id=user_id).values_list("uebung_id", flat=True)
+    )
+    PersoenlicherRekord.objects.filter(user_id=user_id).exclude(uebung_id__in=uebung_ids).delete()
+    return sum(1 for uebung_id in uebung_ids if berechne_rekord(user_id, uebung_id))
@@ -0,0 +1,221 @@
+"""Per-Request-Snapshot der Trainingsdaten eines Users (Dashboard-Helfer).
+
+Die Dashboard-Helfer in ``core/views/training_stats.py`` haben bisher jeder
+für sich ``Satz``-/``Trainingseinheit``-/``TrainingsPause``-Queries über sich
+überlappende Zeiträume abgesetzt – ein Cache-Miss kostete 60+ Queries.
+``UserTrainingSnapshot`` lädt die Daten EINMAL und alle Helfer filtern danach
+nur noch im Speicher.
+
+Umfang:
+- Sessions und Sätze ab dem Montag vor 52 Wochen (Streak, Heatmap, Volumen,
+  RPE-Fenster). Liegen die letzten ``SESSION_TREND_MAX`` abgeschlossenen
+  Sessions weiter zurück (lange Trainingspause), wird der Zeitraum bis dorthin
+  erweitert – der Session-RPE-Trend braucht sie unabhängig vom Alter.
+- Alle Pausen, Cardio im selben Zeitraum, aktueller Körperwert, aktiver Block.
+- ``IsoWochenKalender`` aus den geladenen Sessions (Streak, Wochenübersicht,
+  Netto-Blockdauer) – ohne weiteren Query.
+- All-Time-Aggregat je Übung (Favoriten, Satzanzahl, letzte Einheit je
+  Muskelgruppe) – ein GROUP-BY-Query statt Zählungen je Helfer.
+
+Jede Datenquelle ist ein ``cached_property``: Ein Helfer, der allein aufgerufen
+wird, lädt nur, was er braucht; im Dashboard wird jede Quelle genau einmal
+gelesen (feste Query-Anzahl, unabhängig von der Datenmenge).
+"""
+
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from functools import cached_property
+
+from django.db.models import Count, Max, Q
+
+from core.helpers.volume import get_user_kg
+from core.models import (
+    CardioEinheit,
+    Satz,
+    Trainingsblock,
+    Trainingseinheit,
+    TrainingsPause,
+    Uebung,
+)
+from core.utils.week_classification import IsoWochenKalender
+
+# Streak prüft 53 ISO-Wochen (laufende + 52), Heatmap 365 Tage.
+SNAPSHOT_WOCHEN = 53
+# Maximale Session-Anzahl des Session-RPE-Trends (Dashboard-Karte).
+SESSION_TREND_MAX = 12
+
+
+def _als_zeitpunkt(wert):
+    """``date`` → Mitternacht UTC, wie Django ``datum__gte=<date>`` auslegt."""
+    if isinstance(wert, date) and not isinstance(wert, datetime):
+        return datetime.combine(wert, time.min, tzinfo=dt_timezone.utc)
+    return wert
+
+
+class UserTrainingSnapshot:
+    """Trainingsdaten eines Users zu einem Stichtag, einmal geladen.
+
+    ``heute`` darf ``datetime`` oder ``date`` sein (Stats-Seite übergibt ein
+    Datum); Zeitgrenzen aus ``date``-Werten gelten ab Mitternacht.
+    """
+
+    def __init__(self, user, heute):
+        self.user = user
+        self.heute = heute
+
+    # ------------------------------------------------------------------
+    # Datenquellen (je ein Query, lazy)
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def start(self):
+        """Früheste geladene Session-Zeit (inklusiv)."""
+        heute = _als_zeitpunkt(self.heute)
+        montag = heute - timedelta(days=heute.isoweekday() - 1)
+        montag = montag.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = montag - timedelta(weeks=SNAPSHOT_WOCHEN - 1)
+        letzte = list(
+            Trainingseinheit.objects.filter(user=self.user, abgeschlossen=True)
+            .order_by("-datum")
+            .values_list("datum", flat=True)[:SESSION_TREND_MAX]
+        )
+        if letzte and letzte[-1] < start:
+            start = letzte[-1]
+        return start
+
+    @cached_property
+    def trainings(self) -> list:
+        """Sessions ab ``start``, chronologisch."""
+        return list(
+            Trainingseinheit.objects.filter(user=self.user, datum__gte=self.start)
+            .only("id", "datum", "ist_deload", "abgeschlossen", "plan_id")
+            .order_by("datum", "id")
+        )
+
+    @cached_property
+    def saetze(self) -> list:
+        """Alle Sätze (inkl. Warmup/Deload) ab ``start`` mit Einheit und Übung."""
+        return list(
+            Satz.objects.filter(einheit__user=self.user, einheit__datum__gte=self.start)
+            .select_related("einheit", "uebung")
+            .order_by("einheit__datum", "einheit_id", "satz_nr", "id")
+        )
+
+    @cached_property
+    def pausen(self) -> list:
+        return list(TrainingsPause.objects.filter(user=self.user))
+
+    @cached_property
+    def cardio(self) -> list:
+        return list(CardioEinheit.objects.filter(user=self.user, datum__gte=self.start.date()))
+
+    @cached_property
+    def user_kg(self) -> float:
+        return get_user_kg(self.user)
+
+    @cached_property
+    def active_block(self):
+        """Aktuell aktiver Trainingsblock (``end_datum=None``) oder None."""
+        return (
+            Trainingsblock.objects.filter(user=self.user, end_datum__isnull=True)
+            .order_by("-start_datum")
+            .first()
+        )
+
+    @cached_property
+    def gesamt_trainings(self) -> int:
+        return Trainingseinheit.objects.filter(user=self.user).count()
+
+    @cached_property
+    def _uebung_aggregat(self) -> list[dict]:
+        """All-Time je Übung: Arbeitssätze (ohne Deload) und letzte Einheit."""
+        return list(
+            Satz.objects.filter(
+                einheit__user=self.user, ist_aufwaermsatz=False, einheit__ist_deload=False
+            )
+            .values("uebung__bezeichnung", "uebung__id", "uebung__muskelgruppe")
+            .annotate(anzahl=Count("id"), zuletzt=Max("einheit__datum"))
+            .order_by("-anzahl", "uebung__id")
+        )
+
+    @cached_property
+    def muskelgruppen_katalog(self) -> set:
+        """Muskelgruppen aller für den User sichtbaren Übungen."""
+        return set(
+            Uebung.objects.filter(Q(is_custom=False) | Q(created_by=self.user)).values_list(
+                "muskelgruppe", flat=True
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Abgeleitete Werte (ohne weitere Queries)
+    # ------------------------------------------------------------------
+
+    @property
+    def favoriten(self) -> list[dict]:
+        """Top-3 Übungen nach Arbeitssätzen (Format wie ``.values().annotate()``)."""
+        return [
+            {
+                "uebung__bezeichnung": row["uebung__bezeichnung"],
+                "uebung__id": row["uebung__id"],
+                "anzahl": row["anzahl"],
+            }
+            for row in self._uebung_aggregat[:3]
+        ]
+
+    @property
+    def gesamt_saetze(self) -> int:
+        """Arbeitssätze ohne Deload, All-Time."""
+        return sum(row["anzahl"] for row in self._uebung_aggregat)
+
+    @property
+    def letztes_training_je_muskelgruppe(self) -> dict:
+        """{muskelgruppe: Datum der letzten Einheit mit Arbeitssatz} (All-Time)."""
+        result: dict = {}
+        for row in self._uebung_aggregat:
+            mg = row["uebung__muskelgruppe"]
+            if mg not in result or row["zuletzt"] > result[mg]:
+                result[mg] = row["zuletzt"]
+        return result
+
+    def trainings_im_zeitraum(self, seit=None, bis=None) -> list:
+        """Sessions mit ``seit <= datum < bis`` (None = offen)."""
+        seit, bis = _als_zeitpunkt(seit), _als_zeitpunkt(bis)
+        return [
+            t
+            for t in self.trainings
+            if (seit is None or t.datum >= seit) and (bis is None or t.datum < bis)
+        ]
+
+    def arbeitssaetze(self, seit=None, bis=None, *, mit_deload: bool = False) -> list:
+        """Arbeitssätze (kein Warmup) mit ``seit <= einheit.datum < bis``."""
+        seit, bis = _als_zeitpunkt(seit), _als_zeitpunkt(bis)
+        return [
+            s
+            for s in self.saetze
+            if not s.ist_aufwaermsatz
+            and (mit_deload or not s.einheit.ist_deload)
+            and (seit is None or s.einheit.datum >= seit)
+            and (bis is None or s.einheit.datum < bis)
+        ]
+
+    @cached_property
+    def kalender(self) -> IsoWochenKalender:
+        """ISO-Wochen-Kalender der geladenen Sessions (kein eigener Query)."""
+        return IsoWochenKalender(
+            ((t.id, t.datum, t.abgeschlossen, t.ist_deload) for t in self.trainings),
+            self.pausen,
+            _als_zeitpunkt(self.heute).date(),
+        )
+
+    def kalender_seit(self, seit_datum) -> IsoWochenKalender:
+        """Kalender, der mindestens ab ``seit_datum`` vollständig ist.
+
+        Liegt ``seit_datum`` vor dem geladenen Zeitraum (Block älter als ein
+        Jahr), wird ausnahmsweise ein eigener Kalender nachgeladen.
+        """
+        if seit_datum < self.start.date():
+            return IsoWochenKalender.fuer_user(
+                self.user, _als_zeitpunkt(self.heute).date(), pausen=self.pausen, seit=seit_datum
+            )
+        return self.kalender
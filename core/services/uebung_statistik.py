@@ -0,0 +1,160 @@
+"""Pflege der materialisierten Übungs-Statistik (``UebungTagesStatistik``).
+
+Die Tabelle hält je (Trainingseinheit, Übung) die Kennzahlen, die vorher bei
+jedem Seitenaufruf aus allen Sätzen neu gerechnet wurden. Schreibpfade:
+
+- ``aktualisiere_statistik`` – eine Zeile neu berechnen (Satz save/delete,
+  siehe ``core/signals.py``).
+- ``rebuild_fuer_user`` – alle Zeilen eines Users in wenigen Queries neu
+  aufbauen (Backfill, ``manage.py rebuild_uebung_statistik``); mit
+  ``einheit_ids`` nur die Zeilen dieser Einheiten (Bulk-Import).
+- ``aktualisiere_koerpergewicht`` – KOERPERGEWICHT-Zeilen, deren gespeichertes
+  Körpergewicht nicht mehr zum Verlauf passt, beim Lesen nachziehen. Damit
+  braucht es keinen Signal-Fan-out bei jedem KoerperWerte-Eintrag.
+
+Rechenregeln (bewusst identisch zu den bisherigen Live-Berechnungen):
+- Roh-1RM: Epley mit ``wiederholungen or 1`` (Kraftstandards, Plateau, Saleria).
+- Effektive Werte: ``_compute_1rm_and_weight`` (Stats-Seite einer Übung).
+- Bei Gleichstand gewinnt der erste Satz in ``satz_nr``-Reihenfolge.
+"""
+
+from django.db import transaction
+
+from core.models import Satz, UebungTagesStatistik
+
+
+def _roh_1rm(satz) -> float:
+    """Epley-Schätzung auf dem eingetragenen Gewicht (0 Wdh zählt als 1)."""
+    wdh = satz.wiederholungen or 1
+    return float(satz.gewicht) * (1 + wdh / 30.0)
+
+
+def _aggregiere(einheit, uebung, saetze, koerpergewicht: float) -> UebungTagesStatistik:
+    """Baut eine (ungespeicherte) Statistik-Zeile aus den Arbeitssätzen einer Einheit."""
+    from core.views.training_stats import _compute_1rm_and_weight
+
+    stat = UebungTagesStatistik(user_id=einheit.user_id, einheit=einheit, uebung=uebung)
+    stat.koerpergewicht = koerpergewicht if uebung.gewichts_typ == "KOERPERGEWICHT" else None
+    for satz in saetze:
+        stat.saetze_anzahl += 1
+
+        roh = _roh_1rm(satz)
+        if roh > stat.bestes_1rm:
+            stat.bestes_1rm = roh
+            stat.bester_satz = satz
+        if satz.gewicht > stat.max_gewicht:
+            stat.max_gewicht = satz.gewicht
+
+        one_rm, eff_gewicht = _compute_1rm_and_weight(satz, uebung, koerpergewicht)
+        stat.effektives_1rm = max(stat.effektives_1rm, one_rm)
+        stat.max_effektives_gewicht = max(stat.max_effektives_gewicht, eff_gewicht)
+        stat.tonnage += eff_gewicht * satz.wiederholungen
+        if float(satz.gewicht) == 0:
+            stat.max_wdh_ohne_gewicht = max(stat.max_wdh_ohne_gewicht or 0, satz.wiederholungen)
+
+        if satz.rpe is not None:
+            stat.rpe_summe += float(satz.rpe)
+            stat.rpe_anzahl += 1
+    return stat
+
+
+def _koerpergewicht_fuer(user_id: int, daten) -> dict:
+    """Historisches Körpergewicht je Trainingsdatum (ein Query, Bisect)."""
+    from django.contrib.auth.models import User
+
+    from core.views.training_stats import _get_koerpergewicht_map
+
+    return _get_koerpergewicht_map(User(pk=user_id), daten)
+
+
+@transaction.atomic
+def aktualisiere_statistik(einheit_id: int, uebung_id: int) -> UebungTagesStatistik | None:
+    """Berechnet die Zeile für (Einheit, Übung) neu; löscht sie ohne Arbeitssätze."""
+    saetze = list(
+        Satz.objects.filter(einheit_id=einheit_id, uebung_id=uebung_id, ist_aufwaermsatz=False)
+        .select_related("einheit", "uebung")
+        .order_by("satz_nr", "id")
+    )
+    if not saetze:
+        UebungTagesStatistik.objects.filter(einheit_id=einheit_id, uebung_id=uebung_id).delete()
+        return None
+
+    einheit, uebung = saetze[0].einheit, saetze[0].uebung
+    koerpergewicht = 0.0
+    if uebung.gewichts_typ == "KOERPERGEWICHT":
+        koerpergewicht = _koerpergewicht_fuer(einheit.user_id, [einheit.datum])[einheit.datum]
+
+    neu = _aggregiere(einheit, uebung, saetze, koerpergewicht)
+    UebungTagesStatistik.objects.filter(einheit_id=einheit_id, uebung_id=uebung_id).delete()
+    neu.save()
+    return neu
+
+
+@transaction.atomic
+def rebuild_fuer_user(user_id: int, einheit_ids=None) -> int:
+    """Baut die Statistik-Zeilen eines Users neu auf. Gibt die Zeilenanzahl zurück.
+
+    ``einheit_ids``: nur Zeilen dieser Einheiten (``bulk_create`` umgeht die Signale).
+    """
+    saetze = (
+        Satz.objects.filter(einheit__user_id=user_id, ist_aufwaermsatz=False)
+        .select_related("einheit", "uebung")
+        .order_by("einheit_id", "uebung_id", "satz_nr", "id")
+    )
+    bestehend = UebungTagesStatistik.objects.filter(user_id=user_id)
+    if einheit_ids is not None:
+        saetze = saetze.filter(einheit_id__in=einheit_ids)
+        bestehend = bestehend.filter(einheit_id__in=einheit_ids)
+    gruppen: dict[tuple[int, int], list] = {}
+    for satz in saetze:
+        gruppen.setdefault((satz.einheit_id, satz.uebung_id), []).append(satz)
+
+    kg_daten = {
+        s[0].einheit.datum for s in gruppen.values() if s[0].uebung.gewichts_typ == "KOERPERGEWICHT"
+    }
+    kg_map = _koerpergewicht_fuer(user_id, list(kg_daten)) if kg_daten else {}
+
+    zeilen = [
+        _aggregiere(s[0].einheit, s[0].uebung, s, kg_map.get(s[0].einheit.datum, 0.0))
+        for s in gruppen.values()
+    ]
+    bestehend.delete()
+    UebungTagesStatistik.objects.bulk_create(zeilen, batch_size=500)
+    return len(zeilen)
+
+
+def backfill_falls_leer(user_id: int, uebung_id: int) -> bool:
+    """Baut die Zeilen einer Übung nach, falls noch keine existieren.
+
+    Sicherheitsnetz für Bestandsdaten, solange der Backfill-Command noch nicht
+    gelaufen ist. Gibt True zurück, wenn Zeilen angelegt wurden.
+    """
+    if UebungTagesStatistik.objects.filter(user_id=user_id, uebung_id=uebung_id).exists():
+        return False
+    einheit_ids = set(
+        Satz.objects.filter(
+            einheit__user_id=user_id, uebung_id=uebung_id, ist_aufwaermsatz=False
+        ).values_list("einheit_id", flat=True)
+    )
+    for einheit_id in einheit_ids:
+        aktualisiere_statistik(einheit_id, uebung_id)
+    return bool(einheit_ids)
+
+
+def aktualisiere_koerpergewicht(statistiken, kg_map: dict) -> list:
+    """Zieht KOERPERGEWICHT-Zeilen nach, deren Körpergewicht vom Verlauf abweicht.
+
+    ``statistiken``: Zeilen mit geladener ``einheit``; ``kg_map``: {datum: kg}
+    aus ``_get_koerpergewicht_map``. Gibt die (ggf. ersetzten) Zeilen zurück.
+    """
+    ergebnis = []
+    for stat in statistiken:
+        soll = kg_map.get(stat.einheit.datum)
+        if soll is not None and stat.koerpergewicht != soll:
+            neu = aktualisiere_statistik(stat.einheit_id, stat.uebung_id)
+            if neu is None:
+                continue
+            neu.einheit = stat.einheit
+            stat = neu
+        ergebnis.append(stat)
+    return ergebnis
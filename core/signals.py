@@ -1,9 +1,37 @@
 from django.contrib.auth.models import User
-from django.core.cache import cache
-from django.db.models.signals import post_delete, post_save
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import Trainingseinheit, TrainingsPause, UserProfile
+from .models import (
+    Equipment,
+    KoerperWerte,
+    MLPredictionModel,
+    Plan,
+    PlanUebung,
+    Satz,
+    Trainingsblock,
+    Trainingseinheit,
+    TrainingsPause,
+    UserProfile,
+)
+from .services import dashboard_cache
+from .services.daten_version import erhoehe
+
+
+def _kaskade(kwargs, model) -> bool:
+    """True bei ``post_delete`` als Kaskade eines anderen Objekts (z.B. Einheit, User).
+
+    ``origin`` ist das Objekt bzw. QuerySet, dessen ``delete()`` gerufen wurde.
+    Abgeleitete Daten zieht dann ein Handler des Ursprungs einmal mengenbasiert
+    nach, statt je gelöschter Zeile.
+    """
+    origin = kwargs.get("origin")
+    if origin is None:
+        return False
+    if isinstance(origin, QuerySet):
+        return origin.model is not model
+    return not isinstance(origin, model)
 
 
 @receiver(post_save, sender=User)
@@ -13,15 +41,35 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.get_or_create(user=instance)
 
 
+# ---------------------------------------------------------------------------
+# Daten-Versionen (versionierte Cache-Keys, core/services/daten_version.py)
+# ---------------------------------------------------------------------------
+
+
 @receiver(post_save, sender=Trainingseinheit)
+@receiver(post_delete, sender=Trainingseinheit)
 def invalidate_dashboard_cache(sender, instance, **kwargs):
-    """Invalidiert den Dashboard-Cache wenn ein Training gespeichert wird.
+    """Invalidiert Dashboard/Statistiken wenn ein Training gespeichert/gelöscht wird.
 
     Stellt sicher dass Streak, Volumen-Trends und Performance-Warnings
     nach dem Training sofort aktuell sind.
     """
-    if instance.user_id:
-        cache.delete(f"dashboard_computed_{instance.user_id}")
+    erhoehe(instance.user_id, "einheiten")
+
+
+@receiver(post_save, sender=Satz)
+@receiver(post_delete, sender=Satz)
+def satz_version_erhoehen(sender, instance, raw=False, **kwargs):
+    """Satz anlegen/ändern/löschen (add_set, update_set, delete_set, Offline-Sync)."""
+    if raw or _kaskade(kwargs, Satz):
+        return
+    erhoehe(instance.einheit.user_id, "saetze")
+
+
+@receiver(post_save, sender=KoerperWerte)
+@receiver(post_delete, sender=KoerperWerte)
+def koerper_version_erhoehen(sender, instance, **kwargs):
+    erhoehe(instance.user_id, "koerper")
 
 
 @receiver(post_save, sender=TrainingsPause)
@@ -29,9 +77,140 @@ def invalidate_dashboard_cache(sender, instance, **kwargs):
 def invalidate_dashboard_cache_on_pause(sender, instance, **kwargs):
     """Invalidiert den Dashboard-Cache bei Anlegen/Ändern/Löschen einer Pause.
 
-    Der Dashboard-Block (Streak/Volumen/Fatigue) ist jetzt pause-bewusst und wird
-    unter `dashboard_computed_<user>` gecacht – ohne Invalidierung bei post_save
-    UND post_delete zeigte das Dashboard bis zum TTL den alten Stand (§32.2, ⑬).
+    Der Dashboard-Block (Streak/Volumen/Fatigue) ist pause-bewusst – ohne
+    Invalidierung bei post_save UND post_delete zeigte das Dashboard bis zum
+    TTL den alten Stand (§32.2, ⑬). Danach wird der Block per
+    Hintergrund-Job vorgewärmt.
     """
     if instance.user_id:
-        cache.delete(f"dashboard_computed_{instance.user_id}")
+        erhoehe(instance.user_id, "pausen")
+        dashboard_cache.aufwaermen_einreihen(instance.user_id)
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+@receiver(post_save, sender=Trainingsblock)
+@receiver(post_delete, sender=Trainingsblock)
+def plan_version_erhoehen(sender, instance, **kwargs):
+    erhoehe(instance.user_id, "plaene")
+
+
+@receiver(post_save, sender=PlanUebung)
+@receiver(post_delete, sender=PlanUebung)
+def plan_uebung_version_erhoehen(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    plan = Plan.objects.filter(pk=instance.plan_id).only("user_id").first()
+    if plan is not None:
+        erhoehe(plan.user_id, "plaene")
+
+
+@receiver(m2m_changed, sender=Equipment.users.through)
+def equipment_version_erhoehen(sender, instance, action, reverse, pk_set, **kwargs):
+    """Verfügbares Equipment geändert – von beiden Seiten der M2M-Relation."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:  # instance ist der User
+        erhoehe(instance.pk, "equipment")
+    elif action == "post_clear":
+        return  # pk_set unbekannt; Equipment.users.clear() nutzt die App nicht
+    else:
+        for user_id in pk_set or ():
+            erhoehe(user_id, "equipment")
+
+
+@receiver(post_save, sender=MLPredictionModel)
+@receiver(post_delete, sender=MLPredictionModel)
+def ml_version_erhoehen(sender, instance, **kwargs):
+    erhoehe(instance.user_id, "ml")
+
+
+@receiver(post_save, sender=Satz)
+@receiver(post_delete, sender=Satz)
+def aktualisiere_uebung_statistik(sender, instance, raw=False, **kwargs):
+    """Hält ``UebungTagesStatistik`` für (Einheit, Übung) des Satzes aktuell.
+
+    ``raw`` (loaddata) wird übersprungen – Fixtures werden danach per
+    ``manage.py rebuild_uebung_statistik`` nachgezogen. Kaskaden: die Zeilen
+    hängen per CASCADE an der Einheit.
+    """
+    if raw or _kaskade(kwargs, Satz):
+        return
+    from .services.uebung_statistik import aktualisiere_statistik
+
+    aktualisiere_statistik(instance.einheit_id, instance.uebung_id)
+
+
+@receiver(post_save, sender=Satz)
+@receiver(post_delete, sender=Satz)
+def aktualisiere_ml_features(sender, instance, raw=False, **kwargs):
+    """Hält den ML-Feature-Store (``MLFeatureZeile``) für (Einheit, Übung) aktuell.
+
+    Die ganze Gruppe wird neu berechnet: ein gelöschter oder umsortierter Satz
+    verschiebt die Satz-Nummern der übrigen. ``raw`` → ``manage.py rebuild_ml_features``.
+    Kaskaden: die Zeilen hängen per CASCADE an der Einheit.
+    """
+    if raw or _kaskade(kwargs, Satz):
+        return
+    from .services.ml_features import aktualisiere_gruppe
+
+    aktualisiere_gruppe(instance.einheit_id, instance.uebung_id)
+
+
+@receiver(post_save, sender=Satz)
+def aktualisiere_persoenlichen_rekord(sender, instance, created=False, raw=False, **kwargs):
+    """Hält ``PersoenlicherRekord`` für (User, Übung) des Satzes aktuell (PR-Erkennung)."""
+    if raw:
+        return
+    from .services.persoenliche_rekorde import aktualisiere_rekord
+
+    aktualisiere_rekord(instance, created=created)
+
+
+@receiver(post_delete, sender=Satz)
+def persoenliche_rekorde_nach_loeschen(sender, instance, **kwargs):
+    """Rekorde, deren Rekordsatz gelöscht wurde, aus den übrigen Sätzen neu berechnen."""
+    if _kaskade(kwargs, Satz):
+        return  # einheit_geloescht bzw. CASCADE über den User
+    from .services.persoenliche_rekorde import rekorde_nach_loeschen
+
+    rekorde_nach_loeschen(instance)
+
+
+@receiver(post_save, sender=Trainingseinheit)
+def rekorde_nach_deload_wechsel(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Deload-Umschalten (``save(update_fields=["ist_deload"])``) ändert, welche
+    Sätze als Rekord zählen → Rekorde der Übungen dieser Einheit neu berechnen.
+    """
+    if raw or created or not update_fields or "ist_deload" not in update_fields:
+        return
+    from .services.persoenliche_rekorde import berechne_rekord
+
+    uebung_ids = set(instance.saetze.values_list("uebung_id", flat=True))
+    for uebung_id in uebung_ids:
+        berechne_rekord(instance.user_id, uebung_id)
+
+
+@receiver(pre_delete, sender=Trainingseinheit)
+def einheit_uebungen_merken(sender, instance, **kwargs):
+    """Übungen der Einheit merken – in ``post_delete`` sind die Sätze schon weg."""
+    if not _kaskade(kwargs, Trainingseinheit):
+        instance._geloeschte_uebung_ids = set(instance.saetze.values_list("uebung_id", flat=True))
+
+
+@receiver(post_delete, sender=Trainingseinheit)
+def einheit_geloescht(sender, instance, **kwargs):
+    """Abgeleitete Daten nach dem Löschen einer Einheit einmal mengenbasiert nachziehen.
+
+    Die Satz-Receiver überspringen die Kaskade. Statistik- und ML-Zeilen hängen
+    per CASCADE an der Einheit; Rekorde der betroffenen Übungen werden wie beim
+    Offline-Sync mit fester Query-Anzahl neu berechnet. Löscht ein User-Delete
+    die Einheit, verschwinden auch die Rekorde per CASCADE.
+    """
+    uebung_ids = getattr(instance, "_geloeschte_uebung_ids", None)
+    if not uebung_ids or not instance.user_id:
+        return
+    from .services.persoenliche_rekorde import berechne_rekorde
+
+    erhoehe(instance.user_id, "saetze")
+    berechne_rekorde(instance.user_id, uebung_ids)
@@ -0,0 +1,51 @@
+/**
+ * Hintergrund-Jobs – Polling für eingereihte Jobs
+ * Pollt /api/jobs/<id>/ bis der Job fertig ist (KI-Plan, ML-Training, PDF-Report)
+ */
+
+/**
+ * Wartet auf einen Hintergrund-Job.
+ *
+ * @param {number} jobId - ID aus der 202-Antwort ({job_id})
+ * @param {function} [onFortschritt] - Callback(fortschritt, schritt) bei jedem Poll
+ * @param {number} [intervallMs] - Abstand zwischen zwei Polls
+ * @returns {Promise<object>} Status-Dict des fertigen Jobs (ergebnis, download_url?)
+ */
+function warteAufJob(jobId, onFortschritt, intervallMs = 1500) {
+    return new Promise((resolve, reject) => {
+        function poll() {
+            fetch(`/api/jobs/${jobId}/`, { credentials: 'same-origin' })
+                .then(r => {
+                    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+                    return r.json();
+                })
+                .then(job => {
+                    if (onFortschritt) onFortschritt(job.fortschritt, job.schritt);
+                    if (job.status === 'FERTIG') resolve(job);
+                    else if (job.status === 'FEHLER') reject(new Error(job.fehler || 'Job fehlgeschlagen'));
+                    else setTimeout(poll, intervallMs);
+                })
+                .catch(reject);
+        }
+        poll();
+    });
+}
+
+/**
+ * Startet einen Job per fetch und wartet auf das Ergebnis.
+ * Antwortet der Server synchron (kein job_id), wird die Antwort direkt geliefert.
+ *
+ * @param {string} url - Endpoint mit async-Unterstützung
+ * @param {object} fetchOptionen - Optionen für fetch()
+ * @param {function} [onFortschritt] - Callback(fortschritt, schritt)
+ * @returns {Promise<object>} Job-Ergebnis bzw. synchrone Antwort
+ */
+function starteJob(url, fetchOptionen, onFortschritt) {
+    return fetch(url, { credentials: 'same-origin', ...fetchOptionen })
+        .then(r => r.json())
+        .then(data => {
+            if (!data.job_id) return data;
+            return warteAufJob(data.job_id, onFortschritt)
+                .then(job => ({ ...(job.ergebnis || {}), download_url: job.download_url }));
+        });
+}
@@ -1,6 +1,9 @@
 // Offline Status Indicator & IndexedDB Manager
 // Zeigt Connection Status und cached kritische Daten offline
 
+// Max. Items je Sync-Request (Server: MAX_ITEMS in core/services/offline_sync.py)
+const SYNC_BATCH_GROESSE = 500;
+
 class OfflineManager {
     constructor() {
         this.dbName = 'HomeGymDB';
@@ -142,73 +145,80 @@ class OfflineManager {
             // CSRF Token holen
             const csrfToken = this.getCSRFToken();
 
-            const response = await fetch('/api/sync-offline/', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': csrfToken
-                },
-                body: JSON.stringify(validData)
-            });
+            // Ältere Einträge ohne Schlüssel: stabil aus ID + Timestamp ableiten
+            const items = validData.map(item => ({
+                ...item,
+                idempotency_key: item.idempotency_key || `offline-${item.id}-${item.timestamp}`
+            }));
+
+            let syncedCount = 0;
+            let failedCount = 0;
+
+            // Größere Backlogs in Teilen – der Server lehnt Batches über MAX_ITEMS ab
+            for (let start = 0; start < items.length; start += SYNC_BATCH_GROESSE) {
+                const response = await fetch('/api/v2/sync-offline/', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': csrfToken
+                    },
+                    body: JSON.stringify({ items: items.slice(start, start + SYNC_BATCH_GROESSE) })
+                });
+
+                if (!response.ok) {
+                    const errorText = await response.text();
+                    console.error('[Manual Sync] Server error:', response.status, errorText);
+                    this.showToast('Sync fehlgeschlagen: ' + response.status, 'error');
+                    break;
+                }
 
-            if (response.ok) {
                 const result = await response.json();
                 console.log('[Manual Sync] Response:', result);
 
-                let syncedCount = 0;
-                let failedCount = 0;
-
                 // Markiere erfolgreiche Syncs
-                if (result.results) {
-                    for (const syncResult of result.results) {
-                        if (syncResult.success) {
-                            await this.markAsSynced('trainingData', syncResult.id);
-                            syncedCount++;
-                            console.log('[Manual Sync] Marked as synced:', syncResult.id);
-                        } else {
-                            failedCount++;
-                            console.warn('[Manual Sync] Sync failed for:', syncResult.id, syncResult.error);
-                        }
-                    }
-                }
-
-                // Zeige detailliertes Feedback
-                if (syncedCount > 0) {
-                    const message = syncedCount === 1
-                        ? '✓ 1 Satz synchronisiert'
-                        : `✓ ${syncedCount} Sätze synchronisiert`;
-
-                    // Verwende window.showToast falls vorhanden (von toast.js), sonst diese Methode
-                    if (typeof window.showToast === 'function') {
-                        window.showToast(message, 'success', 3000);
+                for (const syncResult of result.results || []) {
+                    if (syncResult.success) {
+                        await this.markAsSynced('trainingData', syncResult.id);
+                        syncedCount++;
+                        console.log('[Manual Sync] Marked as synced:', syncResult.id);
                     } else {
-                        this.showToast(message, 'success');
+                        failedCount++;
+                        console.warn('[Manual Sync] Sync failed for:', syncResult.id, syncResult.error);
                     }
                 }
+            }
 
-                if (failedCount > 0) {
-                    const message = `⚠ ${failedCount} Satz(e) konnten nicht synchronisiert werden`;
-                    if (typeof window.showToast === 'function') {
-                        window.showToast(message, 'warning', 4000);
-                    } else {
-                        this.showToast(message, 'warning');
-                    }
+            // Zeige detailliertes Feedback
+            if (syncedCount > 0) {
+                const message = syncedCount === 1
+                    ? '✓ 1 Satz synchronisiert'
+                    : `✓ ${syncedCount} Sätze synchronisiert`;
+
+                // Verwende window.showToast falls vorhanden (von toast.js), sonst diese Methode
+                if (typeof window.showToast === 'function') {
+                    window.showToast(message, 'success', 3000);
+                } else {
+                    this.showToast(message, 'success');
                 }
+            }
 
-                // Seite nach kurzer Verzögerung neu laden
-                if (syncedCount > 0) {
-                    setTimeout(() => {
-                        if (window.location.pathname.includes('/training/')) {
-                            console.log('[Manual Sync] Reloading page...');
-                            window.location.reload();
-                        }
-                    }, 1500);
+            if (failedCount > 0) {
+                const message = `⚠ ${failedCount} Satz(e) konnten nicht synchronisiert werden`;
+                if (typeof window.showToast === 'function') {
+                    window.showToast(message, 'warning', 4000);
+                } else {
+                    this.showToast(message, 'warning');
                 }
+            }
 
-            } else {
-                const errorText = await response.text();
-                console.error('[Manual Sync] Server error:', response.status, errorText);
-                this.showToast('Sync fehlgeschlagen: ' + response.status, 'error');
+            // Seite nach kurzer Verzögerung neu laden
+            if (syncedCount > 0) {
+                setTimeout(() => {
+                    if (window.location.pathname.includes('/training/')) {
+                        console.log('[Manual Sync] Reloading page...');
+                        window.location.reload();
+                    }
+                }, 1500);
             }
 
         } catch (error) {
@@ -341,10 +351,15 @@ class OfflineManager {
             const transaction = this.db.transaction([storeName], 'readwrite');
             const store = transaction.objectStore(storeName);
 
-            // Timestamp und Sync-Status hinzufügen
+            // Timestamp, Sync-Status und Idempotenz-Schlüssel hinzufügen
+            // (Schlüssel bleibt über Retries gleich → Server legt nichts doppelt an)
+            const timestamp = Date.now();
             const dataToSave = {
                 ...data,
-                timestamp: Date.now(),
+                timestamp: timestamp,
+                idempotency_key: (self.crypto && crypto.randomUUID)
+                    ? crypto.randomUUID()
+                    : `offline-${timestamp}-${Math.random().toString(36).slice(2)}`,
                 synced: false
             };
 
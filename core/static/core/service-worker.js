@@ -1,4 +1,4 @@
-const CACHE_NAME = 'homegym-v5'; // Version erhöht für Cache-Clear
+const CACHE_NAME = 'homegym-v7'; // Version erhöht für Cache-Clear
 const urlsToCache = [
   '/',
   '/dashboard/',
@@ -182,6 +182,9 @@ self.addEventListener('fetch', event => {
   );
 });
 
+// Max. Items je Sync-Request (Server: MAX_ITEMS in core/services/offline_sync.py)
+const SYNC_BATCH_GROESSE = 500;
+
 // Background Sync
 self.addEventListener('sync', event => {
   console.log('[Service Worker] Background sync:', event.tag);
@@ -205,41 +208,49 @@ async function syncTrainingData() {
 
     console.log(`[Service Worker] Found ${unsyncedData.length} unsynced items`);
 
-    // POST alle unsynced Items als Batch
-    const response = await fetch('/api/sync-offline/', {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'X-CSRFToken': await getCSRFToken()
-      },
-      body: JSON.stringify(unsyncedData)
-    });
+    // POST alle unsynced Items als Batch (v2: Idempotenz-Schlüssel je Item,
+    // ältere Einträge ohne Schlüssel → stabil aus ID + Timestamp)
+    const items = unsyncedData.map(item => ({
+      ...item,
+      idempotency_key: item.idempotency_key || `offline-${item.id}-${item.timestamp}`
+    }));
+    // Größere Backlogs in Teilen – der Server lehnt Batches über MAX_ITEMS ab
+    let syncedCount = 0;
+    for (let start = 0; start < items.length; start += SYNC_BATCH_GROESSE) {
+      const response = await fetch('/api/v2/sync-offline/', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-CSRFToken': await getCSRFToken()
+        },
+        body: JSON.stringify({ items: items.slice(start, start + SYNC_BATCH_GROESSE) })
+      });
+
+      if (!response.ok) {
+        throw new Error('Sync failed: ' + response.status);
+      }
 
-    if (response.ok) {
       const result = await response.json();
       console.log('[Service Worker] Sync response:', result);
+      syncedCount += result.synced_count || 0;
 
-      // Markiere erfolgreiche Syncs
-      if (result.results) {
-        for (const item of result.results) {
-          if (item.success) {
-            await markAsSynced(db, 'trainingData', item.id);
-            console.log('[Service Worker] Synced:', item.id);
-          }
+      // Markiere erfolgreiche Syncs (bereits gesendete Teile bleiben beim Retry markiert)
+      for (const item of result.results || []) {
+        if (item.success) {
+          await markAsSynced(db, 'trainingData', item.id);
+          console.log('[Service Worker] Synced:', item.id);
         }
       }
+    }
 
-      // Notify clients
-      const clients = await self.clients.matchAll();
-      clients.forEach(client => {
-        client.postMessage({
-          type: 'SYNC_COMPLETE',
-          synced_count: result.synced_count || 0
-        });
+    // Notify clients
+    const clients = await self.clients.matchAll();
+    clients.forEach(client => {
+      client.postMessage({
+        type: 'SYNC_COMPLETE',
+        synced_count: syncedCount
       });
-    } else {
-      throw new Error('Sync failed: ' + response.status);
-    }
+    });
   } catch (error) {
     console.error('[Service Worker] Sync failed:', error);
     throw error; // Retry sync later
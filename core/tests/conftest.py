@@ -92,10 +92,12 @@ def clear_cache_between_tests():
 
 @pytest.fixture(autouse=True)
 def use_temp_media_root(settings, tmp_path):
-    """Leitet MEDIA_ROOT in ein temporäres Verzeichnis um.
+    """Leitet MEDIA_ROOT, JOB_DATEI_ROOT und PDF_CACHE_ROOT in temporäre Verzeichnisse um.
 
-    Verhindert dass Tests echte Dateien in media/ hinterlassen.
+    Verhindert dass Tests echte Dateien in media/ bzw. private/ hinterlassen.
     Jeder Test bekommt sein eigenes Temp-Verzeichnis, das nach dem Test
     automatisch gelöscht wird.
     """
     settings.MEDIA_ROOT = tmp_path / "test_media"
+    settings.JOB_DATEI_ROOT = tmp_path / "test_jobs"
+    settings.PDF_CACHE_ROOT = tmp_path / "test_pdf_cache"
@@ -476,8 +476,9 @@ class TestAiEndpointsExtended:
     @patch("core.views.ai_recommendations._check_ai_rate_limit", return_value=None)
     @patch("ai_coach.plan_generator.PlanGenerator", side_effect=RuntimeError("boom"))
     def test_generate_plan_stream_generator_exception_returns_sse_error(
-        self, _mock_generator, _mock_rate_limit, client
+        self, _mock_generator, _mock_rate_limit, client, settings
     ):
+        settings.HINTERGRUND_JOBS_EAGER = True
         user = UserFactory()
         client.force_login(user)
         url = reverse("generate_plan_stream_api")
@@ -652,6 +652,15 @@ class TestAiRecommendationRemainingBranches:
 
         assert resp.status_code == 200
         assert resp.json()["ok"] is True
+        assert _mock_generator.call_args.kwargs["cache"] is True
+
+        client.post(
+            url,
+            json.dumps({"plan_type": "3er-split", "cache": False}),
+            content_type="application/json",
+            secure=True,
+        )
+        assert _mock_generator.call_args.kwargs["cache"] is False
 
     def test_apply_optimization_helpers(self, user):
         plan = Plan.objects.create(user=user, name="P")
@@ -804,8 +813,9 @@ class TestAiRecommendationRemainingBranches:
     @patch("core.views.ai_recommendations._check_ai_rate_limit", return_value=None)
     @patch("ai_coach.plan_generator.PlanGenerator")
     def test_generate_plan_stream_emits_progress_callback(
-        self, mock_generator_cls, _mock_limit, client
+        self, mock_generator_cls, _mock_limit, client, settings
     ):
+        settings.HINTERGRUND_JOBS_EAGER = True
         user = UserFactory()
         client.force_login(user)
         url = reverse("generate_plan_stream_api")
@@ -825,8 +835,9 @@ class TestAiRecommendationRemainingBranches:
     @patch("core.views.ai_recommendations._check_ai_rate_limit", return_value=None)
     @patch("ai_coach.plan_generator.PlanGenerator")
     def test_generate_plan_stream_failed_result_branch(
-        self, mock_generator_cls, _mock_limit, client
+        self, mock_generator_cls, _mock_limit, client, settings
     ):
+        settings.HINTERGRUND_JOBS_EAGER = True
         user = UserFactory()
         client.force_login(user)
         url = reverse("generate_plan_stream_api")
@@ -842,24 +853,16 @@ class TestAiRecommendationRemainingBranches:
         assert "broken" in payload
 
     @patch("core.views.ai_recommendations._check_ai_rate_limit", return_value=None)
-    def test_generate_plan_stream_timeout_branch(self, _mock_limit, client):
+    @patch("core.services.hintergrund_jobs.starte_im_webprozess")
+    def test_generate_plan_stream_timeout_branch(self, _mock_start, _mock_limit, client, settings):
+        # Job wird nie abgeholt → nach HINTERGRUND_JOBS_TIMEOUT Timeout-Event
+        settings.HINTERGRUND_JOBS_TIMEOUT = 0
         user = UserFactory()
         client.force_login(user)
         url = reverse("generate_plan_stream_api")
 
-        with (
-            patch("threading.Thread") as thread_cls,
-            patch("queue.Queue") as queue_cls,
-        ):
-            queue_instance = MagicMock()
-            import queue as std_queue
-
-            queue_instance.get.side_effect = std_queue.Empty
-            queue_cls.return_value = queue_instance
-            thread_cls.return_value = MagicMock(start=MagicMock())
-
-            resp = client.get(url, secure=True)
-            payload = b"".join(resp.streaming_content).decode("utf-8")
+        resp = client.get(url, secure=True)
+        payload = b"".join(resp.streaming_content).decode("utf-8")
 
         assert "Timeout" in payload and "erneut versuchen" in payload
 
@@ -1207,3 +1210,72 @@ class TestRepRangeEmpfehlung:
         result = ai_views._get_rep_range_empfehlung(saetze)
         warnings = [e for e in result if e["prioritaet"] != "info"]
         assert len(warnings) == 0
+
+
+@pytest.mark.django_db
+class TestLiveGuidanceStreamApi:
+    """POST /api/live-guidance/stream/ – SSE-Stream der Live-Guidance."""
+
+    def _post(self, client, payload):
+        return client.post(
+            reverse("live_guidance_stream_api"),
+            json.dumps(payload),
+            content_type="application/json",
+            secure=True,
+        )
+
+    @staticmethod
+    def _events(resp):
+        body = b"".join(resp.streaming_content).decode()
+        return [json.loads(block[6:]) for block in body.split("\n\n") if block]
+
+    @patch("ai_coach.live_guidance.LiveGuidance")
+    def test_stream_sanitized_schluss_event(self, mock_guidance_cls, client):
+        user = UserFactory()
+        session = TrainingseinheitFactory(user=user)
+        client.force_login(user)
+        mock_guidance_cls.return_value.stream_guidance.return_value = iter(
+            [
+                {"token": "Bleib ", "done": False},
+                {
+                    "done": True,
+                    "success": True,
+                    "answer": "Bleib stabil.",
+                    "cost": "0.02",
+                    "model": 123,
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 3},
+                    "metrics": {"ttft_ms": 90.0},
+                    "context": {"should_not": "leak"},
+                },
+            ]
+        )
+
+        resp = self._post(client, {"session_id": session.id, "question": "Wie war der Satz?"})
+
+        assert resp["Content-Type"] == "text/event-stream"
+        events = self._events(resp)
+        assert events[0] == {"token": "Bleib ", "done": False}
+        assert events[1]["cost"] == 0.02 and events[1]["model"] == "123"
+        assert "context" not in events[1]
+        kwargs = mock_guidance_cls.return_value.stream_guidance.call_args.kwargs
+        assert kwargs["trainingseinheit_id"] == session.id
+
+    def test_validierung_vor_dem_stream(self, client):
+        user = UserFactory()
+        client.force_login(user)
+        fremde = TrainingseinheitFactory(user=UserFactory())
+
+        assert self._post(client, {"session_id": fremde.id, "question": "?"}).status_code == 404
+        assert self._post(client, {"question": "?"}).status_code == 400
+        assert client.get(reverse("live_guidance_stream_api"), secure=True).status_code == 405
+
+    def test_rate_limit_gilt_auch_fuer_stream(self, client, settings):
+        settings.RATELIMIT_BYPASS = False
+        user = UserFactory()
+        session = TrainingseinheitFactory(user=user)
+        client.force_login(user)
+        user.profile.custom_ai_limit_guidance = 0
+        user.profile.save()
+
+        resp = self._post(client, {"session_id": session.id, "question": "?"})
+        assert resp.status_code == 429
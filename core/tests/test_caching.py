@@ -4,15 +4,22 @@ Tests für Phase 4.3 – Caching Strategy.
 Testet:
 - _load_templates(): Cache-Hit nach erstem Aufruf (kein File-I/O mehr)
 - Dashboard: Cache wird befüllt beim ersten Request
-- Dashboard: Cache wird invalidiert wenn User ein Training speichert
+- Dashboard: neuer (versionierter) Cache-Key wenn User ein Training speichert
+- Daten-Versionen: Sätze, Körperwerte, Equipment, Plan-update() ändern den Key
+- training_stats: Abschnitte einzeln gecacht, nur abhängige werden neu berechnet
 - Cache-Key-Isolation: User A sieht nicht den Cache von User B
+- Dashboard: Vorwärmen nach finish_training / Pausen-CRUD, Single-Flight
 """
 
+from unittest.mock import MagicMock, patch
+
 from django.core.cache import cache
 from django.urls import reverse
 
 import pytest
 
+from core.services.dashboard_cache import dashboard_cache_key
+
 
 @pytest.fixture(autouse=True)
 def clear_cache():
@@ -71,7 +78,7 @@ class TestDashboardCache:
         user = django_user_model.objects.create_user(
             username="cache_test_user", password="testpass123"
         )
-        cache_key = f"dashboard_computed_{user.id}"
+        cache_key = dashboard_cache_key(user.id)
         assert cache.get(cache_key) is None
 
         client.force_login(user)
@@ -86,7 +93,7 @@ class TestDashboardCache:
         user = django_user_model.objects.create_user(
             username="cache_keys_user", password="testpass123"
         )
-        cache_key = f"dashboard_computed_{user.id}"
+        cache_key = dashboard_cache_key(user.id)
 
         client.force_login(user)
         client.get(reverse("dashboard"))
@@ -116,16 +123,18 @@ class TestDashboardCache:
         user = django_user_model.objects.create_user(
             username="invalidation_user", password="testpass123"
         )
-        cache_key = f"dashboard_computed_{user.id}"
+        cache_key = dashboard_cache_key(user.id)
 
         # Cache befüllen
         client.force_login(user)
         client.get(reverse("dashboard"))
         assert cache.get(cache_key) is not None
 
-        # Neues Training speichern → Signal soll Cache löschen
+        # Neues Training speichern → Signal erhöht die Daten-Version
         Trainingseinheit.objects.create(user=user)
-        assert cache.get(cache_key) is None, (
+        neuer_key = dashboard_cache_key(user.id)
+        assert neuer_key != cache_key
+        assert cache.get(neuer_key) is None, (
             "Dashboard-Cache wurde nach neuem Training NICHT invalidiert. "
             "Signal in signals.py prüfen."
         )
@@ -143,8 +152,8 @@ class TestDashboardCache:
         client.force_login(user_a)
         client.get(reverse("dashboard"))
 
-        key_a = f"dashboard_computed_{user_a.id}"
-        key_b = f"dashboard_computed_{user_b.id}"
+        key_a = dashboard_cache_key(user_a.id)
+        key_b = dashboard_cache_key(user_b.id)
 
         assert cache.get(key_a) is not None
         assert (
@@ -152,6 +161,185 @@ class TestDashboardCache:
         ), "User B hat einen Cache-Eintrag obwohl er nie das Dashboard aufgerufen hat."
 
 
+@pytest.mark.django_db
+class TestDashboardVorwaermen:
+    def _job_ausfuehren(self, job):
+        from core.services.hintergrund_jobs import fuehre_job_aus, hole_naechsten_job
+
+        assert hole_naechsten_job("test") == job.pk
+        return fuehre_job_aus(job.pk, verbindung_schliessen=False)
+
+    def test_finish_training_waermt_dashboard_vor(
+        self, client, django_user_model, django_capture_on_commit_callbacks
+    ):
+        """Nach finish_training ist der erste Dashboard-Aufruf ein Cache-Hit."""
+        from core.models import HintergrundJob, Trainingseinheit
+
+        user = django_user_model.objects.create_user(username="warm_user", password="pw")
+        client.force_login(user)
+        training = Trainingseinheit.objects.create(user=user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(reverse("finish_training", args=[training.id]), {"dauer_minuten": "45"})
+        assert cache.get(dashboard_cache_key(user.id)) is None
+
+        job = HintergrundJob.objects.get(typ="dashboard_aufwaermen", user=user)
+        assert self._job_ausfuehren(job) == "FERTIG"
+        assert cache.get(dashboard_cache_key(user.id))["gesamt_trainings"] == 1
+
+        with patch("core.views.training_stats._compute_dashboard_block") as berechne:
+            assert client.get(reverse("dashboard")).status_code == 200
+        berechne.assert_not_called()
+
+    def test_wartender_job_wird_wiederverwendet(
+        self, django_user_model, django_capture_on_commit_callbacks
+    ):
+        """Mehrere Pausen-Änderungen hintereinander → ein Vorwärm-Job."""
+        from core.models import HintergrundJob
+        from core.tests.factories import TrainingsPauseFactory
+
+        user = django_user_model.objects.create_user(username="coalesce_user", password="pw")
+        with django_capture_on_commit_callbacks(execute=True):
+            pause = TrainingsPauseFactory(user=user)
+        with django_capture_on_commit_callbacks(execute=True):
+            pause.delete()
+        assert HintergrundJob.objects.filter(typ="dashboard_aufwaermen", user=user).count() == 1
+
+    def test_single_flight_wartet_auf_laufende_berechnung(self):
+        """Hält ein anderer den Lock, wird dessen Ergebnis übernommen statt neu gerechnet."""
+        from core.services import dashboard_cache
+
+        cache.add(dashboard_cache._lock_key(7), "anderer", timeout=60)
+
+        def fremdes_ergebnis(_sekunden):
+            cache.set(dashboard_cache.dashboard_cache_key(7), {"streak": 3})
+
+        berechne = MagicMock(return_value={"streak": 0})
+        with patch("core.services.dashboard_cache.time.sleep", side_effect=fremdes_ergebnis):
+            assert dashboard_cache.hole_oder_berechne(7, berechne) == {"streak": 3}
+        berechne.assert_not_called()
+
+    def test_single_flight_rechnet_einmal_und_gibt_lock_frei(self):
+        from core.services import dashboard_cache
+
+        berechne = MagicMock(return_value={"streak": 1})
+        assert dashboard_cache.hole_oder_berechne(8, berechne) == {"streak": 1}
+        assert dashboard_cache.hole_oder_berechne(8, berechne) == {"streak": 1}
+        assert berechne.call_count == 1
+        assert cache.get(dashboard_cache._lock_key(8)) is None
+
+
+@pytest.mark.django_db
+class TestDatenVersion:
+    def test_satz_aendert_dashboard_key(self):
+        """Sätze invalidierten bisher nichts – jetzt erhöht jede Änderung die Version."""
+        from core.tests.factories import SatzFactory, TrainingseinheitFactory
+
+        einheit = TrainingseinheitFactory()
+        key = dashboard_cache_key(einheit.user_id)
+        satz = SatzFactory(einheit=einheit)
+        nach_anlegen = dashboard_cache_key(einheit.user_id)
+        assert nach_anlegen != key
+
+        satz.gewicht = 100
+        satz.save()
+        assert dashboard_cache_key(einheit.user_id) != nach_anlegen
+
+    def test_koerperwerte_und_equipment(self):
+        from core.services.daten_version import versionen
+        from core.tests.factories import EquipmentFactory, KoerperWerteFactory, UserFactory
+
+        user = UserFactory()
+        vorher = versionen(user.id, "koerper", "equipment")
+        KoerperWerteFactory(user=user)
+        EquipmentFactory().users.add(user)
+        nachher = versionen(user.id, "koerper", "equipment")
+        assert nachher["koerper"] > vorher["koerper"]
+        assert nachher["equipment"] > vorher["equipment"]
+
+    def test_plan_queryset_update(self, client):
+        """update() umgeht Signale – der View erhöht die Version selbst."""
+        import json
+
+        from core.services.daten_version import versionen
+        from core.tests.factories import PlanFactory, UserFactory
+
+        user = UserFactory()
+        plan = PlanFactory(user=user, gruppe_id="11111111-1111-1111-1111-111111111111")
+        vorher = versionen(user.id, "plaene")["plaene"]
+        client.force_login(user)
+        client.post(
+            reverse("api_ungroup_plans"),
+            data=json.dumps({"gruppe_id": str(plan.gruppe_id)}),
+            content_type="application/json",
+        )
+        assert versionen(user.id, "plaene")["plaene"] > vorher
+
+    def test_verdraengter_zaehler_erzeugt_neuen_namensraum(self):
+        """Fehlt der Zähler (Eviction), darf kein alter Key wiederverwendet werden."""
+        from core.services.daten_version import _key, versionierter_key
+
+        alt = versionierter_key("x", 5, "saetze")
+        cache.delete(_key(5, "saetze"))
+        assert versionierter_key("x", 5, "saetze") != alt
+
+    def test_unbekannte_domaene(self):
+        from core.services.daten_version import erhoehe
+
+        with pytest.raises(ValueError):
+            erhoehe(1, "gibt_es_nicht")
+
+
+@pytest.mark.django_db
+class TestStatsAbschnitte:
+    def _setup(self, client):
+        from core.tests.factories import SatzFactory, TrainingseinheitFactory, UserFactory
+
+        user = UserFactory()
+        SatzFactory(einheit=TrainingseinheitFactory(user=user))
+        client.force_login(user)
+        return user
+
+    def test_zweiter_aufruf_rechnet_nicht_neu(self, client):
+        self._setup(client)
+        assert client.get(reverse("training_stats")).status_code == 200
+        with (
+            patch("core.views.training_stats._calc_muscle_balance") as balance,
+            patch("core.views.training_stats._calc_plateau_live") as plateau,
+        ):
+            response = client.get(reverse("training_stats"))
+        assert response.status_code == 200
+        balance.assert_not_called()
+        plateau.assert_not_called()
+
+    def test_koerperwert_berechnet_nur_abhaengige_abschnitte(self, client):
+        """Ein Körperwert mit gleichem Gewicht ändert nur die Körper-Charts."""
+        from core.models import KoerperWerte
+        from core.tests.factories import KoerperWerteFactory
+
+        user = self._setup(client)
+        KoerperWerteFactory(user=user, gewicht=80)
+        client.get(reverse("training_stats"))
+
+        KoerperWerte.objects.create(user=user, groesse_cm=180, gewicht=80)
+        with (
+            patch("core.views.training_stats._calc_muscle_balance") as balance,
+            patch("core.views.training_stats._prepare_body_chart_data", return_value={}) as body,
+        ):
+            response = client.get(reverse("training_stats"))
+        assert response.status_code == 200
+        balance.assert_not_called()
+        body.assert_called_once()
+
+    def test_neuer_satz_aktualisiert_verlauf(self, client):
+        from core.tests.factories import SatzFactory
+
+        user = self._setup(client)
+        assert client.get(reverse("training_stats")).context["gesamt_saetze"] == 1
+        SatzFactory(einheit=user.trainings.first())
+        assert client.get(reverse("training_stats")).context["gesamt_saetze"] == 2
+
+
 # ---------------------------------------------------------------------------
 # Global Exercise List Cache
 # ---------------------------------------------------------------------------
@@ -4,10 +4,12 @@ Tests für core/chart_generator.py
 Abdeckung:
 - _rgba_to_hex(): pure mapping function
 - _status_to_rgba(): pure mapping function
-- generate_body_map_with_data(): PIL-Fallback (cairosvg nicht verfügbar auf CI/Windows)
+- generate_body_map_with_data(): PIL-Fallback (cairosvg nicht verfügbar auf CI/Windows),
+  Memo nach Status-Vektor, einmal geparste SVG-Vorlage
 - generate_muscle_heatmap(): matplotlib bar chart
 - generate_volume_chart(): matplotlib line chart
 - generate_push_pull_pie(): matplotlib pie chart
+- chart_pool.rendere(): Prozess-Pool, Deadline- und Seriell-Fallback
 """
 
 import base64
@@ -15,8 +17,9 @@ from datetime import date
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from core import chart_generator
 from core.chart_generator import (
     _heatmap_grid_range,
     _rgba_to_hex,
@@ -29,6 +32,7 @@ from core.chart_generator import (
     generate_training_heatmap,
     generate_volume_chart,
 )
+from core.export import chart_pool
 
 
 class TestRgbaToHex(TestCase):
@@ -114,6 +118,41 @@ class TestGenerateBodyMapWithData(TestCase):
         result = generate_body_map_with_data(stats)
         self.assertIsNotNone(result)
 
+    def test_memo_nach_status_vektor(self):
+        """Gleiche Status (andere Satzzahlen) → kein zweites Rendern."""
+        chart_generator._body_map_png_gecacht.cache_clear()
+        a = [{"key": "BRUST", "saetze": 10, "status": "optimal"}]
+        b = [{"key": "BRUST", "saetze": 14, "status": "optimal"}]
+        with (
+            patch.object(
+                chart_generator, "_render_svg_muscle_map_png_base64", side_effect=ImportError
+            ),
+            patch.object(
+                chart_generator, "_generate_body_map_with_data_pil_fallback", return_value="png"
+            ) as pil,
+        ):
+            self.assertEqual(generate_body_map_with_data(a), "png")
+            self.assertEqual(generate_body_map_with_data(b), "png")
+            generate_body_map_with_data([{"key": "BRUST", "status": "zu_wenig"}])
+        self.assertEqual(pil.call_count, 2)
+        chart_generator._body_map_png_gecacht.cache_clear()
+
+    def test_svg_vorlage_einmal_geparst_und_unveraendert(self):
+        chart_generator._muscle_map_vorlage.cache_clear()
+        vektor = (("BRUST", "optimal"),)
+        svg = chart_generator._muscle_map_svg_bytes(vektor).decode()
+        chart_generator._muscle_map_svg_bytes((("BIZEPS", "zu_wenig"),))
+        self.assertEqual(chart_generator._muscle_map_vorlage.cache_info().misses, 1)
+        fill = chart_generator._rgba_to_hex(chart_generator._status_to_rgba("optimal"))
+        self.assertIn(f'fill="{fill}"', svg)
+        # Die geteilte Vorlage selbst bleibt ungefärbt
+        pfad = chart_generator._find_muscle_svg_path()
+        vorlage, positionen = chart_generator._muscle_map_vorlage(
+            str(pfad), pfad.stat().st_mtime_ns
+        )
+        brust = list(vorlage.iter())[positionen["front_chest_left"]]
+        self.assertNotEqual(brust.get("fill"), fill)
+
 
 class TestGenerateTrainingHeatmap(TestCase):
     """Phase 35.3: Trainings-Heatmap inkl. Pausen-Marker (#1059 g)."""
@@ -449,3 +488,47 @@ class TestGenerateExerciseProgressionChart(TestCase):
         # < 3 Punkte → keine Trendlinie, aber valides PNG
         result = generate_exercise_progression_chart(self.DATA[:2])
         self.assertIsNotNone(result)
+
+
+class TestChartPool(TestCase):
+    AUFTRAEGE = {
+        "pie": ("generate_push_pull_pie", (10, 5), {}),
+        "volumen": (
+            "generate_volume_chart",
+            ([{"woche": "KW1", "volumen": 1000}, {"woche": "KW2", "volumen": 1200}],),
+            {},
+        ),
+    }
+
+    def tearDown(self):
+        chart_pool._verwerfe_pool()
+
+    @override_settings(PDF_CHART_WORKERS=0)
+    def test_ohne_pool_seriell(self):
+        ergebnisse = chart_pool.rendere(self.AUFTRAEGE)
+        self.assertIsNone(chart_pool._pool)
+        self.assertEqual(ergebnisse["pie"], generate_push_pull_pie(10, 5))
+
+    @override_settings(PDF_CHART_WORKERS=2, PDF_CHART_TIMEOUT=120)
+    def test_pool_liefert_dieselben_bilder(self):
+        ergebnisse = chart_pool.rendere(self.AUFTRAEGE)
+        self.assertIsNotNone(chart_pool._pool)
+        self.assertEqual(ergebnisse["pie"], generate_push_pull_pie(10, 5))
+        self.assertTrue(ergebnisse["volumen"])
+
+    @override_settings(PDF_CHART_WORKERS=2)
+    def test_deadline_rendert_seriell_nach(self):
+        future = MagicMock()
+        future.result.side_effect = chart_pool.FutureTimeout()
+        pool = MagicMock()
+        pool.submit.return_value = future
+        with patch.object(chart_pool, "_hole_pool", return_value=pool):
+            ergebnisse = chart_pool.rendere(self.AUFTRAEGE)
+        self.assertEqual(ergebnisse["pie"], generate_push_pull_pie(10, 5))
+        self.assertEqual(future.cancel.call_count, 2)
+
+    @override_settings(PDF_CHART_WORKERS=0)
+    def test_fehler_betrifft_nur_einen_chart(self):
+        ergebnisse = chart_pool.rendere({**self.AUFTRAEGE, "kaputt": ("gibt_es_nicht", (), {})})
+        self.assertIsNone(ergebnisse["kaputt"])
+        self.assertTrue(ergebnisse["pie"])
@@ -15,13 +15,12 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from django.conf import settings
-from django.contrib.messages.storage.fallback import FallbackStorage
 from django.test import RequestFactory, override_settings
 from django.urls import reverse
 
 import pytest
 
-from core.export import pdf_renderer
+from core.export import pdf_cache, pdf_renderer
 from core.tests.factories import (
     PlanFactory,
     PlanUebungFactory,
@@ -32,6 +31,11 @@ from core.tests.factories import (
 )
 
 
+def _pdf_inhalt(response) -> bytes:
+    """PDF-Download wird aus dem Datei-Cache gestreamt (FileResponse)."""
+    return b"".join(response.streaming_content)
+
+
 @pytest.mark.django_db
 class TestTrainingCSVExport:
     """Tests für CSV Export von Trainingseinheiten."""
@@ -83,12 +87,16 @@ class TestTrainingCSVExport:
         assert response.status_code == 200
 
         # CSV parsen
-        content = response.content.decode("utf-8")
+        assert response.streaming
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
         csv_reader = csv.DictReader(io.StringIO(content))
         rows = list(csv_reader)
 
         # Mindestens 2 Sätze vorhanden
         assert len(rows) >= 2
+        assert rows[0]["Übung"] == "Bankdrücken"
+        assert rows[0]["Muskelgruppe"] == uebung.get_muskelgruppe_display()
+        assert rows[0]["Volumen (kg)"] == "800.0"
 
     def test_export_training_csv_only_own_data(self, client):
         """CSV Export zeigt nur eigene Trainingsdaten."""
@@ -138,7 +146,7 @@ class TestTrainingPDFExport:
         assert ".pdf" in response["Content-Disposition"]
 
         # PDF sollte nicht leer sein
-        assert len(response.content) > 1000  # Mindestgröße
+        assert len(_pdf_inhalt(response)) > 1000  # Mindestgröße
 
     @override_settings(PDF_ENGINE="weasyprint")
     def test_export_training_pdf_weasyprint_engine(self, client):
@@ -156,8 +164,9 @@ class TestTrainingPDFExport:
 
         assert response.status_code == 200
         assert response["Content-Type"] == "application/pdf"
-        assert response.content[:5] == b"%PDF-"
-        assert len(response.content) > 1000
+        inhalt = _pdf_inhalt(response)
+        assert inhalt[:5] == b"%PDF-"
+        assert len(inhalt) > 1000
 
     def test_export_training_pdf_with_data(self, client):
         """PDF enthält Trainingsdaten."""
@@ -171,7 +180,64 @@ class TestTrainingPDFExport:
         response = client.get(reverse("export_training_pdf"))
 
         assert response.status_code == 200
-        assert len(response.content) > 5000  # Größere Datei = mehr Inhalt
+        assert len(_pdf_inhalt(response)) > 5000  # Größere Datei = mehr Inhalt
+
+    def test_wiederholter_download_aus_datei_cache(self, client):
+        """Zweiter Download ohne Datenänderung rendert nicht erneut."""
+        user = UserFactory()
+        client.force_login(user)
+        training = TrainingseinheitFactory(user=user)
+        SatzFactory(einheit=training, uebung=UebungFactory())
+
+        with patch.object(pdf_cache, "_render_pdf_bytes", return_value=b"%PDF-1.4 fake") as render:
+            erster = _pdf_inhalt(client.get(reverse("export_training_pdf")))
+            zweiter = _pdf_inhalt(client.get(reverse("export_training_pdf")))
+            assert render.call_count == 1
+            assert erster == zweiter == b"%PDF-1.4 fake"
+
+            # Neuer Satz → neue Daten-Version → neuer Fingerprint, alte Datei weg
+            SatzFactory(einheit=training, uebung=UebungFactory())
+            client.get(reverse("export_training_pdf"))
+            assert render.call_count == 2
+        ordner = Path(settings.PDF_CACHE_ROOT) / str(user.id)
+        assert len(list(ordner.glob("*.pdf"))) == 1
+        # Nicht unter dem öffentlich ausgelieferten /media/
+        assert not list(Path(settings.MEDIA_ROOT).rglob("*.pdf"))
+
+    def test_vorrendern_job_ohne_oeffentlichen_download(self, client):
+        from core.services.hintergrund_jobs import enqueue
+
+        user = UserFactory()
+        with (
+            override_settings(HINTERGRUND_JOBS_EAGER=True),
+            patch.object(pdf_cache, "_render_pdf_bytes", return_value=b"%PDF-1.4 fake"),
+        ):
+            job = enqueue("training_pdf_vorrendern", user=user)
+        assert job.status == "FERTIG"
+        assert "datei" not in job.ergebnis
+        assert (
+            Path(settings.PDF_CACHE_ROOT) / str(user.id) / f"{job.ergebnis['fingerprint']}.pdf"
+        ).exists()
+
+        client.force_login(user)
+        assert "download_url" not in client.get(reverse("job_status_api", args=[job.pk])).json()
+
+    def test_fingerprint_haengt_von_engine_und_datum_ab(self):
+        user = UserFactory()
+        heute = date(2026, 6, 1)
+        basis = pdf_cache.report_fingerprint(user.id, heute)
+        assert pdf_cache.report_fingerprint(user.id, heute) == basis
+        assert pdf_cache.report_fingerprint(user.id, date(2026, 6, 2)) != basis
+        with override_settings(PDF_ENGINE="weasyprint"):
+            assert pdf_cache.report_fingerprint(user.id, heute) != basis
+
+    def test_render_fehler_redirect_ohne_cache_datei(self, client):
+        user = UserFactory()
+        client.force_login(user)
+        with patch.object(pdf_cache, "_render_pdf_bytes", side_effect=RuntimeError("boom")):
+            response = client.get(reverse("export_training_pdf"))
+        assert response.status_code == 302
+        assert not list(Path(settings.PDF_CACHE_ROOT).rglob("*.pdf"))
 
 
 @pytest.mark.django_db
@@ -421,21 +487,9 @@ class TestPdfRendererEngine:
             with pytest.raises(RuntimeError):
                 pdf_renderer._render_pdf_bytes(req, {})
 
-    def test_render_response_faengt_engine_fehler_und_leitet_um(self):
-        req = self._request()
-        req.session = {}
-        setattr(req, "_messages", FallbackStorage(req))
-        with patch.object(pdf_renderer, "_render_pdf_bytes", side_effect=RuntimeError("boom")):
-            response = pdf_renderer.render_training_pdf_response(req, {}, date(2026, 6, 1))
-        assert response.status_code == 302
-
     def test_dateiname_ohne_zeitraum_nutzt_heute(self):
-        req = self._request()
-        req.user = MagicMock(username="tester")
-        with patch.object(pdf_renderer, "_render_pdf_bytes", return_value=b"%PDF-1.4 fake"):
-            response = pdf_renderer.render_training_pdf_response(req, {}, date(2026, 6, 1))
-        assert response.status_code == 200
-        assert "TrainingReport_tester_20260601.pdf" in response["Content-Disposition"]
+        dateiname = pdf_renderer.training_pdf_filename("tester", {}, date(2026, 6, 1))
+        assert dateiname == "TrainingReport_tester_20260601.pdf"
 
     @override_settings(STATIC_ROOT=_FONTS_STATIC_ROOT)
     def test_url_fetcher_static_root_fallback(self):
@@ -4,7 +4,7 @@ Tests für helpers/ und utils/ – Phase 5.6
 Abgedeckte Module:
 - core/helpers/email.py           (send_welcome_email)
 - core/helpers/notifications.py   (_build_push_payload, _send_single_push,
-                                   send_push_notification)
+                                   send_push_notification, _sende_an_alle_geraete)
 - core/helpers/exercises.py       (_build_equipment_map, _get_available_equipment_objects,
                                    _find_original_uebung, _find_substitute_by_priority,
                                    _find_bodyweight_fallback, find_substitute_exercise)
@@ -268,6 +268,7 @@ class TestSendPushNotification:
     def test_abgelaufene_subscription_wird_geloescht(self, settings):
         from core.models import PushSubscription
 
+        settings.HINTERGRUND_JOBS_EAGER = True
         settings.VAPID_PRIVATE_KEY = "private"
         settings.VAPID_PUBLIC_KEY = "public"
         settings.VAPID_PRIVATE_KEY_FILE = "vapid_private.pem"
@@ -289,6 +290,7 @@ class TestSendPushNotification:
     def test_gueltige_subscription_wird_aktualisiert(self, settings):
         from core.models import PushSubscription
 
+        settings.HINTERGRUND_JOBS_EAGER = True
         settings.VAPID_PRIVATE_KEY = "private"
         settings.VAPID_PUBLIC_KEY = "public"
         settings.VAPID_PRIVATE_KEY_FILE = "vapid_private.pem"
@@ -308,6 +310,25 @@ class TestSendPushNotification:
         sub.refresh_from_db()
         assert sub.last_used is not None
 
+    def test_fan_out_laeuft_als_job(self, settings):
+        from core.models import HintergrundJob, PushSubscription
+
+        settings.VAPID_PRIVATE_KEY = "private"
+        settings.VAPID_PUBLIC_KEY = "public"
+        user = UserFactory()
+        PushSubscription.objects.create(
+            user=user, endpoint="https://push.example.com/a", p256dh="key", auth="auth"
+        )
+        from core.helpers.notifications import send_push_notification
+
+        with patch("core.helpers.notifications._send_single_push") as mock_send:
+            job = send_push_notification(user, "T", "B", url="/training/")
+
+        # Request-Worker sendet nicht selbst – erst der Worker
+        mock_send.assert_not_called()
+        assert HintergrundJob.objects.get(pk=job.pk).typ == "push_senden"
+        assert job.parameter["url"] == "/training/"
+
 
 # ===========================================================================
 # helpers/exercises.py – reine Hilfsfunktionen (kein DB)
@@ -880,6 +901,31 @@ class TestCalculate1rmStandards:
         result = calculate_1rm_standards(qs, top)
         assert len(result[0]["1rm_entwicklung"]) == 6
 
+    def test_saetze_ohne_wiederholungen_zaehlen_nicht(self):
+        """0-Wdh-Sätze zählen nicht (wie vor der Tagesstatistik, dort gilt 0 Wdh = 1)."""
+        from core.models import Satz
+        from core.utils.advanced_stats import calculate_1rm_standards
+
+        user = UserFactory()
+        uebung = UebungFactory(
+            standard_beginner=Decimal("60"),
+            standard_intermediate=Decimal("100"),
+            standard_advanced=Decimal("140"),
+            standard_elite=Decimal("180"),
+        )
+        mit_wdh = TrainingseinheitFactory(user=user)
+        SatzFactory(einheit=mit_wdh, uebung=uebung, gewicht=Decimal("120"), wiederholungen=0)
+        SatzFactory(einheit=mit_wdh, uebung=uebung, gewicht=Decimal("90"), wiederholungen=3)
+        nur_null = TrainingseinheitFactory(user=user)
+        SatzFactory(einheit=nur_null, uebung=uebung, gewicht=Decimal("150"), wiederholungen=0)
+        qs = Satz.objects.filter(einheit__user=user)
+        top = [{"uebung__bezeichnung": uebung.bezeichnung, "muskelgruppe_display": "Brust"}]
+
+        result = calculate_1rm_standards(qs, top)
+
+        # 90 × (1 + 3/30) = 99.0 – nicht 150 × (1 + 1/30) = 155.0
+        assert result[0]["geschaetzter_1rm"] == 99.0
+
     def test_skalierung_mit_koerpergewicht(self):
         """Heavier user → höhere skalierte Standards."""
         from core.models import Satz
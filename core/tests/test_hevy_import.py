@@ -9,7 +9,10 @@ Testet:
 
 import csv
 import io
+from pathlib import Path
+from unittest.mock import patch
 
+from django.db import connection
 from django.urls import reverse
 
 import pytest
@@ -51,6 +54,11 @@ def _make_hevy_csv(*rows: dict) -> bytes:
     return ("\ufeff" + buf.getvalue()).encode("utf-8")
 
 
+def _csv_inhalt(response) -> str:
+    """Inhalt eines gestreamten CSV-Exports (ohne BOM)."""
+    return b"".join(response.streaming_content).decode("utf-8-sig")
+
+
 def _hevy_row(
     title="Test Workout",
     start="2025-01-15 10:00:00",
@@ -100,7 +108,7 @@ class TestHevyCSVExport:
         user = UserFactory()
         client.force_login(user)
         response = client.get(reverse("export_hevy_csv"))
-        content = response.content.decode("utf-8-sig")
+        content = _csv_inhalt(response)
         reader = csv.reader(io.StringIO(content))
         headers = next(reader)
         for col in _HEVY_HEADERS:
@@ -116,7 +124,7 @@ class TestHevyCSVExport:
         SatzFactory(einheit=open_, uebung=uebung, gewicht=60, wiederholungen=10)
 
         response = client.get(reverse("export_hevy_csv"))
-        content = response.content.decode("utf-8-sig")
+        content = _csv_inhalt(response)
         rows = list(csv.DictReader(io.StringIO(content)))
         # Only the set from the finished workout
         assert len(rows) == 1
@@ -135,7 +143,7 @@ class TestHevyCSVExport:
         )
 
         response = client.get(reverse("export_hevy_csv"))
-        content = response.content.decode("utf-8-sig")
+        content = _csv_inhalt(response)
         rows = list(csv.DictReader(io.StringIO(content)))
         types = {r["weight_kg"]: r["set_type"] for r in rows}
         assert types["40.0"] == "warmup"
@@ -150,7 +158,7 @@ class TestHevyCSVExport:
 
         client.force_login(user1)
         response = client.get(reverse("export_hevy_csv"))
-        content = response.content.decode("utf-8-sig")
+        content = _csv_inhalt(response)
         rows = list(csv.DictReader(io.StringIO(content)))
         assert len(rows) == 0
 
@@ -164,7 +172,7 @@ class TestHevyCSVExport:
         )
 
         response = client.get(reverse("export_hevy_csv"))
-        content = response.content.decode("utf-8-sig")
+        content = _csv_inhalt(response)
         rows = list(csv.DictReader(io.StringIO(content)))
         assert rows[0]["superset_id"] == "S2"
 
@@ -176,10 +184,38 @@ class TestHevyCSVExport:
         SatzFactory(einheit=training, uebung=uebung, rpe=8.0, gewicht=100, wiederholungen=3)
 
         response = client.get(reverse("export_hevy_csv"))
-        content = response.content.decode("utf-8-sig")
+        content = _csv_inhalt(response)
         rows = list(csv.DictReader(io.StringIO(content)))
         assert rows[0]["rpe"] == "8.0"
 
+    def test_streaming_set_index_je_training_und_uebung(self, client):
+        from core.models import Plan
+
+        user = UserFactory()
+        client.force_login(user)
+        bank, kniebeuge = UebungFactory(), UebungFactory()
+        plan = Plan.objects.create(user=user, name="Push")
+        t1 = TrainingseinheitFactory(user=user, abgeschlossen=True, plan=plan)
+        t2 = TrainingseinheitFactory(user=user, abgeschlossen=True, plan=None)
+        Trainingseinheit.objects.filter(pk=t1.pk).update(
+            datum="2025-01-10T10:00:00Z", dauer_minuten=None
+        )
+        Trainingseinheit.objects.filter(pk=t2.pk).update(datum="2025-01-12T10:00:00Z")
+        for nr, uebung in enumerate([bank, kniebeuge, bank], start=1):
+            SatzFactory(einheit=t1, uebung=uebung, satz_nr=nr, gewicht=50, wiederholungen=5)
+        SatzFactory(einheit=t2, uebung=bank, satz_nr=1, gewicht=60, wiederholungen=5)
+
+        response = client.get(reverse("export_hevy_csv"))
+        assert response.streaming
+        rows = list(csv.DictReader(io.StringIO(_csv_inhalt(response))))
+        assert [(r["title"], r["exercise_title"], r["set_index"]) for r in rows] == [
+            ("Push", bank.bezeichnung, "0"),
+            ("Push", bank.bezeichnung, "1"),
+            ("Push", kniebeuge.bezeichnung, "0"),
+            ("12.01.2025", bank.bezeichnung, "0"),
+        ]
+        assert rows[0]["end_time"] == "2025-01-10 11:00:00"
+
 
 # ---------------------------------------------------------------------------
 # Import Tests
@@ -280,6 +316,28 @@ class TestHevyCSVImport:
         assert custom is not None
         assert custom.is_custom is True
 
+    def test_neue_uebungen_ohne_pks_aus_bulk_create(self, client):
+        """MariaDB liefert keine PKs aus bulk_create – neue Übungen müssen trotzdem Sätze tragen."""
+        user = UserFactory()
+        client.force_login(user)
+        f = io.BytesIO(
+            _make_hevy_csv(
+                _hevy_row(exercise="FooBar Exotic Lift", weight=50, reps=10),
+                _hevy_row(exercise="Zercher Squat", weight=80, reps=5),
+            )
+        )
+        f.name = "hevy.csv"
+
+        with patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            client.post(reverse("import_hevy_csv"), {"hevy_csv": f})
+
+        neu = Uebung.objects.filter(created_by=user, is_custom=True)
+        assert sorted(neu.values_list("bezeichnung", flat=True)) == [
+            "FooBar Exotic Lift",
+            "Zercher Squat",
+        ]
+        assert Satz.objects.filter(einheit__user=user, uebung__in=neu).count() == 2
+
     def test_dry_run_does_not_create_records(self, client):
         user = UserFactory()
         client.force_login(user)
@@ -384,3 +442,97 @@ class TestHevyCSVImport:
         client.post(reverse("import_hevy_csv"), {"hevy_csv": f})
 
         assert Satz.objects.filter(einheit__user=user).count() == 1
+
+    def test_bulk_import_mit_wenigen_queries(self, client, django_assert_max_num_queries):
+        """Übungen in einem Lookup, Einheiten/Sätze per bulk_create – unabhängig von der Größe."""
+        user = UserFactory()
+        client.force_login(user)
+        UebungFactory(bezeichnung="Bankdrücken")
+        rows = [
+            _hevy_row(
+                title=f"W{tag}",
+                start=f"2024-03-{tag:02d} 10:00:00",
+                end=f"2024-03-{tag:02d} 11:00:00",
+                exercise=name,
+                weight=60 + tag,
+                reps=5,
+            )
+            for tag in range(1, 29)
+            for name in ("Bankdrücken", "Neue Übung A", "Neue Übung B")
+        ]
+        f = io.BytesIO(_make_hevy_csv(*rows))
+        f.name = "hevy.csv"
+        with django_assert_max_num_queries(40):
+            client.post(reverse("import_hevy_csv"), {"hevy_csv": f})
+
+        assert Trainingseinheit.objects.filter(user=user).count() == 28
+        assert Satz.objects.filter(einheit__user=user).count() == 84
+        assert Uebung.objects.filter(created_by=user, is_custom=True).count() == 2
+        datum = Trainingseinheit.objects.filter(user=user).order_by("datum").first().datum
+        assert datum.strftime("%Y-%m-%d %H:%M") == "2024-03-01 10:00"
+
+    def test_abgeleitete_daten_nachgezogen(self, client):
+        """bulk_create umgeht die Signale – PR-Tabelle und Statistik werden nachgezogen."""
+        from core.models import PersoenlicherRekord, UebungTagesStatistik
+
+        user = UserFactory()
+        client.force_login(user)
+        uebung = UebungFactory(bezeichnung="Kreuzheben")
+        f = io.BytesIO(
+            _make_hevy_csv(
+                _hevy_row(exercise="kreuzheben", weight=140, reps=3),
+                _hevy_row(exercise="Kreuzheben", weight=150, reps=2),
+            )
+        )
+        f.name = "hevy.csv"
+        client.post(reverse("import_hevy_csv"), {"hevy_csv": f})
+
+        assert Satz.objects.filter(einheit__user=user, uebung=uebung).count() == 2
+        rekord = PersoenlicherRekord.objects.get(user=user, uebung=uebung)
+        assert float(rekord.max_gewicht) == 150
+        assert UebungTagesStatistik.objects.filter(user=user, uebung=uebung).count() == 1
+
+    def test_zeilenfehler_und_dublette_in_datei(self, client):
+        user = UserFactory()
+        client.force_login(user)
+        f = io.BytesIO(
+            _make_hevy_csv(
+                _hevy_row(exercise="Dips", weight=10, reps="viele"),
+                _hevy_row(exercise="Dips", weight=10, reps=8),
+                _hevy_row(title="Doppelt", start="2025-01-15 10:02:00", exercise="Dips", reps=8),
+            )
+        )
+        f.name = "hevy.csv"
+        response = client.post(reverse("import_hevy_csv"), {"hevy_csv": f}, follow=True)
+
+        meldungen = [str(m) for m in response.context["messages"]]
+        assert any("Zeile 2: ungültige Wiederholungen" in m for m in meldungen)
+        assert any("'Doppelt'" in m and "existiert bereits" in m for m in meldungen)
+        assert Trainingseinheit.objects.filter(user=user).count() == 1
+        # satz_nr zählt wie bisher auch die übersprungene Zeile
+        assert list(Satz.objects.filter(einheit__user=user).values_list("satz_nr", flat=True)) == [
+            2
+        ]
+
+    def test_async_import_als_job(self, client, settings):
+        from core.models import HintergrundJob
+        from core.services.hintergrund_jobs import fuehre_job_aus, hole_naechsten_job
+
+        user = UserFactory()
+        client.force_login(user)
+        f = io.BytesIO(_make_hevy_csv(_hevy_row(exercise="Rudern", weight=70, reps=10)))
+        f.name = "hevy.csv"
+        response = client.post(reverse("import_hevy_csv"), {"hevy_csv": f, "async": "1"})
+        assert response.status_code == 202
+        job = HintergrundJob.objects.get(pk=response.json()["job_id"])
+        assert job.typ == "hevy_import"
+
+        assert hole_naechsten_job("test") == job.pk
+        fuehre_job_aus(job.pk, verbindung_schliessen=False)
+        job.refresh_from_db()
+        assert job.status == "FERTIG"
+        assert job.ergebnis["trainings"] == 1
+        assert job.ergebnis["neue_uebungen"] == ["Rudern"]
+        # Upload lag privat (nicht unter /media/) und ist nach dem Import weg
+        assert not list(Path(settings.JOB_DATEI_ROOT).iterdir())
+        assert not list(Path(settings.MEDIA_ROOT).rglob("*.csv"))
@@ -0,0 +1,218 @@
+"""Tests für die DB-Job-Queue (core/services/hintergrund_jobs.py) und run_worker.
+
+Abgedeckt:
+- enqueue / Beanspruchen: nur fällige Jobs, jeder Job genau einmal
+- Ausführung: Ergebnis, Retry mit Backoff, max_versuche, JobAbbruch ohne Retry
+- Hängende Jobs werden erneut eingereiht bzw. beendet
+- Aufräumen: alte Jobs samt Dateien, verwaiste Dateien in JOB_DATEI_ROOT
+- Job-Dateien liegen außerhalb von MEDIA_ROOT, Download nur für den Owner
+- Polling-Endpoint (nur eigene Jobs) und async-Opt-in von ml_train_model
+- run_worker --once arbeitet die Queue im Thread-Pool ab
+"""
+
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+
+from core.models import HintergrundJob
+from core.services import hintergrund_jobs
+from core.services.hintergrund_jobs import (
+    JobAbbruch,
+    enqueue,
+    fuehre_job_aus,
+    hole_naechsten_job,
+    melde_fortschritt,
+    raeume_alte_jobs,
+    setze_haengende_zurueck,
+)
+from core.services.job_aufgaben import job_datei_pfad
+from core.tests.factories import UserFactory
+
+
+@pytest.fixture
+def aufgaben(monkeypatch):
+    """Registriert Test-Handler nur für die Dauer eines Tests."""
+    hintergrund_jobs._lade_aufgaben()
+    aufrufe = []
+
+    def ok(job):
+        aufrufe.append(job.pk)
+        melde_fortschritt(job, 50, "halb")
+        return {"summe": sum(job.parameter.get("werte", []))}
+
+    def kaputt(job):
+        raise RuntimeError("LLM nicht erreichbar")
+
+    def abbruch(job):
+        raise JobAbbruch("Zu wenig Daten")
+
+    for typ, handler in (("test_ok", ok), ("test_kaputt", kaputt), ("test_abbruch", abbruch)):
+        monkeypatch.setitem(hintergrund_jobs._AUFGABEN, typ, handler)
+    return aufrufe
+
+
+def _ausfuehren(job):
+    job_id = hole_naechsten_job("test")
+    assert job_id == job.pk
+    fuehre_job_aus(job_id, verbindung_schliessen=False)
+    job.refresh_from_db()
+    return job
+
+
+@pytest.mark.django_db
+class TestQueue:
+    def test_unbekannter_typ(self):
+        with pytest.raises(ValueError):
+            enqueue("gibt_es_nicht")
+
+    def test_jeder_job_nur_einmal_beansprucht(self, aufgaben):
+        job = enqueue("test_ok", werte=[1, 2])
+        assert hole_naechsten_job("a") == job.pk
+        assert hole_naechsten_job("b") is None
+        job.refresh_from_db()
+        assert job.status == "LAEUFT" and job.worker == "a" and job.versuche == 1
+
+    def test_nicht_faellige_jobs_warten(self, aufgaben):
+        job = enqueue("test_ok")
+        HintergrundJob.objects.filter(pk=job.pk).update(
+            ausfuehren_ab=timezone.now() + timedelta(minutes=5)
+        )
+        assert hole_naechsten_job("a") is None
+
+    def test_erfolg(self, aufgaben):
+        job = _ausfuehren(enqueue("test_ok", user=UserFactory(), werte=[1, 2, 3]))
+        assert job.status == "FERTIG"
+        assert job.ergebnis == {"summe": 6}
+        assert job.fortschritt == 100
+        assert job.beendet_am is not None
+
+    def test_retry_mit_backoff_bis_max_versuche(self, aufgaben):
+        job = enqueue("test_kaputt", max_versuche=2)
+        job = _ausfuehren(job)
+        assert job.status == "WARTEND"
+        assert job.fehler == "LLM nicht erreichbar"
+        assert job.ausfuehren_ab > timezone.now() + timedelta(seconds=20)
+
+        HintergrundJob.objects.filter(pk=job.pk).update(ausfuehren_ab=timezone.now())
+        job = _ausfuehren(job)
+        assert job.status == "FEHLER"
+        assert job.versuche == 2
+
+    def test_job_abbruch_ohne_retry(self, aufgaben):
+        job = _ausfuehren(enqueue("test_abbruch"))
+        assert job.status == "FEHLER"
+        assert job.versuche == 1
+        assert job.fehler == "Zu wenig Daten"
+
+    def test_haengende_jobs(self, aufgaben):
+        neu = enqueue("test_ok")
+        erschoepft = enqueue("test_ok", max_versuche=1)
+        hole_naechsten_job("a")
+        hole_naechsten_job("a")
+        alt = timezone.now() - timedelta(hours=1)
+        HintergrundJob.objects.filter(pk__in=[neu.pk, erschoepft.pk]).update(aktualisiert_am=alt)
+
+        assert setze_haengende_zurueck() == 1
+        neu.refresh_from_db()
+        erschoepft.refresh_from_db()
+        assert neu.status == "WARTEND"
+        assert erschoepft.status == "FEHLER"
+
+    def test_raeume_alte_jobs_samt_dateien(self, aufgaben, settings):
+        os.makedirs(settings.JOB_DATEI_ROOT)
+        alt = _ausfuehren(enqueue("test_ok"))
+        neu = _ausfuehren(enqueue("test_ok"))
+        wartend = enqueue("test_ok", datei="upload.csv")
+        vor_zehn_tagen = timezone.now() - timedelta(days=10)
+        HintergrundJob.objects.filter(pk=alt.pk).update(
+            beendet_am=vor_zehn_tagen, ergebnis={"datei": f"job_{alt.pk}.pdf"}
+        )
+        for name in (f"job_{alt.pk}.pdf", "upload.csv", "verwaist.csv"):
+            Path(job_datei_pfad(name)).write_bytes(b"x")
+        os.utime(job_datei_pfad("verwaist.csv"), (vor_zehn_tagen.timestamp(),) * 2)
+
+        assert raeume_alte_jobs() == 1
+        assert set(HintergrundJob.objects.values_list("pk", flat=True)) == {neu.pk, wartend.pk}
+        assert sorted(os.listdir(settings.JOB_DATEI_ROOT)) == ["upload.csv"]
+
+    @override_settings(HINTERGRUND_JOBS_EAGER=True)
+    def test_eager_fuehrt_direkt_aus(self, aufgaben):
+        job = enqueue("test_ok", werte=[4])
+        assert job.status == "FERTIG"
+        assert job.ergebnis == {"summe": 4}
+
+
+@pytest.mark.django_db
+class TestEndpoints:
+    def test_polling_nur_eigene_jobs(self, client, aufgaben):
+        user = UserFactory()
+        job = _ausfuehren(enqueue("test_ok", user=user, werte=[2]))
+        url = reverse("job_status_api", args=[job.pk])
+
+        client.force_login(UserFactory())
+        assert client.get(url).status_code == 404
+
+        client.force_login(user)
+        data = client.get(url).json()
+        assert data["status"] == "FERTIG"
+        assert data["fertig"] is True
+        assert data["ergebnis"] == {"summe": 2}
+
+    def test_pdf_job_datei_privat_nur_fuer_owner(self, client, settings):
+        from core.export import pdf_cache
+
+        user = UserFactory()
+        job = enqueue("training_pdf", user=user)
+        with patch.object(pdf_cache, "_render_pdf_bytes", return_value=b"%PDF-1.4 fake"):
+            job = _ausfuehren(job)
+        assert job.status == "FERTIG"
+        pfad = Path(job_datei_pfad(job.ergebnis["datei"]))
+        assert pfad.parent == Path(settings.JOB_DATEI_ROOT)
+        assert not list(Path(settings.MEDIA_ROOT).rglob(pfad.name))
+
+        url = reverse("job_download", args=[job.pk])
+        client.force_login(UserFactory())
+        assert client.get(url).status_code == 404
+        client.force_login(user)
+        response = client.get(url)
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"%PDF-1.4 fake"
+
+    def test_ml_train_async(self, client):
+        user = UserFactory()
+        client.force_login(user)
+        response = client.post(
+            reverse("ml_train_model"),
+            data=json.dumps({"async": True}),
+            content_type="application/json",
+        )
+        assert response.status_code == 202
+        job = HintergrundJob.objects.get(pk=response.json()["job_id"])
+        assert job.user == user and job.typ == "ml_training"
+
+        payload = {"success": True, "message": "0 Modelle trainiert", "trained_models": []}
+        with patch(
+            "core.views.machine_learning._train_ml_models", return_value=(payload, 200)
+        ) as train:
+            job = _ausfuehren(job)
+        train.assert_called_once_with(user, None)
+        assert job.status == "FERTIG"
+        assert job.ergebnis == payload
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_worker_once_thread_pool(aufgaben):
+    jobs = [enqueue("test_ok", werte=[i]) for i in range(3)]
+    call_command("run_worker", "--once", "--concurrency", "2", "--poll-interval", "0.05")
+
+    assert sorted(aufgaben) == sorted(j.pk for j in jobs)
+    assert set(HintergrundJob.objects.values_list("status", flat=True)) == {"FERTIG"}
@@ -0,0 +1,71 @@
+"""Start-Budget: django.setup() + URLconf ohne schwere Bibliotheken.
+
+Misst in einem frischen Prozess (``core/utils/import_profil.py``). Schlägt fehl,
+wenn z.B. ein neuer Modul-Level-Import matplotlib, scikit-learn oder xhtml2pdf
+wieder in jeden Worker-Start zieht.
+
+Hier nur deterministische Checks (welche Module, wie viele). Das Zeit-Budget
+(``IMPORT_BUDGET_SEKUNDEN``) hängt an der Maschine und prüft ein eigener
+CI-Schritt: ``python manage.py import_profile --pruefen``.
+"""
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+import pytest
+
+from core.export import pdf_renderer
+from core.utils.import_profil import messe_start, parse_importtime
+
+_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   encodings
+import time:      2000 |       5000 | django
+import time:      3000 |       3000 |   django.conf
+import time:    400000 |     400000 | matplotlib
+"""
+
+
+@pytest.fixture(scope="module")
+def start_profil():
+    return messe_start()
+
+
+class TestImportBudget:
+    def test_keine_schweren_module_beim_start(self, start_profil):
+        assert start_profil.schwere_module() == []
+
+    def test_modul_budget(self, start_profil):
+        assert start_profil.anzahl_module <= settings.IMPORT_BUDGET_MODULE
+
+
+class TestImportProfil:
+    def test_parse_importtime(self):
+        profil = parse_importtime(_IMPORTTIME)
+        assert profil.anzahl_module == 4
+        assert profil.gesamt_sekunden == pytest.approx(0.405)
+        assert profil.teuerste(1)[0].modul == "matplotlib"
+        assert profil.teuerste(1, kumuliert=False)[0].modul == "matplotlib"
+        assert profil.schwere_module() == ["matplotlib"]
+
+    def test_command_pruefen_schlaegt_bei_schweren_modulen_fehl(self):
+        with patch(
+            "core.management.commands.import_profile.messe_start",
+            return_value=parse_importtime(_IMPORTTIME),
+        ):
+            out = StringIO()
+            call_command("import_profile", "--top", "2", stdout=out)
+            assert "matplotlib" in out.getvalue()
+            with pytest.raises(CommandError, match="schwere Module"):
+                call_command("import_profile", "--pruefen", stdout=StringIO())
+
+    def test_pdf_engine_wird_bei_bedarf_geladen(self):
+        # Zugriff von außen lädt und cached das Modul-Global
+        engine = pdf_renderer.pisa
+        assert pdf_renderer._lib("pisa") is engine
+        with pytest.raises(AttributeError):
+            pdf_renderer.gibt_es_nicht
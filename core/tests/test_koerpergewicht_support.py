@@ -557,6 +557,47 @@ class TestPrDetectionKoerpergewicht:
         result = _check_pr(user, uebung_dips, satz2, 0.0, 8)
         assert result is None
 
+    def test_nachgetragener_satz_nutzt_koerpergewicht_vom_trainingstag(self, user, uebung_dips):
+        """Pinnt: auch der neue Satz wird mit dem Körpergewicht vom Trainingstag bewertet.
+
+        Bis Phase 14.3 nutzte _check_pr für den neuen Satz das aktuelle
+        Körpergewicht, für historische Sätze das vom Trainingstag. Seit der
+        PR-Tabelle gilt für alle Sätze die Tagesregel – relevant nur für
+        nachgetragene Trainings, bei heutigen Sätzen sind beide Werte gleich.
+        """
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from core.models import KoerperWerte, PersoenlicherRekord, Trainingseinheit
+        from core.views.training_session import _check_pr
+
+        damals = KoerperWerteFactory(user=user, gewicht=Decimal("70.0"))
+        KoerperWerte.objects.filter(pk=damals.pk).update(
+            datum=(timezone.now() - timedelta(days=20)).date()
+        )
+        KoerperWerteFactory(user=user, gewicht=Decimal("90.0"))  # heute
+        training = TrainingseinheitFactory(user=user)
+        # datum ist auto_now_add – Nachtrag per update()
+        Trainingseinheit.objects.filter(pk=training.pk).update(
+            datum=timezone.now() - timedelta(days=10)
+        )
+        training.refresh_from_db()
+        satz = SatzFactory(
+            einheit=training,
+            uebung=uebung_dips,
+            gewicht=Decimal("0"),
+            wiederholungen=10,
+            ist_aufwaermsatz=False,
+        )
+
+        result = _check_pr(user, uebung_dips, satz, 0.0, 10)
+
+        # 70 kg × 0.70 × (1 + 10/30) = 65.3 – mit aktuellem Gewicht wären es 84.0
+        assert "65.3 kg" in result
+        rekord = PersoenlicherRekord.objects.get(user=user, uebung=uebung_dips)
+        assert rekord.bestes_1rm == pytest.approx(65.33, abs=0.01)
+
 
 # ---------------------------------------------------------------------------
 # Phase 14.3: Tonnage für Körpergewicht-Übungen
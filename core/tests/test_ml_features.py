@@ -0,0 +1,160 @@
+"""
+Tests für core/services/ml_features.py (ML-Feature-Store, MLFeatureZeile).
+
+Abgedeckt:
+- Signale: Zeilen je Arbeitssatz, Satz-Nummer inkl. Aufwärmsätze, Löschen
+- lade_matrix: days_since_last aus der Reihenfolge, Zeitraum-Filter
+- KOERPERGEWICHT: veraltetes Körpergewicht wird beim Lesen nachgezogen
+- letzte_zeile für die Vorhersage
+- Backfill/Rebuild per manage.py rebuild_ml_features (auch nach dem ersten neuen Satz)
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+import pytest
+
+from core.models import KoerperWerte, MLFeatureZeile, Trainingseinheit
+from core.services import ml_features
+from core.tests.factories import (
+    AufwaermsatzFactory,
+    KoerperWerteFactory,
+    SatzFactory,
+    TrainingseinheitFactory,
+    UebungFactory,
+    UserFactory,
+)
+
+_JETZT = timezone.now()
+
+
+def _einheit(user, tage_zurueck):
+    einheit = TrainingseinheitFactory(user=user, plan=None)
+    datum = _JETZT - timedelta(days=tage_zurueck)
+    Trainingseinheit.objects.filter(pk=einheit.pk).update(datum=datum)
+    einheit.refresh_from_db()
+    return einheit
+
+
+@pytest.mark.django_db
+class TestFeatureStorePflege:
+    def test_zeile_je_arbeitssatz_mit_satz_nummer(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="PRO_SEITE")
+        einheit = _einheit(user, 1)
+        AufwaermsatzFactory(einheit=einheit, uebung=uebung, satz_nr=1)
+        SatzFactory(einheit=einheit, uebung=uebung, satz_nr=2, gewicht=Decimal("20"), rpe=None)
+
+        zeile = MLFeatureZeile.objects.get(user=user, uebung=uebung)
+        assert zeile.satz_nummer == 2
+        assert zeile.effektives_gewicht == 40.0
+        assert zeile.rpe is None
+
+    def test_loeschen_rechnet_gruppe_neu(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        einheit = _einheit(user, 1)
+        erster = SatzFactory(einheit=einheit, uebung=uebung, satz_nr=1)
+        zweiter = SatzFactory(einheit=einheit, uebung=uebung, satz_nr=2)
+
+        erster.delete()
+        zeilen = list(MLFeatureZeile.objects.filter(uebung=uebung))
+        assert [(z.satz_id, z.satz_nummer) for z in zeilen] == [(zweiter.id, 1)]
+
+
+@pytest.mark.django_db
+class TestFeatureStoreLesen:
+    def test_lade_matrix_reihenfolge_und_tage(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        for tage, gewicht in ((10, "60"), (3, "62.5"), (400, "40")):
+            SatzFactory(
+                einheit=_einheit(user, tage), uebung=uebung, gewicht=Decimal(gewicht), rpe=None
+            )
+
+        features, gewichte = ml_features.lade_matrix(user.id, uebung)
+        assert list(gewichte) == [40.0, 60.0, 62.5]
+        assert list(features[:, 2]) == [0, 390, 7]
+        assert features[0, 3] == ml_features.RPE_DEFAULT
+
+        seit = timezone.now() - timedelta(days=180)
+        features, gewichte = ml_features.lade_matrix(user.id, uebung, seit=seit)
+        assert list(gewichte) == [60.0, 62.5]
+        assert features[0, 2] == 0
+
+    def test_koerpergewicht_wird_nachgezogen(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="KOERPERGEWICHT", koerpergewicht_faktor=0.5)
+        SatzFactory(einheit=_einheit(user, 1), uebung=uebung, gewicht=Decimal("0"))
+        assert ml_features.lade_matrix(user.id, uebung)[0][0, 0] == 40.0  # Fallback 80 kg
+
+        KoerperWerteFactory(user=user, gewicht=Decimal("90.0"))
+        KoerperWerte.objects.filter(user=user).update(datum=timezone.now() - timedelta(days=5))
+        assert ml_features.lade_matrix(user.id, uebung)[0][0, 0] == 45.0
+        assert MLFeatureZeile.objects.get(uebung=uebung).koerpergewicht == 90.0
+
+    def test_letzte_zeile(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        assert ml_features.letzte_zeile(user.id, uebung.id) is None
+
+        SatzFactory(einheit=_einheit(user, 9), uebung=uebung, gewicht=Decimal("50"))
+        SatzFactory(
+            einheit=_einheit(user, 2),
+            uebung=uebung,
+            gewicht=Decimal("55"),
+            wiederholungen=8,
+            rpe=Decimal("8.5"),
+        )
+        assert ml_features.letzte_zeile(user.id, uebung.id) == {
+            "last_weight": 55.0,
+            "last_reps": 8.0,
+            "rpe": 8.5,
+            "days_since_last": 7,
+        }
+
+
+@pytest.mark.django_db
+class TestRebuildMlFeaturesCommand:
+    def test_backfill_und_rebuild(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        for tage in (5, 3, 1):
+            SatzFactory(einheit=_einheit(user, tage), uebung=uebung)
+        MLFeatureZeile.objects.filter(
+            einheit__datum__lt=timezone.now() - timedelta(days=2)
+        ).delete()
+
+        out = StringIO()
+        call_command("rebuild_ml_features", "--nur-fehlende", stdout=out)
+        assert "2 Zeilen" in out.getvalue()
+        assert MLFeatureZeile.objects.filter(user=user).count() == 3
+
+        out = StringIO()
+        call_command("rebuild_ml_features", "--user-id", str(user.id), stdout=out)
+        assert "3 Zeilen" in out.getvalue()
+
+    def test_backfill_beim_lesen(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        SatzFactory(einheit=_einheit(user, 1), uebung=uebung)
+        MLFeatureZeile.objects.all().delete()
+
+        assert len(ml_features.lade_matrix(user.id, uebung)[1]) == 1
+
+    def test_command_backfill_trotz_neuer_zeile(self):
+        """Erster Satz nach dem Deploy legt Zeilen an – der Deploy-Schritt holt die Historie nach."""
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        for tage in (9, 7, 5):
+            SatzFactory(einheit=_einheit(user, tage), uebung=uebung)
+        MLFeatureZeile.objects.all().delete()  # Stand vor Migration 0091
+        SatzFactory(einheit=_einheit(user, 1), uebung=uebung)
+
+        call_command("rebuild_ml_features", stdout=StringIO())
+
+        assert len(ml_features.lade_matrix(user.id, uebung)[1]) == 4
@@ -0,0 +1,114 @@
+"""
+Tests für ml_coach/model_registry.py und MLPredictor.load_model.
+
+Abgedeckt:
+- LRU: Größenbegrenzung, Eviction-Zähler, Hit/Miss
+- Neuer Stand (trained_at) ersetzt den alten Estimator
+- MLPredictor: geteilter Cache enthält nur Metadaten, Neu-Training invalidiert
+- Staff-Endpoint /api/ml/registry-stats/
+"""
+
+from django.core.cache import cache
+from django.urls import reverse
+
+import joblib
+import pytest
+
+from core.tests.factories import UebungFactory, UserFactory
+from core.tests.test_ml_trainer import _create_saetze
+from ml_coach.ml_trainer import MLTrainer
+from ml_coach.model_registry import ModelRegistry, registry
+from ml_coach.prediction_service import MLPredictor
+
+
+@pytest.fixture(autouse=True)
+def leere_registry():
+    registry.leeren()
+    yield
+    registry.leeren()
+
+
+def _dump(tmp_path, name, wert):
+    pfad = str(tmp_path / f"{name}.pkl")
+    joblib.dump(wert, pfad)
+    return pfad
+
+
+class TestModelRegistry:
+    def test_lru_verdraengt_aeltestes(self, tmp_path):
+        reg = ModelRegistry(max_eintraege=2)
+        a, b, c = (_dump(tmp_path, n, {"n": n}) for n in "abc")
+
+        reg.hole(a, "1")
+        reg.hole(b, "1")
+        reg.hole(a, "1")  # a zuletzt benutzt → b fliegt
+        reg.hole(c, "1")
+
+        stats = reg.statistik()
+        assert stats["eintraege"] == 2
+        assert stats["evictions"] == 1
+        assert (stats["hits"], stats["misses"]) == (1, 3)
+        reg.hole(b, "1")
+        assert reg.statistik()["misses"] == 4
+
+    def test_neuer_stand_laedt_neu(self, tmp_path):
+        reg = ModelRegistry(max_eintraege=2)
+        pfad = _dump(tmp_path, "m", "alt")
+        assert reg.hole(pfad, "t1") == "alt"
+        joblib.dump("neu", pfad)
+        assert reg.hole(pfad, "t1") == "alt"
+        assert reg.hole(pfad, "t2") == "neu"
+        assert reg.statistik()["eintraege"] == 1
+
+    def test_fehlende_datei(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            ModelRegistry().hole(str(tmp_path / "fehlt.pkl"), "1")
+
+
+@pytest.mark.django_db
+class TestMLPredictorRegistry:
+    def test_cache_enthaelt_nur_metadaten(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        _create_saetze(user, uebung, n=20)
+        MLTrainer(user, uebung).train_model()
+
+        ergebnis = MLPredictor(user, uebung).predict_next_weight()
+        assert ergebnis["method"] == "ml"
+        MLPredictor(user, uebung).predict_next_weight()
+        assert (registry.hits, registry.misses) == (1, 1)
+
+        from core.services.daten_version import versionierter_key
+
+        meta = cache.get(f"{versionierter_key('ml_model', user.id, 'ml')}_uebung_{uebung.id}")
+        assert isinstance(meta, dict)
+        assert set(meta) >= {"model_path", "trained_at", "mean_absolute_error"}
+
+    def test_neu_training_invalidiert(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        _create_saetze(user, uebung, n=20)
+        MLTrainer(user, uebung).train_model()
+        assert MLPredictor(user, uebung).load_model()
+
+        MLTrainer(user, uebung).train_model()
+        assert MLPredictor(user, uebung).load_model()
+        assert registry.misses == 2
+
+    def test_ohne_modell_fallback(self):
+        user = UserFactory()
+        uebung = UebungFactory(gewichts_typ="GESAMT")
+        assert MLPredictor(user, uebung).load_model() is False
+        assert MLPredictor(user, uebung).predict_next_weight()["method"] == "no_data"
+
+
+@pytest.mark.django_db
+class TestRegistryStatsView:
+    def test_nur_staff(self, client):
+        client.force_login(UserFactory())
+        assert client.get(reverse("ml_registry_stats")).status_code == 302
+
+        client.force_login(UserFactory(is_staff=True))
+        response = client.get(reverse("ml_registry_stats"))
+        assert response.status_code == 200
+        assert response.json()["registry"]["hits"] == 0
@@ -0,0 +1,146 @@
+"""
+Tests für MLPredictor.predict_batch und POST /api/ml/predict-batch/.
+
+Abgedeckt:
+- Batch-Ergebnis identisch zu Einzel-Vorhersagen (ML + Regel-Fallback)
+- Konstante Query-Anzahl unabhängig von der Übungsanzahl
+- Endpoint: training_id, plan_id, uebung_ids, Validierung, fremde Objekte
+- Ghost-Sätze beim Trainingsstart nutzen ML-Startgewichte
+"""
+
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+
+from core.models import Satz
+from core.tests.factories import (
+    PlanFactory,
+    PlanUebungFactory,
+    TrainingseinheitFactory,
+    UebungFactory,
+    UserFactory,
+)
+from core.tests.test_ml_trainer import _create_saetze
+from ml_coach.ml_trainer import MLTrainer
+from ml_coach.model_registry import registry
+from ml_coach.prediction_service import MLPredictor
+
+
+@pytest.fixture(autouse=True)
+def leere_registry():
+    registry.leeren()
+    yield
+    registry.leeren()
+
+
+@pytest.fixture
+def daten():
+    """User mit zwei trainierten Übungen, einer ohne Modell und einer ohne Daten."""
+    user = UserFactory()
+    mit_modell = [UebungFactory(gewichts_typ="GESAMT") for _ in range(2)]
+    for i, uebung in enumerate(mit_modell):
+        _create_saetze(user, uebung, n=20, gewicht=60.0 + i * 20)
+        MLTrainer(user, uebung).train_model()
+    ohne_modell = UebungFactory(gewichts_typ="GESAMT")
+    _create_saetze(user, ohne_modell, n=3)
+    ohne_daten = UebungFactory(gewichts_typ="GESAMT")
+    return user, mit_modell, ohne_modell, ohne_daten
+
+
+def _post(client, payload):
+    return client.post(
+        reverse("ml_predict_batch"), data=json.dumps(payload), content_type="application/json"
+    )
+
+
+@pytest.mark.django_db
+class TestPredictBatch:
+    def test_wie_einzelvorhersagen(self, daten):
+        user, mit_modell, ohne_modell, ohne_daten = daten
+        alle = [*mit_modell, ohne_modell, ohne_daten]
+
+        batch = MLPredictor.predict_batch(user, [u.id for u in alle])
+
+        for uebung in alle:
+            assert batch[uebung.id] == MLPredictor(user, uebung).predict_next_weight()
+        assert [batch[u.id]["method"] for u in alle] == ["ml", "ml", "rules", "no_data"]
+
+    def test_ohne_fallback_nur_modelle(self, daten):
+        user, mit_modell, ohne_modell, ohne_daten = daten
+        ids = [u.id for u in (*mit_modell, ohne_modell, ohne_daten)]
+        assert set(MLPredictor.predict_batch(user, ids, fallback=False)) == {
+            u.id for u in mit_modell
+        }
+        assert MLPredictor.predict_batch(user, [ohne_daten.id], fallback=False) == {}
+
+    def test_konstante_query_anzahl(self, daten):
+        user, mit_modell, ohne_modell, ohne_daten = daten
+        with CaptureQueriesContext(connection) as eine:
+            MLPredictor.predict_batch(user, [mit_modell[0].id])
+        weitere = [UebungFactory(gewichts_typ="GESAMT") for _ in range(3)]
+        for uebung in weitere:
+            _create_saetze(user, uebung, n=12)
+            MLTrainer(user, uebung).train_model()
+        ids = [u.id for u in (*mit_modell, *weitere)]
+        with CaptureQueriesContext(connection) as viele:
+            MLPredictor.predict_batch(user, ids)
+        assert len(viele) <= len(eine) + 1
+
+
+@pytest.mark.django_db
+class TestPredictBatchEndpoint:
+    def test_training_und_plan(self, client, daten):
+        user, mit_modell, ohne_modell, _ = daten
+        client.force_login(user)
+        plan = PlanFactory(user=user)
+        PlanUebungFactory(plan=plan, uebung=mit_modell[0], rpe_ziel=7.0)
+        training = TrainingseinheitFactory(user=user, plan=plan)
+        Satz.objects.create(
+            einheit=training, uebung=ohne_modell, satz_nr=1, gewicht=50, wiederholungen=8
+        )
+
+        data = _post(client, {"training_id": training.id}).json()
+        assert set(data["predictions"]) == {str(mit_modell[0].id), str(ohne_modell.id)}
+        assert data["predictions"][str(mit_modell[0].id)]["method"] == "ml"
+
+        data = _post(client, {"plan_id": plan.id}).json()
+        assert list(data["predictions"]) == [str(mit_modell[0].id)]
+
+        data = _post(client, {"uebung_ids": [mit_modell[1].id]}).json()
+        assert data["success"] is True
+
+    def test_validierung_und_fremde_objekte(self, client, daten):
+        client.force_login(UserFactory())
+        assert _post(client, {"uebung_ids": "1"}).status_code == 400
+        assert _post(client, {"uebung_ids": list(range(51))}).status_code == 400
+        assert _post(client, {}).status_code == 400
+        fremdes_training = TrainingseinheitFactory(user=daten[0], plan=None)
+        assert _post(client, {"training_id": fremdes_training.id}).status_code == 404
+
+
+@pytest.mark.django_db
+class TestGhostSaetzeMitML:
+    def test_trainingsstart_nutzt_ml_startgewicht(self, client, daten):
+        user, mit_modell, ohne_modell, _ = daten
+        plan = PlanFactory(user=user)
+        PlanUebungFactory(plan=plan, uebung=mit_modell[0], saetze_ziel=2, reihenfolge=1)
+        PlanUebungFactory(plan=plan, uebung=ohne_modell, saetze_ziel=2, reihenfolge=2)
+        erwartet = MLPredictor(user, mit_modell[0]).predict_next_weight(rpe_target=None)
+        client.force_login(user)
+
+        client.get(reverse("training_start_plan", args=[plan.id]))
+
+        training = user.trainings.order_by("-id").first()
+        ml_saetze = training.saetze.filter(uebung=mit_modell[0])
+        assert {float(s.gewicht) for s in ml_saetze} == {erwartet["predicted_weight"]}
+        letzter = (
+            Satz.objects.filter(einheit__user=user, uebung=ohne_modell)
+            .exclude(einheit=training)
+            .order_by("-einheit__datum", "-satz_nr")
+            .first()
+        )
+        assert {s.gewicht for s in training.saetze.filter(uebung=ohne_modell)} == {letzter.gewicht}
@@ -274,3 +274,55 @@ class TestTrainAllUserModels:
         results = MLTrainer.train_all_user_models(user, min_samples=10)
         trainierten_uebungen = [r[0] for r in results]
         assert uebung not in trainierten_uebungen
+
+
+# ---------------------------------------------------------------------------
+# veraltete_paare / train_ml_models (inkrementell)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+class TestVeraltetePaare:
+    def test_neu_dann_aktuell_dann_neue_saetze(self, user, uebung_gesamt):
+        _create_saetze(user, uebung_gesamt, n=15)
+        paare, aktuell = MLTrainer.veraltete_paare(user_ids=[user.id])
+        assert paare == [(user.id, uebung_gesamt.id, "neu")]
+
+        MLTrainer(user, uebung_gesamt).train_model()
+        assert MLTrainer.veraltete_paare(user_ids=[user.id]) == ([], 1)
+
+        _create_saetze(user, uebung_gesamt, n=1, days_back=1)
+        paare, _ = MLTrainer.veraltete_paare(user_ids=[user.id])
+        assert paare == [(user.id, uebung_gesamt.id, "neue_saetze")]
+
+    def test_alter_und_force(self, user, uebung_gesamt):
+        from core.models import MLPredictionModel
+
+        _create_saetze(user, uebung_gesamt, n=15)
+        MLTrainer(user, uebung_gesamt).train_model()
+        MLPredictionModel.objects.filter(user=user).update(
+            trained_at=timezone.now() - timedelta(days=31)
+        )
+        assert MLTrainer.veraltete_paare(user_ids=[user.id])[0][0][2] == "alter"
+        assert MLTrainer.veraltete_paare(user_ids=[user.id], force=True)[0][0][2] == "force"
+
+
+@pytest.mark.django_db
+class TestTrainMlModelsCommand:
+    def test_zweiter_lauf_ueberspringt_unveraenderte(self, user, uebung_gesamt):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        _create_saetze(user, uebung_gesamt, n=15)
+        out = StringIO()
+        call_command("train_ml_models", "--user-id", str(user.id), stdout=out)
+        assert "1 trainiert, 0 übersprungen" in out.getvalue()
+
+        out = StringIO()
+        call_command("train_ml_models", "--user-id", str(user.id), stdout=out)
+        assert "0 trainiert, 1 übersprungen" in out.getvalue()
+
+        out = StringIO()
+        call_command("train_ml_models", "--user-id", str(user.id), "--force", stdout=out)
+        assert "1 trainiert" in out.getvalue()
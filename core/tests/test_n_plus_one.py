@@ -15,6 +15,7 @@ from django.urls import reverse
 import pytest
 
 from core.models import Plan, Trainingseinheit, Uebung
+from core.templatetags import source_tags
 from core.tests.factories import (
     PlanFactory,
     PlanUebungFactory,
@@ -231,3 +232,54 @@ class TestTrainingStatsNoNPlusOne:
             f"N+1 erkannt in training_stats: {queries_5} Queries für 5 Trainings, "
             f"{queries_10} Queries für 10 Trainings"
         )
+
+
+# ---------------------------------------------------------------------------
+# dashboard (Cache-Miss)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db
+class TestDashboardNoNPlusOne:
+    """Dashboard-Helfer teilen einen UserTrainingSnapshot statt eigener Queries."""
+
+    def _count_queries_for_n_trainings(self, client, user, n: int) -> int:
+        uebungen = [UebungFactory(bezeichnung=f"Dashboard-{n}-{i}") for i in range(3)]
+        for _ in range(n):
+            training = TrainingseinheitFactory(user=user, abgeschlossen=True)
+            _add_sets_to_training(training, uebungen)
+
+        source_tags._SOURCE_CACHE.clear()  # prozessweiter Quellen-Cache verfälscht sonst
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse("dashboard"))
+        assert response.status_code == 200
+        return len(ctx)
+
+    def test_query_count_stable_with_more_trainings(self, client):
+        """Query-Anzahl bei 5 Trainings == Query-Anzahl bei 10 Trainings."""
+        user = UserFactory()
+        client.force_login(user)
+        queries_5 = self._count_queries_for_n_trainings(client, user, 5)
+
+        user2 = UserFactory()
+        client.force_login(user2)
+        queries_10 = self._count_queries_for_n_trainings(client, user2, 10)
+
+        assert queries_5 == queries_10, (
+            f"N+1 erkannt im Dashboard: {queries_5} Queries für 5 Trainings, "
+            f"{queries_10} Queries für 10 Trainings"
+        )
+
+    def test_query_count_bounded(self, client):
+        """Cache-Miss des Dashboards bleibt unter 45 Queries."""
+        user = UserFactory()
+        client.force_login(user)
+        queries = self._count_queries_for_n_trainings(client, user, 5)
+        assert queries < 45, f"Dashboard: {queries} Queries (erwartet < 45)"
+
+    def test_cache_hit_rendert(self, client):
+        """Zweiter Aufruf (computed-Block aus dem Cache) ohne Snapshot lauffähig."""
+        user = UserFactory()
+        client.force_login(user)
+        self._count_queries_for_n_trainings(client, user, 2)
+        assert client.get(reverse("dashboard")).status_code == 200
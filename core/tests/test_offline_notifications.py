@@ -3,17 +3,28 @@ Tests für Offline-Sync und Push-Notification Views.
 
 Abgedeckt:
 - sync_offline_data: Login-Schutz, JSON-Sync, Update, Fehlerbehandlung
+- sync_offline_data_v2: Batch-Sync, Idempotenz-Schlüssel, Query-Anzahl
 - subscribe_push / unsubscribe_push: Login, Subscription-CRUD
 - get_vapid_public_key: VAPID-Key-Ausgabe
 """
 
 import json
+from decimal import Decimal
 
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 import pytest
 
+from core.models import (
+    MLFeatureZeile,
+    PersoenlicherRekord,
+    Satz,
+    SyncSchluessel,
+    UebungTagesStatistik,
+)
 from core.tests.factories import SatzFactory, TrainingseinheitFactory, UebungFactory, UserFactory
 
 
@@ -164,6 +175,131 @@ class TestSyncOfflineData:
         assert resp.status_code in (302, 405)  # Redirect (login) oder 405
 
 
+@pytest.mark.django_db
+class TestSyncOfflineDataV2:
+    """Tests für POST /api/v2/sync-offline/ (Batch + Idempotenz)."""
+
+    def setup_method(self):
+        self.client = Client()
+        self.user = UserFactory()
+        self.client.force_login(self.user)
+        self.url = reverse("sync_offline_data_v2")
+        self.training = TrainingseinheitFactory(user=self.user)
+        self.uebung = UebungFactory()
+
+    def _post(self, items):
+        return self.client.post(
+            self.url, data=json.dumps({"items": items}), content_type="application/json"
+        )
+
+    def _item(self, nr, **extra):
+        return {
+            "id": f"offline-{nr}",
+            "idempotency_key": f"key-{nr}",
+            "training_id": self.training.id,
+            "uebung_id": self.uebung.id,
+            "gewicht": "80.0",
+            "wiederholungen": 8,
+            "rpe": 7.5,
+            **extra,
+        }
+
+    def test_batch_creates_saetze_with_consecutive_satz_nr(self):
+        SatzFactory(einheit=self.training, uebung=self.uebung, satz_nr=2)
+        resp = self._post([self._item(i) for i in range(3)])
+        data = resp.json()
+        assert resp.status_code == 200
+        assert data["synced_count"] == 3
+        neue = Satz.objects.filter(id__in=[r["satz_id"] for r in data["results"]])
+        assert sorted(neue.values_list("satz_nr", flat=True)) == [3, 4, 5]
+        assert str(neue.first().rpe) == "7.5"
+        assert SyncSchluessel.objects.filter(user=self.user).count() == 3
+
+    def test_retry_with_same_keys_creates_nothing(self):
+        erster = self._post([self._item(1), self._item(2)]).json()
+        zweiter = self._post([self._item(1), self._item(2), self._item(3)]).json()
+        assert Satz.objects.filter(einheit=self.training).count() == 3
+        assert zweiter["results"][0]["duplicate"] is True
+        assert zweiter["results"][0]["satz_id"] == erster["results"][0]["satz_id"]
+        assert "duplicate" not in zweiter["results"][2]
+        assert zweiter["synced_count"] == 3
+
+    def test_duplicate_key_within_batch(self):
+        data = self._post([self._item(1), self._item(1)]).json()
+        assert Satz.objects.filter(einheit=self.training).count() == 1
+        assert data["results"][1]["duplicate"] is True
+        assert data["results"][1]["satz_id"] == data["results"][0]["satz_id"]
+
+    def test_update_and_invalid_items(self):
+        satz = SatzFactory(einheit=self.training, uebung=self.uebung, gewicht=70)
+        fremd = TrainingseinheitFactory(user=UserFactory())
+        data = self._post(
+            [
+                self._item(1, is_update=True, action=f"/set/{satz.id}/update/", gewicht="90"),
+                self._item(2, training_id=fremd.id),
+                self._item(3, gewicht="abc"),
+            ]
+        ).json()
+        assert [r["success"] for r in data["results"]] == [True, False, False]
+        assert data["results"][0]["updated"] is True
+        satz.refresh_from_db()
+        assert satz.gewicht == 90
+        # Fehlgeschlagene Items hinterlassen keinen Schlüssel → Retry möglich
+        assert list(SyncSchluessel.objects.values_list("schluessel", flat=True)) == ["key-1"]
+
+    def test_bad_item_rejected_alone(self):
+        """Nicht numerische satz_id und zu großes Gewicht: nur diese Items scheitern."""
+        data = self._post(
+            [
+                self._item(1, satz_id="abc"),
+                self._item(2, gewicht="123456.78"),
+                self._item(3, gewicht="9999.999"),
+                self._item(4, training_id=10**30),
+                self._item(5, gewicht="9999.99"),
+            ]
+        ).json()
+        assert [r["success"] for r in data["results"]] == [False, False, False, False, True]
+        assert data["results"][1]["error"] == "Gewicht außerhalb des gültigen Bereichs"
+        assert Satz.objects.get(id=data["results"][4]["satz_id"]).gewicht == Decimal("9999.99")
+        assert list(SyncSchluessel.objects.values_list("schluessel", flat=True)) == ["key-5"]
+
+    def test_query_count_independent_of_batch_size(self):
+        self._post([self._item(0)])
+        with CaptureQueriesContext(connection) as klein:
+            self._post([self._item(i) for i in range(1, 3)])
+        with CaptureQueriesContext(connection) as gross:
+            self._post([self._item(i) for i in range(10, 40)])
+        assert len(gross) == len(klein)
+
+    def test_query_count_independent_of_pairs(self):
+        """Abgeleitete Daten mengenbasiert: mehr (Einheit, Übung)-Paare, gleiche Query-Anzahl."""
+        trainings = [self.training] + [TrainingseinheitFactory(user=self.user) for _ in range(2)]
+        uebungen = [self.uebung, UebungFactory()]
+        self._post([self._item(0)])
+
+        with CaptureQueriesContext(connection) as ein_paar:
+            self._post([self._item(1)])
+        with CaptureQueriesContext(connection) as sechs_paare:
+            self._post(
+                [
+                    self._item(f"{t.id}-{u.id}", training_id=t.id, uebung_id=u.id)
+                    for t in trainings
+                    for u in uebungen
+                ]
+            )
+
+        assert len(sechs_paare) == len(ein_paar)
+        assert UebungTagesStatistik.objects.filter(user=self.user).count() == 6
+        assert MLFeatureZeile.objects.filter(user=self.user).count() == 8
+        assert PersoenlicherRekord.objects.filter(user=self.user).count() == 2
+
+    def test_payload_not_list_returns_400(self):
+        resp = self.client.post(
+            self.url, data=json.dumps({"items": "x"}), content_type="application/json"
+        )
+        assert resp.status_code == 400
+
+
 @pytest.mark.django_db
 class TestPushNotifications:
     """Tests für Push-Notification-Endpunkte."""
@@ -6,7 +6,7 @@ Deckt ab (Konzept §32.2 / §9.1+§9.7):
 - rückwirkendes Anlegen, offene Pause anlegbar,
 - Pause-vs-Pause-Overlap blockt (Fehler, kein Write),
 - Overlap mit Wochen, die Sessions haben → Warnung, aber NICHT blockiert,
-- Anlegen UND Löschen invalidieren `dashboard_computed_<user>` (⑬).
+- Anlegen UND Löschen ändern den versionierten `dashboard_computed_<user>_…`-Key (⑬).
 """
 
 from datetime import date, timedelta
@@ -18,6 +18,7 @@ from django.utils import timezone
 import pytest
 
 from core.models import TrainingsPause
+from core.services.dashboard_cache import dashboard_cache_key
 from core.tests.factories import TrainingseinheitFactory, TrainingsPauseFactory, UserFactory
 
 
@@ -236,19 +237,19 @@ class TestCacheInvalidierung:
     def test_anlegen_invalidiert_dashboard_cache(self, client):
         user = UserFactory()
         client.force_login(user)
-        key = f"dashboard_computed_{user.id}"
+        key = dashboard_cache_key(user.id)
         cache.set(key, "stale")
         client.post(
             reverse("pausen_add"),
             {"start_datum": "2026-01-05", "end_datum": "2026-01-15", "grund": "krankheit"},
         )
-        assert cache.get(key) is None
+        assert cache.get(dashboard_cache_key(user.id)) is None
 
     def test_loeschen_invalidiert_dashboard_cache(self, client):
         user = UserFactory()
         client.force_login(user)
         pause = TrainingsPauseFactory(user=user)
-        key = f"dashboard_computed_{user.id}"
+        key = dashboard_cache_key(user.id)
         cache.set(key, "stale")  # nach dem Anlegen setzen
         client.post(reverse("pausen_delete", args=[pause.id]))
-        assert cache.get(key) is None
+        assert cache.get(dashboard_cache_key(user.id)) is None
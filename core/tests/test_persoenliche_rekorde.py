@@ -0,0 +1,216 @@
+"""Tests für die PR-Tabelle (PersoenlicherRekord) und die PR-Erkennung in add_set.
+
+Abgedeckt:
+- Signal-Pflege: neuer Bestwert, Gleichstand, Aufwärm-/Deload-Sätze
+- Fallback-Neuberechnung: Rekordsatz gelöscht / verschlechtert, Deload umgeschaltet
+- Zweitbester gelöscht / verschlechtert: vorheriges_1rm sinkt wieder
+- Max.-Gewicht mit Wdh bei gleichem Gewicht
+- add_set: Query-Anzahl unabhängig von der Historie
+- rebuild_fuer_user entspricht der Signal-Pflege
+- Einheit/User löschen: ein mengenbasierter Nachzug statt Signal je Satz
+"""
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+
+from core.models import MLFeatureZeile, PersoenlicherRekord, UebungTagesStatistik
+from core.services.persoenliche_rekorde import rebuild_fuer_user
+from core.tests.factories import SatzFactory, TrainingseinheitFactory, UebungFactory, UserFactory
+
+
+def _rekord(user, uebung):
+    return PersoenlicherRekord.objects.get(user=user, uebung=uebung)
+
+
+def _satz(einheit, uebung, gewicht, wdh, **kwargs):
+    return SatzFactory(
+        einheit=einheit,
+        uebung=uebung,
+        gewicht=Decimal(str(gewicht)),
+        wiederholungen=wdh,
+        ist_aufwaermsatz=kwargs.pop("ist_aufwaermsatz", False),
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestSignalPflege:
+    def test_neuer_bestwert_merkt_vorherigen(self):
+        user, uebung = UserFactory(), UebungFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        erster = _satz(einheit, uebung, 100, 5)
+        rekord = _rekord(user, uebung)
+        assert rekord.bester_satz_id == erster.id
+        assert rekord.vorheriges_1rm is None
+
+        zweiter = _satz(einheit, uebung, 100, 8)
+        rekord = _rekord(user, uebung)
+        assert rekord.bester_satz_id == zweiter.id
+        assert rekord.bestes_1rm == pytest.approx(100 * (1 + 8 / 30))
+        assert rekord.vorheriges_1rm == pytest.approx(100 * (1 + 5 / 30))
+
+    def test_gleichstand_behaelt_alten_halter(self):
+        user, uebung = UserFactory(), UebungFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        erster = _satz(einheit, uebung, 100, 5)
+        _satz(einheit, uebung, 100, 5)
+        assert _rekord(user, uebung).bester_satz_id == erster.id
+
+    def test_aufwaerm_und_deload_zaehlen_nicht(self):
+        user, uebung = UserFactory(), UebungFactory()
+        _satz(TrainingseinheitFactory(user=user), uebung, 60, 5)
+        _satz(TrainingseinheitFactory(user=user), uebung, 200, 5, ist_aufwaermsatz=True)
+        _satz(TrainingseinheitFactory(user=user, ist_deload=True), uebung, 200, 5)
+        assert _rekord(user, uebung).max_gewicht == Decimal("60")
+
+    def test_max_gewicht_mit_wdh(self):
+        user, uebung = UserFactory(), UebungFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        _satz(einheit, uebung, 100, 3)
+        _satz(einheit, uebung, 90, 12)  # besseres 1RM, aber weniger Gewicht
+        besser = _satz(einheit, uebung, 100, 4)
+        rekord = _rekord(user, uebung)
+        assert rekord.max_gewicht == Decimal("100")
+        assert rekord.wdh_bei_max_gewicht == 4
+        assert rekord.max_gewicht_satz_id == besser.id
+
+
+@pytest.mark.django_db
+class TestNeuberechnung:
+    def test_rekordsatz_geloescht(self):
+        user, uebung = UserFactory(), UebungFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        zweitbester = _satz(einheit, uebung, 90, 5)
+        bester = _satz(einheit, uebung, 120, 5)
+
+        bester.delete()
+        rekord = _rekord(user, uebung)
+        assert rekord.bester_satz_id == zweitbester.id
+        assert rekord.max_gewicht == Decimal("90")
+
+        zweitbester.delete()
+        assert not PersoenlicherRekord.objects.filter(user=user, uebung=uebung).exists()
+
+    def test_rekordsatz_verschlechtert(self):
+        user, uebung = UserFactory(), UebungFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        anderer = _satz(einheit, uebung, 90, 5)
+        bester = _satz(einheit, uebung, 120, 5)
+
+        bester.gewicht = Decimal("80")
+        bester.save()
+        assert _rekord(user, uebung).bester_satz_id == anderer.id
+
+    def test_zweitbester_geloescht_dann_neuer_pr(self):
+        user, uebung = UserFactory(), UebungFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        dritter = _satz(einheit, uebung, 80, 5)
+        zweitbester = _satz(einheit, uebung, 100, 5)
+        _satz(einheit, uebung, 120, 5)
+
+        zweitbester.delete()
+        assert _rekord(user, uebung).vorheriges_1rm == pytest.approx(80 * (1 + 5 / 30))
+
+        # Neuer PR vergleicht gegen den alten Halter, nicht gegen den gelöschten Satz
+        neuer = _satz(einheit, uebung, 130, 5)
+        rekord = _rekord(user, uebung)
+        assert rekord.bester_satz_id == neuer.id
+        assert rekord.vorheriges_1rm == pytest.approx(120 * (1 + 5 / 30))
+        dritter.delete()
+        assert _rekord(user, uebung).vorheriges_1rm == pytest.approx(120 * (1 + 5 / 30))
+
+    def test_zweitbester_verschlechtert(self):
+        user, uebung = UserFactory(), UebungFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        _satz(einheit, uebung, 80, 5)
+        zweitbester = _satz(einheit, uebung, 100, 5)
+        _satz(einheit, uebung, 120, 5)
+
+        zweitbester.gewicht = Decimal("60")
+        zweitbester.save()
+        assert _rekord(user, uebung).vorheriges_1rm == pytest.approx(80 * (1 + 5 / 30))
+
+    def test_deload_umschalten(self):
+        user, uebung = UserFactory(), UebungFactory()
+        _satz(TrainingseinheitFactory(user=user), uebung, 90, 5)
+        einheit = TrainingseinheitFactory(user=user)
+        _satz(einheit, uebung, 120, 5)
+
+        einheit.ist_deload = True
+        einheit.save(update_fields=["ist_deload"])
+        assert _rekord(user, uebung).max_gewicht == Decimal("90")
+
+    def test_rebuild_entspricht_signal_pflege(self):
+        user, uebung = UserFactory(), UebungFactory()
+        for gewicht in (80, 100, 90):
+            _satz(TrainingseinheitFactory(user=user), uebung, gewicht, 5)
+        felder = ("uebung_id", "bestes_1rm", "bester_satz_id", "max_gewicht", "vorheriges_1rm")
+        vorher = list(PersoenlicherRekord.objects.filter(user=user).values_list(*felder))
+        PersoenlicherRekord.objects.all().delete()
+
+        assert rebuild_fuer_user(user.id) == 1
+        assert list(PersoenlicherRekord.objects.filter(user=user).values_list(*felder)) == vorher
+
+
+@pytest.mark.django_db
+class TestAddSetKonstant:
+    def _queries_fuer_add_set(self, client, n_historie: int) -> int:
+        user, uebung = UserFactory(), UebungFactory()
+        client.force_login(user)
+        alt = TrainingseinheitFactory(user=user)
+        for i in range(n_historie):
+            _satz(alt, uebung, 60 + i, 5, satz_nr=i + 1)
+        training = TrainingseinheitFactory(user=user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post(
+                reverse("add_set", args=[training.id]),
+                {"uebung": uebung.id, "gewicht": "200", "wiederholungen": "5"},
+                HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+            )
+        assert response.json()["pr_message"]
+        return len(ctx)
+
+    def test_query_anzahl_unabhaengig_von_historie(self, client):
+        assert self._queries_fuer_add_set(client, 3) == self._queries_fuer_add_set(client, 30)
+
+
+@pytest.mark.django_db
+class TestEinheitLoeschen:
+    def test_rekorde_nach_einheit_loeschen(self):
+        user, uebung = UserFactory(), UebungFactory()
+        bleibt = TrainingseinheitFactory(user=user)
+        dritter = _satz(bleibt, uebung, 80, 5)
+        _satz(bleibt, uebung, 100, 5)
+        weg = TrainingseinheitFactory(user=user)
+        _satz(weg, uebung, 120, 5)
+        _satz(weg, uebung, 110, 5)
+
+        weg.delete()
+        rekord = _rekord(user, uebung)
+        assert rekord.bestes_1rm == pytest.approx(100 * (1 + 5 / 30))
+        assert rekord.vorheriges_1rm == pytest.approx(80 * (1 + 5 / 30))
+        assert not UebungTagesStatistik.objects.filter(einheit_id=weg.pk).exists()
+        assert not MLFeatureZeile.objects.filter(einheit_id=weg.pk).exists()
+        assert MLFeatureZeile.objects.filter(satz=dritter).exists()
+
+    def _queries_fuer_loeschen(self, n_saetze: int, ganzer_user: bool = False) -> int:
+        user = UserFactory()
+        uebungen = [UebungFactory() for _ in range(3)]
+        einheit = TrainingseinheitFactory(user=user)
+        for i in range(n_saetze):
+            _satz(einheit, uebungen[i % 3], 60 + i, 5, satz_nr=i + 1)
+        _satz(TrainingseinheitFactory(user=user), uebungen[0], 50, 5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            (user if ganzer_user else einheit).delete()
+        return len(ctx)
+
+    def test_query_anzahl_unabhaengig_von_saetzen(self):
+        assert self._queries_fuer_loeschen(3) == self._queries_fuer_loeschen(18)
+        assert self._queries_fuer_loeschen(3, True) == self._queries_fuer_loeschen(18, True)
@@ -0,0 +1,188 @@
+"""Tests für den Plan-Stream (generate_plan_stream_api) auf Basis der Job-Queue.
+
+Abgedeckt:
+- Fortschritts-Ereignisse werden nur bei Änderung gespeichert
+- Begrenzter Pool im Web-Prozess (HINTERGRUND_JOBS_WEB_PARALLEL), Warteschlangen-Platz
+- Reconnect per Last-Event-ID liefert nur fehlende Ereignisse, ohne Rate-Limit
+- Ergebnis bleibt nach dem Stream über /api/jobs/<id>/ abrufbar
+"""
+
+import json
+from unittest.mock import patch
+
+from django.urls import reverse
+
+import pytest
+
+from core.models import HintergrundJob, HintergrundJobEreignis
+from core.services import hintergrund_jobs
+from core.services.hintergrund_jobs import (
+    enqueue,
+    melde_fortschritt,
+    starte_im_webprozess,
+    warteschlangen_platz,
+)
+from core.tests.factories import UserFactory
+
+PLAN_DATA = {"plan_name": "Push Pull Legs", "sessions": []}
+
+
+@pytest.fixture
+def generator():
+    """PlanGenerator-Mock, der zwei Fortschritts-Schritte meldet."""
+    with patch("ai_coach.plan_generator.PlanGenerator") as generator_cls:
+
+        def generate(*_args, **_kwargs):
+            melde = generator_cls.call_args.kwargs["progress_callback"]
+            melde(20, "Analysiere Trainingshistorie...")
+            melde(20, "Analysiere Trainingshistorie...")
+            melde(60, "KI generiert Plan...")
+            return {"success": True, "plan_data": PLAN_DATA, "coverage_warnings": ["Waden"]}
+
+        generator_cls.return_value.generate.side_effect = generate
+        yield generator_cls
+
+
+def _events(resp):
+    """Parst einen SSE-Body in [(id, data)]."""
+    payload = b"".join(resp.streaming_content).decode("utf-8")
+    events = []
+    for block in payload.split("\n\n"):
+        felder = dict(zeile.split(": ", 1) for zeile in block.splitlines() if ": " in zeile)
+        if "data" in felder:
+            events.append((felder.get("id"), json.loads(felder["data"])))
+    return events
+
+
+@pytest.mark.django_db
+class TestEreignisse:
+    def test_nur_bei_aenderung_gespeichert(self):
+        job = HintergrundJob.objects.create(typ="plan_vorschau", user=UserFactory())
+        melde_fortschritt(job, 10, "A")
+        melde_fortschritt(job, 10, "A")
+        melde_fortschritt(job, 10, "B")
+
+        assert list(job.ereignisse.values_list("fortschritt", "schritt")) == [
+            (10, "A"),
+            (10, "B"),
+        ]
+
+
+@pytest.mark.django_db
+class TestWebPool:
+    def test_max_parallel_aus_settings(self, settings):
+        settings.HINTERGRUND_JOBS_WEB_PARALLEL = 1
+        hintergrund_jobs._nach_fork()
+        try:
+            assert hintergrund_jobs._web_executor()._max_workers == 1
+            assert hintergrund_jobs._web_executor() is hintergrund_jobs._web_executor()
+        finally:
+            hintergrund_jobs._nach_fork()
+
+    def test_nur_wartende_jobs_und_warteschlange(self):
+        user = UserFactory()
+        erster, zweiter = [
+            HintergrundJob.objects.create(typ="plan_vorschau", user=user) for _ in range(2)
+        ]
+        assert (warteschlangen_platz(erster), warteschlangen_platz(zweiter)) == (1, 2)
+
+        with (
+            patch.object(hintergrund_jobs, "_beanspruche", return_value=True) as beanspruche,
+            patch.object(hintergrund_jobs, "fuehre_job_aus") as ausfuehren,
+        ):
+            starte_im_webprozess(erster).result(timeout=5)
+        beanspruche.assert_called_once()
+        ausfuehren.assert_called_once_with(erster.pk)
+
+        erster.status = "LAEUFT"
+        assert starte_im_webprozess(erster) is None
+        assert warteschlangen_platz(erster) == 0
+
+    def test_wartender_job_meldet_platz(self, client, settings):
+        settings.HINTERGRUND_JOBS_TIMEOUT = 0
+        user = UserFactory()
+        client.force_login(user)
+        vorher = enqueue("plan_vorschau", user, params=[])
+
+        with patch.object(hintergrund_jobs, "starte_im_webprozess"):
+            events = _events(client.get(reverse("generate_plan_stream_api"), secure=True))
+
+        assert events[1][1]["queue_position"] == 2
+        assert events[-1][1]["error"] == "Timeout – bitte erneut versuchen."
+        assert HintergrundJob.objects.get(pk=vorher.pk).status == "WARTEND"
+
+
+@pytest.mark.django_db
+class TestStreamResume:
+    @pytest.fixture(autouse=True)
+    def eager(self, settings):
+        settings.HINTERGRUND_JOBS_EAGER = True
+
+    def test_stream_mit_job_id_und_ergebnis(self, client, generator):
+        user = UserFactory()
+        client.force_login(user)
+
+        events = _events(client.get(reverse("generate_plan_stream_api"), secure=True))
+
+        job = HintergrundJob.objects.get(user=user, typ="plan_vorschau")
+        start_id, start = events[0]
+        assert start_id == f"{job.pk}:0" and start["job_id"] == job.pk
+        assert [e["progress"] for _, e in events] == [0, 20, 60, 100]
+        assert events[-1][1]["plan_data"] == PLAN_DATA
+        assert events[-1][1]["coverage_warnings"] == ["Waden"]
+
+        status = client.get(reverse("job_status_api", args=[job.pk]), secure=True).json()
+        assert status["status"] == "FERTIG"
+        assert status["ergebnis"]["plan_data"] == PLAN_DATA
+        assert generator.call_args.kwargs["cache"] is True
+
+    def test_cache_bypass_per_query_parameter(self, client, generator):
+        client.force_login(UserFactory())
+
+        client.get(reverse("generate_plan_stream_api"), {"cache": "0"}, secure=True)
+
+        assert generator.call_args.kwargs["cache"] is False
+
+    @patch("core.views.ai_recommendations._check_ai_rate_limit", return_value=None)
+    def test_last_event_id_liefert_nur_fehlendes(self, rate_limit, client, generator):
+        user = UserFactory()
+        client.force_login(user)
+        client.get(reverse("generate_plan_stream_api"), secure=True)
+        job = HintergrundJob.objects.get(user=user)
+        erstes = job.ereignisse.first()
+
+        events = _events(
+            client.get(
+                reverse("generate_plan_stream_api"),
+                secure=True,
+                HTTP_LAST_EVENT_ID=f"{job.pk}:{erstes.pk}",
+            )
+        )
+
+        assert [e["progress"] for _, e in events] == [60, 100]
+        assert rate_limit.call_count == 1
+        assert HintergrundJob.objects.filter(user=user).count() == 1
+        assert HintergrundJobEreignis.objects.filter(job=job).count() == 2
+
+        # Seite neu geladen: ?job_id= liefert alles nochmal
+        events = _events(
+            client.get(reverse("generate_plan_stream_api"), {"job_id": job.pk}, secure=True)
+        )
+        assert [e["progress"] for _, e in events] == [20, 60, 100]
+
+    def test_fremder_job_nicht_gefunden(self, client, generator):
+        besitzer = UserFactory()
+        client.force_login(besitzer)
+        client.get(reverse("generate_plan_stream_api"), secure=True)
+        job = HintergrundJob.objects.get(user=besitzer)
+
+        client.force_login(UserFactory())
+        events = _events(
+            client.get(
+                reverse("generate_plan_stream_api"), secure=True, HTTP_LAST_EVENT_ID=f"{job.pk}:0"
+            )
+        )
+
+        assert events == [
+            (None, {"done": True, "success": False, "error": "Plan-Generierung nicht gefunden"})
+        ]
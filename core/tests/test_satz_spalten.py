@@ -0,0 +1,141 @@
+"""Tests für den spaltenorientierten Satz-Loader (core/utils/satz_spalten.py).
+
+Abgedeckt:
+- Laden: Reihenfolge, NaN-RPE, Flags, Durchreichen bereits geladener Spalten
+- Zeitfenster: date-Ende schließt den ganzen Tag ein (wie der Queryset-Filter)
+- Parität: Analysefunktionen liefern mit Queryset und SatzSpalten dasselbe
+"""
+
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.utils import timezone
+
+import numpy as np
+import pytest
+
+from core.models import Satz, Trainingseinheit
+from core.tests.factories import SatzFactory, TrainingseinheitFactory, UebungFactory, UserFactory
+from core.utils.advanced_stats import (
+    _fenster_maske,
+    calculate_fatigue_index,
+    calculate_plateau_analysis,
+    calculate_rpe_quality_analysis,
+    calculate_rpe_quality_analysis_windowed,
+)
+from core.utils.satz_spalten import SatzSpalten, lade_satz_spalten, np_zeitpunkt
+
+
+def _einheit(user, tage_her, **kwargs):
+    einheit = TrainingseinheitFactory(user=user, **kwargs)
+    Trainingseinheit.objects.filter(pk=einheit.pk).update(
+        datum=timezone.now() - timedelta(days=tage_her)
+    )
+    einheit.refresh_from_db()
+    return einheit
+
+
+def test_np_zeitpunkt_normalisiert_auf_utc():
+    cet = dt_timezone(timedelta(hours=1))
+    aware = datetime(2026, 3, 1, 10, 0, tzinfo=cet)
+    assert np_zeitpunkt(aware) == np.datetime64("2026-03-01T09:00:00", "us")
+    assert np_zeitpunkt(aware.date()) == np.datetime64("2026-03-01T00:00:00", "us")
+
+
+@pytest.mark.django_db
+class TestLaden:
+    def test_reihenfolge_und_spalten(self):
+        user = UserFactory()
+        uebung = UebungFactory()
+        neu = _einheit(user, 1)
+        alt = _einheit(user, 5, ist_deload=True)
+        SatzFactory(einheit=neu, uebung=uebung, gewicht=Decimal("100"), rpe=None)
+        SatzFactory(
+            einheit=alt,
+            uebung=uebung,
+            gewicht=Decimal("60"),
+            rpe=Decimal("8.5"),
+            ist_aufwaermsatz=True,
+        )
+
+        sp = lade_satz_spalten(Satz.objects.filter(einheit__user=user))
+
+        assert len(sp) == 2
+        assert sp.gewicht.tolist() == [60.0, 100.0]  # chronologisch
+        assert sp.rpe[0] == 8.5 and np.isnan(sp.rpe[1])
+        assert sp.ist_aufwaermsatz.tolist() == [True, False]
+        assert sp.ist_deload.tolist() == [True, False]
+        assert len(sp.arbeitssaetze()) == 1
+        assert lade_satz_spalten(sp) is sp
+
+    def test_leeres_queryset(self):
+        sp = lade_satz_spalten(Satz.objects.none())
+        assert isinstance(sp, SatzSpalten)
+        assert len(sp) == 0
+        assert calculate_rpe_quality_analysis(sp) is None
+
+    def test_date_ende_schliesst_ganzen_tag_ein(self):
+        user = UserFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        spaet = timezone.now().replace(hour=23, minute=30, second=0, microsecond=0)
+        Trainingseinheit.objects.filter(pk=einheit.pk).update(datum=spaet)
+        SatzFactory(einheit=einheit)
+
+        sp = lade_satz_spalten(Satz.objects.filter(einheit__user=user))
+
+        assert _fenster_maske(sp, None, spaet.date()).tolist() == [True]
+        assert _fenster_maske(sp, None, spaet - timedelta(minutes=1)).tolist() == [False]
+
+
+@pytest.mark.django_db
+class TestParitaet:
+    @pytest.fixture
+    def user_mit_historie(self):
+        user = UserFactory()
+        uebung = UebungFactory(bezeichnung="Bankdrücken Spalten")
+        for tage_her in range(70, -1, -5):
+            einheit = _einheit(user, tage_her)
+            for nr, rpe in enumerate(("7.0", "8.5", "10.0", None, "5.0"), start=1):
+                SatzFactory(
+                    einheit=einheit,
+                    uebung=uebung,
+                    satz_nr=nr,
+                    gewicht=Decimal(60 + (70 - tage_her) // 5),
+                    wiederholungen=8,
+                    rpe=Decimal(rpe) if rpe else None,
+                    ist_aufwaermsatz=nr == 5,
+                )
+        return user, uebung
+
+    def test_rpe_qualitaet_queryset_gleich_spalten(self, user_mit_historie):
+        user, _ = user_mit_historie
+        qs = Satz.objects.filter(einheit__user=user)
+        sp = lade_satz_spalten(qs)
+
+        assert calculate_rpe_quality_analysis(qs) == calculate_rpe_quality_analysis(sp)
+        heute = timezone.now()
+        assert calculate_rpe_quality_analysis_windowed(
+            qs, reference_date=heute
+        ) == calculate_rpe_quality_analysis_windowed(sp, reference_date=heute)
+
+    def test_plateau_queryset_gleich_spalten(self, user_mit_historie):
+        user, uebung = user_mit_historie
+        qs = Satz.objects.filter(einheit__user=user, ist_aufwaermsatz=False)
+        top = [{"uebung__bezeichnung": uebung.bezeichnung, "muskelgruppe_display": "Brust"}]
+
+        ergebnis = calculate_plateau_analysis(qs, top)
+        assert ergebnis
+        assert ergebnis == calculate_plateau_analysis(lade_satz_spalten(qs), top)
+
+    def test_fatigue_rpe_komponente_gleich(self, user_mit_historie):
+        user, _ = user_mit_historie
+        trainings = Trainingseinheit.objects.filter(user=user)
+        rpe_saetze = Satz.objects.filter(einheit__user=user, rpe__isnull=False)
+        sp = lade_satz_spalten(Satz.objects.filter(einheit__user=user))
+
+        live = calculate_fatigue_index([], rpe_saetze, trainings)
+        spalten = calculate_fatigue_index([], rpe_saetze, trainings, spalten=sp)
+
+        assert live["rpe_steigend"]  # 33 % RPE 10 → RPE-Komponente greift
+        assert live == spalten
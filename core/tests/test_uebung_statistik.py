@@ -0,0 +1,175 @@
+"""Tests für die materialisierte Übungs-Statistik (UebungTagesStatistik).
+
+Abgedeckt:
+- Signal-Pflege bei Satz anlegen / ändern / löschen
+- Aufwärmsätze zählen nicht, Einheit löschen räumt auf
+- Effektive Werte (PRO_SEITE, KOERPERGEWICHT mit historischem Körpergewicht)
+- Lazy-Nachzug bei geändertem Körpergewicht
+- rebuild_fuer_user / Management-Command liefern dieselben Zeilen
+- manage.py rebuild_uebung_statistik baut die Historie auch nach einem ersten Satz nach dem Deploy auf
+"""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+
+import pytest
+
+from core.models import UebungTagesStatistik
+from core.services.uebung_statistik import aktualisiere_koerpergewicht, rebuild_fuer_user
+from core.tests.factories import (
+    KoerperWerteFactory,
+    SatzFactory,
+    TrainingseinheitFactory,
+    UebungFactory,
+    UserFactory,
+)
+
+
+def _stat(einheit, uebung):
+    return UebungTagesStatistik.objects.get(einheit=einheit, uebung=uebung)
+
+
+@pytest.mark.django_db
+class TestSignalPflege:
+    def test_satz_anlegen_erzeugt_zeile(self):
+        einheit = TrainingseinheitFactory()
+        uebung = UebungFactory()
+        SatzFactory(einheit=einheit, uebung=uebung, gewicht=Decimal("100"), wiederholungen=5)
+        SatzFactory(einheit=einheit, uebung=uebung, gewicht=Decimal("90"), wiederholungen=10)
+
+        stat = _stat(einheit, uebung)
+        assert stat.user_id == einheit.user_id
+        assert stat.saetze_anzahl == 2
+        assert stat.bestes_1rm == pytest.approx(120.0)  # 90 × (1 + 10/30)
+        assert stat.bester_satz.gewicht == Decimal("90")
+        assert stat.max_gewicht == Decimal("100")
+        assert stat.tonnage == pytest.approx(100 * 5 + 90 * 10)
+
+    def test_aufwaermsatz_zaehlt_nicht(self):
+        einheit = TrainingseinheitFactory()
+        uebung = UebungFactory()
+        SatzFactory(
+            einheit=einheit,
+            uebung=uebung,
+            gewicht=Decimal("200"),
+            wiederholungen=5,
+            ist_aufwaermsatz=True,
+        )
+        assert not UebungTagesStatistik.objects.filter(einheit=einheit).exists()
+
+    def test_satz_aendern_und_loeschen(self):
+        einheit = TrainingseinheitFactory()
+        uebung = UebungFactory()
+        satz = SatzFactory(einheit=einheit, uebung=uebung, gewicht=Decimal("60"), wiederholungen=5)
+
+        satz.gewicht = Decimal("80")
+        satz.save()
+        assert _stat(einheit, uebung).max_gewicht == Decimal("80")
+
+        satz.delete()
+        assert not UebungTagesStatistik.objects.filter(einheit=einheit).exists()
+
+    def test_einheit_loeschen_raeumt_auf(self):
+        einheit = TrainingseinheitFactory()
+        SatzFactory(einheit=einheit)
+        SatzFactory(einheit=einheit)
+        einheit.delete()
+        assert UebungTagesStatistik.objects.count() == 0
+
+    def test_rpe_summe_und_anzahl(self):
+        einheit = TrainingseinheitFactory()
+        uebung = UebungFactory()
+        SatzFactory(einheit=einheit, uebung=uebung, rpe=Decimal("7.0"))
+        SatzFactory(einheit=einheit, uebung=uebung, rpe=Decimal("9.0"))
+        SatzFactory(einheit=einheit, uebung=uebung, rpe=None)
+
+        stat = _stat(einheit, uebung)
+        assert stat.rpe_anzahl == 2
+        assert stat.avg_rpe == pytest.approx(8.0)
+
+
+@pytest.mark.django_db
+class TestEffektiveWerte:
+    def test_pro_seite_verdoppelt(self):
+        einheit = TrainingseinheitFactory()
+        uebung = UebungFactory(gewichts_typ="PRO_SEITE")
+        SatzFactory(einheit=einheit, uebung=uebung, gewicht=Decimal("20"), wiederholungen=10)
+
+        stat = _stat(einheit, uebung)
+        assert stat.max_effektives_gewicht == pytest.approx(40.0)
+        assert stat.bestes_1rm == pytest.approx(20 * (1 + 10 / 30))  # roh bleibt roh
+        assert stat.koerpergewicht is None
+
+    def test_koerpergewicht_uebung_nutzt_historisches_gewicht(self):
+        user = UserFactory()
+        KoerperWerteFactory(user=user, gewicht=Decimal("80"))
+        einheit = TrainingseinheitFactory(user=user)
+        uebung = UebungFactory(gewichts_typ="KOERPERGEWICHT", koerpergewicht_faktor=0.5)
+        SatzFactory(einheit=einheit, uebung=uebung, gewicht=Decimal("0"), wiederholungen=12)
+
+        stat = _stat(einheit, uebung)
+        assert stat.koerpergewicht == pytest.approx(80.0)
+        assert stat.max_effektives_gewicht == pytest.approx(40.0)
+        assert stat.max_wdh_ohne_gewicht == 12
+
+    def test_geaendertes_koerpergewicht_wird_nachgezogen(self):
+        user = UserFactory()
+        einheit = TrainingseinheitFactory(user=user)
+        uebung = UebungFactory(gewichts_typ="KOERPERGEWICHT", koerpergewicht_faktor=1.0)
+        SatzFactory(einheit=einheit, uebung=uebung, gewicht=Decimal("0"), wiederholungen=10)
+        assert _stat(einheit, uebung).koerpergewicht == pytest.approx(80.0)  # Fallback
+
+        stats = list(UebungTagesStatistik.objects.select_related("einheit"))
+        stats = aktualisiere_koerpergewicht(stats, {einheit.datum: 90.0})
+        # Ohne KoerperWerte bleibt 80 kg maßgeblich → Neuberechnung ergibt 80
+        assert stats[0].koerpergewicht == pytest.approx(80.0)
+
+        KoerperWerteFactory(user=user, gewicht=Decimal("90"), datum=date(2000, 1, 1))
+        stats = aktualisiere_koerpergewicht(stats, {einheit.datum: 90.0})
+        assert stats[0].koerpergewicht == pytest.approx(90.0)
+        assert _stat(einheit, uebung).max_effektives_gewicht == pytest.approx(90.0)
+
+
+@pytest.mark.django_db
+class TestRebuild:
+    def test_rebuild_entspricht_signal_pflege(self):
+        user = UserFactory()
+        uebung = UebungFactory()
+        for _ in range(3):
+            einheit = TrainingseinheitFactory(user=user)
+            SatzFactory(einheit=einheit, uebung=uebung)
+            SatzFactory(einheit=einheit, uebung=uebung)
+
+        felder = ("einheit_id", "uebung_id", "saetze_anzahl", "bestes_1rm", "tonnage")
+        vorher = sorted(UebungTagesStatistik.objects.values_list(*felder))
+        UebungTagesStatistik.objects.all().delete()
+
+        assert rebuild_fuer_user(user.id) == 3
+        assert sorted(UebungTagesStatistik.objects.values_list(*felder)) == vorher
+
+    def test_command_baut_fehlende_zeilen_auf(self):
+        einheit = TrainingseinheitFactory()
+        SatzFactory(einheit=einheit)
+        UebungTagesStatistik.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_uebung_statistik", stdout=out)
+        assert UebungTagesStatistik.objects.filter(einheit=einheit).count() == 1
+        assert "1 Zeilen" in out.getvalue()
+
+    def test_command_backfill_trotz_neuer_zeile(self):
+        """Nach dem Deploy legt der erste neue Satz eine Zeile an – die Historie fehlt trotzdem nicht."""
+        user = UserFactory()
+        uebung = UebungFactory()
+        alt = [TrainingseinheitFactory(user=user) for _ in range(3)]
+        for einheit in alt:
+            SatzFactory(einheit=einheit, uebung=uebung)
+        UebungTagesStatistik.objects.all().delete()  # Stand vor Migration 0086
+        SatzFactory(einheit=TrainingseinheitFactory(user=user), uebung=uebung)
+
+        call_command("rebuild_uebung_statistik", stdout=StringIO())
+
+        assert UebungTagesStatistik.objects.filter(user=user, uebung=uebung).count() == 4
@@ -9,6 +9,8 @@ wurden. Umfasst:
 - build_weekly_volume_overview Diagnose (vergleichbare Wochen)
 - Dashboard-Integration (Phase 24.1c – stellt sicher, dass die
   training_stats-View denselben Klassifikator nutzt wie der PDF-Pfad).
+- IsoWochenKalender (Streak/Netto-Blockdauer aus einem Query, Parität zu
+  pausen_grenze_keys / pausen_ausfall_wochen).
 """
 
 from datetime import date, datetime, timedelta
@@ -29,7 +31,11 @@ from core.tests.factories import (
     UserFactory,
 )
 from core.utils.week_classification import (
+    IsoWochenKalender,
     build_weekly_volume_overview,
+    letzte_iso_wochen_keys,
+    pausen_ausfall_wochen,
+    pausen_grenze_keys,
     pausen_im_zeitraum,
     select_comparable_weeks,
 )
@@ -688,3 +694,81 @@ class TestPlanWechselSplitRoutine:
         assert kw17["ist_plan_wechsel"] is False
         assert kw18["ist_plan_wechsel"] is True  # erste Woche der neuen Routine
         assert kw19["ist_plan_wechsel"] is False  # gleiche Routine wie KW18
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# IsoWochenKalender
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Mittwoch KW30/2026
+_HEUTE = date(2026, 7, 22)
+
+
+def _zeile(training_id, d, abgeschlossen=True, ist_deload=False):
+    dt = datetime(d.year, d.month, d.day, 18, 0, tzinfo=timezone.get_current_timezone())
+    return (training_id, dt, abgeschlossen, ist_deload)
+
+
+def _montag_vor(wochen):
+    return _HEUTE - timedelta(days=_HEUTE.weekday(), weeks=wochen)
+
+
+class TestIsoWochenKalender:
+    def test_streak_laufende_woche_neutral(self):
+        zeilen = [_zeile(i, _montag_vor(k)) for i, k in enumerate((1, 2, 3), start=1)]
+        kalender = IsoWochenKalender(zeilen, [], _HEUTE)
+        assert kalender.streak() == 3
+
+    def test_streak_pause_bridged_luecke_bricht(self):
+        zeilen = [_zeile(i, _montag_vor(k)) for i, k in enumerate((0, 1, 4, 5, 7), start=1)]
+        pause = _pause_obj(_montag_vor(3), _montag_vor(2) + timedelta(days=6))
+        assert IsoWochenKalender(zeilen, [pause], _HEUTE).streak() == 4
+        assert IsoWochenKalender(zeilen, [], _HEUTE).streak() == 2
+
+    def test_deload_majority_und_erstes_training(self):
+        montag = _montag_vor(1)
+        zeilen = [
+            _zeile(7, montag + timedelta(days=1), ist_deload=True),
+            _zeile(5, montag, abgeschlossen=False),
+            _zeile(6, montag + timedelta(days=1)),
+        ]
+        kalender = IsoWochenKalender(zeilen, [], _HEUTE)
+        key = letzte_iso_wochen_keys(_HEUTE, 2)[0]
+        assert kalender.anzahl_sessions(key) == 3
+        assert not kalender.ist_deload_majority(key)  # 1/3 Deload
+        assert kalender.erstes_training_am(montag) is None  # nicht abgeschlossen
+        assert kalender.erstes_training_am(montag + timedelta(days=1)) == 6
+
+    def test_paritaet_zu_pausen_funktionen(self):
+        pausen = [
+            _pause_obj(date(2026, 6, 18), date(2026, 7, 19)),
+            _pause_obj(date(2026, 5, 4), date(2026, 5, 4)),
+        ]
+        zeilen = [_zeile(1, date(2026, 7, 1)), _zeile(2, date(2026, 7, 8), abgeschlossen=False)]
+        kalender = IsoWochenKalender(zeilen, pausen, _HEUTE)
+        keys = letzte_iso_wochen_keys(_HEUTE, 20)
+
+        assert {k for k in keys if kalender.ist_pausen_grenze(k)} == pausen_grenze_keys(
+            pausen, _HEUTE, keys
+        )
+        start = date(2026, 5, 1)
+        assert kalender.ausfall_wochen(start) == pausen_ausfall_wochen(
+            pausen, start, _HEUTE, sessions_week_keys={"2026-W27"}
+        )
+        assert kalender.ausfall_wochen(start) == 3  # 4 voll abgedeckt, eine trainiert
+
+
+@pytest.mark.django_db
+class TestIsoWochenKalenderQueries:
+    def test_fuer_user_ein_query_fuer_sessions(self, django_assert_num_queries):
+        from core.models import Trainingseinheit
+
+        user = UserFactory()
+        for k in range(30):
+            einheit = TrainingseinheitFactory(user=user, abgeschlossen=True)
+            Trainingseinheit.objects.filter(pk=einheit.pk).update(
+                datum=timezone.now() - timedelta(weeks=k)
+            )
+        with django_assert_num_queries(2):  # Sessions + Pausen
+            kalender = IsoWochenKalender.fuer_user(user, timezone.now().date())
+            assert kalender.streak() == 30
@@ -82,6 +82,7 @@ urlpatterns = [
     path("stats/exercise/<int:uebung_id>/", views.exercise_stats, name="exercise_stats"),
     # Offline Sync
     path("api/sync-offline/", views.sync_offline_data, name="sync_offline_data"),
+    path("api/v2/sync-offline/", views.sync_offline_data_v2, name="sync_offline_data_v2"),
     # Progress Photos
     path("progress-photos/", views.progress_photos, name="progress_photos"),
     path("progress-photos/upload/", views.upload_progress_photo, name="upload_progress_photo"),
@@ -112,6 +113,11 @@ urlpatterns = [
     path("api/exercise/<int:exercise_id>/", views.exercise_api_detail, name="exercise_api_detail"),
     # Live Guidance API
     path("api/live-guidance/", views.live_guidance_api, name="live_guidance_api"),
+    path(
+        "api/live-guidance/stream/",
+        views.live_guidance_stream_api,
+        name="live_guidance_stream_api",
+    ),
     # AI Plan Generator API
     path("api/generate-plan/", views.generate_plan_api, name="generate_plan_api"),
     path(
@@ -173,6 +179,9 @@ urlpatterns = [
     path("api/push/subscribe/", views.subscribe_push, name="subscribe_push"),
     path("api/push/unsubscribe/", views.unsubscribe_push, name="unsubscribe_push"),
     path("api/push/vapid-key/", views.get_vapid_public_key, name="get_vapid_public_key"),
+    # Hintergrund-Jobs (manage.py run_worker)
+    path("api/jobs/<int:job_id>/", views.job_status_api, name="job_status_api"),
+    path("api/jobs/<int:job_id>/download/", views.job_download, name="job_download"),
     # Saleria API (Elder-Berry AI-Assistent, Token-Auth)
     path("api/saleria/summary/", views.saleria_summary, name="saleria_summary"),
     path("api/saleria/last-training/", views.saleria_last_training, name="saleria_last_training"),
@@ -181,6 +190,8 @@ urlpatterns = [
     # ML Prediction (scikit-learn, 100% lokal, CPU-only)
     path("api/ml/train/", views.ml_train_model, name="ml_train_model"),
     path("api/ml/predict/<int:uebung_id>/", views.ml_predict_weight, name="ml_predict_weight"),
+    path("api/ml/predict-batch/", views.ml_predict_batch, name="ml_predict_batch"),
     path("api/ml/model-info/<int:uebung_id>/", views.ml_model_info, name="ml_model_info"),
+    path("api/ml/registry-stats/", views.ml_registry_stats, name="ml_registry_stats"),
     path("ml/dashboard/", views.ml_dashboard, name="ml_dashboard"),
 ]
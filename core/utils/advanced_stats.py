@@ -4,9 +4,19 @@ Provides comprehensive analysis for training progression, consistency, and perfo
 """
 
 from datetime import datetime, timedelta
+from math import fsum
 
 from django.utils import timezone
 
+import numpy as np
+
+from core.utils.satz_spalten import (
+    als_datetime,
+    lade_satz_spalten,
+    lade_trainings_daten,
+    np_zeitpunkt,
+)
+
 # Phase 23: Zeitfenster-Konstanten für gestaffelte Trainingsanalysen
 WINDOW_2W_DAYS = 14
 WINDOW_4W_DAYS = 28
@@ -140,26 +150,42 @@ def compute_progression_rate(
     """
     if pr_satz is None or not pr_satz.gewicht:
         return 0.0, 0
-    weighted_saetze = list(uebung_saetze.filter(gewicht__isnull=False).order_by("einheit__datum"))
-    if not weighted_saetze:
+    return _progression_rate_aus_spalten(
+        lade_satz_spalten(uebung_saetze),
+        pr_satz.einheit.datum,
+        reference_date=reference_date,
+        recent_window_weeks=recent_window_weeks,
+    )
+
+
+def _progression_rate_aus_spalten(
+    sp,
+    pr_datum,
+    *,
+    reference_date=None,
+    recent_window_weeks: int = PROGRESSION_RATE_RECENT_WINDOW_WEEKS,
+) -> tuple[float, int]:
+    """Spalten-Variante von :func:`compute_progression_rate` (``sp`` = eine Übung)."""
+    if not len(sp):
         return 0.0, 0
-    erster = weighted_saetze[0]
-    history_days = (pr_satz.einheit.datum.date() - erster.einheit.datum.date()).days
+    history_days = (pr_datum.date() - sp.tage[0].item()).days
     if history_days <= 0:
         return 0.0, 0
 
     if reference_date is None:
         reference_date = timezone.now()
     window_start = reference_date - timedelta(days=recent_window_weeks * 7)
-    recent = [s for s in weighted_saetze if s.einheit.datum >= window_start and s.gewicht]
+    recent = np.flatnonzero(sp.fenster(window_start) & (sp.gewicht != 0))
     if len(recent) < 2:
         return 0.0, history_days
     erster_recent, letzter_recent = recent[0], recent[-1]
-    span_days = (letzter_recent.einheit.datum.date() - erster_recent.einheit.datum.date()).days
+    span_days = (sp.tage[letzter_recent].item() - sp.tage[erster_recent].item()).days
     if span_days <= 0:
         return 0.0, history_days
-    erstes_1rm = float(erster_recent.gewicht) * (1 + (erster_recent.wiederholungen or 1) / 30.0)
-    letztes_1rm = float(letzter_recent.gewicht) * (1 + (letzter_recent.wiederholungen or 1) / 30.0)
+    erstes_1rm = float(sp.gewicht[erster_recent]) * (1 + (int(sp.wdh[erster_recent]) or 1) / 30.0)
+    letztes_1rm = float(sp.gewicht[letzter_recent]) * (
+        1 + (int(sp.wdh[letzter_recent]) or 1) / 30.0
+    )
     rate = round((letztes_1rm - erstes_1rm) / span_days * 30, 2)
     return rate, history_days
 
@@ -286,7 +312,23 @@ def classify_progression_status(
     if reference_date is None:
         reference_date = timezone.now()
 
-    result = {
+    if not pr_satz or not pr_satz.gewicht or not getattr(pr_satz, "einheit", None):
+        return _finalize_progression(_leeres_progressions_ergebnis())
+
+    pr_1rm = float(pr_satz.gewicht) * (1 + (pr_satz.wiederholungen or 1) / 30.0)
+    return _klassifiziere_aus_spalten(
+        lade_satz_spalten(uebung_saetze),
+        pr_satz.einheit.datum,
+        pr_1rm,
+        reference_date,
+        progression_pro_monat=progression_pro_monat,
+        training_history_days=training_history_days,
+        reentry_pause=reentry_pause,
+    )
+
+
+def _leeres_progressions_ergebnis() -> dict:
+    return {
         "status": "no_data",
         "status_label": "Keine Daten",
         "status_farbe": "secondary",
@@ -299,26 +341,33 @@ def classify_progression_status(
         "progression_rate_pct": None,
     }
 
-    if not pr_satz or not pr_satz.gewicht or not getattr(pr_satz, "einheit", None):
-        return _finalize_progression(result)
 
-    pr_date = pr_satz.einheit.datum
-    days_since_pr = (reference_date.date() - pr_date.date()).days
+def _klassifiziere_aus_spalten(
+    sp,
+    pr_datum,
+    pr_1rm: float,
+    reference_date,
+    *,
+    progression_pro_monat=None,
+    training_history_days=None,
+    reentry_pause=None,
+):
+    """Spalten-Kern von :func:`classify_progression_status` (``sp`` = eine Übung).
+
+    ``pr_datum`` ist das (aware) Datum des PR-Satzes, ``pr_1rm`` dessen Roh-Epley.
+    """
+    result = _leeres_progressions_ergebnis()
+    days_since_pr = (reference_date.date() - pr_datum.date()).days
     result["days_since_pr"] = days_since_pr
-    pr_1rm = float(pr_satz.gewicht) * (1 + (pr_satz.wiederholungen or 1) / 30.0)
 
     vier_wochen_start = reference_date - timedelta(days=28)
-    cur_saetze = list(
-        uebung_saetze.filter(einheit__datum__gte=vier_wochen_start).order_by("einheit__datum")
-    )
-    result["cur_4w_n"] = len(cur_saetze)
+    cur = sp.fenster(vier_wochen_start)
+    result["cur_4w_n"] = int(cur.sum())
 
     # Weight-Drop berechnen, sofern mindestens 1 Working Set in den letzten 4w
-    cur_weighted = [s for s in cur_saetze if s.gewicht]
-    if cur_weighted and pr_1rm > 0:
-        cur_best_1rm = max(
-            float(s.gewicht) * (1 + (s.wiederholungen or 1) / 30.0) for s in cur_weighted
-        )
+    cur_weighted = cur & (sp.gewicht != 0)
+    if cur_weighted.any() and pr_1rm > 0:
+        cur_best_1rm = float(sp.epley_1rm()[cur_weighted].max())
         result["weight_drop_pct"] = round((pr_1rm - cur_best_1rm) / pr_1rm * 100, 2)
 
     # 1) Regression schlägt alles – außer während einer laufenden
@@ -358,9 +407,8 @@ def classify_progression_status(
         return _finalize_progression(result)
 
     # 4) Konsolidierung: RPE-Trend in den letzten 4w vergleichen.
-    rpe_saetze = [s for s in cur_saetze if s.rpe is not None and s.gewicht]
-    if len(rpe_saetze) >= PROGRESSION_RPE_MIN_SETS:
-        rpe_values = [float(s.rpe) for s in rpe_saetze]
+    rpe_values = sp.rpe[cur_weighted & ~np.isnan(sp.rpe)].tolist()
+    if len(rpe_values) >= PROGRESSION_RPE_MIN_SETS:
         mid = len(rpe_values) // 2
         first_half = sum(rpe_values[:mid]) / mid
         second_half = sum(rpe_values[mid:]) / len(rpe_values[mid:])
@@ -435,6 +483,18 @@ def classify_progression_status(
     return _finalize_progression(result)
 
 
+def _uebung_ids_nach_name(namen) -> dict[str, list[int]]:
+    """{bezeichnung: [uebung_ids]} – entspricht dem ``uebung__bezeichnung``-Filter."""
+    from core.models import Uebung
+
+    ids: dict[str, list[int]] = {}
+    for uebung_id, name in Uebung.objects.filter(bezeichnung__in=list(namen)).values_list(
+        "id", "bezeichnung"
+    ):
+        ids.setdefault(name, []).append(uebung_id)
+    return ids
+
+
 def calculate_plateau_analysis(alle_saetze, top_uebungen, *, reentry_pause=None):
     """
     Analyzes progression for top exercises to detect plateaus.
@@ -442,6 +502,9 @@ def calculate_plateau_analysis(alle_saetze, top_uebungen, *, reentry_pause=None)
     ``reentry_pause``: siehe :func:`classify_progression_status` (Phase 35.1) –
     wird pro Übung unverändert durchgereicht.
 
+    ``alle_saetze`` darf ein Satz-Queryset oder bereits geladene
+    :class:`~core.utils.satz_spalten.SatzSpalten` sein.
+
     Returns list with:
     - uebung: Exercise name
     - letzter_pr: Last personal record weight (estimated 1RM)
@@ -455,35 +518,44 @@ def calculate_plateau_analysis(alle_saetze, top_uebungen, *, reentry_pause=None)
     """
     heute = timezone.now()
     plateau_analysis = []
+    if not top_uebungen:
+        return plateau_analysis
+
+    # Alle Sätze EINMAL spaltenweise laden; je Übung nur noch eine Maske.
+    sp_alle = lade_satz_spalten(alle_saetze)
+    uebung_ids = _uebung_ids_nach_name(u["uebung__bezeichnung"] for u in top_uebungen[:5])
 
     for uebung in top_uebungen[:5]:
         uebung_name = uebung["uebung__bezeichnung"]
         muskelgruppe = uebung.get("muskelgruppe_display", "")
 
-        uebung_saetze = alle_saetze.filter(uebung__bezeichnung=uebung_name).order_by(
-            "einheit__datum"
-        )
+        sp = sp_alle.teilmenge(np.isin(sp_alle.uebung_id, uebung_ids.get(uebung_name, [])))
 
-        if uebung_saetze.count() < 2:
+        if len(sp) < 2:
             continue
 
-        bester_1rm, pr_satz = _find_best_1rm_satz(uebung_saetze)
-        if not pr_satz:
+        # Bestes 1RM – bei Gleichstand der chronologisch erste Satz (wie
+        # ``_find_best_1rm_satz``: argmax liefert das erste Maximum)
+        epley = sp.epley_1rm()
+        pr_idx = int(np.argmax(epley))
+        bester_1rm = float(epley[pr_idx])
+        if not bester_1rm > 0:
             continue
 
         letzter_pr = round(bester_1rm, 1)
-        pr_datum = pr_satz.einheit.datum
+        pr_datum = als_datetime(sp.datum[pr_idx])
 
         # Phase 24.5a: Steigerungsrate über das aktuelle 8-Wochen-Fenster,
         # nicht mehr All-Time. Anker = ``heute`` für Test-Determinismus.
-        progression_pro_monat, training_history_days = compute_progression_rate(
-            uebung_saetze, pr_satz, reference_date=heute
+        progression_pro_monat, training_history_days = _progression_rate_aus_spalten(
+            sp, pr_datum, reference_date=heute
         )
 
-        classification = classify_progression_status(
-            uebung_saetze,
-            pr_satz,
-            reference_date=heute,
+        classification = _klassifiziere_aus_spalten(
+            sp,
+            pr_datum,
+            bester_1rm,
+            heute,
             progression_pro_monat=progression_pro_monat,
             training_history_days=training_history_days,
             reentry_pause=reentry_pause,
@@ -525,7 +597,10 @@ def calculate_consistency_metrics(alle_trainings):
     - avg_pause_tage: Average days between sessions
     - bewertung: Overall consistency rating
     """
-    if not alle_trainings.exists():
+    # Alle Trainingsdaten EINMAL laden; Wochen-Counts per searchsorted statt
+    # 104 einzelner COUNT-Queries.
+    daten = lade_trainings_daten(alle_trainings)
+    if not len(daten):
         return None
 
     heute = timezone.now()
@@ -536,8 +611,12 @@ def calculate_consistency_metrics(alle_trainings):
     from core.models import TrainingsPause
     from core.utils.week_classification import letzte_iso_wochen_keys, pausen_grenze_keys
 
-    _user = alle_trainings.first().user
-    _pausen = TrainingsPause.objects.filter(user=_user) if _user else TrainingsPause.objects.none()
+    _user_id = alle_trainings.values_list("user_id", flat=True).first()
+    _pausen = (
+        TrainingsPause.objects.filter(user_id=_user_id)
+        if _user_id
+        else TrainingsPause.objects.none()
+    )
 
     def _wk(d) -> str:
         return f"{d.isocalendar()[0]}-W{d.isocalendar()[1]:02d}"
@@ -562,7 +641,10 @@ def calculate_consistency_metrics(alle_trainings):
         week_end = week_start + timedelta(days=7)
         is_current_week = wochen_geprueft == 0
 
-        trainings_in_week = alle_trainings.filter(datum__gte=week_start, datum__lt=week_end).count()
+        trainings_in_week = int(
+            np.searchsorted(daten, np_zeitpunkt(week_end))
+            - np.searchsorted(daten, np_zeitpunkt(week_start))
+        )
 
         if trainings_in_week > 0:
             temp_streak += 1
@@ -595,40 +677,36 @@ def calculate_consistency_metrics(alle_trainings):
     # dieselbe Einheit verwenden – beide basieren auf ISO-Kalenderwochen.
     # Vorher: wochen_gesamt = days // 7 (Ganzzahl-Division) vs. Django-Kalenderwochen
     # → führte zu Adherence > 100% wenn Trainings Wochengrenzen überbrücken.
-    erste_training = alle_trainings.order_by("datum").first()
-    if erste_training:
-        erste_datum = erste_training.datum.date()
-        heute_datum = heute.date()
-        # Montag der Startwoche und Montag der aktuellen Woche
-        erste_woche_montag = erste_datum - timedelta(days=erste_datum.weekday())
-        heute_woche_montag = heute_datum - timedelta(days=heute_datum.weekday())
-        # Anzahl Kalenderwochen inklusiv Start- und Endwoche
-        wochen_gesamt = max(1, ((heute_woche_montag - erste_woche_montag).days // 7) + 1)
-        wochen_mit_training = alle_trainings.dates("datum", "week").count()
-        # §32.5 (㉒): dokumentierte Pausenwochen OHNE Training aus dem Nenner
-        # nehmen – eine begründete Lücke soll die Konsistenz-Bewertung nicht
-        # zusätzlich senken (konsistent zum Feature-Ziel; Streak ist bereits
-        # gebridged). Nur Wochen ohne Training zählen (Trainings-Wochen stehen im
-        # Zähler und dürfen den Nenner nicht verlieren).
-        training_week_keys = {_wk(d) for d in alle_trainings.values_list("datum", flat=True)}
-        adherence_grenze = pausen_grenze_keys(
-            _pausen, heute.date(), letzte_iso_wochen_keys(heute.date(), wochen_gesamt)
-        )
-        pausierte_ohne_training = adherence_grenze - training_week_keys
-        wochen_gesamt = max(1, wochen_gesamt - len(pausierte_ohne_training))
-        # min(100.0) als Sicherheitsnetz (darf nie über 100% liegen)
-        adherence_rate = min(100.0, round((wochen_mit_training / wochen_gesamt) * 100, 1))
-    else:
-        adherence_rate = 0
-
-    # Durchschnittliche Pause zwischen Trainings
-    trainings_sorted = list(alle_trainings.order_by("datum").values_list("datum", flat=True))
-    if len(trainings_sorted) > 1:
-        pausen = []
-        for i in range(1, len(trainings_sorted)):
-            pause_tage = (trainings_sorted[i].date() - trainings_sorted[i - 1].date()).days
-            pausen.append(pause_tage)
-        avg_pause_tage = round(sum(pausen) / len(pausen), 1)
+    tage = np.unique(daten.astype("datetime64[D]"))
+    erste_datum = tage[0].item()
+    heute_datum = heute.date()
+    # Montag der Startwoche und Montag der aktuellen Woche
+    erste_woche_montag = erste_datum - timedelta(days=erste_datum.weekday())
+    heute_woche_montag = heute_datum - timedelta(days=heute_datum.weekday())
+    # Anzahl Kalenderwochen inklusiv Start- und Endwoche
+    wochen_gesamt = max(1, ((heute_woche_montag - erste_woche_montag).days // 7) + 1)
+    # Montag je Trainingstag (1970-01-01 war ein Donnerstag → +3) – entspricht
+    # ``alle_trainings.dates("datum", "week")`` (TIME_ZONE = UTC).
+    montage = tage - ((tage.astype(np.int64) + 3) % 7).astype("timedelta64[D]")
+    wochen_mit_training = len(np.unique(montage))
+    # §32.5 (㉒): dokumentierte Pausenwochen OHNE Training aus dem Nenner
+    # nehmen – eine begründete Lücke soll die Konsistenz-Bewertung nicht
+    # zusätzlich senken (konsistent zum Feature-Ziel; Streak ist bereits
+    # gebridged). Nur Wochen ohne Training zählen (Trainings-Wochen stehen im
+    # Zähler und dürfen den Nenner nicht verlieren).
+    training_week_keys = {_wk(d) for d in tage.tolist()}
+    adherence_grenze = pausen_grenze_keys(
+        _pausen, heute.date(), letzte_iso_wochen_keys(heute.date(), wochen_gesamt)
+    )
+    pausierte_ohne_training = adherence_grenze - training_week_keys
+    wochen_gesamt = max(1, wochen_gesamt - len(pausierte_ohne_training))
+    # min(100.0) als Sicherheitsnetz (darf nie über 100% liegen)
+    adherence_rate = min(100.0, round((wochen_mit_training / wochen_gesamt) * 100, 1))
+
+    # Durchschnittliche Pause zwischen Trainings (Kalendertage)
+    if len(daten) > 1:
+        pausen = np.diff(daten.astype("datetime64[D]")).astype(np.int64)
+        avg_pause_tage = round(int(pausen.sum()) / len(pausen), 1)
     else:
         avg_pause_tage = 0
 
@@ -659,7 +737,7 @@ def calculate_consistency_metrics(alle_trainings):
     }
 
 
-def calculate_fatigue_index(weekly_volume_data, rpe_saetze, alle_trainings):
+def calculate_fatigue_index(weekly_volume_data, rpe_saetze, alle_trainings, *, spalten=None):
     """
     Calculates fatigue index and deload recommendations.
 
@@ -675,17 +753,24 @@ def calculate_fatigue_index(weekly_volume_data, rpe_saetze, alle_trainings):
     RPE-Komponente ist konsistent mit der RPE-Verteilung aus 23.1 (4-Wochen-
     Bewertung der Karten + 14-Tage-Fenster im Index = derselbe Trend-Bereich).
 
+    ``spalten``: optional ALLE Sätze des Users als :class:`SatzSpalten`
+    (inkl. Warmup/Deload). Dann wird die RPE-Komponente aus den Spalten
+    berechnet statt mit drei weiteren Queries.
+
     Returns dict with:
     - fatigue_index, bewertung, bewertung_farbe, empfehlung
     - volumen_spike, rpe_steigend, deload_empfohlen
     - warnungen
     """
+    from core.services.training_snapshot import UserTrainingSnapshot
     from core.utils.week_classification import select_comparable_weeks
     from core.views.training_stats import (
+        FATIGUE_RPE_WINDOW_DAYS,
         _get_cardio_fatigue,
         _get_frequency_fatigue,
         _get_rpe_fatigue,
         _get_volume_spike_fatigue,
+        _rpe_fatigue_punkte,
     )
 
     heute = timezone.now()
@@ -716,20 +801,29 @@ def calculate_fatigue_index(weekly_volume_data, rpe_saetze, alle_trainings):
 
     volumen_spike = fatigue_index > 0
 
-    # RPE + Frequenz + Cardio: nutzen User-Objekt
+    # RPE + Frequenz + Cardio: nutzen User-Objekt – ein gemeinsamer Snapshot,
+    # damit die drei Dashboard-Helfer die Daten nur einmal laden.
+    snap = UserTrainingSnapshot(user, heute) if user else None
     rpe_steigend = False
     if user and alle_trainings.count() >= 4:
-        rpe_pts, rpe_warns = _get_rpe_fatigue(user, heute)
+        if spalten is not None:
+            rpe_pts, rpe_warns = _rpe_fatigue_punkte(
+                *_rpe_kennzahlen_aus_spalten(
+                    spalten, heute - timedelta(days=FATIGUE_RPE_WINDOW_DAYS)
+                )
+            )
+        else:
+            rpe_pts, rpe_warns = _get_rpe_fatigue(user, heute, snap=snap)
         fatigue_index += rpe_pts
         warnungen.extend(rpe_warns)
         rpe_steigend = rpe_pts > 0
 
-        freq_pts, freq_warns = _get_frequency_fatigue(user, heute)
+        freq_pts, freq_warns = _get_frequency_fatigue(user, heute, snap=snap)
         fatigue_index += freq_pts
         warnungen.extend(freq_warns)
 
     if user:
-        cardio_pts, cardio_warns, _, _ = _get_cardio_fatigue(user, heute)
+        cardio_pts, cardio_warns, _, _ = _get_cardio_fatigue(user, heute, snap=snap)
         fatigue_index += cardio_pts
         warnungen.extend(cardio_warns)
 
@@ -770,12 +864,53 @@ def calculate_fatigue_index(weekly_volume_data, rpe_saetze, alle_trainings):
     }
 
 
+def _rpe_kennzahlen_aus_spalten(sp, seit) -> tuple[float | None, float | None]:
+    """(RPE-10-Anteil in %, Ø-RPE) der Arbeitssätze ab ``seit`` (ohne Deload).
+
+    Spalten-Pendant zu ``_get_rpe10_anteil`` / ``_get_rpe_score``.
+    """
+    maske = ~sp.ist_aufwaermsatz & ~sp.ist_deload & ~np.isnan(sp.rpe) & sp.fenster(start=seit)
+    rpe = sp.rpe[maske]
+    if not len(rpe):
+        return None, None
+    anteil = round((int(np.count_nonzero(rpe == 10)) / len(rpe)) * 100, 1)
+    return anteil, fsum(rpe.tolist()) / len(rpe)
+
+
+def _ohne_nullwdh_saetze(zeilen, alle_saetze):
+    """Kraftstandards zählen nur Sätze mit Wiederholungen > 0.
+
+    ``UebungTagesStatistik.bestes_1rm`` wertet 0 Wdh als 1 (Regel der übrigen
+    Konsumenten). Einheiten, deren Bestwert aus einem 0-Wdh-Satz stammt (selten),
+    werden aus ``alle_saetze`` neu bewertet – ein zusätzlicher Query nur dann.
+
+    Returns:
+        [(name, datum, bestes_1rm)]
+    """
+    betroffen = {(z[3], z[0]) for z in zeilen if not z[4]}
+    ersatz = {}
+    if betroffen:
+        for einheit_id, name, gewicht, wdh in alle_saetze.filter(
+            einheit_id__in={e for e, _ in betroffen},
+            uebung__bezeichnung__in={n for _, n in betroffen},
+            wiederholungen__gt=0,
+        ).values_list("einheit_id", "uebung__bezeichnung", "gewicht", "wiederholungen"):
+            rm = float(gewicht or 0) * (1 + wdh / 30.0)
+            ersatz[(einheit_id, name)] = max(ersatz.get((einheit_id, name), 0.0), rm)
+    return [
+        (name, datum, rm if wdh else ersatz.get((einheit_id, name), 0.0))
+        for name, datum, rm, einheit_id, wdh in zeilen
+    ]
+
+
 def calculate_1rm_standards(alle_saetze, top_uebungen, user_gewicht=None):
     """
     Calculates 1RM estimates and compares against strength standards from database.
     Standards are now stored per-exercise in the Uebung model.
 
     Uses Epley Formula: 1RM = Gewicht × (1 + Wiederholungen/30)
+    Bestwerte kommen aus ``UebungTagesStatistik`` (ein Query für alle Top-Übungen,
+    Monatsfenster als NumPy-Masken).
 
     Returns list with:
     - uebung: Exercise name
@@ -784,13 +919,34 @@ def calculate_1rm_standards(alle_saetze, top_uebungen, user_gewicht=None):
     - 1rm_entwicklung: List of dicts with 'monat' and '1rm' keys for 6-month progression
     - standard_info: Dict with level, progress, and standards
     """
-    from core.models import Uebung
+    from core.models import Uebung, UebungTagesStatistik
 
     if not alle_saetze.exists() or not top_uebungen:
         return []
 
     heute = timezone.now()
 
+    # Bestes 1RM je Einheit aus der materialisierten Tagesstatistik – EIN Query
+    # für alle Top-Übungen, beschränkt auf die Einheiten, aus denen ``alle_saetze``
+    # stammt (Deload-/Zeitfilter des Aufrufers bleiben damit wirksam).
+    namen = [u["uebung__bezeichnung"] for u in top_uebungen[:5]]
+    zeilen = list(
+        UebungTagesStatistik.objects.filter(
+            einheit_id__in=alle_saetze.values("einheit_id"),
+            uebung__bezeichnung__in=namen,
+        ).values_list(
+            "uebung__bezeichnung",
+            "einheit__datum",
+            "bestes_1rm",
+            "einheit_id",
+            "bester_satz__wiederholungen",
+        )
+    )
+    zeilen = _ohne_nullwdh_saetze(zeilen, alle_saetze)
+    zeilen_name = np.array([z[0] for z in zeilen], dtype=object)
+    zeilen_datum = np.array([np_zeitpunkt(z[1]) for z in zeilen], dtype="datetime64[us]")
+    zeilen_1rm = np.array([z[2] for z in zeilen], dtype=np.float64)
+
     ergebnisse = []
 
     for uebung in top_uebungen[:5]:
@@ -807,20 +963,12 @@ def calculate_1rm_standards(alle_saetze, top_uebungen, user_gewicht=None):
             # Keine Standards definiert - überspringe
             continue
 
-        # Hole alle Sätze für diese Übung
-        uebung_saetze = alle_saetze.filter(uebung__bezeichnung=uebung_name)
-
-        # 1RM berechnen für jeden Satz
-        beste_1rm = 0
-        for satz in uebung_saetze:
-            if satz.wiederholungen and satz.wiederholungen > 0:
-                gewicht = float(satz.gewicht or 0)
-                # Epley Formel
-                estimated_1rm = gewicht * (1 + satz.wiederholungen / 30.0)
-                if estimated_1rm > beste_1rm:
-                    beste_1rm = estimated_1rm
+        maske = zeilen_name == uebung_name
+        datum = zeilen_datum[maske]
+        werte = zeilen_1rm[maske]
+        beste_1rm = float(werte.max()) if len(werte) else 0
 
-        if beste_1rm == 0:
+        if beste_1rm <= 0:
             continue
 
         # 6-Monats-Entwicklung (Format für Template: Liste von Dicts)
@@ -832,17 +980,10 @@ def calculate_1rm_standards(alle_saetze, top_uebungen, user_gewicht=None):
         for i in range(6):
             monat_start = heute - timedelta(days=30 * (6 - i))
             monat_ende = monat_start + timedelta(days=30)
-            monat_saetze = uebung_saetze.filter(
-                einheit__datum__gte=monat_start, einheit__datum__lte=monat_ende
-            )
-
-            monat_best_1rm = 0
-            for satz in monat_saetze:
-                if satz.wiederholungen and satz.wiederholungen > 0:
-                    gewicht = float(satz.gewicht or 0)
-                    estimated_1rm = gewicht * (1 + satz.wiederholungen / 30.0)
-                    if estimated_1rm > monat_best_1rm:
-                        monat_best_1rm = estimated_1rm
+            im_monat = werte[
+                (datum >= np_zeitpunkt(monat_start)) & (datum <= np_zeitpunkt(monat_ende))
+            ]
+            monat_best_1rm = float(im_monat.max()) if len(im_monat) else 0
 
             # Label vom Ende-Datum, damit der aktuelle Monat korrekt angezeigt wird
             monat_name = monat_ende.strftime("%b")
@@ -970,28 +1111,39 @@ def calculate_rpe_quality_analysis(alle_saetze):
     - rpe_verteilung_prozent: Distribution across RPE ranges
     - bewertung: Overall training quality rating
     - empfehlungen: List of recommendations
+
+    ``alle_saetze`` darf ein Satz-Queryset oder bereits geladene
+    :class:`SatzSpalten` sein.
     """
+    return _rpe_quality_aus_spalten(lade_satz_spalten(alle_saetze))
+
+
+def _rpe_quality_aus_spalten(sp):
+    """Kern von :func:`calculate_rpe_quality_analysis` auf :class:`SatzSpalten`."""
     # Aufwärmsätze explizit ausschließen: niedrige RPE ist beim Aufwärmen intentional,
     # nicht Junk Volume. Warmup-Sätze würden die Analyse systematisch verfälschen.
-    rpe_saetze = alle_saetze.filter(rpe__isnull=False, ist_aufwaermsatz=False)
-    gesamt = rpe_saetze.count()
+    rpe = sp.rpe[~np.isnan(sp.rpe) & ~sp.ist_aufwaermsatz]
+    gesamt = len(rpe)
 
     if gesamt == 0:
         return None
 
+    def _anzahl(maske) -> int:
+        return int(np.count_nonzero(maske))
+
     # Verteilung berechnen (Detail-Kategorien für Aufschlüsselung)
-    rpe_sehr_leicht = rpe_saetze.filter(rpe__lt=5).count()  # RPE <5
-    rpe_leicht = rpe_saetze.filter(rpe__gte=5, rpe__lt=7).count()  # RPE 5-6.9
-    rpe_moderat = rpe_saetze.filter(rpe__gte=7, rpe__lte=8).count()  # RPE 7-8
-    rpe_schwer = rpe_saetze.filter(rpe__gt=8, rpe__lte=9).count()  # RPE 8.1-9
-    rpe_sehr_schwer = rpe_saetze.filter(rpe__gt=9, rpe__lt=10).count()  # RPE 9.1-9.9
-    rpe_versagen = rpe_saetze.filter(rpe=10).count()  # RPE 10
+    rpe_sehr_leicht = _anzahl(rpe < 5)  # RPE <5
+    rpe_leicht = _anzahl((rpe >= 5) & (rpe < 7))  # RPE 5-6.9
+    rpe_moderat = _anzahl((rpe >= 7) & (rpe <= 8))  # RPE 7-8
+    rpe_schwer = _anzahl((rpe > 8) & (rpe <= 9))  # RPE 8.1-9
+    rpe_sehr_schwer = _anzahl((rpe > 9) & (rpe < 10))  # RPE 9.1-9.9
+    rpe_versagen = _anzahl(rpe == 10)  # RPE 10
 
     # Top-3 Metriken: Lückenlos (Summe = 100%)
     # Junk Volume: RPE < 7 (zu leicht für echten Muskelreiz)
-    junk_count = rpe_saetze.filter(rpe__lt=7).count()
+    junk_count = _anzahl(rpe < 7)
     # Optimal: RPE 7-9 (idealer Trainingsbereich)
-    optimal_count = rpe_saetze.filter(rpe__gte=7, rpe__lt=10).count()
+    optimal_count = _anzahl((rpe >= 7) & (rpe < 10))
     # Versagen: RPE 10
     failure_count = rpe_versagen
 
@@ -1122,24 +1274,20 @@ def get_time_windows(reference_date=None, plan_start=None):
     }
 
 
-def _filter_saetze_by_window(alle_saetze, start, end):
-    """Apply einheit__datum window filter to a Satz queryset.
+def _fenster_maske(sp, start, end):
+    """Maske für das Zeitfenster ``start``–``end`` auf ``einheit__datum``.
 
     Bug-Fix nach Code-Review: ``Satz.einheit.datum`` ist DateTimeField. Wenn der
     Aufrufer ``end`` als ``date`` übergibt (Live-Stats-View nutzt
-    ``timezone.now().date()``), interpretiert Django ``__lte=date`` als
-    Mitternacht des Tages → heutige Sätze nach Mitternacht werden ausgeschlossen,
-    User sieht sein gerade geloggtes Training nicht in den Karten.
+    ``timezone.now().date()``), würde ``<= date`` als Mitternacht des Tages
+    gelesen → heutige Sätze nach Mitternacht fielen heraus, User sähe sein
+    gerade geloggtes Training nicht in den Karten.
     Lösung: bei date-Werten exklusiver Vergleich gegen den Folgetag.
     """
     if end is not None and not isinstance(end, datetime):
         # `end` ist ein date – inklusive bis Ende des Tages
-        qs = alle_saetze.filter(einheit__datum__lt=end + timedelta(days=1))
-    else:
-        qs = alle_saetze.filter(einheit__datum__lte=end)
-    if start is not None:
-        qs = qs.filter(einheit__datum__gte=start)
-    return qs
+        return sp.fenster(start, end + timedelta(days=1), ende_inklusiv=False)
+    return sp.fenster(start, end)
 
 
 def _evaluate_rpe_failure_rate(failure_rate, primary_label):
@@ -1187,7 +1335,8 @@ def calculate_rpe_quality_analysis_windowed(
     den Trend-Hinweis weiter nutzen (Konzept 3.3).
 
     Args:
-        alle_saetze: Satz-Queryset (User-vorgefiltert, sonst beliebig).
+        alle_saetze: Satz-Queryset (User-vorgefiltert, sonst beliebig) oder
+            bereits geladene :class:`SatzSpalten`.
         reference_date: Stichtag (default: ``timezone.now()``).
         plan_start: Optionaler Plan-Startzeitpunkt (Phase 22) zum Clamping.
         min_sets: Schwelle, ab der ein Fenster valide auswertbar ist.
@@ -1211,9 +1360,10 @@ def calculate_rpe_quality_analysis_windowed(
     raw_results = {}
     meta = {}
 
+    # Einmal laden, pro Fenster nur maskieren (statt 3 × 9 COUNT-Queries).
+    sp = lade_satz_spalten(alle_saetze)
     for key, (start, end) in windows.items():
-        qs = _filter_saetze_by_window(alle_saetze, start, end)
-        result = calculate_rpe_quality_analysis(qs)
+        result = _rpe_quality_aus_spalten(sp.teilmenge(_fenster_maske(sp, start, end)))
         n_sets = result["gesamt_saetze"] if result else 0
         raw_results[key] = result
         meta[key] = {
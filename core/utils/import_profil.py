@@ -0,0 +1,110 @@
+"""Import-Kosten des Django-Starts messen (``python -X importtime``).
+
+Gemessen wird ``django.setup()`` + Import der URLconf – das, was jeder
+Gunicorn-Worker beim Start und (bis auf die URLconf) jedes Management-Command
+bezahlt. Die Messung läuft in einem frischen Python-Prozess, damit bereits
+geladene Module des aufrufenden Prozesses nichts verfälschen.
+
+Genutzt von ``manage.py import_profile`` und ``core/tests/test_import_budget.py``
+(Budget: ``settings.IMPORT_BUDGET_SEKUNDEN`` / ``IMPORT_BUDGET_MODULE``).
+"""
+
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+# Dürfen beim Start nicht geladen werden – nur bei Bedarf (core/utils/lazy_import.py)
+SCHWERE_MODULE = (
+    "matplotlib",
+    "sklearn",
+    "joblib",
+    "scipy",
+    "pandas",
+    "openai",
+    "ollama",
+    "reportlab",
+    "xhtml2pdf",
+    "weasyprint",
+    "cairosvg",
+    "qrcode",
+)
+
+_START_CODE = (
+    "import importlib, django; django.setup(); "
+    "from django.conf import settings; importlib.import_module(settings.ROOT_URLCONF)"
+)
+_ZEILE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass
+class ImportEintrag:
+    modul: str
+    selbst_us: int
+    kumuliert_us: int
+    tiefe: int
+
+
+@dataclass
+class ImportProfil:
+    eintraege: list[ImportEintrag] = field(default_factory=list)
+
+    @property
+    def anzahl_module(self) -> int:
+        return len(self.eintraege)
+
+    @property
+    def gesamt_sekunden(self) -> float:
+        """Summe der Top-Level-Imports (ohne Interpreter-Start)."""
+        return sum(e.kumuliert_us for e in self.eintraege if e.tiefe == 1) / 1e6
+
+    def teuerste(self, n: int = 20, kumuliert: bool = True) -> list[ImportEintrag]:
+        schluessel = (lambda e: e.kumuliert_us) if kumuliert else (lambda e: e.selbst_us)
+        return sorted(self.eintraege, key=schluessel, reverse=True)[:n]
+
+    def schwere_module(self) -> list[str]:
+        geladen = {e.modul.split(".")[0] for e in self.eintraege}
+        return [m for m in SCHWERE_MODULE if m in geladen]
+
+
+def parse_importtime(ausgabe: str) -> ImportProfil:
+    profil = ImportProfil()
+    for zeile in ausgabe.splitlines():
+        m = _ZEILE_RE.match(zeile)
+        if m:
+            profil.eintraege.append(
+                ImportEintrag(
+                    modul=m.group(4),
+                    selbst_us=int(m.group(1)),
+                    kumuliert_us=int(m.group(2)),
+                    tiefe=len(m.group(3)) // 2 + 1,
+                )
+            )
+    return profil
+
+
+def messe_start() -> ImportProfil:
+    """Startet ``django.setup()`` + URLconf-Import in einem neuen Prozess und misst ihn.
+
+    Raises:
+        RuntimeError: Der Messprozess ist fehlgeschlagen (Importfehler).
+    """
+    env = {**os.environ}
+    env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    # Der Messprozess importiert nur – ein Dummy-Key genügt, falls keiner gesetzt ist
+    if not (env.get("DJANGO_SECRET_KEY") or env.get("SECRET_KEY")):
+        env["DJANGO_SECRET_KEY"] = "import-profil-nur-messung"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _START_CODE],
+        capture_output=True,
+        text=True,
+        cwd=str(settings.BASE_DIR),
+        env=env,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import-Messung fehlgeschlagen:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
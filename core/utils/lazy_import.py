@@ -0,0 +1,58 @@
+"""Verzögertes Laden schwerer, optionaler Bibliotheken.
+
+xhtml2pdf (inkl. reportlab), WeasyPrint und qrcode kosteten jeden
+Gunicorn-Worker-Start und jedes Management-Command rund eine Sekunde, weil
+``core.views`` sie beim Import von ``core/views/export.py`` mitlud – obwohl sie
+nur für PDF-Exporte gebraucht werden.
+
+Module, die eine solche Bibliothek bisher als Modul-Global hielten
+(``try: from xhtml2pdf import pisa / except ImportError: pisa = None``),
+ersetzen den Import durch ein Modul-``__getattr__`` (PEP 562)::
+
+    __getattr__ = modul_getattr(globals(), {"pisa": ("xhtml2pdf", "pisa")})
+
+Der erste Zugriff (``modul.pisa`` von außen bzw. ``_lib("pisa")`` intern)
+importiert und legt das Ergebnis als echtes Global ab; nicht installierte oder
+nicht ladbare Bibliotheken ergeben wie bisher ``None``. ``patch.object`` in
+Tests funktioniert unverändert.
+
+``manage.py import_profile`` und ``test_import_budget`` wachen darüber, dass
+diese Module beim Start nicht wieder eager geladen werden.
+"""
+
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def lade_optional(modul: str, attribut: str | None = None):
+    """Importiert ``modul`` (bzw. ``modul.attribut``); ``None``, wenn nicht verfügbar.
+
+    Neben ``ImportError`` wird jede Exception beim Import abgefangen – WeasyPrint
+    scheitert bei fehlenden nativen Libs (Pango/GLib) mit ``OSError``.
+    """
+    try:
+        geladen = importlib.import_module(modul)
+        if not attribut:
+            return geladen
+        if hasattr(geladen, attribut):
+            return getattr(geladen, attribut)
+        # ``from paket import submodul`` (z.B. xhtml2pdf.pisa)
+        return importlib.import_module(f"{modul}.{attribut}")
+    except Exception as e:
+        logger.info("Optionale Bibliothek %s nicht verfügbar: %s", modul, e)
+        return None
+
+
+def modul_getattr(modul_globals: dict, optionale: dict[str, tuple[str, str | None]]):
+    """Baut ein Modul-``__getattr__``, das ``optionale`` Namen beim ersten Zugriff lädt."""
+
+    def __getattr__(name: str):
+        if name not in optionale:
+            raise AttributeError(f"module {modul_globals['__name__']!r} has no attribute {name!r}")
+        wert = lade_optional(*optionale[name])
+        modul_globals[name] = wert
+        return wert
+
+    return __getattr__
@@ -0,0 +1,171 @@
+"""Spaltenorientierter Satz-Loader für die Statistik-Helfer (NumPy).
+
+Die Analysefunktionen in ``advanced_stats`` haben bisher pro Übung, pro Woche
+und pro RPE-Bucket eigene Querysets ausgewertet (Plateau: 3 Queries je Übung,
+Konsistenz: 104 Wochen-Counts, RPE-Qualität: 9 Counts je Zeitfenster). Hier
+wird EIN ``values_list``-Query in NumPy-Arrays geladen; alle Filter laufen
+danach als boolesche Masken im Speicher.
+
+Konventionen:
+- ``datum`` ist ``datetime64[us]`` in UTC (naiv) – entspricht den aware
+  UTC-Datetimes aus der DB (``TIME_ZONE = "UTC"``). ``tage`` ist das zugehörige
+  Kalenderdatum (``datetime64[D]``), äquivalent zu ``einheit.datum.date()``.
+- Reihenfolge: ``einheit__datum``, dann Satz-ID – wie ``order_by("einheit__datum")``
+  der Queryset-Pfade, mit stabilem Tiebreak.
+- ``rpe`` ist ``NaN``, wenn nicht erfasst.
+"""
+
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+
+import numpy as np
+
+_FELDER = (
+    "einheit__datum",
+    "uebung_id",
+    "gewicht",
+    "wiederholungen",
+    "rpe",
+    "ist_aufwaermsatz",
+    "einheit__ist_deload",
+    "uebung__koerpergewicht_faktor",
+    "uebung__gewichts_richtung",
+)
+
+
+def np_zeitpunkt(wert) -> np.datetime64:
+    """``date``/``datetime`` (aware oder naiv) → ``datetime64[us]`` in UTC.
+
+    Ein ``date`` wird wie im Django-Lookup als Mitternacht interpretiert.
+    """
+    if isinstance(wert, datetime):
+        if wert.tzinfo is not None:
+            wert = wert.astimezone(dt_timezone.utc).replace(tzinfo=None)
+        return np.datetime64(wert, "us")
+    if isinstance(wert, date):
+        return np.datetime64(wert, "D").astype("datetime64[us]")
+    raise TypeError(f"Kein Datum: {wert!r}")
+
+
+def als_datetime(wert: np.datetime64) -> datetime:
+    """``datetime64`` (UTC) → aware ``datetime`` in UTC (für strftime/Anzeige)."""
+    return wert.astype("datetime64[us]").item().replace(tzinfo=dt_timezone.utc)
+
+
+class SatzSpalten:
+    """Satz-Daten als parallele NumPy-Arrays (eine Zeile je Satz)."""
+
+    __slots__ = (
+        "datum",
+        "tage",
+        "uebung_id",
+        "gewicht",
+        "wdh",
+        "rpe",
+        "ist_aufwaermsatz",
+        "ist_deload",
+        "koerpergewicht_faktor",
+        "gegen",
+    )
+
+    def __init__(
+        self,
+        datum,
+        uebung_id,
+        gewicht,
+        wdh,
+        rpe,
+        ist_aufwaermsatz,
+        ist_deload,
+        koerpergewicht_faktor,
+        gegen,
+    ):
+        self.datum = datum
+        self.tage = datum.astype("datetime64[D]")
+        self.uebung_id = uebung_id
+        self.gewicht = gewicht
+        self.wdh = wdh
+        self.rpe = rpe
+        self.ist_aufwaermsatz = ist_aufwaermsatz
+        self.ist_deload = ist_deload
+        self.koerpergewicht_faktor = koerpergewicht_faktor
+        self.gegen = gegen
+
+    def __len__(self) -> int:
+        return len(self.datum)
+
+    def teilmenge(self, maske) -> "SatzSpalten":
+        """Neue Spalten-Instanz mit den Zeilen, für die ``maske`` True ist."""
+        return SatzSpalten(
+            self.datum[maske],
+            self.uebung_id[maske],
+            self.gewicht[maske],
+            self.wdh[maske],
+            self.rpe[maske],
+            self.ist_aufwaermsatz[maske],
+            self.ist_deload[maske],
+            self.koerpergewicht_faktor[maske],
+            self.gegen[maske],
+        )
+
+    def arbeitssaetze(self, *, ohne_deload: bool = True) -> "SatzSpalten":
+        """Nur Arbeitssätze (kein Warmup), optional ohne Deload-Einheiten."""
+        maske = ~self.ist_aufwaermsatz
+        if ohne_deload:
+            maske &= ~self.ist_deload
+        return self.teilmenge(maske)
+
+    def fenster(self, start=None, ende=None, *, ende_inklusiv: bool = True):
+        """Maske für ``start <= datum <= ende`` (``None`` = offen)."""
+        maske = np.ones(len(self), dtype=bool)
+        if start is not None:
+            maske &= self.datum >= np_zeitpunkt(start)
+        if ende is not None:
+            grenze = np_zeitpunkt(ende)
+            maske &= (self.datum <= grenze) if ende_inklusiv else (self.datum < grenze)
+        return maske
+
+    def epley_1rm(self) -> np.ndarray:
+        """Roh-Epley je Satz: ``gewicht × (1 + (wdh or 1) / 30)``."""
+        wdh = np.where(self.wdh == 0, 1, self.wdh)
+        return self.gewicht * (1 + wdh / 30.0)
+
+
+def lade_satz_spalten(saetze) -> SatzSpalten:
+    """Lädt ein Satz-Queryset mit einem ``values_list``-Query in Spalten.
+
+    Ist ``saetze`` bereits eine :class:`SatzSpalten`-Instanz, wird sie
+    unverändert zurückgegeben – die Analysefunktionen akzeptieren beides.
+    """
+    if isinstance(saetze, SatzSpalten):
+        return saetze
+    zeilen = list(saetze.order_by("einheit__datum", "id").values_list(*_FELDER))
+    n = len(zeilen)
+    datum = np.empty(n, dtype="datetime64[us]")
+    uebung_id = np.empty(n, dtype=np.int64)
+    gewicht = np.empty(n, dtype=np.float64)
+    wdh = np.empty(n, dtype=np.int64)
+    rpe = np.empty(n, dtype=np.float64)
+    warmup = np.empty(n, dtype=bool)
+    deload = np.empty(n, dtype=bool)
+    faktor = np.empty(n, dtype=np.float64)
+    gegen = np.empty(n, dtype=bool)
+    for i, (d, ueb, gew, w, r, wu, dl, fak, richtung) in enumerate(zeilen):
+        datum[i] = np_zeitpunkt(d)
+        uebung_id[i] = ueb
+        gewicht[i] = float(gew) if gew is not None else np.nan
+        wdh[i] = w or 0
+        rpe[i] = float(r) if r is not None else np.nan
+        warmup[i] = wu
+        deload[i] = dl
+        faktor[i] = fak if fak else 1.0
+        gegen[i] = richtung == "GEGEN"
+    return SatzSpalten(datum, uebung_id, gewicht, wdh, rpe, warmup, deload, faktor, gegen)
+
+
+def lade_trainings_daten(trainings) -> np.ndarray:
+    """Sortierte ``datetime64[us]``-Daten (UTC) eines Trainingseinheit-Querysets."""
+    return np.array(
+        [np_zeitpunkt(d) for d in trainings.order_by("datum").values_list("datum", flat=True)],
+        dtype="datetime64[us]",
+    )
@@ -17,6 +17,9 @@ Wochen fälschlich als „Echte Regression" werten konnte.
 - :func:`select_comparable_weeks` – filtert vergleichbare Wochen für
   Trend-Vergleiche (genutzt zusätzlich von
   ``advanced_stats.calculate_fatigue_index``).
+- :class:`IsoWochenKalender` – Sessions eines Users je ISO-Woche (ein Query)
+  inkl. Pausen-Klassifikation; Basis für Streak, Wochenübersicht und
+  Netto-Blockdauer im Dashboard.
 """
 
 from collections import defaultdict
@@ -242,6 +245,119 @@ def pausen_im_zeitraum(pausen, start_datum: date, end_datum: date) -> dict | Non
     return {"spannen": spannen, "tage": tage, "medizinisch": medizinisch}
 
 
+class IsoWochenKalender:
+    """Sessions eines Users je ISO-Woche – Basis für Streak, Wochenübersicht, Netto-Block.
+
+    Vorher setzte der Dashboard-Streak bis zu 53 ``exists()``-Queries ab (eine
+    je Woche); Wochenübersicht und Netto-Blockdauer fragten dieselben Sessions
+    erneut ab. Der Kalender wird aus EINEM
+    ``values_list("id", "datum", "abgeschlossen", "ist_deload")`` gebaut und
+    beantwortet danach alle Wochen-Fragen im Speicher. Die Pausen-Achsen
+    delegieren an ``_classify_week_pause`` (SoT) – keine Parallel-Logik.
+
+    ``zeilen``: Iterable von ``(id, datum, abgeschlossen, ist_deload)``.
+    """
+
+    def __init__(self, zeilen, pausen, heute_date: date):
+        self.heute_date = heute_date
+        self._pausen_clamped = _clamp_pausen(pausen, heute_date)
+        self._sessions: dict[str, int] = defaultdict(int)
+        self._abgeschlossen: dict[str, int] = defaultdict(int)
+        self._deload: dict[str, int] = defaultdict(int)
+        # Tag → ID des ersten abgeschlossenen Trainings (Link der Wochenübersicht)
+        self._erstes_training: dict[date, int] = {}
+        for training_id, datum, abgeschlossen, ist_deload in sorted(
+            zeilen, key=lambda z: (z[1], z[0])
+        ):
+            key = _iso_key(datum)
+            self._sessions[key] += 1
+            if ist_deload:
+                self._deload[key] += 1
+            if abgeschlossen:
+                self._abgeschlossen[key] += 1
+                self._erstes_training.setdefault(datum.date(), training_id)
+
+    @classmethod
+    def fuer_user(cls, user, heute_date: date, pausen=None, seit: date | None = None):
+        """Lädt die Sessions des Users (optional ab ``seit``) mit einem Query."""
+        from core.models import Trainingseinheit, TrainingsPause
+
+        qs = Trainingseinheit.objects.filter(user=user)
+        if seit is not None:
+            qs = qs.filter(datum__date__gte=seit)
+        if pausen is None:
+            pausen = TrainingsPause.objects.filter(user=user)
+        zeilen = qs.values_list("id", "datum", "abgeschlossen", "ist_deload")
+        return cls(zeilen, pausen, heute_date)
+
+    # -- Sessions ---------------------------------------------------------
+
+    def anzahl_sessions(self, key: str) -> int:
+        return self._sessions.get(key, 0)
+
+    def hat_session(self, key: str) -> bool:
+        return key in self._sessions
+
+    def hat_abgeschlossene_session(self, key: str) -> bool:
+        return key in self._abgeschlossen
+
+    def ist_deload_majority(self, key: str) -> bool:
+        """≥ ``DELOAD_WEEK_MAJORITY_PCT`` % der Sessions der Woche sind Deload."""
+        total = self._sessions.get(key, 0)
+        return bool(total) and self._deload.get(key, 0) / total * 100 >= DELOAD_WEEK_MAJORITY_PCT
+
+    def erstes_training_am(self, tag: date) -> int | None:
+        """ID des ersten abgeschlossenen Trainings an ``tag`` oder None."""
+        return self._erstes_training.get(tag)
+
+    # -- Pausen (SoT: _classify_week_pause) -------------------------------
+
+    def ist_pausen_grenze(self, key: str) -> bool:
+        """Wie :func:`pausen_grenze_keys`: Pause ≥ Mindestdauer berührt die Woche."""
+        if not self._pausen_clamped:
+            return False
+        return _classify_week_pause(key, self._pausen_clamped, hat_sessions=False)[2]
+
+    def ist_ausfall(self, key: str) -> bool:
+        """Wie :func:`pausen_ausfall_wochen`: voll abgedeckt, keine abgeschlossene Session."""
+        if not self._pausen_clamped:
+            return False
+        return _classify_week_pause(
+            key, self._pausen_clamped, hat_sessions=self.hat_abgeschlossene_session(key)
+        )[0]
+
+    def ausfall_wochen(self, start_datum: date) -> int:
+        """Anzahl ``ist_ausfall``-Wochen in ``[start_datum, heute]`` (Netto-Blockdauer)."""
+        if not self._pausen_clamped or start_datum > self.heute_date:
+            return 0
+        montag_start = start_datum - timedelta(days=start_datum.weekday())
+        montag_heute = self.heute_date - timedelta(days=self.heute_date.weekday())
+        anzahl = (montag_heute - montag_start).days // 7 + 1
+        return sum(
+            1 for key in letzte_iso_wochen_keys(self.heute_date, anzahl) if self.ist_ausfall(key)
+        )
+
+    # -- Streak -----------------------------------------------------------
+
+    def streak(self, max_wochen: int = 53) -> int:
+        """Aufeinanderfolgende Wochen mit ≥1 Session, rückwärts ab der laufenden Woche.
+
+        Die laufende Woche ist neutral (noch kein Training bricht nichts); eine
+        session-lose Woche mit Pausen-Grenze bridged (§32.5), jede andere
+        Lücke bricht.
+        """
+        streak = 0
+        keys = letzte_iso_wochen_keys(self.heute_date, max_wochen)
+        for i, key in enumerate(reversed(keys)):
+            if self.hat_session(key):
+                streak += 1
+            elif i == 0 or self.ist_pausen_grenze(key):
+                continue
+            else:
+                break
+        return streak
+
+
 def _classify_weeks_from_sessions(alle_trainings) -> tuple[set, set, dict, set]:
     """Return (deload_weeks, deload_majority_weeks, routines_per_week) from sessions.
 
@@ -10,6 +10,7 @@ from .ai_recommendations import (
     generate_plan_api,
     generate_plan_stream_api,
     live_guidance_api,
+    live_guidance_stream_api,
     optimize_plan_api,
     workout_recommendations,
 )
@@ -94,14 +95,24 @@ from .export import (
     import_hevy_csv,
 )
 
+# Hintergrund-Jobs
+from .jobs import job_download, job_status_api
+
 # Machine learning views
-from .machine_learning import ml_dashboard, ml_model_info, ml_predict_weight, ml_train_model
+from .machine_learning import (
+    ml_dashboard,
+    ml_model_info,
+    ml_predict_batch,
+    ml_predict_weight,
+    ml_registry_stats,
+    ml_train_model,
+)
 
 # Notifications views
 from .notifications import get_vapid_public_key, subscribe_push, unsubscribe_push
 
 # Offline sync views
-from .offline import sync_offline_data
+from .offline import sync_offline_data, sync_offline_data_v2
 
 # Onboarding views
 from .onboarding import mark_onboarding_complete, restart_onboarding
@@ -236,6 +247,7 @@ __all__ = [
     "optimize_plan_api",
     "apply_optimizations_api",
     "live_guidance_api",
+    "live_guidance_stream_api",
     # Plan templates
     "get_plan_templates",
     "get_template_detail",
@@ -255,13 +267,19 @@ __all__ = [
     "subscribe_push",
     "unsubscribe_push",
     "get_vapid_public_key",
+    # Hintergrund-Jobs
+    "job_status_api",
+    "job_download",
     # Machine learning
     "ml_train_model",
     "ml_predict_weight",
+    "ml_predict_batch",
     "ml_model_info",
+    "ml_registry_stats",
     "ml_dashboard",
     # Offline
     "sync_offline_data",
+    "sync_offline_data_v2",
     # Onboarding
     "mark_onboarding_complete",
     "restart_onboarding",
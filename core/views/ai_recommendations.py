@@ -26,6 +26,7 @@ from django.utils import timezone
 
 from ..models import (
     MUSKELGRUPPEN,
+    HintergrundJob,
     Plan,
     PlanUebung,
     Satz,
@@ -746,48 +747,110 @@ def _validate_plan_gen_params(
     )
 
 
-def _execute_plan_generation(
+def _create_plan_generator(
+    user_id: int, params: tuple, progress_callback=None, cache: bool = True
+) -> tuple[Any, bool]:
+    """Erstellt den PlanGenerator aus validierten Parametern.
+
+    ``cache=False`` umgeht den LLM-Response-Cache (frischer Plan statt Treffer).
+
+    Returns:
+        (generator, use_openrouter)
+    """
+    from ai_coach.plan_generator import PlanGenerator
+
+    (
+        plan_type,
+        sets_per_session,
+        analysis_days,
+        periodization,
+        target_profile,
+        _preview_only,
+        duration_weeks,
+    ) = params
+    use_openrouter = not settings.DEBUG or os.getenv("USE_OPENROUTER", "False").lower() == "true"
+    generator = PlanGenerator(
+        user_id=user_id,
+        plan_type=plan_type,
+        analysis_days=analysis_days,
+        sets_per_session=sets_per_session,
+        periodization=periodization,
+        target_profile=target_profile,
+        use_openrouter=use_openrouter,
+        fallback_to_openrouter=True,
+        duration_weeks=duration_weeks,
+        progress_callback=progress_callback,
+        cache=cache,
+    )
+    return generator, use_openrouter
+
+
+def _plan_generation_result(
     user: User, generator, preview_only: bool, use_openrouter: bool
-) -> JsonResponse:
-    """Führt die Plan-Generierung aus und gibt die JsonResponse zurück."""
+) -> dict:
+    """Führt die Plan-Generierung aus und gibt das Antwort-Dict zurück.
+
+    Gemeinsam genutzt vom synchronen Endpoint und vom Hintergrund-Job
+    (``core/services/job_aufgaben.py``).
+    """
     cost = 0.003 if use_openrouter else 0.0
     model = "OpenRouter 70B" if use_openrouter else "Ollama 8B"
 
     if preview_only:
         result = generator.generate(save_to_db=False)
-        return JsonResponse(
-            {
-                "success": True,
-                "preview": True,
-                "plan_data": result.get("plan_data", {}),
-                "cost": cost,
-                "model": model,
-            }
-        )
+        return {
+            "success": True,
+            "preview": True,
+            "plan_data": result.get("plan_data", {}),
+            "cost": cost,
+            "model": model,
+        }
 
     result = generator.generate(save_to_db=True)
     if result.get("success") and result.get("plan_ids"):
         _apply_mesocycle_from_plan(user, result.get("plan_data", {}), result.get("plan_ids", []))
     plan_name = result.get("plan_data", {}).get("plan_name", "")
-    return JsonResponse(
-        {
-            "success": True,
-            "plan_ids": result.get("plan_ids", []),
-            "plan_name": plan_name,
-            "sessions": len(result.get("plan_data", {}).get("sessions", [])),
-            "cost": cost,
-            "model": model,
-            "message": f"Plan '{plan_name}' erfolgreich erstellt!",
-        }
-    )
+    return {
+        "success": True,
+        "plan_ids": result.get("plan_ids", []),
+        "plan_name": plan_name,
+        "sessions": len(result.get("plan_data", {}).get("sessions", [])),
+        "cost": cost,
+        "model": model,
+        "message": f"Plan '{plan_name}' erfolgreich erstellt!",
+    }
+
+
+def _plan_preview_result(generator, use_openrouter: bool) -> dict:
+    """Vorschau für den SSE-Stream (Job ``plan_vorschau``), inkl. Coverage-Warnungen."""
+    result = generator.generate(save_to_db=False)
+    if not result.get("success"):
+        errors = result.get("errors") or ["Generierung fehlgeschlagen"]
+        return {"success": False, "error": errors[0]}
+    return {
+        "success": True,
+        "preview": True,
+        "plan_data": result.get("plan_data", {}),
+        "coverage_warnings": result.get("coverage_warnings", []),
+        "cost": 0.003 if use_openrouter else 0.0,
+        "model": "Gemini 2.5 Flash" if use_openrouter else "Ollama",
+    }
+
+
+def _execute_plan_generation(
+    user: User, generator, preview_only: bool, use_openrouter: bool
+) -> JsonResponse:
+    """Führt die Plan-Generierung aus und gibt die JsonResponse zurück."""
+    return JsonResponse(_plan_generation_result(user, generator, preview_only, use_openrouter))
 
 
 @login_required
 def generate_plan_api(request: HttpRequest) -> JsonResponse:
     """
     API Endpoint für KI-Plan-Generierung über Web-Interface
-    POST: { plan_type, sets_per_session, analysis_days? }
+    POST: { plan_type, sets_per_session, analysis_days?, cache? }
     oder: { saveCachedPlan: true, plan_data: {...} }
+    {"cache": false} umgeht den LLM-Response-Cache (frischer Plan).
     Returns: { success, plan_ids, cost, message }
     """
     if request.method != "POST":
@@ -825,33 +888,20 @@ def generate_plan_api(request: HttpRequest) -> JsonResponse:
         params = _validate_plan_gen_params(data)
         if isinstance(params, JsonResponse):
             return params
-        (
-            plan_type,
-            sets_per_session,
-            analysis_days,
-            periodization,
-            target_profile,
-            preview_only,
-            duration_weeks,
-        ) = params
-
-        # Plan Generator importieren (korrekter Package-Import)
-        from ai_coach.plan_generator import PlanGenerator
-
-        use_openrouter = (
-            not settings.DEBUG or os.getenv("USE_OPENROUTER", "False").lower() == "true"
-        )
-        generator = PlanGenerator(
-            user_id=request.user.id,
-            plan_type=plan_type,
-            analysis_days=analysis_days,
-            sets_per_session=sets_per_session,
-            periodization=periodization,
-            target_profile=target_profile,
-            use_openrouter=use_openrouter,
-            fallback_to_openrouter=True,
-            duration_weeks=duration_weeks,
-        )
+
+        cache = data.get("cache", True) is not False
+
+        # {"async": true} (Web-Oberfläche) → Hintergrund-Job, Client pollt /api/jobs/<id>/
+        if data.get("async"):
+            from core.services.hintergrund_jobs import enqueue
+
+            job = enqueue("plan_generieren", user=request.user, params=list(params), cache=cache)
+            return JsonResponse(
+                {"success": True, "job_id": job.pk, "status": job.status}, status=202
+            )
+
+        preview_only = params[5]
+        generator, use_openrouter = _create_plan_generator(request.user.id, params, cache=cache)
         return _execute_plan_generation(request.user, generator, preview_only, use_openrouter)
 
     except Exception as e:
@@ -926,7 +976,8 @@ def optimize_plan_api(request: HttpRequest) -> JsonResponse:
     Body:
         {
             'plan_id': 1,
-            'days': 30
+            'days': 30,
+            'cache': true  # false = LLM-Response-Cache umgehen
         }
 
     Returns:
@@ -970,7 +1021,9 @@ def optimize_plan_api(request: HttpRequest) -> JsonResponse:
             return JsonResponse({"error": "Plan nicht gefunden"}, status=404)
 
         adapter = PlanAdapter(plan_id=plan.id, user_id=request.user.id)
-        result = adapter.suggest_optimizations(days=days)
+        result = adapter.suggest_optimizations(
+            days=days, cache=data.get("cache", True) is not False
+        )
 
         return JsonResponse({"success": True, "plan_id": plan.id, "plan_name": plan.name, **result})
 
@@ -1139,11 +1192,49 @@ def apply_optimizations_api(request: HttpRequest) -> JsonResponse:
         )
 
 
+def _parse_live_guidance_request(request: HttpRequest) -> dict | JsonResponse:
+    """Validiert den Live-Guidance-Body und gibt die Argumente für LiveGuidance zurück.
+
+    Gemeinsam genutzt von ``live_guidance_api`` und ``live_guidance_stream_api``.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Ungültiges JSON im Request-Body"}, status=400)
+
+    session_id = data.get("session_id")
+    question = data.get("question", "").strip()
+
+    if not session_id or not question:
+        return JsonResponse({"error": "session_id und question erforderlich"}, status=400)
+
+    # Prüfe ob Session dem User gehört
+    session = Trainingseinheit.objects.filter(id=session_id, user=request.user).first()
+    if not session:
+        return JsonResponse({"error": "Trainingseinheit nicht gefunden"}, status=404)
+
+    return {
+        "trainingseinheit_id": session_id,
+        "user_question": question,
+        "current_uebung_id": data.get("exercise_id"),
+        "current_satz_number": data.get("set_number"),
+        # Chat-Historie für Konversationsgedächtnis
+        "chat_history": data.get("chat_history", []),
+        # {"cache": false} = frische Antwort statt LLM-Response-Cache
+        "cache": data.get("cache", True) is not False,
+    }
+
+
+def _live_guidance_use_openrouter() -> bool:
+    # Auf dem Server (DEBUG=False) immer OpenRouter verwenden (keine lokale GPU)
+    return not settings.DEBUG or os.getenv("USE_OPENROUTER", "False").lower() == "true"
+
+
 @login_required
 def live_guidance_api(request: HttpRequest) -> JsonResponse:
     """
     API Endpoint für Live-Guidance während Training
-    POST: { session_id, question, exercise_id?, set_number? }
+    POST: { session_id, question, exercise_id?, set_number?, cache? }
     Returns: { answer, cost, model }
     """
     if request.method != "POST":
@@ -1155,41 +1246,15 @@ def live_guidance_api(request: HttpRequest) -> JsonResponse:
         return rate_limit_response
 
     try:
-        try:
-            data = json.loads(request.body)
-        except json.JSONDecodeError:
-            return JsonResponse({"error": "Ungültiges JSON im Request-Body"}, status=400)
-
-        session_id = data.get("session_id")
-        question = data.get("question", "").strip()
-        exercise_id = data.get("exercise_id")
-        set_number = data.get("set_number")
-        chat_history = data.get("chat_history", [])  # Chat-Historie für Konversationsgedächtnis
-
-        if not session_id or not question:
-            return JsonResponse({"error": "session_id und question erforderlich"}, status=400)
-
-        # Prüfe ob Session dem User gehört
-        session = Trainingseinheit.objects.filter(id=session_id, user=request.user).first()
-        if not session:
-            return JsonResponse({"error": "Trainingseinheit nicht gefunden"}, status=404)
+        guidance_kwargs = _parse_live_guidance_request(request)
+        if isinstance(guidance_kwargs, JsonResponse):
+            return guidance_kwargs
 
         # Live Guidance importieren (korrekter Package-Import)
         from ai_coach.live_guidance import LiveGuidance
 
-        # Auf dem Server (DEBUG=False) immer OpenRouter verwenden (keine lokale GPU)
-        use_openrouter = (
-            not settings.DEBUG or os.getenv("USE_OPENROUTER", "False").lower() == "true"
-        )
-
-        guidance = LiveGuidance(use_openrouter=use_openrouter)
-        result = guidance.get_guidance(
-            trainingseinheit_id=session_id,
-            user_question=question,
-            current_uebung_id=exercise_id,
-            current_satz_number=set_number,
-            chat_history=chat_history,  # Chat-Historie für Konversationsgedächtnis
-        )
+        guidance = LiveGuidance(use_openrouter=_live_guidance_use_openrouter())
+        result = guidance.get_guidance(**guidance_kwargs)
 
         # Security: Validate result structure before returning
         if not isinstance(result, dict) or "answer" not in result:
@@ -1219,14 +1284,176 @@ def live_guidance_api(request: HttpRequest) -> JsonResponse:
         )
 
 
+@login_required
+def live_guidance_stream_api(request: HttpRequest) -> HttpResponse:
+    """
+    Server-Sent Events Variante von live_guidance_api – Antwort Token für Token.
+
+    POST /api/live-guidance/stream/  (Body wie live_guidance_api)
+
+    Schickt SSE-Events:
+      data: {"token": "Halte ", "done": false}
+      data: {"reset": true, "done": false}   (Fallback: bisherigen Text verwerfen)
+
+    Letztes Event bei Erfolg:
+      data: {"done": true, "success": true, "answer": "...", "cost": 0.0004,
+             "model": "...", "usage": {...}, "metrics": {"ttft_ms": ..., ...}}
+
+    Letztes Event bei Fehler:
+      data: {"done": true, "success": false, "error": "..."}
+
+    POST statt GET (anders als generate_plan_stream_api): die Chat-Historie passt
+    nicht in einen Query-String, der Client liest den Stream per fetch().
+    Validierungs- und Rate-Limit-Fehler kommen deshalb als normale JSON-Antwort.
+    Das Rate-Limit teilt sich das "guidance"-Budget mit live_guidance_api.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+
+    rate_limit_response = _check_ai_rate_limit(request, "guidance")
+    if rate_limit_response:
+        return rate_limit_response
+
+    guidance_kwargs = _parse_live_guidance_request(request)
+    if isinstance(guidance_kwargs, JsonResponse):
+        return guidance_kwargs
+
+    from django.http import StreamingHttpResponse
+
+    from ai_coach.live_guidance import LiveGuidance
+
+    guidance = LiveGuidance(use_openrouter=_live_guidance_use_openrouter())
+
+    def event_stream():
+        try:
+            for event in guidance.stream_guidance(**guidance_kwargs):
+                if event.get("done") and event.get("success"):
+                    # Explizit nur bekannte skalare Felder (kein Context in der Response)
+                    usage = event.get("usage") or {}
+                    event = {
+                        "done": True,
+                        "success": True,
+                        "answer": str(event.get("answer", "")),
+                        "cost": float(event.get("cost") or 0),
+                        "model": str(event.get("model", "unknown")),
+                        "cached": bool(event.get("cached", False)),
+                        "usage": {
+                            "prompt_tokens": int(usage.get("prompt_tokens", 0)),
+                            "completion_tokens": int(usage.get("completion_tokens", 0)),
+                        },
+                        "metrics": event.get("metrics") or {},
+                    }
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            logger.error(f"Live Guidance Stream Error: {e}", exc_info=True)
+            yield f'data: {json.dumps({"done": True, "success": False, "error": "Antwort konnte nicht erzeugt werden. Bitte später erneut versuchen."})}\n\n'
+
+    response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: Buffering deaktivieren
+    return response
+
+
+# SSE-Plan-Stream: Poll-Intervall, Verbindungsdauer (danach verbindet sich der
+# Browser mit Last-Event-ID neu und gibt den Gunicorn-Worker zwischendurch frei),
+# Reconnect-Pause und max. Stille eines laufenden Jobs
+_PLAN_STREAM_POLL_SEKUNDEN = 0.5
+_PLAN_STREAM_FENSTER_SEKUNDEN = 25
+_PLAN_STREAM_RETRY_MS = 2000
+_PLAN_STREAM_TIMEOUT_SEKUNDEN = 180
+
+
+def _sse(event: dict, event_id: str = "") -> str:
+    id_zeile = f"id: {event_id}\n" if event_id else ""
+    return f"{id_zeile}data: {json.dumps(event)}\n\n"
+
+
+def _plan_stream_resume(request: HttpRequest) -> tuple[HintergrundJob | None, int] | None:
+    """Job + zuletzt empfangenes Ereignis eines Reconnects, None bei neuem Stream.
+
+    Quelle: ``Last-Event-ID: <job_id>:<ereignis_id>`` (EventSource-Reconnect)
+    oder ``?job_id=`` (Seite neu geladen). Nur eigene ``plan_vorschau``-Jobs.
+    """
+    job_id, _, ereignis_id = request.headers.get("Last-Event-ID", "").partition(":")
+    if not job_id:
+        job_id, ereignis_id = request.GET.get("job_id", ""), ""
+        if not job_id:
+            return None
+    try:
+        job_id, ereignis_id = int(job_id), int(ereignis_id or 0)
+    except ValueError:
+        return None, 0
+    job = HintergrundJob.objects.filter(pk=job_id, user=request.user, typ="plan_vorschau").first()
+    return job, ereignis_id
+
+
+def _plan_job_haengt(job: HintergrundJob) -> bool:
+    """Laufender Job ohne Heartbeat bzw. wartender Job, den niemand abholt."""
+    stille = (timezone.now() - job.aktualisiert_am).total_seconds()
+    if job.status == "LAEUFT":
+        return stille >= _PLAN_STREAM_TIMEOUT_SEKUNDEN
+    return stille >= getattr(settings, "HINTERGRUND_JOBS_TIMEOUT", 900)
+
+
+def _plan_stream_events(job_id: int, letzte_ereignis_id: int):
+    """Yield gespeicherte Ereignisse ab ``letzte_ereignis_id`` bis Job-Ende oder Fensterende."""
+    import time
+
+    from core.services.hintergrund_jobs import warteschlangen_platz
+
+    fenster_ende = time.monotonic() + _PLAN_STREAM_FENSTER_SEKUNDEN
+    platz = None
+    while True:
+        job = HintergrundJob.objects.get(pk=job_id)
+        for ereignis in job.ereignisse.filter(pk__gt=letzte_ereignis_id):
+            letzte_ereignis_id = ereignis.pk
+            yield _sse(
+                {"progress": ereignis.fortschritt, "step": ereignis.schritt, "done": False},
+                f"{job_id}:{ereignis.pk}",
+            )
+
+        if job.status == "FERTIG":
+            yield _sse({"progress": 100, "done": True, **(job.ergebnis or {})})
+            return
+        if job.status == "FEHLER":
+            yield _sse({"done": True, "success": False, "error": job.fehler})
+            return
+        neuer_platz = warteschlangen_platz(job)
+        if neuer_platz and neuer_platz != platz:
+            platz = neuer_platz
+            yield _sse(
+                {
+                    "progress": 0,
+                    "step": f"Warte auf freien Platz ({platz}. in der Warteschlange)...",
+                    "done": False,
+                    "queue_position": platz,
+                },
+                f"{job_id}:{letzte_ereignis_id}",
+            )
+        if _plan_job_haengt(job):
+            # Job läuft ggf. weiter – Ergebnis bleibt über /api/jobs/<id>/ abrufbar
+            yield _sse(
+                {"done": True, "success": False, "error": "Timeout – bitte erneut versuchen."}
+            )
+            return
+        if time.monotonic() >= fenster_ende:
+            return  # Browser verbindet sich nach "retry" mit Last-Event-ID neu
+        time.sleep(_PLAN_STREAM_POLL_SEKUNDEN)
+
+
 @login_required
 def generate_plan_stream_api(request: HttpRequest) -> HttpResponse:
     """
     Server-Sent Events Endpoint für KI-Plan-Generierung mit Echtzeit-Progress.
 
     GET  /api/generate-plan/stream/?plan_type=3er-split&sets_per_session=18&...
+    (``cache=0`` umgeht den LLM-Response-Cache)
 
     Schickt SSE-Events:
+      id: 17:0
+      data: {"progress": 0, "step": "Starte Plan-Generierung...", "done": false, "job_id": 17}
+
+      id: 17:42
       data: {"progress": 35, "step": "KI generiert Plan...", "done": false}
 
     Letztes Event bei Erfolg:
@@ -1236,6 +1463,14 @@ def generate_plan_stream_api(request: HttpRequest) -> HttpResponse:
     Letztes Event bei Fehler:
       data: {"done": true, "success": false, "error": "..."}
 
+    Die Generierung läuft als Hintergrund-Job ``plan_vorschau`` im begrenzten
+    Pool des Web-Prozesses (``HINTERGRUND_JOBS_WEB_PARALLEL``, weitere Anfragen
+    warten in der Queue). Der Stream liest nur die gespeicherten Ereignisse und
+    schließt nach ``_PLAN_STREAM_FENSTER_SEKUNDEN``; der Browser verbindet sich
+    mit ``Last-Event-ID`` neu und bekommt nur fehlende Ereignisse. Nach dem
+    Stream bleibt das Ergebnis über ``/api/jobs/<job_id>/`` bzw. ``?job_id=``
+    abrufbar. Reconnects zählen nicht gegen das Rate-Limit.
+
     Warum GET statt POST: SSE-Streams müssen per GET aufgebaut werden.
     Parameter kommen als Query-String. CSRF wird über Cookie-basierte
     Session-Auth (login_required) abgesichert.
@@ -1243,131 +1478,76 @@ def generate_plan_stream_api(request: HttpRequest) -> HttpResponse:
     if request.method != "GET":
         return HttpResponse("GET required", status=405)
 
-    # Rate Limit: teilt Budget mit generate_plan_api (gleicher "plan"-Counter)
-    rate_limit_response = _check_ai_rate_limit(request, "plan")
-    if rate_limit_response:
-        # SSE-Client erwartet text/event-stream – JSON-Response als SSE-Error wrappen
-        import json as _json
-
-        error_data = _json.loads(rate_limit_response.content)
-
-        def _error_stream():
-            yield f"data: {_json.dumps({'done': True, 'success': False, 'error': error_data['error']})}\n\n"
-
-        from django.http import StreamingHttpResponse
-
-        return StreamingHttpResponse(_error_stream(), content_type="text/event-stream", status=429)
-
-    import threading
-
     from django.http import StreamingHttpResponse
 
-    # Parameter aus Query-String lesen
-    data = {
-        "plan_type": request.GET.get("plan_type", "3er-split"),
-        "sets_per_session": request.GET.get("sets_per_session", "18"),
-        "analysis_days": request.GET.get("analysis_days", "30"),
-        "periodization": request.GET.get("periodization", "linear"),
-        "target_profile": request.GET.get("target_profile", "hypertrophie"),
-        "duration_weeks": request.GET.get("duration_weeks", "12"),
-        "previewOnly": True,  # Stream gibt immer Preview zurück; User bestätigt danach
-    }
-
-    params = _validate_plan_gen_params(data)
-    if isinstance(params, JsonResponse):
-        # Validierungsfehler als SSE-Error-Event zurückgeben
-        error_msg = json.loads(params.content).get("error", "Ungültige Parameter")
+    resume = _plan_stream_resume(request)
+    if resume is not None:
+        job, letzte_ereignis_id = resume
+        if job is None:
 
-        def error_stream():
-            yield f'data: {json.dumps({"done": True, "success": False, "error": error_msg})}\n\n'
-
-        return StreamingHttpResponse(error_stream(), content_type="text/event-stream")
+            def unbekannt_stream():
+                yield _sse(
+                    {"done": True, "success": False, "error": "Plan-Generierung nicht gefunden"}
+                )
 
-    plan_type, sets_per_session, analysis_days, periodization, target_profile, _, duration_weeks = (
-        params
-    )
+            return StreamingHttpResponse(unbekannt_stream(), content_type="text/event-stream")
+        start_event = ""
+    else:
+        # Rate Limit: teilt Budget mit generate_plan_api (gleicher "plan"-Counter)
+        rate_limit_response = _check_ai_rate_limit(request, "plan")
+        if rate_limit_response:
+            # SSE-Client erwartet text/event-stream – JSON-Response als SSE-Error wrappen
+            error_data = json.loads(rate_limit_response.content)
 
-    use_openrouter = not settings.DEBUG or os.getenv("USE_OPENROUTER", "False").lower() == "true"
+            def _error_stream():
+                yield _sse({"done": True, "success": False, "error": error_data["error"]})
 
-    # Thread-sichere Queue für Events zwischen Generator-Thread und SSE-Stream
-    import queue
+            return StreamingHttpResponse(
+                _error_stream(), content_type="text/event-stream", status=429
+            )
 
-    event_queue: queue.Queue = queue.Queue()
+        # Parameter aus Query-String lesen
+        data = {
+            "plan_type": request.GET.get("plan_type", "3er-split"),
+            "sets_per_session": request.GET.get("sets_per_session", "18"),
+            "analysis_days": request.GET.get("analysis_days", "30"),
+            "periodization": request.GET.get("periodization", "linear"),
+            "target_profile": request.GET.get("target_profile", "hypertrophie"),
+            "duration_weeks": request.GET.get("duration_weeks", "12"),
+            "previewOnly": True,  # Stream gibt immer Preview zurück; User bestätigt danach
+        }
 
-    def progress_callback(percent: int, step: str) -> None:
-        """Wird vom PlanGenerator aufgerufen und packt Event in Queue."""
-        event_queue.put({"progress": percent, "step": step, "done": False})
+        params = _validate_plan_gen_params(data)
+        if isinstance(params, JsonResponse):
+            # Validierungsfehler als SSE-Error-Event zurückgeben
+            error_msg = json.loads(params.content).get("error", "Ungültige Parameter")
 
-    def run_generator():
-        """Läuft in separatem Thread – blockiert nicht den SSE-Stream."""
-        try:
-            from ai_coach.plan_generator import PlanGenerator
-
-            generator = PlanGenerator(
-                user_id=request.user.id,
-                plan_type=plan_type,
-                analysis_days=analysis_days,
-                sets_per_session=sets_per_session,
-                periodization=periodization,
-                target_profile=target_profile,
-                use_openrouter=use_openrouter,
-                fallback_to_openrouter=True,
-                progress_callback=progress_callback,
-                duration_weeks=duration_weeks,
-            )
-            result = generator.generate(save_to_db=False)
+            def error_stream():
+                yield _sse({"done": True, "success": False, "error": error_msg})
 
-            if result.get("success"):
-                event_queue.put(
-                    {
-                        "progress": 100,
-                        "done": True,
-                        "success": True,
-                        "preview": True,
-                        "plan_data": result.get("plan_data", {}),
-                        "coverage_warnings": result.get("coverage_warnings", []),
-                        "cost": 0.003 if use_openrouter else 0.0,
-                        "model": "Gemini 2.5 Flash" if use_openrouter else "Ollama",
-                    }
-                )
-            else:
-                errors = result.get("errors") or ["Generierung fehlgeschlagen"]
-                event_queue.put(
-                    {
-                        "done": True,
-                        "success": False,
-                        "error": errors[0] if errors else "Unbekannter Fehler",
-                    }
-                )
-        except Exception as exc:
-            logger.error(f"Stream Generator Error: {exc}", exc_info=True)
-            event_queue.put(
-                {
-                    "done": True,
-                    "success": False,
-                    "error": "Plan-Generierung fehlgeschlagen. Bitte erneut versuchen.",
-                }
-            )
+            return StreamingHttpResponse(error_stream(), content_type="text/event-stream")
 
-    # Generator im Hintergrund starten
-    thread = threading.Thread(target=run_generator, daemon=True)
-    thread.start()
+        from core.services.hintergrund_jobs import enqueue, starte_im_webprozess
 
-    def event_stream():
-        """Yield SSE-Events aus der Queue bis done=True empfangen wird."""
+        # max_versuche=1: der User wartet live – kein Retry Minuten später
+        job = enqueue(
+            "plan_vorschau",
+            request.user,
+            max_versuche=1,
+            params=list(params),
+            cache=request.GET.get("cache", "1").lower() not in ("0", "false"),
+        )
+        starte_im_webprozess(job)
+        letzte_ereignis_id = 0
         # Initiales Event sofort senden (zeigt dem Browser: Verbindung steht)
-        yield f'data: {json.dumps({"progress": 0, "step": "Starte Plan-Generierung...", "done": False})}\n\n'
+        start_event = _sse(
+            {"progress": 0, "step": "Starte Plan-Generierung...", "done": False, "job_id": job.pk},
+            f"{job.pk}:0",
+        )
 
-        while True:
-            try:
-                event = event_queue.get(timeout=180)  # max 3 Minuten warten
-                yield f"data: {json.dumps(event)}\n\n"
-                if event.get("done"):
-                    break
-            except queue.Empty:
-                # Timeout – informiere Client
-                yield f'data: {json.dumps({"done": True, "success": False, "error": "Timeout – bitte erneut versuchen."})}\n\n'
-                break
+    def event_stream():
+        yield f"retry: {_PLAN_STREAM_RETRY_MS}\n\n{start_event}"
+        yield from _plan_stream_events(job.pk, letzte_ereignis_id)
 
     response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
     response["Cache-Control"] = "no-cache"
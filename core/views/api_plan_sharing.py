@@ -16,6 +16,7 @@ from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_http_methods
 
 from ..models import Plan
+from ..services.daten_version import erhoehe
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,7 @@ def api_ungroup_plans(request: HttpRequest) -> JsonResponse:
         updated = Plan.objects.filter(user=request.user, gruppe_id=gruppe_id).update(
             gruppe_id=None, gruppe_name=""
         )
+        erhoehe(request.user.id, "plaene")  # update() umgeht die Signale
 
         return JsonResponse(
             {"success": True, "message": f"{updated} Pläne wurden aus der Gruppe entfernt"}
@@ -177,6 +179,7 @@ def api_rename_group(request: HttpRequest) -> JsonResponse:
         updated = Plan.objects.filter(user=request.user, gruppe_id=gruppe_id).update(
             gruppe_name=new_name
         )
+        erhoehe(request.user.id, "plaene")  # update() umgeht die Signale
 
         if updated == 0:
             return JsonResponse(
@@ -17,7 +17,7 @@ from django.http import JsonResponse
 from django.utils import timezone
 from django.views.decorators.http import require_GET
 
-from core.models import KoerperWerte, Satz, Trainingseinheit
+from core.models import KoerperWerte, Satz, Trainingseinheit, UebungTagesStatistik
 
 logger = logging.getLogger("core")
 
@@ -219,20 +219,25 @@ def saleria_prs(request):
     user = request.saleria_user
     seit = timezone.now() - timedelta(days=30)
 
-    saetze = Satz.objects.filter(
-        einheit__user=user,
-        einheit__abgeschlossen=True,
-        einheit__datum__gte=seit,
-        ist_aufwaermsatz=False,
-        gewicht__gt=0,
-    ).select_related("uebung", "einheit")
+    # Bester Satz je (Einheit, Übung) aus der materialisierten Tagesstatistik
+    statistiken = (
+        UebungTagesStatistik.objects.filter(
+            user=user,
+            einheit__abgeschlossen=True,
+            einheit__datum__gte=seit,
+            bestes_1rm__gt=0,
+            bester_satz__isnull=False,
+        )
+        .select_related("uebung", "einheit", "bester_satz")
+        .order_by("einheit_id")
+    )
 
     # Beste 1RM pro Übung berechnen
     best_per_exercise = {}
-    for s in saetze:
-        wdh = s.wiederholungen or 1
-        estimated_1rm = float(s.gewicht) * (1 + wdh / 30.0)
-        name = s.uebung.bezeichnung
+    for stat in statistiken:
+        s = stat.bester_satz
+        estimated_1rm = stat.bestes_1rm
+        name = stat.uebung.bezeichnung
 
         if (
             name not in best_per_exercise
@@ -243,7 +248,7 @@ def saleria_prs(request):
                 "estimated_1rm": round(estimated_1rm, 1),
                 "gewicht_kg": _decimal_to_float(s.gewicht),
                 "wiederholungen": s.wiederholungen,
-                "datum": s.einheit.datum.isoformat(),
+                "datum": stat.einheit.datum.isoformat(),
             }
 
     # Nach 1RM absteigend sortieren
@@ -8,131 +8,157 @@ downloadable reports of training history, statistics, and plan documentation.
 
 import base64
 import csv
-import io
 import logging
+import os
+import uuid
 from datetime import datetime, timedelta
 from io import BytesIO
+from itertools import groupby
+from operator import itemgetter
+from types import SimpleNamespace
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, HttpResponse
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils import timezone
 
-try:
-    from xhtml2pdf import pisa
-except ImportError:
-    pisa = None
-
-try:
-    import qrcode
-except ImportError:
-    qrcode = None
-
-from core.chart_generator import (
-    generate_body_trend_chart,
-    generate_exercise_progression_chart,
-    generate_rpe_donut,
-    generate_training_heatmap,
-)
-
-from ..export.chart_orchestrator import generate_pdf_charts
-from ..export.pdf_renderer import render_training_pdf_response
+from ..export import pdf_cache
+from ..export.chart_orchestrator import pdf_chart_auftraege, rendere_gecacht
 from ..export.stats_collector import calc_volume_trend_weekly, collect_pdf_stats
 from ..export.weight_analysis import analyze_weight_loss_context
-from ..models import MUSKELGRUPPEN, Plan, PlanUebung, Satz, Trainingseinheit, TrainingsPause, Uebung
+from ..models import MUSKELGRUPPEN, Plan, PlanUebung, Satz, TrainingsPause
+from ..services.hevy_import import MAX_FEHLERMELDUNGEN, HevyImportFehler, importiere_hevy_csv
+from ..utils.lazy_import import modul_getattr
 from ..utils.week_classification import pausen_im_zeitraum
 
 logger = logging.getLogger(__name__)
 
+# Plan-PDF-Bibliotheken erst beim ersten Export laden (core/utils/lazy_import.py)
+__getattr__ = modul_getattr(globals(), {"pisa": ("xhtml2pdf", "pisa"), "qrcode": ("qrcode", None)})
+
+
+def _lib(name: str):
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
 # Backward-compatible aliases for tests that import private names
 _analyze_weight_loss_context = analyze_weight_loss_context
 _calc_volume_trend_weekly = calc_volume_trend_weekly
 
 
-@login_required
-def export_training_csv(request: HttpRequest) -> HttpResponse:
-    """Export all training data as CSV.
+# Sätze je Datenbank-Roundtrip beim Streaming-Export
+CSV_EXPORT_CHUNK_SIZE = 2000
 
-    Exports all training sessions and sets for the current user in CSV format,
-    including exercise details, weights, reps, RPE, and volume calculations.
 
-    Args:
-        request: Django request object
+class _Echo:
+    """Pseudo-Puffer für ``csv.writer``: ``write`` gibt die Zeile zurück statt sie zu puffern."""
 
-    Returns:
-        HttpResponse: CSV file download with training data
-    """
-    response = HttpResponse(content_type="text/csv; charset=utf-8")
-    response["Content-Disposition"] = 'attachment; filename="training_export.csv"'
-    response.write("\ufeff")  # UTF-8 BOM for Excel
-
-    writer = csv.writer(response)
-    writer.writerow(
-        [
-            "Datum",
-            "Übung",
-            "Muskelgruppe",
-            "Satz Nr.",
-            "Gewicht (kg)",
-            "Wiederholungen",
-            "RPE",
-            "Volumen (kg)",
-            "Aufwärmsatz",
-            "Notiz",
-        ]
-    )
+    def write(self, value: str) -> str:
+        return value
 
-    trainings = (
-        Trainingseinheit.objects.filter(user=request.user)
-        .prefetch_related("saetze__uebung")
-        .order_by("-datum")
-    )
 
-    for training in trainings:
-        for satz in training.saetze.all():
-            volumen = float(satz.gewicht) * satz.wiederholungen if satz.gewicht else 0
-            writer.writerow(
-                [
-                    training.datum.strftime("%d.%m.%Y"),
-                    satz.uebung.bezeichnung,
-                    satz.uebung.get_muskelgruppe_display(),
-                    satz.satz_nr,
-                    float(satz.gewicht) if satz.gewicht else "",
-                    satz.wiederholungen,
-                    satz.rpe if satz.rpe else "",
-                    round(volumen, 1),
-                    "Ja" if satz.ist_aufwaermsatz else "Nein",
-                    satz.notiz or "",
-                ]
-            )
+def _csv_streaming_response(zeilen, dateiname: str) -> StreamingHttpResponse:
+    """Streamt ``zeilen`` (Iterable von Listen) als CSV-Download mit UTF-8-BOM.
 
+    Der Speicherbedarf bleibt konstant (ein Chunk Sätze), das erste Byte geht
+    sofort raus – wichtig für Accounts mit zehntausenden Sätzen (Gunicorn-Timeout).
+    """
+    writer = csv.writer(_Echo())
+
+    def _stream():
+        yield "\ufeff"  # UTF-8 BOM for Excel
+        for zeile in zeilen:
+            yield writer.writerow(zeile)
+
+    response = StreamingHttpResponse(_stream(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{dateiname}"'
     return response
 
 
+def _training_csv_zeilen(user):
+    yield [
+        "Datum",
+        "Übung",
+        "Muskelgruppe",
+        "Satz Nr.",
+        "Gewicht (kg)",
+        "Wiederholungen",
+        "RPE",
+        "Volumen (kg)",
+        "Aufwärmsatz",
+        "Notiz",
+    ]
+    muskelgruppen = dict(MUSKELGRUPPEN)
+    saetze = (
+        Satz.objects.filter(einheit__user=user)
+        .order_by("-einheit__datum", "einheit_id", "satz_nr")
+        .values_list(
+            "einheit__datum",
+            "uebung__bezeichnung",
+            "uebung__muskelgruppe",
+            "satz_nr",
+            "gewicht",
+            "wiederholungen",
+            "rpe",
+            "ist_aufwaermsatz",
+            "notiz",
+        )
+    )
+    for datum, bezeichnung, mg, satz_nr, gewicht, wdh, rpe, aufwaermsatz, notiz in saetze.iterator(
+        chunk_size=CSV_EXPORT_CHUNK_SIZE
+    ):
+        volumen = float(gewicht) * wdh if gewicht else 0
+        yield [
+            datum.strftime("%d.%m.%Y"),
+            bezeichnung,
+            muskelgruppen.get(mg, mg),
+            satz_nr,
+            float(gewicht) if gewicht else "",
+            wdh,
+            rpe if rpe else "",
+            round(volumen, 1),
+            "Ja" if aufwaermsatz else "Nein",
+            notiz or "",
+        ]
+
+
 @login_required
-def export_training_pdf(request: HttpRequest) -> HttpResponse:
-    """Export training statistics as PDF.
+def export_training_csv(request: HttpRequest) -> StreamingHttpResponse:
+    """Export all training data as CSV.
 
-    Generates a comprehensive PDF report of training statistics including
-    volume progression, muscle group balance, push/pull analysis, and
-    strength development using xhtml2pdf.
+    Exports all training sessions and sets for the current user in CSV format,
+    including exercise details, weights, reps, RPE, and volume calculations.
+    Streamed row by row over a chunked ``values_list`` query.
 
     Args:
         request: Django request object
 
     Returns:
-        HttpResponse: PDF file download with training report
+        StreamingHttpResponse: CSV file download with training data
+    """
+    return _csv_streaming_response(_training_csv_zeilen(request.user), "training_export.csv")
+
+
+def build_training_pdf_context(user) -> tuple[dict, datetime]:
+    """Sammelt Statistiken und Charts für den Trainings-PDF-Report.
+
+    Vom Request unabhängig, damit der Hintergrund-Job
+    (``core/services/job_aufgaben.py``) denselben Report rendern kann.
+
+    Returns:
+        (context, heute) für ``_render_pdf_bytes``
     """
-    # Engine-Verfügbarkeit + Fallback liegen zentral im Renderer
-    # (render_training_pdf_response → _render_pdf_bytes): WeasyPrint primär bei
-    # PDF_ENGINE=weasyprint, sonst bzw. bei Fehler xhtml2pdf. Eine harte
-    # xhtml2pdf-Vorabprüfung hier würde den WeasyPrint-only-Betrieb (ohne
-    # installiertes xhtml2pdf) fälschlich blockieren.
     heute = timezone.now()
     letzte_30_tage = heute - timedelta(days=30)
-    stats = collect_pdf_stats(request.user, letzte_30_tage, heute)
+    stats = collect_pdf_stats(user, letzte_30_tage, heute)
 
     # Abhängige Analysen – benötigen den vollständigen stats-Dict
     volumen_trend_weekly = calc_volume_trend_weekly(
@@ -142,37 +168,70 @@ def export_training_pdf(request: HttpRequest) -> HttpResponse:
     weight_loss_analysis = analyze_weight_loss_context(stats)
     stats["weight_loss_analysis"] = weight_loss_analysis
 
-    muskelgruppen_stats = stats["muskelgruppen_stats"]
-    volumen_wochen = stats["volumen_wochen"]
-    push_saetze = stats["push_saetze"]
-    pull_saetze = stats["pull_saetze"]
-    muscle_heatmap, volume_chart, push_pull_chart, body_map_image = generate_pdf_charts(
-        muskelgruppen_stats, volumen_wochen, push_saetze, pull_saetze
-    )
-    body_trend_chart = generate_body_trend_chart(stats.get("koerperwerte_chart", []))
-    rpe_donut_chart = generate_rpe_donut(stats.get("rpe_verteilung", {}), stats.get("avg_rpe", 0.0))
-
     # Phase 35.3 (#1059 g): globaler Pausen-Kontext – EINE Datenquelle für den
     # Report-Kopf-Banner (30-Tage-Berichtszeitraum) und die Heatmap-Marker
     # (12-Wochen-Chartfenster).
-    pausen_qs = TrainingsPause.objects.filter(user=request.user)
+    pausen_qs = TrainingsPause.objects.filter(user=user)
     pausen_banner = pausen_im_zeitraum(pausen_qs, letzte_30_tage.date(), heute.date())
     heatmap_pausen = pausen_im_zeitraum(
         pausen_qs, (heute - timedelta(days=84)).date(), heute.date()
     )
 
+    # Alle Charts sind voneinander unabhängig → EIN Durchlauf durch den
+    # Chart-Pool (parallel, core/export/chart_pool.py); Basis-Charts gecacht.
+    auftraege = pdf_chart_auftraege(
+        stats["muskelgruppen_stats"],
+        stats["volumen_wochen"],
+        stats["push_saetze"],
+        stats["pull_saetze"],
+    )
+    koerperwerte = [
+        SimpleNamespace(
+            datum=kw.datum,
+            gewicht=kw.gewicht,
+            koerperfett_prozent=kw.koerperfett_prozent,
+            muskelmasse_prozent=kw.muskelmasse_prozent,
+        )
+        for kw in stats.get("koerperwerte_chart", [])
+    ]
+    auftraege["body_trend_chart"] = (None, ("generate_body_trend_chart", (koerperwerte,), {}))
+    auftraege["rpe_donut_chart"] = (
+        None,
+        ("generate_rpe_donut", (stats.get("rpe_verteilung", {}), stats.get("avg_rpe", 0.0)), {}),
+    )
     # Phase D: Heatmap + Übungsdetail-Charts
-    training_heatmap_chart = generate_training_heatmap(
-        stats.get("training_heatmap_data", []),
-        pause_ranges=heatmap_pausen["spannen"] if heatmap_pausen else None,
-        # PR-#209-Codex R3: Report-Datum als Grid-Anker, sonst fehlen
-        # trainingsfreie Tage zwischen Pausenende und Report-Erstellung.
-        end_date=heute.date(),
+    auftraege["training_heatmap_chart"] = (
+        None,
+        (
+            "generate_training_heatmap",
+            (stats.get("training_heatmap_data", []),),
+            {
+                "pause_ranges": heatmap_pausen["spannen"] if heatmap_pausen else None,
+                # PR-#209-Codex R3: Report-Datum als Grid-Anker, sonst fehlen
+                # trainingsfreie Tage zwischen Pausenende und Report-Erstellung.
+                "end_date": heute.date(),
+            },
+        ),
     )
+    exercise_details = stats.get("exercise_detail_data", [])
+    for i, ex_data in enumerate(exercise_details):
+        auftraege[f"exercise_{i}"] = (
+            None,
+            ("generate_exercise_progression_chart", (ex_data["verlauf"],), {}),
+        )
+    charts = rendere_gecacht(auftraege)
+
+    muscle_heatmap = charts["muscle_heatmap"]
+    volume_chart = charts["volume_chart"]
+    push_pull_chart = charts["push_pull_chart"]
+    body_map_image = charts["body_map_image"]
+    body_trend_chart = charts["body_trend_chart"]
+    rpe_donut_chart = charts["rpe_donut_chart"]
+    training_heatmap_chart = charts["training_heatmap_chart"]
 
     exercise_detail_charts = []
-    for ex_data in stats.get("exercise_detail_data", []):
-        chart_img = generate_exercise_progression_chart(ex_data["verlauf"])
+    for i, ex_data in enumerate(exercise_details):
+        chart_img = charts[f"exercise_{i}"]
         if chart_img:
             exercise_detail_charts.append(
                 {
@@ -280,7 +339,7 @@ def export_training_pdf(request: HttpRequest) -> HttpResponse:
     ]
 
     context = {
-        "user": request.user,
+        "user": user,
         "datum": heute,
         "muscle_heatmap": muscle_heatmap,
         "volume_chart": volume_chart,
@@ -297,12 +356,54 @@ def export_training_pdf(request: HttpRequest) -> HttpResponse:
         **stats,
     }
 
-    return render_training_pdf_response(request, context, heute)
+    return context, heute
+
+
+@login_required
+def export_training_pdf(request: HttpRequest) -> HttpResponse:
+    """Export training statistics as PDF.
+
+    Generates a comprehensive PDF report of training statistics including
+    volume progression, muscle group balance, push/pull analysis, and
+    strength development using xhtml2pdf.
+
+    Mit ``?async=1`` wird der Report als Hintergrund-Job eingereiht
+    (JSON-Antwort mit ``job_id``, Download über ``/api/jobs/<id>/download/``).
+
+    Gerenderte Reports liegen im Datei-Cache (``core/export/pdf_cache.py``);
+    ein erneuter Download ohne Datenänderung wird direkt aus der Datei gestreamt.
+
+    Args:
+        request: Django request object
+
+    Returns:
+        HttpResponse: PDF file download with training report
+    """
+    if request.GET.get("async") == "1":
+        from core.services.hintergrund_jobs import enqueue
+
+        job = enqueue("training_pdf", user=request.user)
+        return JsonResponse({"success": True, "job_id": job.pk, "status": job.status}, status=202)
+
+    # Engine-Verfügbarkeit + Fallback liegen zentral im Renderer
+    # (pdf_cache.hole_oder_rendere → _render_pdf_bytes): WeasyPrint primär bei
+    # PDF_ENGINE=weasyprint, sonst bzw. bei Fehler xhtml2pdf. Eine harte
+    # xhtml2pdf-Vorabprüfung hier würde den WeasyPrint-only-Betrieb (ohne
+    # installiertes xhtml2pdf) fälschlich blockieren.
+    try:
+        pfad, dateiname = pdf_cache.hole_oder_rendere(request.user, request)
+    except Exception as e:
+        logger.error(f"PDF export failed: {str(e)}", exc_info=True)
+        messages.error(request, "PDF-Generierung fehlgeschlagen. Bitte später erneut versuchen.")
+        return redirect("training_stats")
+    return FileResponse(
+        open(pfad, "rb"), as_attachment=True, filename=dateiname, content_type="application/pdf"
+    )
 
 
 def _generate_qr_code_base64(url: str) -> str:
     """Generiert einen QR-Code für die angegebene URL und gibt ihn als Base64-PNG zurück."""
-    qr = qrcode.QRCode(version=1, box_size=10, border=2)
+    qr = _lib("qrcode").QRCode(version=1, box_size=10, border=2)
     qr.add_data(url)
     qr.make(fit=True)
     qr_img = qr.make_image(fill_color="black", back_color="white")
@@ -334,7 +435,7 @@ def _generate_and_return_pdf(
     """
     try:
         result = BytesIO()
-        pdf = pisa.pisaDocument(BytesIO(html.encode("utf-8")), result)
+        pdf = _lib("pisa").pisaDocument(BytesIO(html.encode("utf-8")), result)
         if pdf.err:
             logger.error(f"PDF generation errors: {pdf.err}")
             messages.error(request, "Fehler bei PDF-Generierung")
@@ -431,7 +532,7 @@ def export_plan_pdf(request: HttpRequest, plan_id: int) -> HttpResponse:
     Returns:
         HttpResponse: PDF file download with training plan
     """
-    if not pisa or not qrcode:
+    if not _lib("pisa") or not _lib("qrcode"):
         messages.error(request, "PDF Export nicht verfügbar - Pakete fehlen")
         return redirect("plan_details", plan_id=plan_id)
 
@@ -550,7 +651,7 @@ def export_plan_group_pdf(request: HttpRequest, gruppe_id: int) -> HttpResponse:
     Returns:
         HttpResponse: PDF file download with complete training group
     """
-    if not pisa or not qrcode:
+    if not _lib("pisa") or not _lib("qrcode"):
         messages.error(request, "PDF Export nicht verfügbar - Pakete fehlen")
         return redirect("training_select_plan")
 
@@ -607,117 +708,95 @@ _HEVY_HEADERS = [
 _HEVY_DATETIME_FMT = "%Y-%m-%d %H:%M:%S"
 
 
+def _hevy_csv_zeilen(user):
+    yield _HEVY_HEADERS
+    saetze = (
+        Satz.objects.filter(einheit__user=user, einheit__abgeschlossen=True)
+        .order_by("einheit__datum", "einheit_id", "satz_nr")
+        .values_list(
+            "einheit_id",
+            "einheit__datum",
+            "einheit__dauer_minuten",
+            "einheit__kommentar",
+            "einheit__plan__name",
+            "uebung__bezeichnung",
+            "superset_gruppe",
+            "notiz",
+            "ist_aufwaermsatz",
+            "gewicht",
+            "wiederholungen",
+            "rpe",
+        )
+    )
+    # Sätze kommen nach Training sortiert → je Training nur dessen Sätze im Speicher
+    for _einheit_id, training_saetze in groupby(
+        saetze.iterator(chunk_size=CSV_EXPORT_CHUNK_SIZE), key=itemgetter(0)
+    ):
+        training_saetze = list(training_saetze)
+        _, datum, dauer_minuten, kommentar, plan_name = training_saetze[0][:5]
+        title = plan_name if plan_name else datum.strftime("%d.%m.%Y")
+        start_time = datum.strftime(_HEVY_DATETIME_FMT)
+        # Hevy needs an end_time; estimate from dauer_minuten or start + 60 min
+        if dauer_minuten:
+            end_dt = datum + timedelta(minutes=dauer_minuten)
+        else:
+            end_dt = datum + timedelta(hours=1)
+        end_time = end_dt.strftime(_HEVY_DATETIME_FMT)
+        description = kommentar or ""
+
+        # Group sets by exercise to build set_index per exercise within workout
+        sets_by_exercise: dict = {}
+        for satz in training_saetze:
+            sets_by_exercise.setdefault(satz[5], []).append(satz)
+
+        for exercise_name, saetze_uebung in sets_by_exercise.items():
+            for idx, satz in enumerate(saetze_uebung):
+                superset_gruppe, notiz, aufwaermsatz, gewicht, wdh, rpe = satz[6:]
+                yield [
+                    title,
+                    start_time,
+                    end_time,
+                    description,
+                    exercise_name,
+                    f"S{superset_gruppe}" if superset_gruppe else "",
+                    notiz or "",
+                    idx,  # set_index (0-based within exercise)
+                    "warmup" if aufwaermsatz else "normal",
+                    float(gewicht) if gewicht else "",
+                    wdh,
+                    "",  # distance_km – not tracked
+                    "",  # duration_seconds – not tracked
+                    float(rpe) if rpe else "",
+                ]
+
+
 @login_required
-def export_hevy_csv(request: HttpRequest) -> HttpResponse:
+def export_hevy_csv(request: HttpRequest) -> StreamingHttpResponse:
     """Export all training data in Hevy-compatible CSV format.
 
     Produces a CSV that can be imported into Hevy (and similar apps like
     Strong). Each row represents one set. Workout title falls back to the
-    date string when no plan name is set.
+    date string when no plan name is set. Streamed like ``export_training_csv``.
 
     Args:
         request: Django request object
 
     Returns:
-        HttpResponse: CSV file download
+        StreamingHttpResponse: CSV file download
     """
-    response = HttpResponse(content_type="text/csv; charset=utf-8")
-    response["Content-Disposition"] = 'attachment; filename="homegym_hevy_export.csv"'
-    response.write("\ufeff")  # UTF-8 BOM for Excel / Hevy importer
-
-    writer = csv.writer(response)
-    writer.writerow(_HEVY_HEADERS)
-
-    trainings = (
-        Trainingseinheit.objects.filter(user=request.user, abgeschlossen=True)
-        .select_related("plan")
-        .prefetch_related("saetze__uebung")
-        .order_by("datum")
-    )
-
-    for training in trainings:
-        title = training.plan.name if training.plan else training.datum.strftime("%d.%m.%Y")
-        start_time = training.datum.strftime(_HEVY_DATETIME_FMT)
-        # Hevy needs an end_time; estimate from dauer_minuten or start + 60 min
-        if training.dauer_minuten:
-            from datetime import timedelta as _td
-
-            end_dt = training.datum + _td(minutes=training.dauer_minuten)
-        else:
-            end_dt = training.datum + timedelta(hours=1)
-        end_time = end_dt.strftime(_HEVY_DATETIME_FMT)
-        description = training.kommentar or ""
-
-        # Group sets by exercise to build set_index per exercise within workout
-        sets_by_exercise: dict = {}
-        for satz in training.saetze.all():
-            key = satz.uebung.bezeichnung
-            sets_by_exercise.setdefault(key, []).append(satz)
-
-        for exercise_name, saetze in sets_by_exercise.items():
-            for idx, satz in enumerate(saetze):
-                superset_id = f"S{satz.superset_gruppe}" if satz.superset_gruppe else ""
-                set_type = "warmup" if satz.ist_aufwaermsatz else "normal"
-                weight = float(satz.gewicht) if satz.gewicht else ""
-                rpe = float(satz.rpe) if satz.rpe else ""
-                writer.writerow(
-                    [
-                        title,
-                        start_time,
-                        end_time,
-                        description,
-                        exercise_name,
-                        superset_id,
-                        satz.notiz or "",
-                        idx,  # set_index (0-based within exercise)
-                        set_type,
-                        weight,
-                        satz.wiederholungen,
-                        "",  # distance_km – not tracked
-                        "",  # duration_seconds – not tracked
-                        rpe,
-                    ]
-                )
-
-    return response
+    return _csv_streaming_response(_hevy_csv_zeilen(request.user), "homegym_hevy_export.csv")
 
 
 # ---------------------------------------------------------------------------
 # Hevy-Format Import
 # ---------------------------------------------------------------------------
 
-_REQUIRED_HEVY_COLS = {"title", "start_time", "exercise_title", "set_type", "weight_kg", "reps"}
-
-
-def _parse_hevy_datetime(raw: str) -> datetime | None:
-    """Parse Hevy datetime string. Hevy uses 'YYYY-MM-DD HH:MM:SS' or ISO."""
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(raw.strip(), fmt)
-        except ValueError:
-            continue
-    return None
-
-
-def _match_or_create_uebung(name: str, user) -> Uebung:
-    """Find an exercise by name (case-insensitive). Create a custom one if not found."""
-    # Exact match first (global)
-    uebung = Uebung.objects.filter(bezeichnung__iexact=name, created_by__isnull=True).first()
-    if uebung:
-        return uebung
-    # User's own custom exercises
-    uebung = Uebung.objects.filter(bezeichnung__iexact=name, created_by=user).first()
-    if uebung:
-        return uebung
-    # Create as custom exercise
-    uebung = Uebung.objects.create(
-        bezeichnung=name,
-        muskelgruppe="sonstige",
-        created_by=user,
-        is_custom=True,
-    )
-    logger.info("Hevy import: created custom exercise '%s' for user %s", name, user)
-    return uebung
+
+def _hevy_import_meldungen(request: HttpRequest, fehler: list[str]) -> None:
+    for err in fehler[:MAX_FEHLERMELDUNGEN]:
+        messages.warning(request, err)
+    if len(fehler) > MAX_FEHLERMELDUNGEN:
+        messages.warning(request, f"… und {len(fehler) - MAX_FEHLERMELDUNGEN} weitere Hinweise.")
 
 
 @login_required
@@ -725,7 +804,10 @@ def import_hevy_csv(request: HttpRequest) -> HttpResponse:
     """Import training data from a Hevy-compatible CSV file.
 
     Supports GET (show form) and POST (process file).
-    POST with dry_run=1 returns a JSON preview without writing to the DB.
+    POST with dry_run=1 returns a preview without writing to the DB.
+    POST with async=1 queues the import as background job (202 JSON with
+    ``job_id``, progress via ``/api/jobs/<id>/``). The import itself lives in
+    ``core/services/hevy_import.py``.
 
     Args:
         request: Django request object
@@ -733,7 +815,6 @@ def import_hevy_csv(request: HttpRequest) -> HttpResponse:
     Returns:
         Rendered import form (GET) or redirect after successful import (POST)
     """
-    from django.contrib import messages as django_messages
     from django.shortcuts import render
 
     if request.method == "GET":
@@ -741,195 +822,58 @@ def import_hevy_csv(request: HttpRequest) -> HttpResponse:
 
     uploaded_file = request.FILES.get("hevy_csv")
     if not uploaded_file:
-        django_messages.error(request, "Bitte eine CSV-Datei auswählen.")
+        messages.error(request, "Bitte eine CSV-Datei auswählen.")
         return render(request, "core/hevy_import.html")
 
     # Security: max 10 MB
     if uploaded_file.size > 10 * 1024 * 1024:
-        django_messages.error(request, "Datei zu groß (max. 10 MB).")
-        return render(request, "core/hevy_import.html")
-
-    # Parse CSV
-    try:
-        raw = uploaded_file.read().decode("utf-8-sig")  # strip BOM if present
-        reader = csv.DictReader(io.StringIO(raw))
-        rows = list(reader)
-    except Exception as exc:
-        logger.warning("Hevy import CSV parse error: %s", exc)
-        django_messages.error(request, f"CSV konnte nicht gelesen werden: {exc}")
-        return render(request, "core/hevy_import.html")
-
-    if not rows:
-        django_messages.error(request, "Die CSV-Datei enthält keine Daten.")
-        return render(request, "core/hevy_import.html")
-
-    # Validate required columns
-    actual_cols = set(rows[0].keys())
-    missing = _REQUIRED_HEVY_COLS - actual_cols
-    if missing:
-        django_messages.error(request, f"Fehlende Spalten: {', '.join(sorted(missing))}")
+        messages.error(request, "Datei zu groß (max. 10 MB).")
         return render(request, "core/hevy_import.html")
 
     dry_run = request.POST.get("dry_run") == "1"
 
-    # Group rows by (title, start_time) → one Trainingseinheit per workout
-    workouts: dict[tuple, list] = {}
-    for row in rows:
-        key = (row["title"].strip(), row["start_time"].strip())
-        workouts.setdefault(key, []).append(row)
-
-    preview = []  # for dry-run display
-    errors = []
-    imported_count = 0
-    set_count = 0
-    new_exercises: set[str] = set()
-
-    for (title, start_str), workout_rows in workouts.items():
-        start_dt = _parse_hevy_datetime(start_str)
-        if not start_dt:
-            errors.append(f"Ungültiges Datum '{start_str}' – Workout '{title}' übersprungen.")
-            continue
-
-        # Make datetime timezone-aware (use server default timezone)
-        from django.utils.timezone import is_aware, make_aware
-
-        if not is_aware(start_dt):
-            try:
-                start_dt = make_aware(start_dt)
-            except Exception:
-                pass  # naive datetime is fine for older Django setups
-
-        # Dry-run: collect preview info only
-        exercises_in_workout = sorted({r["exercise_title"].strip() for r in workout_rows})
-        preview.append(
-            {
-                "title": title,
-                "date": start_dt.strftime("%d.%m.%Y %H:%M"),
-                "sets": len(workout_rows),
-                "exercises": exercises_in_workout,
-            }
-        )
+    if request.POST.get("async") == "1" and not dry_run:
+        from core.services.hintergrund_jobs import enqueue
+        from core.services.job_aufgaben import job_datei_pfad
 
-        if dry_run:
-            continue
-
-        # Check for duplicate (same user + same datetime within 5 min)
-        existing = Trainingseinheit.objects.filter(
-            user=request.user,
-            datum__range=(
-                start_dt - timedelta(minutes=5),
-                start_dt + timedelta(minutes=5),
-            ),
-        ).first()
-        if existing:
-            errors.append(
-                f"Workout '{title}' ({start_dt.strftime('%d.%m.%Y %H:%M')}) "
-                "existiert bereits – übersprungen."
-            )
-            continue
-
-        # Create Trainingseinheit
-        end_str = workout_rows[0].get("end_time", "").strip()
-        end_dt = _parse_hevy_datetime(end_str) if end_str else None
-        if end_dt and not is_aware(end_dt):
-            try:
-                end_dt = make_aware(end_dt)
-            except Exception:
-                pass
-        dauer = None
-        if end_dt and end_dt > start_dt:
-            dauer = int((end_dt - start_dt).total_seconds() / 60)
-
-        description = workout_rows[0].get("description", "").strip()
-
-        training = Trainingseinheit.objects.create(
-            user=request.user,
-            dauer_minuten=dauer,
-            kommentar=description or None,
-            abgeschlossen=True,
-        )
-        # auto_now_add ignores explicit values -> update datum separately
-        Trainingseinheit.objects.filter(pk=training.pk).update(datum=start_dt)
-        training.datum = start_dt
-
-        # Create Sätze grouped per exercise (to track satz_nr)
-        exercise_satz_counter: dict[str, int] = {}
-        for row in workout_rows:
-            ex_name = row["exercise_title"].strip()
-            if not ex_name:
-                continue
-
-            uebung = _match_or_create_uebung(ex_name, request.user)
-            if uebung.is_custom and ex_name not in new_exercises:
-                new_exercises.add(ex_name)
-
-            exercise_satz_counter[ex_name] = exercise_satz_counter.get(ex_name, 0) + 1
-            satz_nr = exercise_satz_counter[ex_name]
-
-            try:
-                gewicht = float(row.get("weight_kg") or 0)
-            except ValueError:
-                gewicht = 0.0
-            try:
-                wdh = int(float(row.get("reps") or 0))
-            except ValueError:
-                wdh = 0
-            if wdh == 0:
-                continue  # skip empty rows
-
-            set_type = row.get("set_type", "normal").strip().lower()
-            ist_warmup = set_type in ("warmup", "warm_up", "warm up")
-
-            rpe_raw = row.get("rpe", "").strip()
-            rpe = None
-            if rpe_raw:
-                try:
-                    rpe_val = float(rpe_raw)
-                    if 1.0 <= rpe_val <= 10.0:
-                        rpe = rpe_val
-                except ValueError:
-                    pass
-
-            superset_raw = row.get("superset_id", "").strip()
-            superset_gruppe = 0
-            if superset_raw.startswith("S") and superset_raw[1:].isdigit():
-                superset_gruppe = int(superset_raw[1:])
-
-            Satz.objects.create(
-                einheit=training,
-                uebung=uebung,
-                satz_nr=satz_nr,
-                gewicht=gewicht,
-                wiederholungen=wdh,
-                ist_aufwaermsatz=ist_warmup,
-                rpe=rpe,
-                notiz=row.get("exercise_notes", "").strip() or None,
-                superset_gruppe=superset_gruppe,
-            )
-            set_count += 1
+        name = f"hevy_{uuid.uuid4().hex}.csv"
+        pfad = job_datei_pfad(name)
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        with open(pfad, "wb") as f:
+            for chunk in uploaded_file.chunks():
+                f.write(chunk)
+        job = enqueue("hevy_import", user=request.user, datei=name)
+        return JsonResponse({"success": True, "job_id": job.pk, "status": job.status}, status=202)
 
-        imported_count += 1
+    try:
+        ergebnis = importiere_hevy_csv(uploaded_file, request.user, dry_run=dry_run)
+    except HevyImportFehler as exc:
+        logger.warning("Hevy import rejected: %s", exc)
+        messages.error(request, str(exc))
+        return render(request, "core/hevy_import.html")
 
     if dry_run:
+        _hevy_import_meldungen(request, ergebnis.fehler)
         return render(
             request,
             "core/hevy_import.html",
             {
-                "preview": preview,
-                "preview_count": len(preview),
+                "preview": ergebnis.vorschau,
+                "preview_count": len(ergebnis.vorschau),
                 "dry_run": True,
             },
         )
 
-    if imported_count:
-        msg = f"{imported_count} Training(s) mit {set_count} Sätzen importiert."
-        if new_exercises:
-            msg += f" {len(new_exercises)} neue Übung(en) angelegt: {', '.join(sorted(new_exercises))}."
-        django_messages.success(request, msg)
+    if ergebnis.trainings:
+        msg = f"{ergebnis.trainings} Training(s) mit {ergebnis.saetze} Sätzen importiert."
+        if ergebnis.neue_uebungen:
+            msg += (
+                f" {len(ergebnis.neue_uebungen)} neue Übung(en) angelegt: "
+                f"{', '.join(ergebnis.neue_uebungen)}."
+            )
+        messages.success(request, msg)
     else:
-        django_messages.warning(request, "Keine neuen Trainings importiert.")
-
-    for err in errors:
-        django_messages.warning(request, err)
+        messages.warning(request, "Keine neuen Trainings importiert.")
 
+    _hevy_import_meldungen(request, ergebnis.fehler)
     return redirect("dashboard")
@@ -0,0 +1,60 @@
+"""
+Hintergrund-Job views.
+
+Polling-Endpoint für eingereihte Jobs (Plan-Generierung, ML-Training,
+PDF-Report) und Download von Job-Dateien. Abgearbeitet werden die Jobs von
+``manage.py run_worker``.
+"""
+
+import logging
+import os
+
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, HttpRequest, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods
+
+from ..models import HintergrundJob
+from ..services.hintergrund_jobs import job_status_dict
+from ..services.job_aufgaben import job_datei_pfad
+
+logger = logging.getLogger(__name__)
+
+
+@login_required
+@require_http_methods(["GET"])
+def job_status_api(request: HttpRequest, job_id: int) -> JsonResponse:
+    """
+    Status eines Hintergrund-Jobs (nur eigene Jobs)
+    GET /api/jobs/<job_id>/
+    Returns: { id, typ, status, fortschritt, schritt, ergebnis, fehler, fertig, download_url? }
+    """
+    job = get_object_or_404(HintergrundJob, id=job_id, user=request.user)
+    data = job_status_dict(job)
+    if job.status == "FERTIG" and (job.ergebnis or {}).get("datei"):
+        data["download_url"] = reverse("job_download", args=[job.pk])
+    return JsonResponse(data)
+
+
+@login_required
+@require_http_methods(["GET"])
+def job_download(request: HttpRequest, job_id: int) -> FileResponse:
+    """
+    Download der Ergebnis-Datei eines fertigen Jobs (z.B. PDF-Report)
+    GET /api/jobs/<job_id>/download/
+    """
+    job = get_object_or_404(HintergrundJob, id=job_id, user=request.user, status="FERTIG")
+    ergebnis = job.ergebnis or {}
+    if not ergebnis.get("datei"):
+        raise Http404("Job hat keine Datei")
+    pfad = job_datei_pfad(ergebnis["datei"])
+    if not os.path.exists(pfad):
+        logger.warning("Job-Datei fehlt: %s (Job #%s)", pfad, job.pk)
+        raise Http404("Datei nicht mehr vorhanden")
+    return FileResponse(
+        open(pfad, "rb"),
+        as_attachment=True,
+        filename=ergebnis.get("dateiname") or os.path.basename(pfad),
+        content_type=ergebnis.get("content_type") or "application/octet-stream",
+    )
@@ -8,17 +8,66 @@ generating predictions based on historical training data.
 
 import json
 import logging
+import os
 
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
 from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.http import require_http_methods
 
-from ..models import Uebung
+from ..models import Plan, Trainingseinheit, Uebung
 
 logger = logging.getLogger(__name__)
 
+# Obergrenze für frei übergebene Übungs-IDs in /api/ml/predict-batch/
+ML_BATCH_MAX_UEBUNGEN = 50
+
+
+def _train_ml_models(user, uebung=None) -> tuple[dict, int]:
+    """Trainiert das Modell einer Übung (oder alle Übungen des Users).
+
+    Gemeinsam genutzt vom synchronen Endpoint und vom Hintergrund-Job
+    (``core/services/job_aufgaben.py``).
+
+    Returns:
+        (Antwort-Dict, HTTP-Status)
+    """
+    from ml_coach.ml_trainer import MLTrainer
+
+    if uebung is not None:
+        # Einzelne Übung trainieren
+        trainer = MLTrainer(user, uebung)
+        ml_model, metrics = trainer.train_model()
+
+        if ml_model:
+            return {
+                "success": True,
+                "message": f"Modell für {uebung.bezeichnung} trainiert",
+                "metrics": metrics,
+            }, 200
+        return {
+            "success": False,
+            "message": "Nicht genug Trainingsdaten (mind. 10 Sätze benötigt)",
+        }, 400
+
+    # Alle Übungen trainieren
+    results = MLTrainer.train_all_user_models(user, min_samples=10)
+    return {
+        "success": True,
+        "message": f"{len(results)} Modelle trainiert",
+        "trained_models": [
+            {
+                "uebung": uebung.bezeichnung,
+                "samples": metrics["samples"],
+                "mae": metrics["mae"],
+                "r2_score": metrics["r2_score"],
+            }
+            for uebung, metrics in results
+        ],
+    }, 200
+
 
 @login_required
 @require_http_methods(["POST"])
@@ -26,55 +75,24 @@ def ml_train_model(request: HttpRequest) -> JsonResponse:
     """
     Trainiert ML-Modell für Gewichtsvorhersagen
     POST /api/ml/train/ mit {"uebung_id": 123} oder ohne (alle Übungen)
+    Optional {"async": true} → Hintergrund-Job, Antwort 202 mit job_id
     """
-    from ml_coach.ml_trainer import MLTrainer
-
     try:
         data = json.loads(request.body) if request.body else {}
         uebung_id = data.get("uebung_id")
+        uebung = get_object_or_404(Uebung, id=uebung_id) if uebung_id else None
 
-        if uebung_id:
-            # Einzelne Übung trainieren
-            uebung = get_object_or_404(Uebung, id=uebung_id)
-            trainer = MLTrainer(request.user, uebung)
-            ml_model, metrics = trainer.train_model()
-
-            if ml_model:
-                return JsonResponse(
-                    {
-                        "success": True,
-                        "message": f"Modell für {uebung.bezeichnung} trainiert",
-                        "metrics": metrics,
-                    }
-                )
-            else:
-                return JsonResponse(
-                    {
-                        "success": False,
-                        "message": "Nicht genug Trainingsdaten (mind. 10 Sätze benötigt)",
-                    },
-                    status=400,
-                )
-        else:
-            # Alle Übungen trainieren
-            results = MLTrainer.train_all_user_models(request.user, min_samples=10)
+        if data.get("async"):
+            from core.services.hintergrund_jobs import enqueue
 
+            job = enqueue("ml_training", user=request.user, uebung_id=uebung_id)
             return JsonResponse(
-                {
-                    "success": True,
-                    "message": f"{len(results)} Modelle trainiert",
-                    "trained_models": [
-                        {
-                            "uebung": uebung.bezeichnung,
-                            "samples": metrics["samples"],
-                            "mae": metrics["mae"],
-                            "r2_score": metrics["r2_score"],
-                        }
-                        for uebung, metrics in results
-                    ],
-                }
+                {"success": True, "job_id": job.pk, "status": job.status}, status=202
             )
 
+        payload, status = _train_ml_models(request.user, uebung)
+        return JsonResponse(payload, status=status)
+
     except Exception as e:
         if isinstance(e, Http404):
             raise
@@ -169,6 +187,62 @@ def ml_predict_weight(request: HttpRequest, uebung_id: int) -> JsonResponse:  #
         )
 
 
+@login_required
+@require_http_methods(["POST"])
+def ml_predict_batch(request: HttpRequest) -> JsonResponse:
+    """
+    Vorhersagen für alle Übungen einer Trainingseinheit oder eines Plans
+    POST /api/ml/predict-batch/
+    Body: {"training_id": 1} | {"plan_id": 2} | {"uebung_ids": [3, 4]}
+    """
+    from ml_coach.prediction_service import MLPredictor
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except (TypeError, ValueError):
+        return JsonResponse({"success": False, "message": "Ungültige JSON-Daten"}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"success": False, "message": "Ungültige JSON-Daten"}, status=400)
+
+    plan = None
+    rpe_targets = {}
+    if data.get("training_id") is not None:
+        training = get_object_or_404(Trainingseinheit, id=data["training_id"], user=request.user)
+        uebung_ids = list(training.saetze.values_list("uebung_id", flat=True).distinct())
+        plan = training.plan
+    elif data.get("plan_id") is not None:
+        plan = get_object_or_404(Plan, id=data["plan_id"], user=request.user)
+        uebung_ids = []
+    else:
+        uebung_ids = data.get("uebung_ids")
+        if (
+            not isinstance(uebung_ids, list)
+            or not all(isinstance(uid, int) and not isinstance(uid, bool) for uid in uebung_ids)
+            or len(uebung_ids) > ML_BATCH_MAX_UEBUNGEN
+        ):
+            return JsonResponse(
+                {"success": False, "message": "training_id, plan_id oder uebung_ids erforderlich"},
+                status=400,
+            )
+
+    if plan is not None:
+        for uid, rpe_ziel in plan.uebungen.values_list("uebung_id", "rpe_ziel"):
+            uebung_ids.append(uid)
+            if rpe_ziel is not None:
+                rpe_targets[uid] = rpe_ziel
+
+    try:
+        ergebnisse = MLPredictor.predict_batch(request.user, uebung_ids, rpe_targets=rpe_targets)
+    except Exception as e:
+        logger.error(f"ML Batch Prediction Error: {e}", exc_info=True)
+        return JsonResponse(
+            {"success": False, "message": "Fehler bei Gewichtsvorhersage"}, status=500
+        )
+    return JsonResponse(
+        {"success": True, "predictions": {str(uid): r for uid, r in ergebnisse.items()}}
+    )
+
+
 @login_required
 @require_http_methods(["GET"])
 def ml_model_info(request: HttpRequest, uebung_id: int) -> JsonResponse:
@@ -200,6 +274,18 @@ def ml_model_info(request: HttpRequest, uebung_id: int) -> JsonResponse:
         )
 
 
+@staff_member_required
+@require_http_methods(["GET"])
+def ml_registry_stats(request: HttpRequest) -> JsonResponse:
+    """
+    Hit/Miss/Eviction-Statistik der Model-Registry dieses Worker-Prozesses
+    GET /api/ml/registry-stats/
+    """
+    from ml_coach.model_registry import registry
+
+    return JsonResponse({"success": True, "pid": os.getpid(), "registry": registry.statistik()})
+
+
 @login_required
 @require_http_methods(["GET"])
 def ml_dashboard(request: HttpRequest) -> HttpResponse:
@@ -3,6 +3,10 @@ Offline data synchronization module for HomeGym.
 
 This module handles synchronization of offline-stored training data to the server,
 including set creation and updates with proper validation and access control.
+
+- ``sync_offline_data`` (v1) – verarbeitet jedes Item einzeln (Altclients)
+- ``sync_offline_data_v2`` – Batch mit Idempotenz-Schlüsseln
+  (``core/services/offline_sync.py``)
 """
 
 import json
@@ -17,6 +21,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from ..models import Satz, Trainingseinheit, Uebung
+from ..services.offline_sync import SyncFehler, synchronisiere
 
 logger = logging.getLogger(__name__)
 
@@ -128,3 +133,33 @@ def sync_offline_data(request: HttpRequest) -> JsonResponse:
             {"success": False, "error": "Offline-Daten konnten nicht synchronisiert werden."},
             status=500,
         )
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@login_required
+def sync_offline_data_v2(request: HttpRequest) -> JsonResponse:
+    """Batch-Sync: ``{"items": [...]}`` (oder Array), je Item ``idempotency_key``.
+
+    Wiederholt gesendete Items (gleicher Schlüssel) werden nicht erneut angelegt,
+    sondern liefern das gespeicherte Ergebnis mit ``duplicate: true``.
+    """
+    try:
+        results = synchronisiere(request.user, json.loads(request.body))
+    except json.JSONDecodeError:
+        return JsonResponse({"success": False, "error": "Ungültiges JSON"}, status=400)
+    except SyncFehler as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+    except Exception as e:
+        logger.error(f"Offline data sync (v2) error: {e}", exc_info=True)
+        return JsonResponse(
+            {"success": False, "error": "Offline-Daten konnten nicht synchronisiert werden."},
+            status=500,
+        )
+    return JsonResponse(
+        {
+            "success": True,
+            "results": results,
+            "synced_count": sum(1 for r in results if r["success"]),
+        }
+    )
@@ -19,6 +19,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
 from ..models import MUSKELGRUPPEN, Plan, PlanUebung, Trainingsblock, Uebung, UserProfile
+from ..services.daten_version import erhoehe
 
 logger = logging.getLogger(__name__)
 
@@ -551,6 +552,7 @@ def toggle_group_public(request: HttpRequest, gruppe_id: int) -> HttpResponse:
     new_status = not all_public
 
     plans.update(is_public=new_status)
+    erhoehe(request.user.id, "plaene")  # update() umgeht die Signale
 
     gruppe_name = plans.first().gruppe_name or "Gruppe"
     status = "öffentlich" if new_status else "privat"
@@ -590,6 +592,7 @@ def _ensure_gruppe_id(plan: "Plan") -> str:
     if not plan.gruppe_id:
         new_id = uuid.uuid4()
         Plan.objects.filter(pk=plan.pk).update(gruppe_id=new_id, gruppe_name=plan.name)
+        erhoehe(plan.user_id, "plaene")
         plan.gruppe_id = new_id
         plan.gruppe_name = plan.name
     return str(plan.gruppe_id)
@@ -604,6 +607,7 @@ def _start_new_trainingsblock(request, gruppe_id: str, block_typ: str) -> None:
 
     # Bestehende offene Blöcke schließen
     Trainingsblock.objects.filter(user=request.user, end_datum__isnull=True).update(end_datum=today)
+    erhoehe(request.user.id, "plaene")
 
     # Aktuellen Plan für den neuen Block ermitteln
     plan_obj = Plan.objects.filter(user=request.user, gruppe_id=gruppe_id).first()
@@ -22,8 +22,11 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
+from ..export import pdf_cache
 from ..helpers.volume import calc_volume, effective_weight, get_user_kg
-from ..models import Plan, Satz, Trainingseinheit, Uebung, UserProfile
+from ..models import PersoenlicherRekord, Plan, Satz, Trainingseinheit, Uebung, UserProfile
+from ..services import dashboard_cache
+from ..services.daten_version import erhoehe
 
 logger = logging.getLogger(__name__)
 
@@ -269,6 +272,29 @@ def _get_rpe_adjusted_weights(
     return result
 
 
+def _get_ml_startgewichte(user, plan_uebungen) -> dict[int, float]:
+    """ML-Startgewichte für alle Plan-Übungen mit trainiertem Modell (Batch-Vorhersage).
+
+    Ein Aufruf für die ganze Einheit statt eines Requests je Übung; Übungen
+    ohne Modell fehlen. Fehler im ML-Pfad dürfen den Trainingsstart nie blockieren.
+    """
+    from ml_coach.prediction_service import MLPredictor
+
+    rpe_targets = {pu.uebung_id: pu.rpe_ziel for pu in plan_uebungen if pu.rpe_ziel is not None}
+    try:
+        ergebnisse = MLPredictor.predict_batch(
+            user, [pu.uebung_id for pu in plan_uebungen], rpe_targets=rpe_targets, fallback=False
+        )
+    except Exception as e:
+        logger.warning(f"ML-Startgewichte nicht verfügbar: {e}")
+        return {}
+    return {
+        uid: r["predicted_weight"]
+        for uid, r in ergebnisse.items()
+        if r.get("method") == "ml" and r.get("predicted_weight") is not None
+    }
+
+
 def _create_ghost_saetze(
     training, plan, is_deload: bool, deload_vol_factor: float, deload_weight_factor: float
 ) -> None:
@@ -294,6 +320,7 @@ def _create_ghost_saetze(
         uebung_ids_ghost,
         plan_uebungen_map,
     )
+    ml_startgewichte = _get_ml_startgewichte(training.user, plan_uebungen)
 
     for plan_uebung in plan_uebungen:
         uebung = plan_uebung.uebung
@@ -301,9 +328,12 @@ def _create_ghost_saetze(
         start_gewicht = letzter_satz.gewicht if letzter_satz else 0
         start_wdh = 0
 
-        # Phase 18: RPE-korrigiertes Gewicht verwenden wenn verfügbar
+        # Phase 18: RPE-korrigiertes Gewicht verwenden wenn verfügbar,
+        # sonst ML-Vorhersage (nur Übungen mit trainiertem Modell)
         if uebung.id in rpe_adjusted:
             start_gewicht = rpe_adjusted[uebung.id]["empfohlen_kg"]
+        elif uebung.id in ml_startgewichte:
+            start_gewicht = ml_startgewichte[uebung.id]
 
         ziel_text = plan_uebung.wiederholungen_ziel
         match = re.search(r"\d{1,4}", str(ziel_text)) if ziel_text else None
@@ -690,81 +720,53 @@ def _check_pr(user, uebung, neuer_satz, gewicht_float: float, wdh_int: int) -> s
 
     Phase 14.3: Für KOERPERGEWICHT-Übungen wird das effektive Gewicht
     (inkl. Körpergewicht × Faktor) verwendet statt nur das Zusatzgewicht.
-    Historische Sätze nutzen das Körpergewicht vom jeweiligen Trainingstag.
+    Alle Sätze – auch der neue – nutzen das Körpergewicht vom jeweiligen
+    Trainingstag (früher: neuer Satz mit aktuellem Körpergewicht; unterscheidet
+    sich nur bei nachgetragenen Trainings).
+
+    Liest nur die ``PersoenlicherRekord``-Zeile (konstant, unabhängig von der
+    Historie). Das Satz-Signal hat sie beim Anlegen bereits nachgezogen: Ist
+    ``neuer_satz`` jetzt Rekordhalter, ist er ein PR gegen ``vorheriges_1rm``.
+    Sätze aus Deload-Einheiten zählen nicht in den Rekord und werden nur
+    gegen ihn verglichen.
 
     Returns:
         PR-Meldung (str) oder None wenn kein PR.
     """
-    from core.views.training_stats import _get_koerpergewicht_map, _get_user_koerpergewicht
-
-    # Effektives Gewicht für aktuellen Satz berechnen
-    is_kg = uebung.gewichts_typ == "KOERPERGEWICHT"
-    if is_kg:
-        faktor = getattr(uebung, "koerpergewicht_faktor", 1.0) or 1.0
-        richtung = getattr(uebung, "gewichts_richtung", "ZUSATZ") or "ZUSATZ"
-        user_kg = _get_user_koerpergewicht(user)
-        basis = user_kg * faktor
-        if richtung == "GEGEN":
-            current_eff = max(0.0, basis - gewicht_float)
-        else:
-            current_eff = basis + gewicht_float
-    else:
-        current_eff = gewicht_float
-
-    current_1rm = current_eff * (1 + wdh_int / 30) if current_eff > 0 else 0.0
+    from core.services.persoenliche_rekorde import koerpergewicht_am, pr_1rm
 
-    alte_saetze = (
-        Satz.objects.filter(
-            uebung=uebung,
-            ist_aufwaermsatz=False,
-            einheit__user=user,
-            einheit__ist_deload=False,
+    rekord = PersoenlicherRekord.objects.filter(user=user, uebung=uebung).first()
+    if rekord is not None and rekord.bester_satz_id == neuer_satz.id:
+        current_1rm = rekord.bestes_1rm
+        vorher = rekord.vorheriges_1rm
+    else:
+        einheit = neuer_satz.einheit
+        if not einheit.ist_deload:
+            return None
+        current_1rm = pr_1rm(
+            uebung, gewicht_float, wdh_int, koerpergewicht_am(user.id, uebung, einheit.datum)
         )
-        .exclude(id=neuer_satz.id)
-        .select_related("einheit")
-    )
+        vorher = rekord.bestes_1rm if rekord is not None else None
+        if vorher is not None and current_1rm <= vorher:
+            return None
 
-    if not alte_saetze.exists():
+    if vorher is None:
         Satz.objects.filter(id=neuer_satz.id).update(
             is_pr=True,
             pr_type="first",
             pr_previous_value=None,
         )
+        erhoehe(user.id, "saetze")  # update() umgeht die Signale
         return f"🏆 Erster Rekord gesetzt! {uebung.bezeichnung}: {round(current_1rm, 1)} kg (1RM)"
 
-    # Historische 1RMs berechnen (mit historischem Körpergewicht)
-    if is_kg:
-        hist_dates = list(alte_saetze.values_list("einheit__datum", flat=True).distinct())
-        kg_map = _get_koerpergewicht_map(user, hist_dates)
-
-        def _alt_1rm(s):
-            hist_kg = kg_map.get(s.einheit.datum, user_kg)
-            alt_basis = hist_kg * faktor
-            alt_zusatz = float(s.gewicht)
-            if richtung == "GEGEN":
-                eff = max(0.0, alt_basis - alt_zusatz)
-            else:
-                eff = alt_basis + alt_zusatz
-            return eff * (1 + int(s.wiederholungen) / 30) if eff > 0 else 0.0
-
-        max_alter_1rm = max(_alt_1rm(s) for s in alte_saetze)
-    else:
-        max_alter_1rm = max(
-            float(s.gewicht) * (1 + int(s.wiederholungen) / 30) for s in alte_saetze
-        )
-
-    if current_1rm > max_alter_1rm:
-        diff = round(current_1rm - max_alter_1rm, 1)
-        Satz.objects.filter(id=neuer_satz.id).update(
-            is_pr=True,
-            pr_type="best_1rm",
-            pr_previous_value=round(max_alter_1rm, 2),
-        )
-        return (
-            f"🎉 NEUER REKORD! {uebung.bezeichnung}: {round(current_1rm, 1)} kg (1RM) - +{diff} kg!"
-        )
-
-    return None
+    diff = round(current_1rm - vorher, 1)
+    Satz.objects.filter(id=neuer_satz.id).update(
+        is_pr=True,
+        pr_type="best_1rm",
+        pr_previous_value=round(vorher, 2),
+    )
+    erhoehe(user.id, "saetze")
+    return f"🎉 NEUER REKORD! {uebung.bezeichnung}: {round(current_1rm, 1)} kg (1RM) - +{diff} kg!"
 
 
 @login_required
@@ -924,8 +926,6 @@ def update_set(request: HttpRequest, set_id: int) -> HttpResponse:
 @require_http_methods(["POST"])
 def toggle_deload(request: HttpRequest, training_id: int) -> JsonResponse:
     """Setzt oder entfernt den Deload-Status eines Trainings via AJAX."""
-    from django.core.cache import cache
-
     training = get_object_or_404(Trainingseinheit, id=training_id, user=request.user)
     try:
         data = json.loads(request.body)
@@ -939,13 +939,9 @@ def toggle_deload(request: HttpRequest, training_id: int) -> JsonResponse:
                 status=400,
             )
         training.ist_deload = ist_deload_value
+        # save() erhöht die Daten-Version "einheiten" → neuer Dashboard-Cache-Key
         training.save(update_fields=["ist_deload"])
 
-        # Dashboard-Cache invalidieren (Performance-Warnungen neu berechnen)
-        cache_key = f"dashboard_computed_{request.user.id}"
-        cache.delete(cache_key)
-        logger.info(f"Dashboard cache invalidated for user {request.user.id} after deload toggle")
-
         return JsonResponse({"success": True, "ist_deload": training.ist_deload})
     except json.JSONDecodeError as e:
         logger.warning(f"toggle_deload JSON decode error: {e}")
@@ -1226,6 +1222,10 @@ def finish_training(request: HttpRequest, training_id: int) -> HttpResponse:
 
     if request.method == "POST":
         if _save_training_post(request, training):
+            # Dashboard direkt nach dem Training vorwärmen – der Redirect
+            # landet sonst auf einem Cache-Miss mit voller Neuberechnung.
+            dashboard_cache.aufwaermen_einreihen(request.user.id)
+            pdf_cache.vorrendern_einreihen(request.user.id)
             if "start_next" in request.POST and next_plan:
                 return redirect("training_start_plan", next_plan.id)
             return redirect("dashboard")
@@ -22,8 +22,7 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.cache import cache
-from django.db.models import Avg, Count, Prefetch, Q, Sum
+from django.db.models import Avg, Count, Max, Prefetch, Q
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
@@ -31,7 +30,6 @@ from django.utils import timezone
 from ..helpers.volume import calc_volume, get_user_kg
 from ..models import (
     MUSKELGRUPPEN,
-    CardioEinheit,
     KoerperWerte,
     Plan,
     Satz,
@@ -39,8 +37,13 @@ from ..models import (
     Trainingseinheit,
     TrainingsPause,
     Uebung,
+    UebungTagesStatistik,
     UserProfile,
 )
+from ..services import dashboard_cache
+from ..services.daten_version import gecacht
+from ..services.training_snapshot import UserTrainingSnapshot
+from ..services.uebung_statistik import aktualisiere_koerpergewicht, backfill_falls_leer
 from ..utils.advanced_stats import (
     DELOAD_WEEK_MAJORITY_PCT,
     EFFECTIVE_VOLUME_RPE_MAX,
@@ -58,7 +61,6 @@ from ..utils.plan_helpers import (
 from ..utils.week_classification import (
     build_weekly_volume_overview,
     letzte_iso_wochen_keys,
-    pausen_ausfall_wochen,
     pausen_grenze_keys,
     pausen_im_zeitraum,
 )
@@ -66,9 +68,9 @@ from .body_tracking import _prepare_body_chart_data
 
 logger = logging.getLogger(__name__)
 
-# TTL für gecachte Dashboard-Berechnungen (pro User)
-# Wird invalidiert wenn der User ein neues Training speichert (signals.py)
-DASHBOARD_CACHE_TTL = 300  # 5 Minuten
+# TTL der gecachten Abschnitte von training_stats. Die Keys sind versioniert
+# (signals.py erhöht die Daten-Versionen) → der TTL begrenzt nur den Speicher.
+STATS_ABSCHNITT_TTL = 6 * 3600
 
 # Phase 23.4: Zeitfenster-Konstanten für Fatigue-Index-Komponenten.
 # Ziel: explizit machen, welches Fenster jede Komponente nutzt – und warum es
@@ -104,29 +106,22 @@ def _get_active_trainingsblock(user):
     )
 
 
-def _count_trainings_this_week(user, heute) -> int:
+def _count_trainings_this_week(user, heute, snap=None) -> int:
     """Count training sessions in the current ISO week (Mon–Sun)."""
-    start_woche = _get_week_start(heute)
-    return Trainingseinheit.objects.filter(user=user, datum__gte=start_woche).count()
+    return _snapshot(user, heute, snap).kalender.anzahl_sessions(_iso_week_key(heute))
 
 
-def _session_week_keys(user, seit_datum) -> set[str]:
-    """ISO-Wochen-Keys mit ≥1 abgeschlossener Session seit ``seit_datum``.
+def _snapshot(user, heute, snap=None) -> UserTrainingSnapshot:
+    """Übergebenen Snapshot nutzen oder für Einzelaufrufe einen eigenen anlegen.
 
-    Phase 34.1: Quelle für ``hat_sessions`` in ``pausen_ausfall_wochen`` –
-    nur abgeschlossene Trainings zählen als Trainingswoche (33.x-Lektion).
+    Das Dashboard lädt EINEN ``UserTrainingSnapshot`` und reicht ihn an alle
+    Helfer durch; Einzelaufrufe (Tests, PDF-Fatigue) bekommen einen frischen,
+    der nur die jeweils benötigten Quellen lädt.
     """
-    keys: set[str] = set()
-    daten = Trainingseinheit.objects.filter(
-        user=user, abgeschlossen=True, datum__date__gte=seit_datum
-    ).values_list("datum", flat=True)
-    for dt in daten:
-        iso_year, iso_week, _ = dt.isocalendar()
-        keys.add(f"{iso_year}-W{iso_week:02d}")
-    return keys
+    return snap if snap is not None else UserTrainingSnapshot(user, heute)
 
 
-def _get_week_overview(user, heute) -> list[dict]:
+def _get_week_overview(user, heute, snap=None) -> list[dict]:
     """Gibt Mo–So der aktuellen Woche zurück mit Training-Status.
 
     Jeder Eintrag:
@@ -140,43 +135,26 @@ def _get_week_overview(user, heute) -> list[dict]:
     LABELS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
     woche_start = _get_week_start(heute).date()
     heute_date = heute.date()
-
-    # Alle Trainings dieser Woche auf einmal laden
-    trainings = (
-        Trainingseinheit.objects.filter(
-            user=user,
-            datum__date__gte=woche_start,
-            datum__date__lte=woche_start + timedelta(days=6),
-            abgeschlossen=True,
-        )
-        .order_by("datum")
-        .values("id", "datum")
-    )
-
-    # Datum → training_id mapping (erstes Training des Tages)
-    training_map: dict = {}
-    for t in trainings:
-        d = t["datum"].date()
-        if d not in training_map:
-            training_map[d] = t["id"]
+    kalender = _snapshot(user, heute, snap).kalender
 
     result = []
     for i in range(7):
         day = woche_start + timedelta(days=i)
+        training_id = kalender.erstes_training_am(day)
         result.append(
             {
                 "date": day,
                 "label": LABELS[i],
                 "is_today": day == heute_date,
                 "is_future": day > heute_date,
-                "has_training": day in training_map,
-                "training_id": training_map.get(day),
+                "has_training": training_id is not None,
+                "training_id": training_id,
             }
         )
     return result
 
 
-def _calculate_streak(user, heute) -> int:
+def _calculate_streak(user, heute, snap=None) -> int:
     """Count consecutive weeks with at least one training session.
 
     The current calendar week is treated as neutral: if the user has not yet
@@ -189,62 +167,26 @@ def _calculate_streak(user, heute) -> int:
     un-dokumentierter Gap bricht weiterhin. Eine 1-Tages-Pause (< Mindestdauer)
     bridged nicht (⑨/⑤).
     """
-    grenze = pausen_grenze_keys(
-        TrainingsPause.objects.filter(user=user),
-        heute.date(),
-        letzte_iso_wochen_keys(heute.date(), 53),
-    )
-    streak = 0
-    check_date = heute
-    iterations = 0
-    while iterations <= 52:
-        week_start = _get_week_start(check_date)
-        week_end = week_start + timedelta(days=7)
-        has_training = Trainingseinheit.objects.filter(
-            user=user, datum__gte=week_start, datum__lt=week_end
-        ).exists()
-        if has_training:
-            streak += 1
-        elif iterations == 0:
-            # Laufende Woche neutral – nicht streak-brechend.
-            pass
-        elif _iso_week_key(week_start) in grenze:
-            # Dokumentierte Pause überbrückt die Lücke (neutral, kein Bruch).
-            pass
-        else:
-            break
-        check_date = week_start - timedelta(days=1)
-        iterations += 1
-    return streak
+    return _snapshot(user, heute, snap).kalender.streak()
 
 
-def _get_favoriten(user):
+def _get_favoriten(user, snap=None) -> list[dict]:
     """Return top-3 most-trained exercises (excluding warmup/deload sets)."""
-    return (
-        Satz.objects.filter(einheit__user=user, ist_aufwaermsatz=False, einheit__ist_deload=False)
-        .values("uebung__bezeichnung", "uebung__id")
-        .annotate(anzahl=Count("id"))
-        .order_by("-anzahl")[:3]
-    )
+    return _snapshot(user, timezone.now(), snap).favoriten
 
 
-def _get_rpe_score(user, heute) -> tuple[int, float | None]:
+def _get_rpe_score(user, heute, snap=None) -> tuple[int, float | None]:
     """Compute RPE form score (0-25) and raw avg_rpe for the last 2 weeks.
 
     Zeitfenster: ``FATIGUE_RPE_WINDOW_DAYS`` (14d) – konsistent mit
     ``_get_rpe10_anteil`` und der RPE-Verteilung aus Phase 23.1.
     """
+    snap = _snapshot(user, heute, snap)
     two_weeks_ago = heute - timedelta(days=FATIGUE_RPE_WINDOW_DAYS)
-    recent_saetze = Satz.objects.filter(
-        einheit__datum__gte=two_weeks_ago,
-        einheit__user=user,
-        ist_aufwaermsatz=False,
-        einheit__ist_deload=False,
-        rpe__isnull=False,
-    )
-    if not recent_saetze.exists():
+    rpes = [s.rpe for s in snap.arbeitssaetze(seit=two_weeks_ago) if s.rpe is not None]
+    if not rpes:
         return 0, None
-    avg_rpe = recent_saetze.aggregate(Avg("rpe"))["rpe__avg"]
+    avg_rpe = float(sum(rpes) / len(rpes))
     if not avg_rpe:
         return 0, None
     if 7 <= avg_rpe <= 8:
@@ -262,12 +204,12 @@ def _iso_week_key(d) -> str:
     return f"{iso[0]}-W{iso[1]:02d}"
 
 
-def _pause_blockiert_volumenvergleich(user, heute, fenster_wochen: int = 2) -> bool:
+def _pause_blockiert_volumenvergleich(user, heute, fenster_wochen: int = 2, snap=None) -> bool:
     """§32.4: True, wenn in den letzten ``fenster_wochen`` ISO-Wochen eine
     dokumentierte Pausen-Grenze (≥ Mindestdauer) liegt.
 
     Geteilte Quelle für die Dashboard-Volumen-Vergleichspfade (Fatigue-Spike,
-    Form-Volumen-Trend): konsumiert ``pausen_grenze_keys`` (SoT-Klassifikation),
+    Form-Volumen-Trend): konsumiert ``IsoWochenKalender.ist_pausen_grenze`` (SoT-Klassifikation),
     keine Parallelstruktur. Ein Wochen-zu-Wochen-Volumenvergleich, der eine
     solche Woche berührt, wird unterdrückt (sonst falscher Comeback-Spike).
 
@@ -277,31 +219,24 @@ def _pause_blockiert_volumenvergleich(user, heute, fenster_wochen: int = 2) -> b
     echten aktuellen Spike NICHT unterdrücken (Codex PR #201, P2: Limit pause
     blocking to the compared weeks).
     """
-    pausen = TrainingsPause.objects.filter(user=user)
+    kalender = _snapshot(user, heute, snap).kalender
     fenster = letzte_iso_wochen_keys(heute.date(), fenster_wochen)
-    return bool(pausen_grenze_keys(pausen, heute.date(), fenster))
+    return any(kalender.ist_pausen_grenze(key) for key in fenster)
 
 
-def _get_volume_trend_score(user, heute) -> int:
+def _get_volume_trend_score(user, heute, snap=None) -> int:
     """Compute volume-trend form score (0-20) based on last 4 weeks."""
+    snap = _snapshot(user, heute, snap)
     # §32.4: Nach einer dokumentierten Pause ist der Wochen-zu-Wochen-Trend nicht
     # aussagekräftig (Comeback vs. Vor-Pause überquert die Lücke). Statt einer
     # falschen „Volumen gestiegen/gehalten"-Bewertung (20) → neutral 0.
-    if _pause_blockiert_volumenvergleich(user, heute):
+    if _pause_blockiert_volumenvergleich(user, heute, snap=snap):
         return 0
-    user_kg = get_user_kg(user)
     last_4_weeks = []
     for i in range(4):
         week_start = heute - timedelta(days=heute.isoweekday() - 1 + (i * 7))
         week_end = week_start + timedelta(days=7)
-        saetze = Satz.objects.filter(
-            einheit__datum__gte=week_start,
-            einheit__datum__lt=week_end,
-            ist_aufwaermsatz=False,
-            einheit__user=user,
-            einheit__ist_deload=False,
-        ).select_related("uebung")
-        vol = calc_volume(saetze, user_kg)
+        vol = calc_volume(snap.arbeitssaetze(seit=week_start, bis=week_end), snap.user_kg)
         if vol:
             last_4_weeks.append(vol)
     if len(last_4_weeks) < 2:
@@ -314,16 +249,17 @@ def _get_volume_trend_score(user, heute) -> int:
 
 
 def _calculate_form_index(
-    user, heute, trainings_diese_woche: int, streak: int, gesamt_trainings: int
+    user, heute, trainings_diese_woche: int, streak: int, gesamt_trainings: int, snap=None
 ) -> tuple[int, str, str, list]:
     """Return (form_index, form_rating, form_color, form_factors)."""
     if gesamt_trainings < 4:
         return 0, "Nicht verfügbar", "secondary", []
 
+    snap = _snapshot(user, heute, snap)
     freq_score = min(trainings_diese_woche * 7.5, 30)
     streak_score = min(streak * 2.5, 25)
-    rpe_score, _ = _get_rpe_score(user, heute)
-    volume_score = _get_volume_trend_score(user, heute)
+    rpe_score, _ = _get_rpe_score(user, heute, snap=snap)
+    volume_score = _get_volume_trend_score(user, heute, snap=snap)
 
     form_factors = [
         ("Trainingsfrequenz", round(freq_score, 1)),
@@ -344,7 +280,7 @@ def _calculate_form_index(
     return form_index, "Ausbaufähig", "danger", form_factors
 
 
-def _calculate_weekly_volumes(user, heute, active_block=None) -> list[dict]:
+def _calculate_weekly_volumes(user, heute, active_block=None, snap=None) -> list[dict]:
     """Return volume data for the last 4 weeks.
 
     Ergänzt jede Woche um:
@@ -353,28 +289,19 @@ def _calculate_weekly_volumes(user, heute, active_block=None) -> list[dict]:
     - ``before_block``: True wenn diese Woche vor dem aktuellen Block-Start liegt
       → Volumen-Warnungen werden für solche Wochen deaktiviert
     """
+    snap = _snapshot(user, heute, snap)
     block_start_date = active_block.start_datum if active_block else None
 
     # §32.4/§9.2 (㉔): Pausen-Grenzen (≥ Mindestdauer) der betrachteten Wochen –
     # markiert die Dashboard-Karte sonst unbeschriftete Null-Wochen als Lücke.
     woche_keys = [_iso_week_key(_get_week_start(heute - timedelta(days=i * 7))) for i in range(4)]
-    pause_grenze_keys = pausen_grenze_keys(
-        TrainingsPause.objects.filter(user=user), heute.date(), woche_keys
-    )
+    pause_grenze_keys = {k for k in woche_keys if snap.kalender.ist_pausen_grenze(k)}
 
     weekly_volumes = []
     for i in range(4):
         week_start = _get_week_start(heute - timedelta(days=i * 7))
         week_end = week_start + timedelta(days=7)
-        week_saetze = list(
-            Satz.objects.filter(
-                einheit__user=user,
-                einheit__datum__gte=week_start,
-                einheit__datum__lt=week_end,
-                ist_aufwaermsatz=False,
-                einheit__ist_deload=False,
-            ).only("gewicht", "wiederholungen")
-        )
+        week_saetze = snap.arbeitssaetze(seit=week_start, bis=week_end)
 
         # Volumen (Tonnage): Gewicht × Wdh
         week_total = sum(
@@ -394,12 +321,7 @@ def _calculate_weekly_volumes(user, heute, active_block=None) -> list[dict]:
         avg_1rm = round(sum(est_1rms) / len(est_1rms), 1) if est_1rms else 0
 
         # Prüfen ob es in dieser Woche Deload-Trainings gab
-        hat_deload = Trainingseinheit.objects.filter(
-            user=user,
-            datum__gte=week_start,
-            datum__lt=week_end,
-            ist_deload=True,
-        ).exists()
+        hat_deload = any(t.ist_deload for t in snap.trainings_im_zeitraum(week_start, week_end))
 
         # Liegt diese Woche vor dem aktuellen Block-Start?
         before_block = bool(block_start_date and week_start.date() < block_start_date)
@@ -455,17 +377,28 @@ def _get_volume_spike_fatigue(
     return 0, []
 
 
-def _get_rpe_fatigue(user, heute) -> tuple[int, list[str]]:
+def _get_rpe_fatigue(user, heute, snap=None) -> tuple[int, list[str]]:
     """Return (points, warnings) based on RPE-10 distribution and avg RPE.
 
     Primary factor: RPE-10 percentage (via _get_rpe10_anteil).
     Secondary factor: average RPE (kept for cases where RPE-10 is low but
     overall intensity is high).  Result = max(primary, secondary).
     """
+    snap = _snapshot(user, heute, snap)
+    anteil = _get_rpe10_anteil(user, heute, snap=snap)
+    _, avg_rpe = _get_rpe_score(user, heute, snap=snap)
+    return _rpe_fatigue_punkte(anteil, avg_rpe)
+
+
+def _rpe_fatigue_punkte(anteil: float | None, avg_rpe: float | None) -> tuple[int, list[str]]:
+    """Punkte/Warnungen aus RPE-10-Anteil (%) und Ø-RPE – ohne DB-Zugriff.
+
+    Getrennt von ``_get_rpe_fatigue``, damit der PDF-Export die beiden Werte
+    aus bereits geladenen Satz-Spalten liefern kann (``calculate_fatigue_index``).
+    """
     warnings: list[str] = []
 
     # Primary: RPE-10 distribution
-    anteil = _get_rpe10_anteil(user, heute)
     if anteil is not None and anteil > 20:
         primary = 50
         warnings.append(f"Sehr hoher RPE-10-Anteil ({anteil}%)")
@@ -478,7 +411,6 @@ def _get_rpe_fatigue(user, heute) -> tuple[int, list[str]]:
         primary = 0
 
     # Secondary: average RPE
-    _, avg_rpe = _get_rpe_score(user, heute)
     if avg_rpe and avg_rpe > 8.5:
         secondary = 30
         warnings.append("Sehr hohe Trainingsintensität")
@@ -491,16 +423,15 @@ def _get_rpe_fatigue(user, heute) -> tuple[int, list[str]]:
     return max(primary, secondary), warnings
 
 
-def _get_frequency_fatigue(user, heute) -> tuple[int, list[str]]:
+def _get_frequency_fatigue(user, heute, snap=None) -> tuple[int, list[str]]:
     """Return (points, warnings) based on training frequency in the last 7 days.
 
     Zeitfenster: ``FATIGUE_FREQUENCY_WINDOW_DAYS`` (7d, akute Last).
     Bewusst nicht 14d wie die RPE-Komponente – die Schwellen ("≥6 Trainings"
     = "sehr viel") gelten pro Woche, nicht pro Zwei-Wochen-Block.
     """
-    count = Trainingseinheit.objects.filter(
-        user=user, datum__gte=heute - timedelta(days=FATIGUE_FREQUENCY_WINDOW_DAYS)
-    ).count()
+    snap = _snapshot(user, heute, snap)
+    count = len(snap.trainings_im_zeitraum(heute - timedelta(days=FATIGUE_FREQUENCY_WINDOW_DAYS)))
     if count >= 6:
         return 30, ["Sehr hohe Trainingsfrequenz"]
     if count >= 5:
@@ -508,33 +439,34 @@ def _get_frequency_fatigue(user, heute) -> tuple[int, list[str]]:
     return 0, []
 
 
-def _get_cardio_fatigue(user, heute) -> tuple[int, list[str], int, int]:
+def _get_cardio_fatigue(user, heute, snap=None) -> tuple[int, list[str], int, int]:
     """Return (points, warnings, session_count, total_minutes) from cardio last 7 days.
 
     Zeitfenster: ``FATIGUE_CARDIO_WINDOW_DAYS`` (7d). Cardio wirkt akut,
     Recovery-Bedarf ist innerhalb der Woche relevant.
     """
-    sessions = CardioEinheit.objects.filter(
-        user=user, datum__gte=heute - timedelta(days=FATIGUE_CARDIO_WINDOW_DAYS)
-    )
+    # CardioEinheit.datum ist ein DateField → Vergleich auf Kalendertag (UTC).
+    seit = (heute - timedelta(days=FATIGUE_CARDIO_WINDOW_DAYS)).date()
+    sessions = [c for c in _snapshot(user, heute, snap).cardio if c.datum >= seit]
     total = sum(c.ermuedungs_punkte for c in sessions)
+    minuten = sum(c.dauer_minuten for c in sessions)
     if total >= 120:
         return (
             20,
             [f"Hohes Cardio-Volumen ({total:.0f} Punkte)"],
-            sessions.count(),
-            sum(c.dauer_minuten for c in sessions),
+            len(sessions),
+            minuten,
         )
     if total >= 60:
         return (
             10,
             [f"Moderates Cardio-Volumen ({total:.0f} Punkte)"],
-            sessions.count(),
-            sum(c.dauer_minuten for c in sessions),
+            len(sessions),
+            minuten,
         )
     if total >= 30:
-        return 5, [], sessions.count(), sum(c.dauer_minuten for c in sessions)
-    return 0, [], sessions.count(), sum(c.dauer_minuten for c in sessions)
+        return 5, [], len(sessions), minuten
+    return 0, [], len(sessions), minuten
 
 
 def _get_fatigue_rating(fatigue_index: int) -> tuple[str, str, str]:
@@ -561,6 +493,7 @@ def _calculate_fatigue_index(
     weekly_volumes: list[dict],
     gesamt_trainings: int,
     block_age_weeks: int | None = None,
+    snap=None,
 ) -> dict:
     """Compute fatigue index and related display data. Returns a dict.
 
@@ -576,6 +509,7 @@ def _calculate_fatigue_index(
     sind. RPE-Komponente ist 14d, damit Index und RPE-Verteilungs-Anzeige (Phase 23.1,
     4-Wochen-Karte primär) nicht widersprüchlich wirken.
     """
+    snap = _snapshot(user, heute, snap)
     fatigue_index = 0
     fatigue_warnings: list[str] = []
 
@@ -583,17 +517,19 @@ def _calculate_fatigue_index(
         spike_pts, spike_warns = _get_volume_spike_fatigue(weekly_volumes, block_age_weeks)
         # §32.4 (⑧): Comeback-Volumen-Spike nach dokumentierter Pause unterdrücken,
         # damit der Wiedereinstieg keine falsche „Volumen-Anstieg"-Ermüdung erzeugt.
-        if _pause_blockiert_volumenvergleich(user, heute):
+        if _pause_blockiert_volumenvergleich(user, heute, snap=snap):
             spike_pts, spike_warns = 0, []
         for pts, warns in [
             (spike_pts, spike_warns),
-            _get_rpe_fatigue(user, heute),
-            _get_frequency_fatigue(user, heute),
+            _get_rpe_fatigue(user, heute, snap=snap),
+            _get_frequency_fatigue(user, heute, snap=snap),
         ]:
             fatigue_index += pts
             fatigue_warnings.extend(warns)
 
-    cardio_pts, cardio_warns, cardio_count, cardio_mins = _get_cardio_fatigue(user, heute)
+    cardio_pts, cardio_warns, cardio_count, cardio_mins = _get_cardio_fatigue(
+        user, heute, snap=snap
+    )
     fatigue_index += cardio_pts
     fatigue_warnings.extend(cardio_warns)
 
@@ -687,15 +623,16 @@ def _get_smart_motivation_quote(user, next_plan, fallback: str) -> str:
     return f"Letztes Mal: {uebung} {gewicht} kg × {wdh} – heute PR-Versuch? 💪"
 
 
-def _get_training_heatmap(user, heute) -> str:
+def _get_training_heatmap(user, heute, snap=None) -> str:
     """Return JSON string of training counts per day for the last 365 days.
 
     Each entry has the format {"count": int, "deload": bool}.
     """
     start_date = heute - timedelta(days=364)
-    trainings = Trainingseinheit.objects.filter(user=user, datum__gte=start_date)
+    trainings = _snapshot(user, heute, snap).trainings_im_zeitraum(start_date)
     heatmap: dict[str, dict] = {}
-    for t in trainings:
+    # Neueste zuerst – Schlüsselreihenfolge wie bisher (Model-Ordering "-datum")
+    for t in reversed(trainings):
         key = t.datum.date().strftime("%Y-%m-%d") if hasattr(t.datum, "date") else str(t.datum)
         if key not in heatmap:
             heatmap[key] = {"count": 0, "deload": False}
@@ -705,7 +642,7 @@ def _get_training_heatmap(user, heute) -> str:
     return json.dumps(heatmap)
 
 
-def _check_plateau_warnings(user, heute, favoriten) -> list[dict]:
+def _check_plateau_warnings(user, heute, favoriten, snap=None) -> list[dict]:
     """Check for plateaus (no progress in top exercises over 4 weeks).
 
     Vergleicht das geschätzte 1RM (Epley-Formel) der letzten 2 Wochen mit
@@ -716,15 +653,16 @@ def _check_plateau_warnings(user, heute, favoriten) -> list[dict]:
     Konsolidierung (kein Plateau). Nur bei stagnierendem/steigendem RPE
     wird ein echtes Plateau gemeldet.
     """
+    snap = _snapshot(user, heute, snap)
     warnings = []
     four_weeks_ago = heute - timedelta(days=28)
     two_weeks_ago = heute - timedelta(days=14)
 
-    def _epley_max(qs):
+    def _epley_max(saetze):
         best = 0.0
-        for gewicht, wdh in qs.values_list("gewicht", "wiederholungen"):
-            reps = wdh or 1
-            est = float(gewicht) * (1 + reps / 30.0)
+        for s in saetze:
+            reps = s.wiederholungen or 1
+            est = float(s.gewicht) * (1 + reps / 30.0)
             if est > best:
                 best = est
         return best
@@ -732,38 +670,22 @@ def _check_plateau_warnings(user, heute, favoriten) -> list[dict]:
     for fav in favoriten[:3]:
         uebung_id = fav["uebung__id"]
         uebung_name = fav["uebung__bezeichnung"]
-        base_filter = dict(
-            einheit__user=user,
-            uebung_id=uebung_id,
-            ist_aufwaermsatz=False,
-            einheit__ist_deload=False,
-            gewicht__isnull=False,
-        )
-        recent_1rm = _epley_max(
-            Satz.objects.filter(**base_filter, einheit__datum__gte=two_weeks_ago)
-        )
-        older_1rm = _epley_max(
-            Satz.objects.filter(
-                **base_filter,
-                einheit__datum__gte=four_weeks_ago,
-                einheit__datum__lt=two_weeks_ago,
-            )
-        )
+        recent = [
+            s
+            for s in snap.arbeitssaetze(seit=two_weeks_ago)
+            if s.uebung_id == uebung_id and s.gewicht is not None
+        ]
+        older = [
+            s
+            for s in snap.arbeitssaetze(seit=four_weeks_ago, bis=two_weeks_ago)
+            if s.uebung_id == uebung_id and s.gewicht is not None
+        ]
+        recent_1rm = _epley_max(recent)
+        older_1rm = _epley_max(older)
         if older_1rm > 0 and recent_1rm > 0 and recent_1rm <= older_1rm:
             # RPE-Trend prüfen: sinkender RPE = Konsolidierung, kein Plateau
-            older_rpes = list(
-                Satz.objects.filter(
-                    **base_filter,
-                    einheit__datum__gte=four_weeks_ago,
-                    einheit__datum__lt=two_weeks_ago,
-                    rpe__isnull=False,
-                ).values_list("rpe", flat=True)
-            )
-            recent_rpes = list(
-                Satz.objects.filter(
-                    **base_filter, einheit__datum__gte=two_weeks_ago, rpe__isnull=False
-                ).values_list("rpe", flat=True)
-            )
+            older_rpes = [s.rpe for s in older if s.rpe is not None]
+            recent_rpes = [s.rpe for s in recent if s.rpe is not None]
             if older_rpes and recent_rpes:
                 avg_older = sum(float(r) for r in older_rpes) / len(older_rpes)
                 avg_recent = sum(float(r) for r in recent_rpes) / len(recent_rpes)
@@ -785,53 +707,47 @@ def _check_plateau_warnings(user, heute, favoriten) -> list[dict]:
     return warnings
 
 
-def _check_regression_warnings(user, heute) -> list[dict]:
+def _check_regression_warnings(user, heute, snap=None) -> list[dict]:
     """Check for performance regressions (>15% weight drop) in recent exercises."""
+    snap = _snapshot(user, heute, snap)
     warnings = []
     two_weeks_ago = heute - timedelta(days=14)
-    recent_exercises = (
-        Satz.objects.filter(
-            einheit__user=user,
-            einheit__datum__gte=two_weeks_ago,
-            ist_aufwaermsatz=False,
-            einheit__ist_deload=False,
-        )
-        .values("uebung__bezeichnung", "uebung_id")
-        .annotate(avg_gewicht=Avg("gewicht"))
-        .filter(avg_gewicht__isnull=False)
+
+    def _gewichte_je_uebung(saetze) -> dict:
+        gruppen: dict = {}
+        for s in saetze:
+            eintrag = gruppen.setdefault(s.uebung_id, (s.uebung.bezeichnung, []))
+            if s.gewicht is not None:
+                eintrag[1].append(s.gewicht)
+        return gruppen
+
+    recent_exercises = _gewichte_je_uebung(snap.arbeitssaetze(seit=two_weeks_ago))
+    previous_exercises = _gewichte_je_uebung(
+        snap.arbeitssaetze(seit=heute - timedelta(days=28), bis=two_weeks_ago)
     )
-    for ex in recent_exercises:
-        current_avg = float(ex["avg_gewicht"])
-        previous_avg = float(
-            Satz.objects.filter(
-                einheit__user=user,
-                uebung_id=ex["uebung_id"],
-                ist_aufwaermsatz=False,
-                einheit__ist_deload=False,
-                einheit__datum__gte=heute - timedelta(days=28),
-                einheit__datum__lt=two_weeks_ago,
-            ).aggregate(Avg("gewicht"))["gewicht__avg"]
-            or 0
-        )
+    recent_trainings = [
+        t for t in reversed(snap.trainings_im_zeitraum(two_weeks_ago)) if not t.ist_deload
+    ]
+    for uebung_id, (bezeichnung, gewichte) in recent_exercises.items():
+        if not gewichte:
+            continue
+        current_avg = float(sum(gewichte) / len(gewichte))
+        previous = previous_exercises.get(uebung_id, ("", []))[1]
+        previous_avg = float(sum(previous) / len(previous)) if previous else 0.0
         if previous_avg > 0 and current_avg < previous_avg * 0.85:
             drop_percent = round(((previous_avg - current_avg) / previous_avg) * 100)
             # Finde betroffene Trainings (nicht als Deload markiert, aber mit Regression)
-            affected_trainings = list(
-                Trainingseinheit.objects.filter(
-                    user=user,
-                    datum__gte=two_weeks_ago,
-                    ist_deload=False,
-                    saetze__uebung_id=ex["uebung_id"],
-                    saetze__ist_aufwaermsatz=False,
-                )
-                .distinct()
-                .values_list("id", flat=True)[:5]
-            )
+            betroffen = {
+                s.einheit_id
+                for s in snap.arbeitssaetze(seit=two_weeks_ago)
+                if s.uebung_id == uebung_id
+            }
+            affected_trainings = [t.id for t in recent_trainings if t.id in betroffen][:5]
             warnings.append(
                 {
                     "type": "regression",
                     "severity": "danger",
-                    "exercise": ex["uebung__bezeichnung"],
+                    "exercise": bezeichnung,
                     "message": f"Leistungsabfall von {drop_percent}%",
                     "suggestion": "Prüfe Regeneration und Schlaf. Erwäge eine Deload-Woche.",
                     "icon": "bi-arrow-down-circle",
@@ -842,39 +758,24 @@ def _check_regression_warnings(user, heute) -> list[dict]:
     return warnings
 
 
-def _check_stagnation_warnings(user, heute) -> list[dict]:
+def _check_stagnation_warnings(user, heute, snap=None) -> list[dict]:
     """Check for muscle groups not trained in the last 14 days."""
+    snap = _snapshot(user, heute, snap)
     warnings = []
     all_muscle_groups = dict(MUSKELGRUPPEN)
-    trained_recently = set(
-        Satz.objects.filter(
-            einheit__user=user,
-            einheit__datum__gte=heute - timedelta(days=14),
-            ist_aufwaermsatz=False,
-            einheit__ist_deload=False,
-        ).values_list("uebung__muskelgruppe", flat=True)
-    )
-    user_muscle_groups = set(
-        Uebung.objects.filter(Q(is_custom=False) | Q(created_by=user)).values_list(
-            "muskelgruppe", flat=True
-        )
-    )
-    for mg in user_muscle_groups:
+    trained_recently = {
+        s.uebung.muskelgruppe for s in snap.arbeitssaetze(seit=heute - timedelta(days=14))
+    }
+    # Letzte Einheit je Muskelgruppe kommt aus dem All-Time-Aggregat des Snapshots
+    # (kann älter sein als der geladene Sessions-Zeitraum).
+    zuletzt = snap.letztes_training_je_muskelgruppe
+    for mg in snap.muskelgruppen_katalog:
         if mg in trained_recently:
             continue
-        last_training = (
-            Satz.objects.filter(
-                einheit__user=user,
-                uebung__muskelgruppe=mg,
-                ist_aufwaermsatz=False,
-                einheit__ist_deload=False,
-            )
-            .order_by("-einheit__datum")
-            .first()
-        )
-        if not last_training:
+        last_datum = zuletzt.get(mg)
+        if not last_datum:
             continue
-        days_ago = (heute.date() - last_training.einheit.datum.date()).days
+        days_ago = (heute.date() - last_datum.date()).days
         if days_ago >= 14:
             warnings.append(
                 {
@@ -894,24 +795,16 @@ _PUSH_MUSCLES = {"BRUST", "TRIZEPS", "SCHULTER_VORN", "SCHULTER_SEIT"}
 _PULL_MUSCLES = {"RUECKEN_LAT", "RUECKEN_TRAPEZ", "BIZEPS", "SCHULTER_HINT"}
 
 
-def _check_balance_warnings(user, heute) -> list[dict]:
+def _check_balance_warnings(user, heute, snap=None) -> list[dict]:
     """Check for push/pull imbalance over the last 14 days.
 
     Vergleicht Arbeitssätze in Push- vs. Pull-Muskelgruppen.
     Warnt wenn das Verhältnis > 2.5:1 oder < 1:2.5 ist.
     """
     two_weeks_ago = heute - timedelta(days=14)
-    muscle_counts = (
-        Satz.objects.filter(
-            einheit__user=user,
-            einheit__datum__gte=two_weeks_ago,
-            ist_aufwaermsatz=False,
-            einheit__ist_deload=False,
-        )
-        .values("uebung__muskelgruppe")
-        .annotate(count=Count("id"))
-    )
-    counts = {r["uebung__muskelgruppe"]: r["count"] for r in muscle_counts}
+    counts: dict[str, int] = defaultdict(int)
+    for s in _snapshot(user, heute, snap).arbeitssaetze(seit=two_weeks_ago):
+        counts[s.uebung.muskelgruppe] += 1
     push = sum(counts.get(mg, 0) for mg in _PUSH_MUSCLES)
     pull = sum(counts.get(mg, 0) for mg in _PULL_MUSCLES)
 
@@ -946,26 +839,24 @@ def _check_balance_warnings(user, heute) -> list[dict]:
     return []
 
 
-def _get_rpe10_anteil(user, heute) -> float | None:
+def _get_rpe10_anteil(user, heute, snap=None) -> float | None:
     """Return RPE-10 percentage over the last 14 days (work sets only), or None."""
     two_weeks_ago = heute - timedelta(days=14)
-    base = Satz.objects.filter(
-        einheit__user=user,
-        einheit__datum__gte=two_weeks_ago,
-        ist_aufwaermsatz=False,
-        einheit__ist_deload=False,
-        rpe__isnull=False,
-    )
-    gesamt = base.count()
+    rpes = [
+        s.rpe
+        for s in _snapshot(user, heute, snap).arbeitssaetze(seit=two_weeks_ago)
+        if s.rpe is not None
+    ]
+    gesamt = len(rpes)
     if gesamt == 0:
         return None
-    rpe10_count = base.filter(rpe=10).count()
+    rpe10_count = sum(1 for r in rpes if r == 10)
     return round((rpe10_count / gesamt) * 100, 1)
 
 
-def _check_rpe10_warning(user, heute) -> list[dict]:
+def _check_rpe10_warning(user, heute, snap=None) -> list[dict]:
     """Warn if >15% of work sets in the last 14 days were RPE 10."""
-    anteil = _get_rpe10_anteil(user, heute)
+    anteil = _get_rpe10_anteil(user, heute, snap=snap)
     if anteil is not None and anteil > 15:
         return [
             {
@@ -987,7 +878,7 @@ def _check_rpe10_warning(user, heute) -> list[dict]:
     return []
 
 
-def _get_session_rpe_trend(user, num_sessions: int = 12) -> dict:
+def _get_session_rpe_trend(user, num_sessions: int = 12, snap=None) -> dict:
     """Phase 19: Berechnet Session-RPE-Trend für die letzten N Sessions.
 
     Aggregiert den gewichteten Durchschnitts-RPE (nach Sätzen) pro Session.
@@ -1001,30 +892,26 @@ def _get_session_rpe_trend(user, num_sessions: int = 12) -> dict:
             "current_avg": float | None,
         }
     """
-    # Letzte N abgeschlossene Sessions mit RPE-Daten
-    sessions_qs = Trainingseinheit.objects.filter(
-        user=user,
-        abgeschlossen=True,
-    ).order_by(
-        "-datum"
-    )[:num_sessions]
+    # Letzte N abgeschlossene Sessions mit RPE-Daten. Der Snapshot enthält die
+    # letzten ``SESSION_TREND_MAX`` abgeschlossenen Sessions unabhängig vom Alter.
+    snap = _snapshot(user, timezone.now(), snap)
+    sessions = [t for t in reversed(snap.trainings) if t.abgeschlossen][:num_sessions]
+    rpes_je_einheit: dict[int, list] = defaultdict(list)
+    for s in snap.saetze:
+        if not s.ist_aufwaermsatz and s.rpe is not None:
+            rpes_je_einheit[s.einheit_id].append(s.rpe)
 
     session_data = []
-    for session in sessions_qs:
-        rpe_agg = Satz.objects.filter(
-            einheit=session,
-            ist_aufwaermsatz=False,
-            rpe__isnull=False,
-        ).aggregate(avg_rpe=Avg("rpe"), count=Sum(1))
-
-        if rpe_agg["avg_rpe"] is not None and rpe_agg["count"] and rpe_agg["count"] >= 2:
+    for session in sessions:
+        rpes = rpes_je_einheit.get(session.id, [])
+        if len(rpes) >= 2:
             session_data.append(
                 {
                     "date": (
                         session.datum.date() if hasattr(session.datum, "date") else session.datum
                     ),
                     "date_str": session.datum.strftime("%d.%m"),
-                    "avg_rpe": round(float(rpe_agg["avg_rpe"]), 1),
+                    "avg_rpe": round(float(sum(rpes) / len(rpes)), 1),
                     "session_id": session.id,
                 }
             )
@@ -1078,9 +965,9 @@ def _get_session_rpe_trend(user, num_sessions: int = 12) -> dict:
     }
 
 
-def _check_session_rpe_trend_warning(user, heute) -> list[dict]:
+def _check_session_rpe_trend_warning(user, heute, snap=None) -> list[dict]:
     """Phase 19.3: Warnt wenn Session-RPE über 3+ Sessions steigend und > 8.5."""
-    trend_data = _get_session_rpe_trend(user, num_sessions=8)
+    trend_data = _get_session_rpe_trend(user, num_sessions=8, snap=snap)
 
     if trend_data["trend"] != "rising" or trend_data["current_avg"] is None:
         return []
@@ -1116,7 +1003,7 @@ def _check_session_rpe_trend_warning(user, heute) -> list[dict]:
     ]
 
 
-def _get_weakness_progress(user, active_block) -> list[dict]:
+def _get_weakness_progress(user, active_block, snap=None) -> list[dict]:
     """Berechne laufenden Fortschritt pro Schwachstelle aus dem Block-Snapshot.
 
     Für jede Muskelgruppe im Snapshot: aktuelle Arbeitssätze im laufenden
@@ -1134,18 +1021,10 @@ def _get_weakness_progress(user, active_block) -> list[dict]:
 
     snapshot = active_block.schwachstellen_snapshot
     # Aktuelle Arbeitssätze pro Muskelgruppe (letzte 30 Tage)
-    seit = timezone.now() - timedelta(days=30)
-    mg_counts = dict(
-        Satz.objects.filter(
-            einheit__user=user,
-            einheit__datum__gte=seit,
-            ist_aufwaermsatz=False,
-            einheit__ist_deload=False,
-        )
-        .values_list("uebung__muskelgruppe")
-        .annotate(count=Count("id"))
-        .values_list("uebung__muskelgruppe", "count")
-    )
+    snap = _snapshot(user, timezone.now(), snap)
+    mg_counts: dict[str, int] = defaultdict(int)
+    for s in snap.arbeitssaetze(seit=snap.heute - timedelta(days=30)):
+        mg_counts[s.uebung.muskelgruppe] += 1
 
     result = []
     for entry in snapshot:
@@ -1231,17 +1110,20 @@ def get_weakness_comparison(user) -> list[dict]:
     return result
 
 
-def _get_performance_warnings(user, heute, favoriten, gesamt_trainings: int) -> list[dict]:
+def _get_performance_warnings(
+    user, heute, favoriten, gesamt_trainings: int, snap=None
+) -> list[dict]:
     """Aggregate performance warnings (plateau, regression, stagnation, balance, rpe10, rpe_trend), max 3."""
     if gesamt_trainings < 4:
         return []
+    snap = _snapshot(user, heute, snap)
     all_warnings = (
-        _check_rpe10_warning(user, heute)
-        + _check_session_rpe_trend_warning(user, heute)
-        + _check_plateau_warnings(user, heute, favoriten)
-        + _check_regression_warnings(user, heute)
-        + _check_balance_warnings(user, heute)
-        + _check_stagnation_warnings(user, heute)
+        _check_rpe10_warning(user, heute, snap=snap)
+        + _check_session_rpe_trend_warning(user, heute, snap=snap)
+        + _check_plateau_warnings(user, heute, favoriten, snap=snap)
+        + _check_regression_warnings(user, heute, snap=snap)
+        + _check_balance_warnings(user, heute, snap=snap)
+        + _check_stagnation_warnings(user, heute, snap=snap)
     )
     priority = {
         "rpe10": 0,
@@ -1337,90 +1219,98 @@ def _add_plan_group_context(user, context: dict) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _compute_dashboard_block(user, heute, snap=None) -> dict:
+    """Teurer, cachebarer Dashboard-Block (Streak, Volumen, Fatigue, Warnungen …).
+
+    Aufgerufen vom Dashboard (Cache-Miss) und vom Vorwärm-Job
+    (``core/services/dashboard_cache.py``).
+    """
+    # Ein Snapshot für alle Helfer: feste, kleine Query-Anzahl statt 60+.
+    snap = _snapshot(user, heute, snap)
+    trainings_diese_woche = _count_trainings_this_week(user, heute, snap=snap)
+    streak = _calculate_streak(user, heute, snap=snap)
+    favoriten = _get_favoriten(user, snap=snap)
+    gesamt_trainings = snap.gesamt_trainings
+    gesamt_saetze = snap.gesamt_saetze
+    form_index, form_rating, form_color, form_factors = _calculate_form_index(
+        user, heute, trainings_diese_woche, streak, gesamt_trainings, snap=snap
+    )
+    active_block = snap.active_block
+    block_age_weeks = active_block.weeks_since_start if active_block else None
+    # Phase 34.1: Netto-Blockdauer = Brutto minus voll pausen-abgedeckte
+    # ISO-Wochen ohne abgeschlossene Session (Abdeckungs-Semantik, SoT aus
+    # week_classification). Liegt im Cache-Block – Pausen-CRUD erhöht die
+    # Daten-Version "pausen" im Cache-Key (signals.py).
+    block_pausen_wochen = 0
+    if active_block is not None:
+        block_pausen_wochen = snap.kalender_seit(active_block.start_datum).ausfall_wochen(
+            active_block.start_datum
+        )
+    block_netto_weeks = (
+        max(0, block_age_weeks - block_pausen_wochen) if block_age_weeks is not None else None
+    )
+    weekly_volumes = _calculate_weekly_volumes(user, heute, active_block, snap=snap)
+    # Phase 34.2: Fatigue-Gate („Block < 3 Wochen → keine Volumen-Warnung")
+    # auf Netto – sonst beendet eine Pause im jungen Block das Schutzfenster
+    # zu früh.
+    fatigue_data = _calculate_fatigue_index(
+        user, heute, weekly_volumes, gesamt_trainings, block_netto_weeks, snap=snap
+    )
+    motivation_quote = _get_motivation_quote(form_index, fatigue_data["fatigue_index"])
+    training_heatmap_json = _get_training_heatmap(user, heute, snap=snap)
+    performance_warnings = _get_performance_warnings(
+        user, heute, favoriten, gesamt_trainings, snap=snap
+    )
+    # Phase 19: Session-RPE-Trend
+    session_rpe_trend = _get_session_rpe_trend(user, snap=snap)
+    session_rpe_trend["sessions_json"] = json.dumps(session_rpe_trend["sessions"])
+    # Phase 20: Schwachstellen-Fortschritt
+    weakness_progress = _get_weakness_progress(user, active_block, snap=snap)
+    return {
+        "trainings_diese_woche": trainings_diese_woche,
+        "streak": streak,
+        "favoriten": favoriten,
+        "gesamt_trainings": gesamt_trainings,
+        "gesamt_saetze": gesamt_saetze,
+        "form_index": form_index,
+        "form_rating": form_rating,
+        "form_color": form_color,
+        "form_factors": form_factors,
+        "weekly_volumes": weekly_volumes,
+        # Trainingsblock-Kontext (Phase 3 + Phase 10; Netto seit Phase 34)
+        "active_block": active_block,
+        "block_age_weeks": block_age_weeks,
+        "block_pausen_wochen": block_pausen_wochen,
+        "block_netto_weeks": block_netto_weeks,
+        "block_age_warning": get_block_age_warning(active_block, netto_weeks=block_netto_weeks),
+        **fatigue_data,
+        "motivation_quote": motivation_quote,
+        "training_heatmap_json": training_heatmap_json,
+        "performance_warnings": performance_warnings,
+        # Phase 19: Session-RPE-Trend
+        "session_rpe_trend": session_rpe_trend,
+        # Phase 20: Schwachstellen-Fortschritt
+        "weakness_progress": weakness_progress,
+    }
+
+
 @login_required
 def dashboard(request: HttpRequest) -> HttpResponse:
     heute = timezone.now()
 
     # ----------------------------------------------------------------
     # Cached block: teure Berechnungen (Streak, Volumen, Fatigue, etc.)
-    # Cache-Key ist user-spezifisch; wird in signals.py invalidiert
-    # wenn der User ein neues Training speichert.
+    # Cache-Key enthält die Daten-Versionen des Users (signals.py erhöht sie
+    # bei jeder Änderung) und das Datum; nach finish_training / Pausen-CRUD
+    # wird der neue Key per Hintergrund-Job vorgewärmt.
+    # Single-Flight: parallele Requests teilen sich eine Berechnung.
     # ----------------------------------------------------------------
-    cache_key = f"dashboard_computed_{request.user.id}"
-    computed = cache.get(cache_key)
-
-    if computed is None:
-        trainings_diese_woche = _count_trainings_this_week(request.user, heute)
-        streak = _calculate_streak(request.user, heute)
-        favoriten = list(_get_favoriten(request.user))  # list() → pickleable
-        gesamt_trainings = Trainingseinheit.objects.filter(user=request.user).count()
-        gesamt_saetze = Satz.objects.filter(
-            einheit__user=request.user, ist_aufwaermsatz=False, einheit__ist_deload=False
-        ).count()
-        form_index, form_rating, form_color, form_factors = _calculate_form_index(
-            request.user, heute, trainings_diese_woche, streak, gesamt_trainings
-        )
-        active_block = _get_active_trainingsblock(request.user)
-        block_age_weeks = active_block.weeks_since_start if active_block else None
-        # Phase 34.1: Netto-Blockdauer = Brutto minus voll pausen-abgedeckte
-        # ISO-Wochen ohne abgeschlossene Session (Abdeckungs-Semantik, SoT aus
-        # week_classification). Liegt im Cache-Block – Pausen-CRUD invalidiert
-        # dashboard_computed seit 32.2 (signals.py).
-        block_pausen_wochen = 0
-        if active_block is not None:
-            block_pausen_wochen = pausen_ausfall_wochen(
-                TrainingsPause.objects.filter(user=request.user),
-                active_block.start_datum,
-                heute.date(),
-                sessions_week_keys=_session_week_keys(request.user, active_block.start_datum),
-            )
-        block_netto_weeks = (
-            max(0, block_age_weeks - block_pausen_wochen) if block_age_weeks is not None else None
-        )
-        weekly_volumes = _calculate_weekly_volumes(request.user, heute, active_block)
-        # Phase 34.2: Fatigue-Gate („Block < 3 Wochen → keine Volumen-Warnung")
-        # auf Netto – sonst beendet eine Pause im jungen Block das Schutzfenster
-        # zu früh.
-        fatigue_data = _calculate_fatigue_index(
-            request.user, heute, weekly_volumes, gesamt_trainings, block_netto_weeks
-        )
-        motivation_quote = _get_motivation_quote(form_index, fatigue_data["fatigue_index"])
-        training_heatmap_json = _get_training_heatmap(request.user, heute)
-        performance_warnings = _get_performance_warnings(
-            request.user, heute, favoriten, gesamt_trainings
-        )
-        # Phase 19: Session-RPE-Trend
-        session_rpe_trend = _get_session_rpe_trend(request.user)
-        session_rpe_trend["sessions_json"] = json.dumps(session_rpe_trend["sessions"])
-        # Phase 20: Schwachstellen-Fortschritt
-        weakness_progress = _get_weakness_progress(request.user, active_block)
-        computed = {
-            "trainings_diese_woche": trainings_diese_woche,
-            "streak": streak,
-            "favoriten": favoriten,
-            "gesamt_trainings": gesamt_trainings,
-            "gesamt_saetze": gesamt_saetze,
-            "form_index": form_index,
-            "form_rating": form_rating,
-            "form_color": form_color,
-            "form_factors": form_factors,
-            "weekly_volumes": weekly_volumes,
-            # Trainingsblock-Kontext (Phase 3 + Phase 10; Netto seit Phase 34)
-            "active_block": active_block,
-            "block_age_weeks": block_age_weeks,
-            "block_pausen_wochen": block_pausen_wochen,
-            "block_netto_weeks": block_netto_weeks,
-            "block_age_warning": get_block_age_warning(active_block, netto_weeks=block_netto_weeks),
-            **fatigue_data,
-            "motivation_quote": motivation_quote,
-            "training_heatmap_json": training_heatmap_json,
-            "performance_warnings": performance_warnings,
-            # Phase 19: Session-RPE-Trend
-            "session_rpe_trend": session_rpe_trend,
-            # Phase 20: Schwachstellen-Fortschritt
-            "weakness_progress": weakness_progress,
-        }
-        cache.set(cache_key, computed, timeout=DASHBOARD_CACHE_TTL)
+    snap = UserTrainingSnapshot(request.user, heute)  # lädt erst bei Zugriff
+    computed = dashboard_cache.hole_oder_berechne(
+        request.user.id,
+        lambda: _compute_dashboard_block(request.user, heute, snap=snap),
+        heute=heute,
+    )
 
     # ----------------------------------------------------------------
     # Immer frisch: Model-Instanzen + settings-basierte Werte
@@ -1447,7 +1337,7 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     reentry_pause = get_active_reentry_pause(request.user, today=heute.date())
 
     # Wochenübersicht (immer frisch – ändert sich intraday)
-    week_overview = _get_week_overview(request.user, heute)
+    week_overview = _get_week_overview(request.user, heute, snap=snap)
     trainings_ziel = 3
     try:
         trainings_ziel = request.user.profile.trainings_pro_woche
@@ -1686,6 +1576,11 @@ def _calc_rpe_trend(saetze, avg_rpe) -> str | None:
         einheit__datum__gte=heute - timedelta(days=56),
         einheit__datum__lt=heute - timedelta(days=28),
     ).aggregate(Avg("rpe"))["rpe__avg"]
+    return _bewerte_rpe_trend(recent_rpe, older_rpe)
+
+
+def _bewerte_rpe_trend(recent_rpe, older_rpe) -> str | None:
+    """Vergleicht Ø-RPE der letzten 4 Wochen mit den 4 Wochen davor (±0.3 = stabil)."""
     if not (recent_rpe and older_rpe):
         return None
     diff = recent_rpe - older_rpe
@@ -1696,6 +1591,30 @@ def _calc_rpe_trend(saetze, avg_rpe) -> str | None:
     return "stable"
 
 
+def _calc_rpe_trend_aus_statistik(statistiken, avg_rpe) -> str | None:
+    """Wie ``_calc_rpe_trend``, aber auf ``UebungTagesStatistik``-Zeilen (RPE-Summe/-Anzahl)."""
+    if not avg_rpe:
+        return None
+    heute = timezone.now()
+    grenze_recent = heute - timedelta(days=28)
+    grenze_older = heute - timedelta(days=56)
+    recent = [0.0, 0]
+    older = [0.0, 0]
+    for stat in statistiken:
+        datum = stat.einheit.datum
+        if datum >= grenze_recent:
+            fenster = recent
+        elif datum >= grenze_older:
+            fenster = older
+        else:
+            continue
+        fenster[0] += stat.rpe_summe
+        fenster[1] += stat.rpe_anzahl
+    recent_rpe = recent[0] / recent[1] if recent[1] else None
+    older_rpe = older[0] / older[1] if older[1] else None
+    return _bewerte_rpe_trend(recent_rpe, older_rpe)
+
+
 @login_required
 def exercise_stats(request: HttpRequest, uebung_id: int) -> HttpResponse:
     """Berechnet 1RM-Verlauf und Rekorde für eine Übung."""
@@ -1705,64 +1624,72 @@ def exercise_stats(request: HttpRequest, uebung_id: int) -> HttpResponse:
         id=uebung_id,
     )
 
-    saetze = (
-        Satz.objects.filter(
-            einheit__user=request.user,
+    # Materialisierte Tageswerte je Einheit statt Iteration über alle Sätze
+    statistik_qs = (
+        UebungTagesStatistik.objects.filter(
+            user=request.user,
             uebung=uebung,
-            ist_aufwaermsatz=False,
             einheit__ist_deload=False,
         )
         .select_related("einheit")
-        .order_by("einheit__datum")
+        .order_by("einheit__datum", "einheit_id")
     )
+    statistiken = list(statistik_qs)
+    if not statistiken and backfill_falls_leer(request.user.id, uebung.id):
+        # Bestandsdaten vor dem Backfill: einmalig für diese Übung nachziehen
+        statistiken = list(statistik_qs)
 
-    if not saetze.exists():
+    if not statistiken:
         return render(request, "core/stats_exercise.html", {"uebung": uebung, "no_data": True})
 
     # Phase 14.2: Historisches Körpergewicht pro Trainingstag laden
     is_kg_uebung = uebung.gewichts_typ == "KOERPERGEWICHT"
     if is_kg_uebung:
-        training_dates = list(saetze.values_list("einheit__datum", flat=True).distinct())
+        training_dates = list({stat.einheit.datum for stat in statistiken})
         kg_map = _get_koerpergewicht_map(request.user, training_dates)
-    else:
-        kg_map = {}
+        # Gespeichertes Körpergewicht weicht ab (neuer KoerperWerte-Eintrag,
+        # rückdatierte Einheit) → betroffene Zeilen neu berechnen
+        statistiken = aktualisiere_koerpergewicht(statistiken, kg_map)
     user_koerpergewicht = _get_user_koerpergewicht(request.user)
 
     # Best 1RM per day + overall records
     history_data: dict[str, float] = {}
     wdh_history: dict[str, int] = {}  # Wdh-Verlauf für KG-Übungen
-    rpe_session: dict[str, list[float]] = {}  # RPE-Werte je Session-Tag
+    rpe_session: dict[str, list[float]] = {}  # [RPE-Summe, Anzahl] je Session-Tag
     personal_record = 0.0
     best_weight = 0.0
     best_reps = 0
+    rpe_summe = 0.0
+    rpe_anzahl = 0
+    hat_zusatzgewicht = False
 
-    for satz in saetze:
-        # Historisches Gewicht für KG-Übungen, aktuelles für andere
-        kg = (
-            kg_map.get(satz.einheit.datum, user_koerpergewicht)
-            if is_kg_uebung
-            else user_koerpergewicht
-        )
-        one_rm, eff_weight = _compute_1rm_and_weight(satz, uebung, kg)
-        datum_str = satz.einheit.datum.strftime("%d.%m.%Y")
+    for stat in statistiken:
+        one_rm = stat.effektives_1rm
+        datum_str = stat.einheit.datum.strftime("%d.%m.%Y")
         if datum_str not in history_data or one_rm > history_data[datum_str]:
             history_data[datum_str] = round(one_rm, 1)
         if one_rm > personal_record:
             personal_record = round(one_rm, 1)
-        if eff_weight > best_weight:
-            best_weight = eff_weight
+        if stat.max_effektives_gewicht > best_weight:
+            best_weight = stat.max_effektives_gewicht
         # Wdh-Verlauf für KG-Übungen ohne Zusatzgewicht
-        if is_kg_uebung and float(satz.gewicht) == 0:
-            wdh = satz.wiederholungen
+        if is_kg_uebung and stat.max_wdh_ohne_gewicht is not None:
+            wdh = stat.max_wdh_ohne_gewicht
             if datum_str not in wdh_history or wdh > wdh_history[datum_str]:
                 wdh_history[datum_str] = wdh
             if wdh > best_reps:
                 best_reps = wdh
         # RPE-Verlauf: Durchschnitt pro Trainingstag
-        if satz.rpe is not None:
-            rpe_session.setdefault(datum_str, []).append(float(satz.rpe))
+        if stat.rpe_anzahl:
+            tag = rpe_session.setdefault(datum_str, [0.0, 0])
+            tag[0] += stat.rpe_summe
+            tag[1] += stat.rpe_anzahl
+            rpe_summe += stat.rpe_summe
+            rpe_anzahl += stat.rpe_anzahl
+        if stat.max_gewicht > 0:
+            hat_zusatzgewicht = True
 
-    rpe_history = {d: round(sum(v) / len(v), 1) for d, v in rpe_session.items()}
+    rpe_history = {d: round(summe / anzahl, 1) for d, (summe, anzahl) in rpe_session.items()}
 
     # 1RM-Prognose: lineare Regression auf bisherigem Verlauf (8 Wochen = 56 Tage)
     _history_pairs = [(_dt.strptime(d, "%d.%m.%Y").date(), v) for d, v in history_data.items()]
@@ -1772,11 +1699,10 @@ def exercise_stats(request: HttpRequest, uebung_id: int) -> HttpResponse:
         round(_forecast_raw, 1) if _forecast_raw and _forecast_raw > _current_1rm_last else None
     )
 
-    avg_rpe = saetze.aggregate(Avg("rpe"))["rpe__avg"]
+    avg_rpe = rpe_summe / rpe_anzahl if rpe_anzahl else None
 
     # Wdh-Verlauf als primäre Chart-Metrik wenn KG-Übung UND ausschließlich
     # ohne Zusatzgewicht trainiert. Sobald irgendein Satz Zusatz hat → 1RM-Chart.
-    hat_zusatzgewicht = saetze.filter(gewicht__gt=0).exists()
     show_reps_chart = is_kg_uebung and bool(wdh_history) and not hat_zusatzgewicht
 
     # PR-Geschichte: alle gespeicherten PRs dieser Übung (älteste zuerst für Timeline)
@@ -1806,7 +1732,7 @@ def exercise_stats(request: HttpRequest, uebung_id: int) -> HttpResponse:
         "best_reps": best_reps,
         "user_koerpergewicht": user_koerpergewicht,
         "avg_rpe": round(avg_rpe, 1) if avg_rpe else None,
-        "rpe_trend": _calc_rpe_trend(saetze, avg_rpe),
+        "rpe_trend": _calc_rpe_trend_aus_statistik(statistiken, avg_rpe),
         "pr_history": pr_history,
         "forecast_1rm": forecast_1rm,
     }
@@ -2234,22 +2160,17 @@ def _calc_plateau_live(user) -> list[dict]:
         )
 
         if not letzter_pr_satz:
-            # Fallback: find the set with highest estimated 1RM
-            alle_saetze = Satz.objects.filter(
-                einheit__user=user,
-                uebung_id=uebung_id,
-                ist_aufwaermsatz=False,
-                gewicht__isnull=False,
-            ).select_related("einheit")
-            best_1rm = 0
-            best_satz = None
-            for satz in alle_saetze:
-                wdh = satz.wiederholungen or 1
-                est = float(satz.gewicht) * (1 + wdh / 30.0)
-                if est > best_1rm:
-                    best_1rm = est
-                    best_satz = satz
-            letzter_pr_satz = best_satz
+            # Fallback: Satz mit höchstem geschätzten 1RM aus der materialisierten
+            # Tagesstatistik (Gleichstand → früheste Einheit, wie die alte Schleife)
+            beste_stat = (
+                UebungTagesStatistik.objects.filter(
+                    user=user, uebung_id=uebung_id, bestes_1rm__gt=0, bester_satz__isnull=False
+                )
+                .select_related("bester_satz__einheit")
+                .order_by("-bestes_1rm", "einheit_id")
+                .first()
+            )
+            letzter_pr_satz = beste_stat.bester_satz if beste_stat else None
 
         if not letzter_pr_satz:
             continue
@@ -2346,19 +2267,13 @@ def _calc_kraftstandards_live(user) -> list[dict]:
         if not uebung_obj.standard_beginner:
             continue
 
-        # Calculate best 1RM
-        saetze = Satz.objects.filter(
-            einheit__user=user,
-            uebung_id=uebung_id,
-            ist_aufwaermsatz=False,
-            gewicht__isnull=False,
+        # Bestes 1RM aus der materialisierten Tagesstatistik (inkl. Deload-Einheiten)
+        beste_1rm = (
+            UebungTagesStatistik.objects.filter(user=user, uebung_id=uebung_id).aggregate(
+                best=Max("bestes_1rm")
+            )["best"]
+            or 0
         )
-        beste_1rm = 0
-        for satz in saetze:
-            wdh = satz.wiederholungen or 1
-            est = float(satz.gewicht) * (1 + wdh / 30.0)
-            if est > beste_1rm:
-                beste_1rm = est
 
         if beste_1rm == 0:
             continue
@@ -2429,11 +2344,10 @@ def _calc_kraftstandards_live(user) -> list[dict]:
     return result[:5]
 
 
-@login_required
-def training_stats(request: HttpRequest) -> HttpResponse:
-    """Erweiterte Trainingsstatistiken mit Volumen-Progression und Analyse."""
+def _stats_verlauf(user, jetzt, user_kg: float) -> dict:
+    """Volumen-Verläufe, Wochenübersicht, Muskel-Balance und 90-Tage-Heatmap."""
     trainings = (
-        Trainingseinheit.objects.filter(user=request.user)
+        Trainingseinheit.objects.filter(user=user)
         .prefetch_related(
             Prefetch(
                 "saetze",
@@ -2443,10 +2357,7 @@ def training_stats(request: HttpRequest) -> HttpResponse:
         )
         .order_by("datum")
     )
-    if not trainings.exists():
-        return render(request, "core/training_stats.html", {"no_data": True})
-
-    user_kg = get_user_kg(request.user)
+    heute = jetzt.date()
     volumen_labels, volumen_data, deload_flags = _calc_per_training_volume(trainings, user_kg)
     weekly_labels, weekly_data, plans_per_week = _calc_weekly_volume(trainings, user_kg)
 
@@ -2462,26 +2373,21 @@ def training_stats(request: HttpRequest) -> HttpResponse:
     # Filterung hat das Dashboard die laufende KW20 fälschlich gegen die
     # abgeschlossene KW19 als „Echte Regression" klassifiziert, obwohl der
     # PDF-Pfad korrekt „Trend-Bewertung pausiert" zeigt.
-    alle_saetze_inkl_deload = Satz.objects.filter(
-        einheit__user=request.user, ist_aufwaermsatz=False
-    )
+    alle_saetze_inkl_deload = Satz.objects.filter(einheit__user=user, ist_aufwaermsatz=False)
     weekly_overview = build_weekly_volume_overview(
         alle_saetze_inkl_deload,
         trainings,
         user_kg=user_kg,
-        heute=timezone.now(),
-        pausen=TrainingsPause.objects.filter(user=request.user),
+        heute=jetzt,
+        pausen=TrainingsPause.objects.filter(user=user),
     )
     volume_diagnosis = weekly_overview[-1].get("diagnose") if weekly_overview else None
-    muskelgruppen_sorted, mg_labels, mg_data, stats_code = _calc_muscle_balance(
-        trainings, request.user
-    )
+    muskelgruppen_sorted, mg_labels, mg_data, stats_code = _calc_muscle_balance(trainings, user)
     svg_muscle_data = _build_svg_muscle_data(stats_code)
-    heute = timezone.now().date()
     # §32.4 (⑱): Pausen-Grenzen (≥ Mindestdauer) der letzten Wochen → ein
     # Volumen-Vergleich, der eine solche Woche überquert, wird nicht gewarnt.
     grenze_keys = pausen_grenze_keys(
-        TrainingsPause.objects.filter(user=request.user),
+        TrainingsPause.objects.filter(user=user),
         heute,
         letzte_iso_wochen_keys(heute, 14),
     )
@@ -2498,74 +2404,147 @@ def training_stats(request: HttpRequest) -> HttpResponse:
     durchschnitt = round(gesamt_volumen / len(volumen_data), 1) if volumen_data else 0
     gesamt_saetze = sum(len(t.arbeitssaetze_list) for t in trainings)
 
-    # RPE-10 metric (Phase 9.3)
-    rpe10_anteil = _get_rpe10_anteil(request.user, heute)
+    return {
+        "stats_code": stats_code,
+        "context": {
+            "trainings_count": len(trainings),
+            "gesamt_saetze": gesamt_saetze,
+            "gesamt_volumen": round(gesamt_volumen, 1),
+            "durchschnitt_volumen": durchschnitt,
+            "volumen_labels_json": json.dumps(volumen_labels),
+            "volumen_data_json": json.dumps(volumen_data),
+            "deload_flags_json": json.dumps(deload_flags),
+            "weekly_labels_json": json.dumps(weekly_labels),
+            "weekly_data_json": json.dumps(weekly_data),
+            # Phase 23.2: zweite Linie + Diagnose-Karte
+            "weekly_effective_data_json": json.dumps(weekly_effective_data),
+            "weekly_deload_majority_json": json.dumps(weekly_deload_majority_flags),
+            "volume_diagnosis": volume_diagnosis,
+            "mg_labels_json": json.dumps(mg_labels),
+            "mg_data_json": json.dumps(mg_data),
+            "muskelgruppen_stats": muskelgruppen_sorted,
+            "heatmap_data_json": json.dumps(heatmap_data),
+            "deload_warnings": deload_warnings,
+            "svg_muscle_data_json": json.dumps(svg_muscle_data),
+        },
+    }
+
 
-    # Phase 23.1: Zeitfenster-basierte RPE-Verteilung (2w / 4w / all)
-    rpe_active_uebung_ids = get_active_plan_exercise_ids(request.user)
+def _stats_rpe(user, heute) -> dict:
+    """RPE-10-Anteil und zeitfenster-basierte RPE-Verteilung (Phase 9.3 / 23.1)."""
+    rpe_active_uebung_ids = get_active_plan_exercise_ids(user)
     rpe_plan_start = (
-        get_active_plan_start_date(request.user)
-        if rpe_active_uebung_ids is not None and not is_active_plan_too_new(request.user)
+        get_active_plan_start_date(user)
+        if rpe_active_uebung_ids is not None and not is_active_plan_too_new(user)
         else None
     )
-    rpe_quality_windowed = calculate_rpe_quality_analysis_windowed(
-        Satz.objects.filter(einheit__user=request.user),
-        reference_date=heute,
-        plan_start=rpe_plan_start,
+    return {
+        "rpe10_anteil": _get_rpe10_anteil(user, heute),
+        "rpe_quality_windowed": calculate_rpe_quality_analysis_windowed(
+            Satz.objects.filter(einheit__user=user),
+            reference_date=heute,
+            plan_start=rpe_plan_start,
+        ),
+    }
+
+
+def _stats_koerper(user) -> dict:
+    """Körperwerte-Charts (nur wenn Messungen existieren), Keys mit ``body_``-Präfix."""
+    body_werte = KoerperWerte.objects.filter(user=user).order_by("datum")
+    if not body_werte.exists():
+        return {}
+    raw = _prepare_body_chart_data(body_werte)
+    # Prefix keys with body_ to avoid collisions with training chart vars
+    body_chart_ctx = {f"body_{k}": v for k, v in raw.items()}
+    body_chart_ctx["has_body_data"] = True
+    return body_chart_ctx
+
+
+def _stats_abschnitt(user, name: str, domaenen: tuple, berechne, zusatz: str = ""):
+    """Ein Abschnitt der Statistik-Seite, gecacht unter den Daten-Versionen ``domaenen``."""
+    return gecacht(f"stats_{name}", user.id, domaenen, berechne, STATS_ABSCHNITT_TTL, zusatz=zusatz)
+
+
+@login_required
+def training_stats(request: HttpRequest) -> HttpResponse:
+    """Erweiterte Trainingsstatistiken mit Volumen-Progression und Analyse.
+
+    Jeder Abschnitt wird einzeln gecacht – der Key enthält nur die
+    Daten-Versionen, von denen er abhängt (``core/services/daten_version.py``),
+    plus Datum und ggf. Körpergewicht. Ein neuer Körperwert berechnet so nur
+    die Körper-Charts (und die vom Körpergewicht abhängigen Abschnitte) neu.
+    """
+    user = request.user
+    if not Trainingseinheit.objects.filter(user=user).exists():
+        return render(request, "core/training_stats.html", {"no_data": True})
+
+    jetzt = timezone.now()
+    heute = jetzt.date()
+    tag = heute.strftime("%Y%m%d")
+    # Volumen von KG-Übungen hängt vom aktuellen Körpergewicht ab → Wert im Key
+    # statt Domäne "koerper" (ältere Messungen ändern das Volumen nicht).
+    user_kg = get_user_kg(user)
+    kg = f"{tag}_kg{user_kg:g}"
+
+    verlauf = _stats_abschnitt(
+        user,
+        "verlauf",
+        ("saetze", "einheiten", "pausen"),
+        lambda: _stats_verlauf(user, jetzt, user_kg),
+        zusatz=kg,
+    )
+    rpe = _stats_abschnitt(
+        user, "rpe", ("saetze", "einheiten", "plaene"), lambda: _stats_rpe(user, heute), tag
     )
 
     # Phase 35.3 (#1059 g): globaler Pausen-Kontext für die 30-Tage-Karten –
     # gleiche Datenquelle wie der PDF-Report-Banner (pausen_im_zeitraum).
+    # Ungecacht: eine Query auf wenige Zeilen.
     pausen_banner = pausen_im_zeitraum(
-        TrainingsPause.objects.filter(user=request.user),
+        TrainingsPause.objects.filter(user=user),
         heute - timedelta(days=30),
         heute,
     )
 
     # Phase 21.1: Muskelgruppen-Balance Soll-Bereich
-    muscle_soll = _calc_muscle_soll_bereiche(stats_code, request.user)
+    muscle_soll = _stats_abschnitt(
+        user,
+        "muskel_soll",
+        ("saetze", "einheiten", "plaene"),
+        lambda: _calc_muscle_soll_bereiche(verlauf["stats_code"], user),
+        tag,
+    )
 
     # Phase 21.2: Push/Pull-Ratio
-    push_pull = _calc_push_pull_ratio(request.user)
+    push_pull = _stats_abschnitt(
+        user, "push_pull", ("saetze", "einheiten"), lambda: _calc_push_pull_ratio(user), tag
+    )
 
-    # Phase 21.3: Plateau-Tracking
-    plateau_live = _calc_plateau_live(request.user)
+    # Phase 21.3: Plateau-Tracking (Pausen: Wiedereinstiegs-Rampe)
+    plateau_live = _stats_abschnitt(
+        user,
+        "plateau",
+        ("saetze", "einheiten", "plaene", "pausen"),
+        lambda: _calc_plateau_live(user),
+        tag,
+    )
 
-    # Phase 21.4: Kraftstandards
-    kraftstandards = _calc_kraftstandards_live(request.user)
+    # Phase 21.4: Kraftstandards (relativ zum Körpergewicht)
+    kraftstandards = _stats_abschnitt(
+        user,
+        "kraftstandards",
+        ("saetze", "einheiten", "plaene"),
+        lambda: _calc_kraftstandards_live(user),
+        kg,
+    )
 
     # Body stats trend data (optional – only if measurements exist)
-    body_werte = KoerperWerte.objects.filter(user=request.user).order_by("datum")
-    body_chart_ctx = {}
-    if body_werte.exists():
-        raw = _prepare_body_chart_data(body_werte)
-        # Prefix keys with body_ to avoid collisions with training chart vars
-        body_chart_ctx = {f"body_{k}": v for k, v in raw.items()}
-        body_chart_ctx["has_body_data"] = True
+    body_chart_ctx = _stats_abschnitt(user, "koerper", ("koerper",), lambda: _stats_koerper(user))
 
     context = {
-        "trainings_count": trainings.count(),
-        "gesamt_saetze": gesamt_saetze,
-        "gesamt_volumen": round(gesamt_volumen, 1),
-        "durchschnitt_volumen": durchschnitt,
-        "volumen_labels_json": json.dumps(volumen_labels),
-        "volumen_data_json": json.dumps(volumen_data),
-        "deload_flags_json": json.dumps(deload_flags),
-        "weekly_labels_json": json.dumps(weekly_labels),
-        "weekly_data_json": json.dumps(weekly_data),
-        # Phase 23.2: zweite Linie + Diagnose-Karte
-        "weekly_effective_data_json": json.dumps(weekly_effective_data),
-        "weekly_deload_majority_json": json.dumps(weekly_deload_majority_flags),
-        "volume_diagnosis": volume_diagnosis,
+        **verlauf["context"],
         "aktuelle_kw": f"{heute.isocalendar()[0]}-W{heute.isocalendar()[1]:02d}",
-        "mg_labels_json": json.dumps(mg_labels),
-        "mg_data_json": json.dumps(mg_data),
-        "muskelgruppen_stats": muskelgruppen_sorted,
-        "heatmap_data_json": json.dumps(heatmap_data),
-        "deload_warnings": deload_warnings,
-        "svg_muscle_data_json": json.dumps(svg_muscle_data),
-        "rpe10_anteil": rpe10_anteil,
-        "rpe_quality_windowed": rpe_quality_windowed,
+        **rpe,
         "pausen_banner": pausen_banner,
         # Phase 21
         "muscle_soll_json": json.dumps(muscle_soll),
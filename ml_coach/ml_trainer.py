@@ -24,71 +24,32 @@ from sklearn.model_selection import train_test_split
 class MLTrainer:
     """Trainiert ML-Modelle für Gewichtsvorhersagen"""
 
-    def __init__(self, user, uebung):
+    def __init__(self, user, uebung, n_jobs: int = -1):
         self.user = user
         self.uebung = uebung
+        # -1 = alle CPU-Cores; im Prozess-Pool von train_ml_models 1 je Worker
+        self.n_jobs = n_jobs
         self.model_dir = os.path.join(settings.MEDIA_ROOT, "ml_models")
         os.makedirs(self.model_dir, exist_ok=True)
 
     def get_training_data(self):
         """
-        Sammelt Trainingsdaten für Übung.
+        Liest Trainingsdaten der Übung aus dem Feature-Store (letzte 6 Monate).
         Features: [effective_weight, last_reps, days_since_last, rpe, set_number, rpe_target]
         Target: next_effective_weight
 
         Bei KOERPERGEWICHT-Übungen wird effective_weight =
         (user_koerpergewicht * koerpergewicht_faktor) + zusatzgewicht berechnet.
         Damit lernt das Modell auf sinnvollen Gewichtswerten statt reinen Nullen.
+        Die Zeilen pflegt ``core/services/ml_features.py`` inkrementell.
         """
-        from core.models import PlanUebung, Satz
-
-        # Phase 14.2: Historisches Körpergewicht pro Trainingstag
-        from core.views.training_stats import _get_koerpergewicht_map, _get_user_koerpergewicht
-
-        is_kg_uebung = self.uebung.gewichts_typ == "KOERPERGEWICHT"
-        kg_faktor = getattr(self.uebung, "koerpergewicht_faktor", 1.0) or 1.0
-        kg_richtung = getattr(self.uebung, "gewichts_richtung", "ZUSATZ") or "ZUSATZ"
-        user_koerpergewicht = _get_user_koerpergewicht(self.user)
-        _kg_map: dict | None = None  # Lazy init nach saetze-Query
-
-        def _get_kg_for_satz(satz):
-            nonlocal _kg_map
-            if not is_kg_uebung:
-                return user_koerpergewicht
-            if _kg_map is None:
-                dates = list(
-                    Satz.objects.filter(einheit__user=self.user, uebung=self.uebung)
-                    .values_list("einheit__datum", flat=True)
-                    .distinct()
-                )
-                _kg_map = _get_koerpergewicht_map(self.user, dates)
-            return _kg_map.get(satz.einheit.datum, user_koerpergewicht)
-
-        def effective_weight(satz):
-            zusatz = float(satz.gewicht)
-            if is_kg_uebung:
-                basis = _get_kg_for_satz(satz) * kg_faktor
-                if kg_richtung == "GEGEN":
-                    return max(0.0, basis - zusatz)
-                return basis + zusatz
-            if self.uebung.gewichts_typ == "PRO_SEITE":
-                return zusatz * 2
-            return zusatz
-
-        # Alle Sätze dieser Übung vom User (letzte 6 Monate)
+        from core.models import PlanUebung
+        from core.services import ml_features
+
         six_months_ago = timezone.now() - timedelta(days=180)
-        saetze = (
-            Satz.objects.filter(
-                einheit__user=self.user,
-                uebung=self.uebung,
-                einheit__datum__gte=six_months_ago,
-                ist_aufwaermsatz=False,  # Nur Arbeitssätze
-            )
-            .select_related("einheit")
-            .order_by("einheit__datum", "id")
-        )
+        zeilen, gewichte = ml_features.lade_matrix(self.user.id, self.uebung, seit=six_months_ago)
 
-        if saetze.count() < 10:
+        if len(zeilen) < 10:
             return None, None  # Zu wenig Daten
 
         # RPE-Ziel aus aktuellem Plan laden (falls vorhanden)
@@ -105,44 +66,21 @@ class MLTrainer:
         )
         rpe_target_val = plan_rpe_target if plan_rpe_target is not None else rpe_target_default
 
-        features = []
-        targets = []
-
-        saetze_list = list(saetze)
-
-        for i in range(len(saetze_list) - 1):
-            current = saetze_list[i]
-            next_satz = saetze_list[i + 1]
-
-            days_since_last = 0
-            if i > 0:
-                prev_training = saetze_list[i - 1].einheit
-                days_since_last = (current.einheit.datum - prev_training.datum).days
-
-            # Satz-Nummer im Training
-            set_number = list(current.einheit.saetze.filter(uebung=self.uebung)).index(current) + 1
-
-            features.append(
-                [
-                    effective_weight(current),
-                    float(current.wiederholungen),
-                    float(days_since_last),
-                    float(current.rpe or 7.0),  # Default RPE
-                    float(set_number),
-                    float(rpe_target_val),
-                ]
-            )
-
-            targets.append(float(next_satz.gewicht))
-
-        return np.array(features), np.array(targets)
+        features = np.column_stack([zeilen[:-1], np.full(len(zeilen) - 1, float(rpe_target_val))])
+        return features, gewichte[1:]
 
     def train_model(self):
         """
         Trainiert Random Forest Regressor
         Returns: (model_instance, metrics_dict) oder (None, None) bei Fehler
         """
-        from core.models import MLPredictionModel
+        from core.models import MLPredictionModel, Satz
+
+        # Datenstand vor dem Sammeln festhalten: Sätze, die während des Trainings
+        # hinzukommen, machen das Modell beim nächsten Lauf wieder veraltet
+        datenstand = Satz.objects.filter(
+            einheit__user=self.user, uebung=self.uebung, ist_aufwaermsatz=False
+        ).aggregate(anzahl=models.Count("id"), letzter=models.Max("id"))
 
         # Daten sammeln
         X, y = self.get_training_data()
@@ -159,7 +97,7 @@ class MLTrainer:
             max_depth=10,
             min_samples_split=5,
             random_state=42,
-            n_jobs=-1,  # Nutzt alle CPU-Cores
+            n_jobs=self.n_jobs,
         )
 
         # Training (<5 Sekunden auf CPU)
@@ -200,6 +138,8 @@ class MLTrainer:
                     "min_samples_split": 5,
                 },
                 "feature_stats": feature_stats,
+                "letzter_satz_id": datenstand["letzter"],
+                "arbeitssaetze": datenstand["anzahl"],
             },
         )
 
@@ -244,6 +184,65 @@ class MLTrainer:
 
         return results
 
+    @staticmethod
+    def veraltete_paare(user_ids=None, min_samples=10, force=False):
+        """
+        Ermittelt (User, Übung)-Paare, deren Modell (neu) trainiert werden muss.
+
+        Veraltet ist ein Paar ohne Modell, mit neuen/gelöschten Arbeitssätzen seit
+        dem Training (``MLPredictionModel.hat_neue_daten``) oder älter als 30 Tage
+        (``needs_retraining``). Zwei Queries, unabhängig von der Anzahl Paare.
+
+        Returns: (Liste von (user_id, uebung_id, grund), Anzahl aktueller Paare)
+        """
+        from core.models import MLPredictionModel, Satz
+
+        kandidaten = Satz.objects.filter(ist_aufwaermsatz=False, einheit__user__is_active=True)
+        modelle = MLPredictionModel.objects.filter(model_type="STRENGTH", uebung__isnull=False)
+        if user_ids is not None:
+            kandidaten = kandidaten.filter(einheit__user_id__in=user_ids)
+            modelle = modelle.filter(user_id__in=user_ids)
+
+        kandidaten = (
+            kandidaten.values("einheit__user_id", "uebung_id")
+            .annotate(anzahl=models.Count("id"), letzter=models.Max("id"))
+            .filter(anzahl__gte=min_samples)
+            .order_by("einheit__user_id", "uebung_id")
+        )
+        bestehend = {
+            (m.user_id, m.uebung_id): m
+            for m in modelle.only(
+                "user_id",
+                "uebung_id",
+                "status",
+                "trained_at",
+                "letzter_satz_id",
+                "arbeitssaetze",
+            )
+        }
+
+        veraltet = []
+        aktuell = 0
+        for k in kandidaten:
+            paar = (k["einheit__user_id"], k["uebung_id"])
+            ml_model = bestehend.get(paar)
+            if force:
+                grund = "force"
+            elif ml_model is None:
+                grund = "neu"
+            elif ml_model.status != "READY":
+                grund = "status"
+            elif ml_model.hat_neue_daten(k["anzahl"], k["letzter"]):
+                grund = "neue_saetze"
+            elif ml_model.needs_retraining():
+                grund = "alter"
+            else:
+                aktuell += 1
+                continue
+            veraltet.append((*paar, grund))
+
+        return veraltet, aktuell
+
 
 # Quick-Import für Management Commands
 from django.db import models
@@ -0,0 +1,91 @@
+"""
+ML Model Registry - Prozesslokaler LRU-Cache geladener scikit-learn-Modelle
+
+Bisher landete der komplette RandomForest (mehrere MB) zusammen mit der
+MLPredictionModel-Instanz im Django-Cache. In Produktion (FileBasedCache)
+hieß das: jede Vorhersage entpickelt das Modell von Platte, und die großen
+Einträge verdrängen alles andere aus den ``MAX_ENTRIES=1000``.
+
+Jetzt:
+- Geladene Estimatoren liegen pro Worker-Prozess in einem größenbegrenzten
+  LRU (``settings.ML_MODEL_REGISTRY_GROESSE``).
+- Schlüssel ist (model_path, trained_at): Neu-Training ändert ``trained_at``
+  → alter Eintrag wird beim nächsten Zugriff ersetzt, ohne explizite Invalidierung.
+- Im geteilten Cache bleiben nur leichtgewichtige Metadaten (MLPredictor).
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+import joblib
+
+
+class ModelRegistry:
+    """Thread-sicherer LRU für geladene Estimatoren mit Hit/Miss/Eviction-Zählern."""
+
+    def __init__(self, max_eintraege: int | None = None):
+        self._max = max_eintraege
+        self._modelle: OrderedDict[str, tuple[str, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_eintraege(self) -> int:
+        if self._max is not None:
+            return self._max
+        return max(1, int(getattr(settings, "ML_MODEL_REGISTRY_GROESSE", 32)))
+
+    def hole(self, model_path: str, stand: str):
+        """
+        Liefert den Estimator für ``model_path`` im Stand ``stand`` (trained_at).
+
+        Lädt bei Miss von Platte (``joblib.load``); FileNotFoundError wird
+        durchgereicht. Ein Eintrag mit anderem Stand gilt als Miss und wird ersetzt.
+        """
+        with self._lock:
+            eintrag = self._modelle.get(model_path)
+            if eintrag is not None and eintrag[0] == stand:
+                self._modelle.move_to_end(model_path)
+                self.hits += 1
+                return eintrag[1]
+            self.misses += 1
+
+        # Laden außerhalb des Locks: andere Modelle bleiben abrufbar
+        estimator = joblib.load(model_path)
+
+        with self._lock:
+            self._modelle[model_path] = (stand, estimator)
+            self._modelle.move_to_end(model_path)
+            while len(self._modelle) > self.max_eintraege:
+                self._modelle.popitem(last=False)
+                self.evictions += 1
+        return estimator
+
+    def entferne(self, model_path: str) -> None:
+        with self._lock:
+            self._modelle.pop(model_path, None)
+
+    def leeren(self) -> None:
+        """Entfernt alle Modelle und setzt die Zähler zurück (Tests)."""
+        with self._lock:
+            self._modelle.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def statistik(self) -> dict:
+        with self._lock:
+            zugriffe = self.hits + self.misses
+            return {
+                "eintraege": len(self._modelle),
+                "max_eintraege": self.max_eintraege,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / zugriffe, 3) if zugriffe else 0.0,
+            }
+
+
+registry = ModelRegistry()
@@ -7,14 +7,130 @@ Funktionen:
 - Inferenz: <10ms auf CPU
 """
 
-import os
-from datetime import timedelta
+import logging
 
 from django.core.cache import cache
 
-import joblib
 import numpy as np
 
+from ml_coach.model_registry import registry
+
+logger = logging.getLogger(__name__)
+
+# Leichtgewichtige Modell-Metadaten für den geteilten Cache (ohne Estimator)
+_META_FELDER = (
+    "id",
+    "user_id",
+    "uebung_id",
+    "model_type",
+    "status",
+    "model_path",
+    "trained_at",
+    "training_samples",
+    "accuracy_score",
+    "mean_absolute_error",
+    "hyperparameters",
+)
+
+
+def _meta_key(user_id: int, uebung_id: int) -> str:
+    from core.services.daten_version import versionierter_key
+
+    # Cache-Key mit ML-Daten-Version: Neu-Training → neuer Key (signals.py)
+    return f"{versionierter_key('ml_model', user_id, 'ml')}_uebung_{uebung_id}"
+
+
+def _lade_metadaten(user_id: int, uebung_ids) -> dict[int, dict]:
+    """Modell-Metadaten je Übung: ``cache.get_many`` + eine Query für Fehlende.
+
+    Im geteilten Cache nur Metadaten ({} = kein Modell); der Estimator selbst
+    liegt prozesslokal in der Registry (model_registry.py).
+    """
+    from core.models import MLPredictionModel
+
+    keys = {_meta_key(user_id, uid): uid for uid in set(uebung_ids)}
+    metadaten = {keys[k]: meta for k, meta in cache.get_many(list(keys)).items()}
+    fehlend = [uid for uid in keys.values() if uid not in metadaten]
+    if fehlend:
+        gefunden = {
+            meta["uebung_id"]: meta
+            for meta in MLPredictionModel.objects.filter(
+                user_id=user_id, uebung_id__in=fehlend, model_type="STRENGTH", status="READY"
+            ).values(*_META_FELDER)
+        }
+        neu = {uid: gefunden.get(uid, {}) for uid in fehlend}
+        # Versionierter Key → keine veralteten Metadaten; TTL nur Speichergrenze
+        cache.set_many({_meta_key(user_id, uid): m for uid, m in neu.items()}, 24 * 3600)
+        metadaten.update(neu)
+    return {uid: meta for uid, meta in metadaten.items() if meta}
+
+
+def _rpe_ziele(user_id: int, uebung_ids) -> dict[int, float]:
+    """Ziel-RPE je Übung aus dem neuesten Plan mit RPE-Ziel (eine Query, Default 8.0)."""
+    from core.models import PlanUebung
+
+    ziele: dict[int, float] = {}
+    for uid, rpe in (
+        PlanUebung.objects.filter(
+            plan__user_id=user_id, uebung_id__in=uebung_ids, rpe_ziel__isnull=False
+        )
+        .order_by("-plan__erstellt_am")
+        .values_list("uebung_id", "rpe_ziel")
+    ):
+        ziele.setdefault(uid, rpe)
+    return {uid: ziele.get(uid, 8.0) for uid in uebung_ids}
+
+
+def _feature_zeile(last_weight, last_reps, days_since_last, rpe, rpe_target) -> list[float]:
+    # [last_weight, last_reps, days_since_last, rpe, set_number, rpe_target]
+    set_number = 1  # Annahme: erster Satz
+    return [
+        float(last_weight),
+        float(last_reps),
+        float(days_since_last),
+        float(rpe or 7.0),
+        float(set_number),
+        float(rpe_target),
+    ]
+
+
+def _ml_ergebnis(predicted_weight: float, last_weight: float, ml_model) -> dict:
+    """Rundung, Sicherheitsgrenzen und Confidence einer Roh-Vorhersage."""
+    # Confidence basierend auf MAE und Modell-Qualität
+    mae = ml_model.mean_absolute_error or 5.0
+    r2 = ml_model.accuracy_score or 0.5
+
+    # Confidence: Je niedriger MAE und höher R², desto höher Confidence
+    confidence = min(1.0, max(0.3, r2 * (1 - mae / 50)))
+
+    # Runde auf sinnvolle Werte (2.5kg Schritte für Gewichte >20kg)
+    if predicted_weight > 20:
+        predicted_weight = round(predicted_weight / 2.5) * 2.5
+    else:
+        predicted_weight = round(predicted_weight * 2) / 2  # 0.5kg Schritte
+
+    # Sicherheits-Check: Nicht mehr als +10kg auf einmal
+    max_increase = last_weight + 10
+    min_weight = last_weight - 5  # Max 5kg weniger
+    predicted_weight = max(min_weight, min(predicted_weight, max_increase))
+
+    return {
+        "predicted_weight": round(predicted_weight, 1),
+        "confidence": round(confidence, 2),
+        "method": "ml",
+        "explanation": f"ML-Vorhersage (R²={r2:.2f}, MAE={mae:.1f}kg)",
+        "model_samples": ml_model.training_samples,
+        "last_trained": ml_model.trained_at.strftime("%d.%m.%Y"),
+    }
+
+
+_KEINE_DATEN = {
+    "predicted_weight": None,
+    "confidence": 0.0,
+    "method": "no_data",
+    "explanation": "Keine vorherigen Trainingsdaten gefunden.",
+}
+
 
 class MLPredictor:
     """Macht Vorhersagen mit trainierten ML-Modellen"""
@@ -26,39 +142,20 @@ class MLPredictor:
         self._ml_model_instance = None
 
     def load_model(self):
-        """Lädt trainiertes Modell aus Cache oder Disk"""
+        """Lädt Metadaten aus Cache/DB und den Estimator aus der Model-Registry"""
         from core.models import MLPredictionModel
 
-        # Cache-Key
-        cache_key = f"ml_model_user_{self.user.id}_uebung_{self.uebung.id}"
-
-        # Versuche aus Cache zu laden (schneller)
-        cached_model = cache.get(cache_key)
-        if cached_model:
-            self._model, self._ml_model_instance = cached_model
-            return True
+        meta = _lade_metadaten(self.user.id, [self.uebung.id]).get(self.uebung.id)
+        if not meta:
+            return False
 
-        # Lade aus Datenbank
         try:
-            ml_model = MLPredictionModel.objects.get(
-                user=self.user, uebung=self.uebung, model_type="STRENGTH", status="READY"
-            )
-
-            # Lade Pickle-File
-            if os.path.exists(ml_model.model_path):
-                model = joblib.load(ml_model.model_path)
-                self._model = model
-                self._ml_model_instance = ml_model
-
-                # Cache für 1 Stunde
-                cache.set(cache_key, (model, ml_model), 3600)
-                return True
-            else:
-                print(f"Modell-Datei nicht gefunden: {ml_model.model_path}")
-                return False
-
-        except MLPredictionModel.DoesNotExist:
+            self._model = registry.hole(meta["model_path"], meta["trained_at"].isoformat())
+        except FileNotFoundError:
+            logger.warning(f"Modell-Datei nicht gefunden: {meta['model_path']}")
             return False
+        self._ml_model_instance = MLPredictionModel(**meta)
+        return True
 
     def predict_next_weight(self, last_weight=None, last_reps=None, rpe=None, rpe_target=None):
         """
@@ -78,115 +175,118 @@ class MLPredictor:
                 'explanation': str
             }
         """
-        from core.models import PlanUebung, Satz
-
         # RPE-Ziel aus Plan laden falls nicht übergeben
         if rpe_target is None:
-            plan_rpe = (
-                PlanUebung.objects.filter(
-                    plan__user=self.user,
-                    uebung=self.uebung,
-                    rpe_ziel__isnull=False,
-                )
-                .order_by("-plan__erstellt_am")
-                .values_list("rpe_ziel", flat=True)
-                .first()
-            )
-            rpe_target = plan_rpe if plan_rpe is not None else 8.0
+            rpe_target = _rpe_ziele(self.user.id, [self.uebung.id])[self.uebung.id]
 
         # Lade Modell
         if not self.load_model():
             return self._fallback_prediction(last_weight, last_reps, rpe, rpe_target)
 
-        # Hole letzte Trainingsdaten falls nicht übergeben
+        # Hole letzte Trainingsdaten falls nicht übergeben (Feature-Store)
         if last_weight is None or last_reps is None:
-            last_satz = (
-                Satz.objects.filter(
-                    einheit__user=self.user, uebung=self.uebung, ist_aufwaermsatz=False
-                )
-                .select_related("einheit")
-                .order_by("-einheit__datum", "-id")
-                .first()
-            )
+            from core.services import ml_features
 
-            if not last_satz:
-                return {
-                    "predicted_weight": None,
-                    "confidence": 0.0,
-                    "method": "no_data",
-                    "explanation": "Keine vorherigen Trainingsdaten gefunden.",
-                }
-
-            last_weight = float(last_satz.gewicht)
-            last_reps = float(last_satz.wiederholungen)
-            rpe = float(last_satz.rpe or 7.0)
-
-            # Days seit letztem Training
-            previous_satz = (
-                Satz.objects.filter(
-                    einheit__user=self.user,
-                    uebung=self.uebung,
-                    ist_aufwaermsatz=False,
-                    einheit__datum__lt=last_satz.einheit.datum,
-                )
-                .order_by("-einheit__datum")
-                .first()
-            )
-
-            if previous_satz:
+            letzte = ml_features.letzte_zeile(self.user.id, self.uebung.id)
+            if letzte is None:
+                return dict(_KEINE_DATEN)
 
-                days_since_last = (last_satz.einheit.datum - previous_satz.einheit.datum).days
-
-            else:
-                days_since_last = 7  # Default
+            last_weight = letzte["last_weight"]
+            last_reps = letzte["last_reps"]
+            rpe = letzte["rpe"]
+            days_since_last = letzte["days_since_last"]
         else:
             days_since_last = 7  # Default wenn manuell übergeben
 
-        # Bereite Features vor
-        # [last_weight, last_reps, days_since_last, rpe, set_number, rpe_target]
-        set_number = 1  # Annahme: erster Satz
         features = np.array(
-            [
-                [
-                    float(last_weight),
-                    float(last_reps),
-                    float(days_since_last),
-                    float(rpe or 7.0),
-                    float(set_number),
-                    float(rpe_target),
-                ]
-            ]
+            [_feature_zeile(last_weight, last_reps, days_since_last, rpe, rpe_target)]
         )
 
         # Prediction (< 10ms)
         predicted_weight = self._model.predict(features)[0]
+        return _ml_ergebnis(predicted_weight, float(last_weight), self._ml_model_instance)
 
-        # Confidence basierend auf MAE und Modell-Qualität
-        mae = self._ml_model_instance.mean_absolute_error or 5.0
-        r2 = self._ml_model_instance.accuracy_score or 0.5
+    @staticmethod
+    def predict_batch(user, uebung_ids, rpe_targets=None, fallback=True) -> dict[int, dict]:
+        """
+        Vorhersagen für mehrere Übungen (Trainingseinheit, Plan) in wenigen Queries.
 
-        # Confidence: Je niedriger MAE und höher R², desto höher Confidence
-        confidence = min(1.0, max(0.3, r2 * (1 - mae / 50)))
+        Metadaten (Cache + 1 Query), letzte Feature-Zeilen (1 Query) und Ziel-RPE
+        (1 Query) werden gesammelt; danach läuft je Estimator ein vektorisiertes
+        ``predict`` über alle zugehörigen Zeilen.
 
-        # Runde auf sinnvolle Werte (2.5kg Schritte für Gewichte >20kg)
-        if predicted_weight > 20:
-            predicted_weight = round(predicted_weight / 2.5) * 2.5
-        else:
-            predicted_weight = round(predicted_weight * 2) / 2  # 0.5kg Schritte
+        Args:
+            uebung_ids: Übungs-IDs (Reihenfolge egal, Duplikate erlaubt)
+            rpe_targets: optional {uebung_id: Ziel-RPE}, sonst aus dem neuesten Plan
+            fallback: False → nur Übungen mit ML-Modell (keine Regel-Vorhersagen)
 
-        # Sicherheits-Check: Nicht mehr als +10kg auf einmal
-        max_increase = last_weight + 10
-        min_weight = last_weight - 5  # Max 5kg weniger
-        predicted_weight = max(min_weight, min(predicted_weight, max_increase))
+        Returns:
+            {uebung_id: dict wie ``predict_next_weight``}
+        """
+        from core.models import MLPredictionModel
+        from core.services import ml_features
+
+        uebung_ids = list(dict.fromkeys(uebung_ids))
+        if not uebung_ids:
+            return {}
+        metadaten = _lade_metadaten(user.id, uebung_ids)
+        if not fallback:
+            uebung_ids = [uid for uid in uebung_ids if uid in metadaten]
+            if not uebung_ids:
+                return {}
+
+        letzte = ml_features.letzte_zeilen(user.id, uebung_ids)
+        ziele = _rpe_ziele(user.id, [uid for uid in uebung_ids if uid not in (rpe_targets or {})])
+        ziele.update(rpe_targets or {})
+
+        ergebnisse: dict[int, dict] = {}
+        gruppen: dict[str, list[int]] = {}
+        for uid in uebung_ids:
+            if uid in metadaten and uid in letzte:
+                gruppen.setdefault(metadaten[uid]["model_path"], []).append(uid)
+            elif uid in metadaten:
+                ergebnisse[uid] = dict(_KEINE_DATEN)
+
+        for model_path, uids in gruppen.items():
+            meta = metadaten[uids[0]]
+            try:
+                estimator = registry.hole(model_path, meta["trained_at"].isoformat())
+            except FileNotFoundError:
+                logger.warning(f"Modell-Datei nicht gefunden: {model_path}")
+                continue
+            features = np.array(
+                [
+                    _feature_zeile(
+                        letzte[uid]["last_weight"],
+                        letzte[uid]["last_reps"],
+                        letzte[uid]["days_since_last"],
+                        letzte[uid]["rpe"],
+                        ziele[uid],
+                    )
+                    for uid in uids
+                ]
+            )
+            for uid, predicted in zip(uids, estimator.predict(features)):
+                ergebnisse[uid] = _ml_ergebnis(
+                    predicted, letzte[uid]["last_weight"], MLPredictionModel(**metadaten[uid])
+                )
 
-        return {
-            "predicted_weight": round(predicted_weight, 1),
-            "confidence": round(confidence, 2),
-            "method": "ml",
-            "explanation": f"ML-Vorhersage (R²={r2:.2f}, MAE={mae:.1f}kg)",
-            "model_samples": self._ml_model_instance.training_samples,
-            "last_trained": self._ml_model_instance.trained_at.strftime("%d.%m.%Y"),
-        }
+        if fallback:
+            regeln = MLPredictor(user, None)
+            for uid in uebung_ids:
+                if uid in ergebnisse:
+                    continue
+                if uid not in letzte:
+                    ergebnisse[uid] = {
+                        **_KEINE_DATEN,
+                        "explanation": "Keine Trainingsdaten vorhanden.",
+                    }
+                    continue
+                zeile = letzte[uid]
+                ergebnisse[uid] = regeln._fallback_prediction(
+                    zeile["last_weight"], zeile["last_reps"], zeile["rpe"], ziele[uid]
+                )
+        return ergebnisse
 
     def _fallback_prediction(self, last_weight, last_reps, rpe, rpe_target=8.0):
         """Fallback auf regelbasierte Vorhersage wenn kein ML-Modell vorhanden"""
@@ -203,12 +303,7 @@ class MLPredictor:
             )
 
             if not last_satz:
-                return {
-                    "predicted_weight": None,
-                    "confidence": 0.0,
-                    "method": "no_data",
-                    "explanation": "Keine Trainingsdaten vorhanden.",
-                }
+                return {**_KEINE_DATEN, "explanation": "Keine Trainingsdaten vorhanden."}
 
             last_weight = last_satz.gewicht
             last_reps = last_satz.wiederholungen